@@ -0,0 +1,620 @@
+"""
+Asynchronous career-page crawler for the Job Scout agent.
+
+Pages are fetched with httpx under a per-host concurrency limit and a per-host
+token bucket. Validators (``ETag``, ``Last-Modified``) from earlier fetches are
+kept in a SQLite fetch-state table and sent back as ``If-None-Match`` and
+``If-Modified-Since``, so an unchanged page costs one bodyless 304; the
+postings found on it are stored with the validators and replayed. Bodies are
+parsed as they stream in, and schema.org ``JobPosting`` JSON-LD blocks (the
+markup job boards and career sites publish for search engines) become
+``JobOpportunity`` records. Fetch state is read and written in a thread, off
+the event loop.
+
+Postings reach the API's job catalog through ``ingest``, which posts them to
+``POST /v1/jobs/ingest`` so reposts are deduplicated before they are listed
+or embedded.
+
+Usage (from ``agents``):
+
+    python -m job_scout.crawler https://example.com/careers
+    python -m job_scout.crawler --ingest http://localhost:8000 https://example.com/careers
+"""
+
+import argparse
+import asyncio
+import codecs
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+from .scout import JobOpportunity
+
+USER_AGENT = "InternAI-JobScout/1.0 (+https://github.com/goksualc/NextStep-AI)"
+# Jobs per ingest request (the API accepts at most 1000)
+INGEST_BATCH_SIZE = 500
+
+_JOB_TYPES = {
+    "INTERN": "internship",
+    "INTERNSHIP": "internship",
+    "FULL_TIME": "full-time",
+    "PART_TIME": "part-time",
+    "CONTRACTOR": "contract",
+    "TEMPORARY": "temporary",
+}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetch_state (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    status INTEGER NOT NULL,
+    content_length INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    postings TEXT
+)
+"""
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second, bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for ``seconds``, e.g. for a ``Retry-After``."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+@dataclass
+class FetchState:
+    """What is known about a URL from its last fetch."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    status: int = 0
+    content_length: int = 0
+    fetched_at: float = 0.0
+    # JSON list of the page's JSON-LD postings, replayed on a 304
+    postings: str | None = None
+
+
+class FetchStateStore:
+    """Fetch validators per URL, persisted in SQLite."""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (and create if needed) the fetch-state database.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(fetch_state)")
+        }
+        if columns and "postings" not in columns:
+            self._conn.execute("ALTER TABLE fetch_state ADD COLUMN postings TEXT")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, url: str) -> FetchState | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, status, content_length, fetched_at, "
+                "postings FROM fetch_state WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return FetchState(*row) if row else None
+
+    def put(self, state: FetchState) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetch_state "
+                "(url, etag, last_modified, status, content_length, fetched_at, "
+                "postings) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    state.url,
+                    state.etag,
+                    state.last_modified,
+                    state.status,
+                    state.content_length,
+                    state.fetched_at,
+                    state.postings,
+                ),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class CrawlStats:
+    """Counters for one crawler, reported after a crawl."""
+
+    pages: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    postings: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        """Pages fetched (including 304s) per second of crawling."""
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        stats = asdict(self)
+        stats["pages_per_second"] = round(self.pages_per_second, 2)
+        return stats
+
+
+class JobPostingParser(HTMLParser):
+    """Incremental HTML parser collecting JSON-LD ``JobPosting`` objects."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._in_json_ld = False
+        self._buffer: list[str] = []
+        self._found: list[dict] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "script" and (dict(attrs).get("type") or "").lower() == (
+            "application/ld+json"
+        ):
+            self._in_json_ld = True
+            self._buffer = []
+
+    def handle_data(self, data: str) -> None:
+        if self._in_json_ld:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "script" or not self._in_json_ld:
+            return
+        self._in_json_ld = False
+        try:
+            data = json.loads("".join(self._buffer))
+        except json.JSONDecodeError:
+            return
+        finally:
+            self._buffer = []
+        self._found.extend(_job_postings(data))
+
+    def postings(self) -> list[dict]:
+        """Return and forget postings completed since the last call."""
+        found, self._found = self._found, []
+        return found
+
+
+def _job_postings(data: object) -> Iterable[dict]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _job_postings(item)
+    elif isinstance(data, dict):
+        kind = data.get("@type")
+        kinds = kind if isinstance(kind, list) else [kind]
+        if "JobPosting" in kinds:
+            yield data
+        if "@graph" in data:
+            yield from _job_postings(data["@graph"])
+
+
+def _text(value: object) -> str:
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("value") or ""
+    if isinstance(value, list):
+        return ", ".join(filter(None, (_text(item) for item in value)))
+    text = _TAG_RE.sub(" ", unescape(str(value or "")))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _items(value: object) -> list[str]:
+    if isinstance(value, list):
+        return [text for text in (_text(item) for item in value) if text]
+    text = _text(value)
+    return [text] if text else []
+
+
+def _location(posting: dict) -> str:
+    locations = posting.get("jobLocation") or []
+    if not isinstance(locations, list):
+        locations = [locations]
+    names = []
+    for location in locations:
+        address = (
+            location.get("address", location)
+            if isinstance(location, dict)
+            else location
+        )
+        if isinstance(address, dict):
+            parts = (
+                address.get("addressLocality"),
+                address.get("addressRegion"),
+                _text(address.get("addressCountry")),
+            )
+            names.append(", ".join(part for part in parts if part))
+        else:
+            names.append(_text(address))
+    return "; ".join(name for name in names if name)
+
+
+def _salary(value: object) -> str | None:
+    if not isinstance(value, dict):
+        return _text(value) or None
+    amount = value.get("value")
+    unit = None
+    if isinstance(amount, dict):
+        unit = amount.get("unitText")
+        low, high = amount.get("minValue"), amount.get("maxValue")
+        amount = f"{low}-{high}" if low and high else low or high or amount.get("value")
+    parts = [value.get("currency"), str(amount) if amount else None]
+    if unit:
+        parts.append(f"per {str(unit).lower()}")
+    return " ".join(part for part in parts if part) or None
+
+
+def _posted_date(value: object) -> datetime:
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.now()
+
+
+def to_opportunity(posting: dict, page_url: str, source: str) -> JobOpportunity | None:
+    """
+    Map a schema.org ``JobPosting`` object to a ``JobOpportunity``.
+
+    Args:
+        posting: Decoded JSON-LD object
+        page_url: URL of the page it was found on
+        source: Source label, e.g. "linkedin" or "company_website"
+
+    Returns:
+        JobOpportunity, or None when the posting has no title
+    """
+    title = _text(posting.get("title"))
+    if not title:
+        return None
+    url = posting.get("url") or page_url
+    identifier = _text(posting.get("identifier"))
+    job_id = identifier or hashlib.sha1(f"{url}\n{title}".encode()).hexdigest()[:16]
+    employment = posting.get("employmentType") or ""
+    if isinstance(employment, list):
+        employment = employment[0] if employment else ""
+    return JobOpportunity(
+        id=f"{source}-{job_id}",
+        title=title,
+        company=_text(posting.get("hiringOrganization")),
+        location=_location(posting),
+        description=_text(posting.get("description")),
+        requirements=_items(posting.get("qualifications") or posting.get("skills")),
+        benefits=_items(posting.get("jobBenefits")),
+        salary_range=_salary(posting.get("baseSalary")),
+        job_type=_JOB_TYPES.get(str(employment).upper(), str(employment).lower()),
+        remote=str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE",
+        posted_date=_posted_date(posting.get("datePosted")),
+        application_url=url,
+        source=source,
+    )
+
+
+class Crawler:
+    """Polite concurrent fetcher of job pages."""
+
+    def __init__(
+        self,
+        state: FetchStateStore | None = None,
+        per_host_concurrency: int = 2,
+        requests_per_second: float = 1.0,
+        burst: int = 2,
+        max_concurrency: int = 16,
+        timeout: float = 15.0,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """
+        Configure the crawler.
+
+        Args:
+            state: Fetch-state store for conditional requests; in-memory
+                when omitted
+            per_host_concurrency: Requests in flight per host
+            requests_per_second: Sustained request rate per host
+            burst: Requests a host may receive back to back
+            max_concurrency: Requests in flight overall
+            timeout: Per-request timeout in seconds
+            client: Shared httpx client; one is created (and closed by
+                ``aclose``) when omitted
+        """
+        self.state = state or FetchStateStore()
+        self.per_host_concurrency = per_host_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.stats = CrawlStats()
+        self._active = 0
+        self._started = 0.0
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._hosts: dict[str, tuple[asyncio.Semaphore, TokenBucket]] = {}
+
+    async def __aenter__(self) -> "Crawler":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    def _host(self, url: str) -> tuple[asyncio.Semaphore, TokenBucket]:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = (
+                asyncio.Semaphore(self.per_host_concurrency),
+                TokenBucket(self.requests_per_second, self.burst),
+            )
+        return self._hosts[host]
+
+    async def crawl(
+        self, urls: Iterable[str], source: str
+    ) -> AsyncIterator[JobOpportunity]:
+        """
+        Fetch ``urls`` concurrently, yielding postings as pages complete.
+
+        Pages that answer 304 Not Modified yield the postings stored by the
+        fetch that returned the validators.
+
+        Args:
+            urls: Page URLs; duplicates are fetched once
+            source: Source label stored on every posting
+
+        Yields:
+            JobOpportunity records
+        """
+        if not self._active:
+            self._started = time.monotonic()
+        self._active += 1
+        tasks = [
+            asyncio.ensure_future(self.fetch(url, source))
+            for url in dict.fromkeys(urls)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for opportunity in await next_done:
+                    yield opportunity
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Overlapping crawls share one wall-clock window.
+            self._active -= 1
+            if not self._active:
+                self.stats.elapsed += time.monotonic() - self._started
+
+    async def fetch(self, url: str, source: str) -> list[JobOpportunity]:
+        """
+        Fetch one page, conditionally when validators are known.
+
+        Returns:
+            Postings on the page; empty for failed fetches
+        """
+        semaphore, bucket = self._host(url)
+        previous = await asyncio.to_thread(self.state.get, url)
+        headers = {}
+        # Rows stored before postings were kept have nothing to replay
+        if previous and previous.postings is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        async with self._global, semaphore:
+            await bucket.acquire()
+            try:
+                async with self._client.stream("GET", url, headers=headers) as response:
+                    return await self._read(url, source, response, previous, bucket)
+            except httpx.HTTPError as e:
+                self.stats.errors += 1
+                print(f"Warning: Could not fetch {url}: {e}")
+                return []
+
+    async def _read(
+        self,
+        url: str,
+        source: str,
+        response: httpx.Response,
+        previous: FetchState | None,
+        bucket: TokenBucket,
+    ) -> list[JobOpportunity]:
+        self.stats.pages += 1
+        if response.status_code == 304 and previous is not None:
+            self.stats.not_modified += 1
+            self.stats.bytes_saved += previous.content_length
+            previous.fetched_at = time.time()
+            await asyncio.to_thread(self.state.put, previous)
+            opportunities = self._convert(
+                json.loads(previous.postings or "[]"), url, source
+            )
+            self.stats.postings += len(opportunities)
+            return opportunities
+        if response.status_code in (429, 503):
+            retry_after = response.headers.get("retry-after", "")
+            bucket.pause(float(retry_after) if retry_after.isdigit() else 30.0)
+        if response.status_code >= 400:
+            self.stats.errors += 1
+            return []
+
+        parser = JobPostingParser()
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+            errors="replace"
+        )
+        postings = []
+        async for chunk in response.aiter_bytes():
+            parser.feed(decoder.decode(chunk))
+            postings.extend(parser.postings())
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        postings.extend(parser.postings())
+        opportunities = self._convert(postings, url, source)
+
+        self.stats.bytes_downloaded += response.num_bytes_downloaded
+        self.stats.postings += len(opportunities)
+        await asyncio.to_thread(
+            self.state.put,
+            FetchState(
+                url=url,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                status=response.status_code,
+                content_length=response.num_bytes_downloaded,
+                fetched_at=time.time(),
+                postings=json.dumps(postings),
+            ),
+        )
+        return opportunities
+
+    @staticmethod
+    def _convert(postings: list[dict], url: str, source: str) -> list[JobOpportunity]:
+        converted = (to_opportunity(posting, url, source) for posting in postings)
+        return [opportunity for opportunity in converted if opportunity is not None]
+
+
+async def crawl_all(
+    urls: Iterable[str], source: str, crawler: Crawler
+) -> list[JobOpportunity]:
+    """Collect every posting ``crawler`` finds on ``urls``."""
+    return [opportunity async for opportunity in crawler.crawl(urls, source)]
+
+
+async def ingest(
+    jobs: list[dict],
+    api_url: str,
+    api_key: str,
+    client: httpx.AsyncClient | None = None,
+) -> dict:
+    """
+    Send postings to the API's job catalog through ``POST /v1/jobs/ingest``.
+
+    Args:
+        jobs: Postings from ``JobOpportunity.to_job_item``
+        api_url: API base URL, e.g. "http://localhost:8000"
+        api_key: The API's ``JOB_INGEST_API_KEY``
+        client: httpx client to send with; a temporary one when omitted
+
+    Returns:
+        {"received", "changed", "duplicates"} summed over all requests
+
+    Raises:
+        httpx.HTTPError: If a request fails; earlier batches stay ingested
+    """
+    totals = {"received": 0, "changed": 0, "duplicates": 0}
+    async with (
+        httpx.AsyncClient(timeout=60.0) if client is None else nullcontext(client)
+    ) as http:
+        for start in range(0, len(jobs), INGEST_BATCH_SIZE):
+            response = await http.post(
+                f"{api_url.rstrip('/')}/v1/jobs/ingest",
+                json=jobs[start : start + INGEST_BATCH_SIZE],
+                headers={"X-API-Key": api_key, "User-Agent": USER_AGENT},
+            )
+            response.raise_for_status()
+            for name, count in response.json().items():
+                totals[name] = totals.get(name, 0) + count
+    return totals
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Crawl job pages for postings")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--source", default="company_website")
+    parser.add_argument("--state", default=":memory:", help="Fetch-state database")
+    parser.add_argument("--rate", type=float, default=1.0, help="Requests/s per host")
+    parser.add_argument(
+        "--ingest",
+        metavar="API_URL",
+        help="Add postings to the API's catalog instead of printing them",
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.getenv("JOB_INGEST_API_KEY"),
+        help="Key for --ingest (default: $JOB_INGEST_API_KEY)",
+    )
+    args = parser.parse_args(argv)
+    if args.ingest and not args.api_key:
+        parser.error("--ingest needs --api-key or JOB_INGEST_API_KEY")
+
+    async def run() -> dict:
+        jobs = []
+        async with Crawler(
+            FetchStateStore(args.state), requests_per_second=args.rate
+        ) as crawler:
+            async for opportunity in crawler.crawl(args.urls, args.source):
+                if args.ingest:
+                    jobs.append(opportunity.to_job_item())
+                else:
+                    print(json.dumps(opportunity.to_job_item()))
+            report = crawler.stats.as_dict()
+        if args.ingest:
+            report["ingest"] = await ingest(jobs, args.ingest, args.api_key)
+        return report
+
+    print(json.dumps(asyncio.run(run())), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
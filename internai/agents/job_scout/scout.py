@@ -2,9 +2,16 @@
 Job Scout implementation
 """
 
+import asyncio
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
+from urllib.parse import quote_plus
+
+LINKEDIN_SEARCH_URL = (
+    "https://www.linkedin.com/jobs/search/?keywords={keywords}&location={location}"
+)
 
 
 @dataclass
@@ -25,13 +32,48 @@ class JobOpportunity:
     application_url: str
     source: str
 
+    def to_job_item(self) -> dict:
+        """Return the posting in the API's ``JobItem`` shape, for ingestion."""
+        return {
+            "id": self.id,
+            "source": self.source,
+            "title": self.title,
+            "company": self.company,
+            "location": self.location or None,
+            "url": self.application_url,
+            "desc": self.description or None,
+        }
+
 
 class JobScout:
     """Job Scout agent for discovering internship opportunities."""
 
-    def __init__(self, api_key: str):
-        """Initialize the job scout with API key."""
+    def __init__(
+        self,
+        api_key: str,
+        career_pages: list[str] | None = None,
+        state_path: str | None = None,
+        requests_per_second: float = 1.0,
+    ):
+        """
+        Initialize the job scout.
+
+        Args:
+            api_key: API key for the scout's LLM calls
+            career_pages: Company career page URLs searched by ``search_jobs``
+            state_path: Fetch-state database for conditional requests;
+                defaults to ``JOB_SCOUT_STATE_PATH`` or
+                ``./storage/job_scout.db``
+            requests_per_second: Request rate per host
+        """
         self.api_key = api_key
+        self.career_pages = career_pages or []
+        self.state_path = state_path or os.getenv(
+            "JOB_SCOUT_STATE_PATH", "./storage/job_scout.db"
+        )
+        self.requests_per_second = requests_per_second
+        self.last_stats = None
+        self._state = None
 
     def search_jobs(
         self,
@@ -43,6 +85,11 @@ class JobScout:
         """
         Search for job opportunities based on criteria.
 
+        Crawls LinkedIn search results and the configured career pages
+        concurrently. Pages unchanged since the last search are not
+        downloaded again; the postings stored from their last download are
+        used instead.
+
         Args:
             keywords: List of search keywords
             location: Location filter
@@ -52,19 +99,80 @@ class JobScout:
         Returns:
             List of JobOpportunity objects
         """
-        # TODO: Implement job search across multiple sources
-        # This is a placeholder implementation
-        return []
+        pages = [
+            (self._linkedin_url(keywords, location), "linkedin"),
+            *((url, "company_website") for url in self.career_pages),
+        ]
+        terms = [keyword.lower() for keyword in keywords]
+        jobs = []
+        for job in self._crawl(pages):
+            text = f"{job.title} {job.description}".lower()
+            if job_type and job.job_type and job.job_type != job_type:
+                continue
+            if location and location.lower() not in job.location.lower():
+                continue
+            if terms and not any(term in text for term in terms):
+                continue
+            jobs.append(job)
+        return jobs[:limit]
 
     def scrape_linkedin_jobs(self, keywords: list[str]) -> list[JobOpportunity]:
         """Scrape job postings from LinkedIn."""
-        # TODO: Implement LinkedIn job scraping
-        return []
+        return self._crawl([(self._linkedin_url(keywords), "linkedin")])
 
     def scrape_company_websites(self, companies: list[str]) -> list[JobOpportunity]:
-        """Scrape job postings directly from company career pages."""
-        # TODO: Implement company website scraping
-        return []
+        """
+        Scrape job postings directly from company career pages.
+
+        Args:
+            companies: Career page URLs, or bare domains (``https://`` is
+                assumed)
+        """
+        return self._crawl(
+            [
+                (url if "://" in url else f"https://{url}", "company_website")
+                for url in companies
+            ]
+        )
+
+    async def crawl(self, pages: list[tuple[str, str]]) -> list[JobOpportunity]:
+        """
+        Crawl ``pages`` from async code.
+
+        Args:
+            pages: (url, source) pairs
+
+        Returns:
+            Postings found; ``last_stats`` holds the crawl statistics
+        """
+        from .crawler import Crawler, FetchStateStore, crawl_all
+
+        if self._state is None:
+            self._state = FetchStateStore(self.state_path)
+        async with Crawler(
+            self._state, requests_per_second=self.requests_per_second
+        ) as crawler:
+            by_source: dict[str, list[str]] = {}
+            for url, source in pages:
+                by_source.setdefault(source, []).append(url)
+            results = await asyncio.gather(
+                *(
+                    crawl_all(urls, source, crawler)
+                    for source, urls in by_source.items()
+                )
+            )
+            self.last_stats = crawler.stats
+        return [job for jobs in results for job in jobs]
+
+    def _crawl(self, pages: list[tuple[str, str]]) -> list[JobOpportunity]:
+        # The sync API drives its own event loop; async callers use ``crawl``.
+        return asyncio.run(self.crawl(pages))
+
+    @staticmethod
+    def _linkedin_url(keywords: list[str], location: str = "") -> str:
+        return LINKEDIN_SEARCH_URL.format(
+            keywords=quote_plus(" ".join(keywords)), location=quote_plus(location)
+        )
 
     def filter_relevant_jobs(
         self, jobs: list[JobOpportunity], user_profile: dict[str, Any]
@@ -0,0 +1,245 @@
+"""
+Tests for the Job Scout crawler against a local fixture HTTP server.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from job_scout.crawler import (
+    INGEST_BATCH_SIZE,
+    Crawler,
+    FetchStateStore,
+    JobPostingParser,
+    TokenBucket,
+    crawl_all,
+    ingest,
+)
+from job_scout.scout import JobScout
+
+POSTING = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "title": "Data Science Intern",
+    "identifier": {"@type": "PropertyValue", "value": "ds-42"},
+    "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+    "jobLocation": {
+        "@type": "Place",
+        "address": {"addressLocality": "Berlin", "addressCountry": "DE"},
+    },
+    "description": "<p>Work with <b>Python</b> &amp; SQL.</p>",
+    "qualifications": ["Python", "SQL"],
+    "jobBenefits": "Mentorship",
+    "baseSalary": {
+        "@type": "MonetaryAmount",
+        "currency": "EUR",
+        "value": {"minValue": 1500, "maxValue": 2000, "unitText": "MONTH"},
+    },
+    "employmentType": "INTERN",
+    "jobLocationType": "TELECOMMUTE",
+    "datePosted": "2026-09-01",
+    "url": "https://acme.example/jobs/ds-42",
+}
+
+
+def _page(postings: list[dict]) -> bytes:
+    scripts = "".join(
+        f'<script type="application/ld+json">{json.dumps(p)}</script>' for p in postings
+    )
+    filler = "<p>Join us.</p>" * 200
+    return f"<html><head>{scripts}</head><body>{filler}</body></html>".encode()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Career pages with ETag (``/etag/*``) or Last-Modified (``/lm/*``)."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            body = _page(
+                [
+                    {
+                        **POSTING,
+                        "identifier": f"{self.path}-{i}",
+                        "title": f"Intern {i}",
+                    }
+                    for i in range(2)
+                ]
+            )
+            if self.path.startswith("/etag/"):
+                validator = ("ETag", '"v1"')
+                fresh = self.headers.get("If-None-Match") == '"v1"'
+            else:
+                validator = ("Last-Modified", "Tue, 01 Sep 2026 00:00:00 GMT")
+                fresh = self.headers.get("If-Modified-Since") == validator[1]
+            self.send_response(304 if fresh else 200)
+            self.send_header(*validator)
+            if not fresh:
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not fresh:
+                self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.in_flight = httpd.max_in_flight = 0
+    httpd.delay = 0.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _crawl(urls, state, **kwargs):
+    async def run():
+        async with Crawler(state, requests_per_second=1000, burst=100, **kwargs) as c:
+            return await crawl_all(urls, "company_website", c), c.stats
+
+    return asyncio.run(run())
+
+
+def test_postings_parsed_into_opportunities(server):
+    """Test JSON-LD JobPostings become JobOpportunity records."""
+    jobs, stats = _crawl([f"{server.base_url}/etag/a"], FetchStateStore())
+
+    assert stats.pages == 1 and stats.postings == 2
+    job = jobs[0]
+    assert job.id == "company_website-/etag/a-0"
+    assert job.company == "Acme"
+    assert job.location == "Berlin, DE"
+    assert job.description == "Work with Python & SQL."
+    assert job.requirements == ["Python", "SQL"]
+    assert job.benefits == ["Mentorship"]
+    assert job.salary_range == "EUR 1500-2000 per month"
+    assert (job.job_type, job.remote) == ("internship", True)
+    assert job.posted_date.year == 2026
+    assert job.to_job_item()["url"] == "https://acme.example/jobs/ds-42"
+
+
+def test_unchanged_pages_cost_a_304(server, tmp_path):
+    """Test validators persist across crawlers and 304s replay stored postings."""
+    urls = [f"{server.base_url}/etag/a", f"{server.base_url}/lm/b"]
+    state_path = str(tmp_path / "state.db")
+    jobs, first = _crawl(urls, FetchStateStore(state_path))
+
+    replayed, second = _crawl(urls, FetchStateStore(state_path))
+
+    assert sorted(job.id for job in replayed) == sorted(job.id for job in jobs)
+    assert len(replayed) == second.postings == 4
+    assert (second.pages, second.not_modified, second.bytes_downloaded) == (2, 2, 0)
+    assert second.bytes_saved == first.bytes_downloaded > 0
+    assert second.pages_per_second > 0
+    assert second.as_dict()["not_modified"] == 2
+
+
+def test_per_host_concurrency_limit(server):
+    """Test no more than ``per_host_concurrency`` requests hit one host."""
+    server.delay = 0.05
+    urls = [f"{server.base_url}/etag/{i}" for i in range(8)]
+
+    jobs, stats = _crawl(urls, FetchStateStore(), per_host_concurrency=2)
+
+    assert len(jobs) == 16 and stats.errors == 0
+    assert server.max_in_flight == 2
+
+
+def test_token_bucket_limits_rate():
+    """Test a bucket allows its burst, then ``rate`` acquisitions per second."""
+
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(7):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert 0.09 <= asyncio.run(run()) < 0.5
+
+
+def test_parser_handles_split_chunks():
+    """Test postings are found when script tags span feed() chunks."""
+    body = _page([POSTING, {"@graph": [{**POSTING, "title": "ML Intern"}]}]).decode()
+    parser = JobPostingParser()
+    found = []
+    for start in range(0, len(body), 7):
+        parser.feed(body[start : start + 7])
+        found.extend(parser.postings())
+
+    assert [p["title"] for p in found] == ["Data Science Intern", "ML Intern"]
+
+
+def test_scout_scrapes_company_websites(server, tmp_path):
+    """Test the JobScout sync API runs the crawler and records stats."""
+    scout = JobScout(
+        "test-key", state_path=str(tmp_path / "scout.db"), requests_per_second=100
+    )
+
+    jobs = scout.scrape_company_websites([f"{server.base_url}/lm/careers"])
+
+    assert {job.source for job in jobs} == {"company_website"}
+    assert len(jobs) == 2
+    assert scout.last_stats.pages == 1
+
+
+def test_scout_returns_unchanged_pages_again(server, tmp_path):
+    """Test a repeated scrape of an unchanged page still returns its jobs."""
+    scout = JobScout(
+        "test-key", state_path=str(tmp_path / "scout.db"), requests_per_second=100
+    )
+    url = f"{server.base_url}/etag/careers"
+
+    first = scout.scrape_company_websites([url])
+    second = scout.scrape_company_websites([url])
+
+    assert [job.title for job in second] == [job.title for job in first]
+    assert scout.last_stats.not_modified == 1
+
+
+def test_ingest_posts_batches_to_the_api(server):
+    """Test postings are sent to /v1/jobs/ingest in batches with the key."""
+    jobs, _ = _crawl([f"{server.base_url}/etag/a"], FetchStateStore())
+    items = [jobs[0].to_job_item()] * (INGEST_BATCH_SIZE + 1)
+    sent = []
+
+    def handler(request):
+        sent.append((request.url.path, request.headers["x-api-key"]))
+        count = len(json.loads(request.content))
+        return httpx.Response(
+            200, json={"received": count, "changed": 1, "duplicates": count - 1}
+        )
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as c:
+            return await ingest(items, "http://api/", "secret", client=c)
+
+    totals = asyncio.run(run())
+
+    assert sent == [("/v1/jobs/ingest", "secret")] * 2
+    assert totals == {
+        "received": INGEST_BATCH_SIZE + 1,
+        "changed": 2,
+        "duplicates": INGEST_BATCH_SIZE - 1,
+    }
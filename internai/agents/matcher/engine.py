@@ -0,0 +1,371 @@
+"""
+Columnar scoring engine for the Matcher agent.
+
+``JobMatrix(jobs)`` compiles a job catalog once into NumPy columns: job
+skills as a sparse (CSR) index over a skill vocabulary, location and region
+codes, remote flags, job type codes and required years of experience.
+``JobMatrix.score`` then evaluates every factor for every job with array
+operations and combines them with ``MatchWeights``, so scoring a user
+against 100k jobs takes milliseconds instead of a Python loop per job.
+
+The scalar helpers (``skill_score``, ``location_score``, ...) apply the same
+rules to a single pair and back the ``Matcher.calculate_*`` methods.
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+import numpy as np
+
+
+class MatchScore(Enum):
+    """Match score categories."""
+
+    EXCELLENT = "excellent"
+    GOOD = "good"
+    FAIR = "fair"
+    POOR = "poor"
+
+
+# Score of a job that lists no skills or no location: unknown, not a mismatch.
+UNKNOWN_SCORE = 0.5
+SAME_REGION_SCORE = 0.6
+# Remote jobs for someone who prefers working on site.
+REMOTE_FOR_ONSITE_SCORE = 0.8
+# On-site jobs for someone who prefers remote work.
+ONSITE_FOR_REMOTE_SCORE = 0.3
+
+# Lower bounds of FAIR, GOOD and EXCELLENT on the 0-1 overall score.
+CATEGORY_THRESHOLDS = np.array([0.4, 0.6, 0.8])
+CATEGORIES = np.array(
+    [MatchScore.POOR, MatchScore.FAIR, MatchScore.GOOD, MatchScore.EXCELLENT],
+    dtype=object,
+)
+
+_YEARS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+_REMOTE_LOCATIONS = {"remote", "anywhere", "worldwide"}
+
+
+@dataclass(frozen=True)
+class MatchWeights:
+    """Relative weight of each factor in the overall score."""
+
+    skills: float = 0.5
+    experience: float = 0.15
+    location: float = 0.2
+    preferences: float = 0.15
+
+    def normalized(self) -> np.ndarray:
+        """Weights as an array summing to 1."""
+        weights = np.array(
+            [self.skills, self.experience, self.location, self.preferences],
+            dtype=np.float32,
+        )
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Match weights must be non-negative and not all zero")
+        return weights / weights.sum()
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase a skill and collapse its whitespace."""
+    return " ".join(skill.lower().split())
+
+
+def normalize_location(location: str | None) -> tuple[str, str] | None:
+    """Return (place, region) for a location, region being its last part."""
+    if not location or not location.strip():
+        return None
+    parts = [" ".join(part.lower().split()) for part in location.split(",")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return None
+    return ", ".join(parts), parts[-1]
+
+
+def is_remote(job: dict[str, Any]) -> bool:
+    """Whether a job is remote, by flag or by its location text."""
+    location = (job.get("location") or "").strip().lower()
+    return bool(job.get("remote")) or location in _REMOTE_LOCATIONS
+
+
+def parse_years(value: Any) -> float | None:
+    """Years of experience from a number or text like "2+ years"."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    match = _YEARS_RE.search(str(value))
+    return float(match.group(1)) if match else None
+
+
+def experience_years(experience: Iterable[dict[str, Any]]) -> float:
+    """Total years across experience entries ("years" or "duration_months")."""
+    total = 0.0
+    for entry in experience or []:
+        years = parse_years(entry.get("years"))
+        if years is None and entry.get("duration_months") is not None:
+            years = float(entry["duration_months"]) / 12
+        total += years or 0.0
+    return total
+
+
+def skill_score(user_skills: Iterable[str], required_skills: Iterable[str]) -> float:
+    """Share of the required skills the user has."""
+    required = {normalize_skill(skill) for skill in required_skills}
+    if not required:
+        return UNKNOWN_SCORE
+    have = {normalize_skill(skill) for skill in user_skills}
+    return len(required & have) / len(required)
+
+
+def experience_score(user_years: float, required_years: float | None) -> float:
+    """User years over required years, capped at 1."""
+    if required_years is None or required_years <= 0:
+        return 1.0
+    return min(1.0, user_years / required_years)
+
+
+def location_score(
+    user_location: str | None,
+    job_location: str | None,
+    job_remote: bool = False,
+    remote_preference: bool | None = None,
+) -> float:
+    """Same place 1, same region 0.6, elsewhere 0; remote jobs fit anywhere."""
+    if job_remote:
+        return REMOTE_FOR_ONSITE_SCORE if remote_preference is False else 1.0
+    user, job = normalize_location(user_location), normalize_location(job_location)
+    if user is None or job is None:
+        return UNKNOWN_SCORE
+    if user[0] == job[0]:
+        return 1.0
+    return SAME_REGION_SCORE if user[1] == job[1] else 0.0
+
+
+def preferences_score(
+    job_remote: bool,
+    job_type: str | None,
+    remote_preference: bool | None = None,
+    job_types: Iterable[str] = (),
+) -> float:
+    """Mean of remote fit and job type fit."""
+    if remote_preference is None:
+        remote_fit = 1.0
+    elif remote_preference:
+        remote_fit = 1.0 if job_remote else ONSITE_FOR_REMOTE_SCORE
+    else:
+        remote_fit = REMOTE_FOR_ONSITE_SCORE if job_remote else 1.0
+    wanted = {t.lower() for t in job_types}
+    if not wanted:
+        type_fit = 1.0
+    elif not job_type:
+        type_fit = UNKNOWN_SCORE
+    else:
+        type_fit = 1.0 if job_type.lower() in wanted else 0.0
+    return (remote_fit + type_fit) / 2
+
+
+def categorize(scores: np.ndarray) -> np.ndarray:
+    """``MatchScore`` of each 0-1 overall score."""
+    return CATEGORIES[np.digitize(scores, CATEGORY_THRESHOLDS)]
+
+
+@dataclass
+class ScoreTable:
+    """Per-factor and overall scores (0-1) for every job in a JobMatrix."""
+
+    overall: np.ndarray
+    skill: np.ndarray
+    experience: np.ndarray
+    location: np.ndarray
+    preferences: np.ndarray
+
+    @property
+    def categories(self) -> np.ndarray:
+        """``MatchScore`` of every job."""
+        return categorize(self.overall)
+
+    def top(self, k: int | None = None) -> np.ndarray:
+        """Row indices of the ``k`` best jobs (all jobs when None), best first."""
+        n = len(self.overall)
+        k = n if k is None else min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        rows = np.arange(n) if k == n else np.argpartition(-self.overall, k - 1)[:k]
+        return rows[np.argsort(-self.overall[rows], kind="stable")]
+
+    def category_counts(self) -> dict[MatchScore, int]:
+        """Number of jobs in each category."""
+        counts = np.bincount(
+            np.digitize(self.overall, CATEGORY_THRESHOLDS), minlength=len(CATEGORIES)
+        )
+        return {
+            category: int(count)
+            for category, count in zip(CATEGORIES, counts, strict=True)
+        }
+
+
+class JobMatrix:
+    """A job catalog compiled into columns for bulk scoring."""
+
+    def __init__(self, jobs: list[dict[str, Any]]):
+        """
+        Compile ``jobs``.
+
+        Args:
+            jobs: Job dictionaries with "id" and optionally "requirements" (or
+                "skills"), "location", "remote", "job_type" and
+                "experience_years" (or "required_experience" text)
+        """
+        self.jobs = jobs
+        self.ids = [str(job.get("id", i)) for i, job in enumerate(jobs)]
+        n = len(jobs)
+
+        self.skill_vocab: dict[str, int] = {}
+        indices: list[int] = []
+        counts = np.zeros(n, dtype=np.int32)
+        places: dict[str, int] = {}
+        regions: dict[str, int] = {}
+        self.place_codes = np.full(n, -1, dtype=np.int32)
+        self.region_codes = np.full(n, -1, dtype=np.int32)
+        self.remote = np.zeros(n, dtype=bool)
+        job_types: dict[str, int] = {}
+        self.type_codes = np.full(n, -1, dtype=np.int32)
+        self.required_years = np.full(n, np.nan, dtype=np.float32)
+
+        for row, job in enumerate(jobs):
+            skills = {
+                normalize_skill(s)
+                for s in (job.get("requirements") or job.get("skills") or [])
+            }
+            for skill in skills:
+                indices.append(
+                    self.skill_vocab.setdefault(skill, len(self.skill_vocab))
+                )
+            counts[row] = len(skills)
+
+            self.remote[row] = is_remote(job)
+            location = normalize_location(job.get("location"))
+            if location is not None and not self.remote[row]:
+                self.place_codes[row] = places.setdefault(location[0], len(places))
+                self.region_codes[row] = regions.setdefault(location[1], len(regions))
+
+            if job.get("job_type"):
+                job_type = job["job_type"].lower()
+                self.type_codes[row] = job_types.setdefault(job_type, len(job_types))
+
+            years = parse_years(
+                job.get("experience_years", job.get("required_experience"))
+            )
+            if years is not None:
+                self.required_years[row] = years
+
+        self.skill_indices = np.array(indices, dtype=np.int32)
+        self.skill_counts = counts
+        # Job row of each entry in skill_indices, for per-job sums
+        self.skill_rows = np.repeat(np.arange(n, dtype=np.int32), counts)
+        self._places = places
+        self._regions = regions
+        self._job_types = job_types
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def score(
+        self, user_profile: dict[str, Any], weights: MatchWeights | None = None
+    ) -> ScoreTable:
+        """
+        Score every job for one user.
+
+        Args:
+            user_profile: "skills", and optionally "location",
+                "remote_preference" (True, False or None for no preference),
+                "job_types" and "experience" entries
+            weights: Factor weights; defaults to ``MatchWeights()``
+
+        Returns:
+            ScoreTable with one score per job for each factor and overall
+        """
+        weights = (weights or MatchWeights()).normalized()
+        n = len(self)
+
+        # Skill overlap: share of each job's skills the user has
+        user_skills = np.zeros(len(self.skill_vocab), dtype=np.float32)
+        for skill in user_profile.get("skills") or []:
+            column = self.skill_vocab.get(normalize_skill(skill))
+            if column is not None:
+                user_skills[column] = 1.0
+        matched = np.bincount(
+            self.skill_rows, weights=user_skills[self.skill_indices], minlength=n
+        )
+        skill = np.full(n, UNKNOWN_SCORE, dtype=np.float32)
+        has_skills = self.skill_counts > 0
+        skill[has_skills] = matched[has_skills] / self.skill_counts[has_skills]
+
+        # Experience: user years over required years, capped at 1
+        user_years = experience_years(user_profile.get("experience") or [])
+        required = self.required_years
+        with np.errstate(divide="ignore", invalid="ignore"):
+            experience = np.where(
+                np.isnan(required) | (required <= 0),
+                1.0,
+                np.minimum(1.0, user_years / required),
+            ).astype(np.float32)
+
+        # Location: same place, same region, remote, or unknown
+        remote_preference = user_profile.get("remote_preference")
+        user_location = normalize_location(user_profile.get("location"))
+        location = np.full(n, UNKNOWN_SCORE, dtype=np.float32)
+        if user_location is not None:
+            known = self.place_codes >= 0
+            location[known] = 0.0
+            region = self._regions.get(user_location[1], -2)
+            location[self.region_codes == region] = SAME_REGION_SCORE
+            location[self.place_codes == self._places.get(user_location[0], -2)] = 1.0
+        location[self.remote] = (
+            REMOTE_FOR_ONSITE_SCORE if remote_preference is False else 1.0
+        )
+
+        # Preferences: remote fit and job type fit, averaged
+        if remote_preference is None:
+            remote_fit = np.ones(n, dtype=np.float32)
+        elif remote_preference:
+            remote_fit = np.where(self.remote, 1.0, ONSITE_FOR_REMOTE_SCORE)
+        else:
+            remote_fit = np.where(self.remote, REMOTE_FOR_ONSITE_SCORE, 1.0)
+        wanted = [
+            self._job_types.get(t.lower(), -2)
+            for t in user_profile.get("job_types") or []
+        ]
+        if wanted:
+            type_fit = np.where(
+                self.type_codes < 0,
+                UNKNOWN_SCORE,
+                np.isin(self.type_codes, wanted).astype(np.float32),
+            )
+        else:
+            type_fit = np.ones(n, dtype=np.float32)
+        preferences = ((remote_fit + type_fit) / 2).astype(np.float32)
+
+        overall = (
+            weights[0] * skill
+            + weights[1] * experience
+            + weights[2] * location
+            + weights[3] * preferences
+        )
+        return ScoreTable(overall, skill, experience, location, preferences)
+
+    def missing_skills(self, row: int, user_skills: Iterable[str]) -> list[str]:
+        """Skills job ``row`` lists that the user lacks."""
+        seen = {normalize_skill(skill) for skill in user_skills}
+        required = self.jobs[row].get("requirements") or self.jobs[row].get("skills")
+        missing = []
+        for skill in required or []:
+            key = normalize_skill(skill)
+            if key not in seen:
+                seen.add(key)
+                missing.append(skill)
+        return missing
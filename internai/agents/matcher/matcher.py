@@ -3,17 +3,24 @@ Matcher implementation
 """
 
 from dataclasses import dataclass
-from enum import Enum
 from typing import Any
 
+from .engine import (
+    JobMatrix,
+    MatchScore,
+    MatchWeights,
+    experience_score,
+    experience_years,
+    location_score,
+    parse_years,
+    skill_score,
+)
 
-class MatchScore(Enum):
-    """Match score categories."""
+__all__ = ["MatchResult", "MatchScore", "MatchWeights", "Matcher"]
 
-    EXCELLENT = "excellent"
-    GOOD = "good"
-    FAIR = "fair"
-    POOR = "poor"
+# Factor scores below this get a recommendation.
+RECOMMENDATION_THRESHOLD = 0.6
+MAX_MISSING_SKILLS = 5
 
 
 @dataclass
@@ -35,49 +42,138 @@ class MatchResult:
 class Matcher:
     """Matcher agent for pairing users with job opportunities."""
 
-    def __init__(self, api_key: str):
-        """Initialize the matcher with API key."""
+    def __init__(self, api_key: str, weights: MatchWeights | None = None):
+        """
+        Initialize the matcher.
+
+        Args:
+            api_key: API key for the matcher's LLM calls
+            weights: Factor weights for the overall score
+        """
         self.api_key = api_key
+        self.weights = weights or MatchWeights()
+        self.jobs: JobMatrix | None = None
+        self._indexed: list[dict[str, Any]] | None = None
+
+    def index_jobs(self, job_opportunities: list[dict[str, Any]]) -> JobMatrix:
+        """
+        Compile the job catalog into columns once, for repeated matching.
+
+        Args:
+            job_opportunities: List of job opportunities
+
+        Returns:
+            The compiled JobMatrix
+        """
+        self.jobs = JobMatrix(job_opportunities)
+        self._indexed = job_opportunities
+        return self.jobs
 
     def match_user_with_jobs(
-        self, user_profile: dict[str, Any], job_opportunities: list[dict[str, Any]]
+        self,
+        user_profile: dict[str, Any],
+        job_opportunities: list[dict[str, Any]] | None = None,
+        limit: int | None = None,
     ) -> list[MatchResult]:
         """
         Match user profile with job opportunities.
 
+        Every factor is computed for the whole catalog at once; result
+        objects are only built for the ``limit`` best jobs.
+
         Args:
-            user_profile: User's profile data
-            job_opportunities: List of job opportunities
+            user_profile: User's profile data ("id", "skills", "location",
+                "remote_preference", "job_types", "experience")
+            job_opportunities: List of job opportunities; defaults to the
+                catalog passed to ``index_jobs``. A list already indexed is
+                not compiled again.
+            limit: Maximum number of results (all jobs when None)
 
         Returns:
             List of MatchResult objects sorted by score
         """
-        # TODO: Implement AI-powered matching algorithm
-        # This is a placeholder implementation
-        return []
+        if job_opportunities is not None and job_opportunities is not self._indexed:
+            self.index_jobs(job_opportunities)
+        if self.jobs is None:
+            return []
+
+        table = self.jobs.score(user_profile, self.weights)
+        rows = table.top(limit)
+        categories = table.categories[rows]
+        user_id = str(user_profile.get("id") or user_profile.get("user_id") or "")
+        user_skills = user_profile.get("skills") or []
+
+        results = []
+        for row, category in zip(rows.tolist(), categories, strict=True):
+            result = MatchResult(
+                job_id=self.jobs.ids[row],
+                user_id=user_id,
+                overall_score=round(float(table.overall[row]) * 100, 1),
+                score_category=category,
+                skill_match=round(float(table.skill[row]), 3),
+                experience_match=round(float(table.experience[row]), 3),
+                location_match=round(float(table.location[row]), 3),
+                preferences_match=round(float(table.preferences[row]), 3),
+                reasoning="",
+                recommendations=[],
+            )
+            missing = self.jobs.missing_skills(row, user_skills)
+            result.reasoning = self._reasoning(result, row, missing)
+            result.recommendations = self.generate_recommendations(result, missing)
+            results.append(result)
+        return results
 
     def calculate_skill_match(
         self, user_skills: list[str], required_skills: list[str]
     ) -> float:
         """Calculate skill matching score."""
-        # TODO: Implement skill matching algorithm
-        return 0.0
+        return skill_score(user_skills, required_skills)
 
     def calculate_experience_match(
         self, user_experience: list[dict[str, Any]], required_experience: str
     ) -> float:
         """Calculate experience matching score."""
-        # TODO: Implement experience matching algorithm
-        return 0.0
+        return experience_score(
+            experience_years(user_experience), parse_years(required_experience)
+        )
 
     def calculate_location_match(
         self, user_location: str, job_location: str, remote_preference: bool
     ) -> float:
         """Calculate location matching score."""
-        # TODO: Implement location matching algorithm
-        return 0.0
-
-    def generate_recommendations(self, match_result: MatchResult) -> list[str]:
+        return location_score(
+            user_location,
+            job_location,
+            job_remote=(job_location or "").strip().lower() == "remote",
+            remote_preference=remote_preference,
+        )
+
+    def generate_recommendations(
+        self, match_result: MatchResult, missing_skills: list[str] | None = None
+    ) -> list[str]:
         """Generate personalized recommendations based on match result."""
-        # TODO: Implement recommendation generation
-        return []
+        recommendations = []
+        if match_result.skill_match < RECOMMENDATION_THRESHOLD:
+            if missing_skills:
+                skills = ", ".join(missing_skills[:MAX_MISSING_SKILLS])
+                recommendations.append(f"Build experience with {skills}")
+            else:
+                recommendations.append("Highlight skills relevant to this role")
+        if match_result.experience_match < RECOMMENDATION_THRESHOLD:
+            recommendations.append(
+                "Emphasize projects and coursework to offset limited experience"
+            )
+        if match_result.location_match < RECOMMENDATION_THRESHOLD:
+            recommendations.append("Check relocation or remote options with the team")
+        if match_result.preferences_match < RECOMMENDATION_THRESHOLD:
+            recommendations.append("This role differs from your stated preferences")
+        return recommendations
+
+    def _reasoning(self, result: MatchResult, row: int, missing: list[str]) -> str:
+        required = int(self.jobs.skill_counts[row])
+        parts = [f"{result.score_category.value.title()} match"]
+        if required:
+            parts.append(f"has {required - len(missing)} of {required} listed skills")
+        if self.jobs.remote[row]:
+            parts.append("remote role")
+        return "; ".join(parts)
@@ -0,0 +1,145 @@
+"""
+Tests for the Matcher agent's columnar scoring engine.
+"""
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from matcher.engine import (
+    JobMatrix,
+    MatchWeights,
+    categorize,
+    location_score,
+    preferences_score,
+)
+from matcher.matcher import Matcher, MatchScore
+
+SKILLS = ["Python", "SQL", "Docker", "React", "Go", "AWS", "Pandas", "Kubernetes"]
+CITIES = ["Berlin, DE", "Munich, DE", "Paris, FR", "Remote", None]
+
+USER = {
+    "id": "u1",
+    "skills": ["python", "SQL ", "Docker"],
+    "location": "Berlin, DE",
+    "remote_preference": True,
+    "job_types": ["internship"],
+    "experience": [{"years": 1}, {"duration_months": 6}],
+}
+
+
+def _jobs(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"job-{i}",
+            "requirements": rng.sample(SKILLS, rng.randint(0, 4)),
+            "location": rng.choice(CITIES),
+            "remote": rng.random() < 0.2,
+            "job_type": rng.choice(["internship", "full-time", None]),
+            "required_experience": rng.choice([None, "2+ years", "1 year", 0]),
+        }
+        for i in range(n)
+    ]
+
+
+def test_bulk_scores_match_scalar_rules():
+    """Test every vectorized factor agrees with the per-job scalar rules."""
+    jobs = _jobs(300)
+    matcher = Matcher("test-key")
+    table = matcher.index_jobs(jobs).score(USER)
+
+    for row, job in enumerate(jobs):
+        remote = job["remote"] or job["location"] == "Remote"
+        assert table.skill[row] == pytest.approx(
+            matcher.calculate_skill_match(USER["skills"], job["requirements"])
+        )
+        assert table.experience[row] == pytest.approx(
+            matcher.calculate_experience_match(
+                USER["experience"], job["required_experience"]
+            )
+        )
+        assert table.location[row] == pytest.approx(
+            location_score(USER["location"], job["location"], remote, True)
+        )
+        assert table.preferences[row] == pytest.approx(
+            preferences_score(remote, job["job_type"], True, USER["job_types"])
+        )
+
+
+def test_results_sorted_with_categories():
+    """Test results are best first, categorized and explain missing skills."""
+    jobs = [
+        {
+            "id": "best",
+            "requirements": ["Python", "SQL"],
+            "location": "Berlin, DE",
+            "remote": True,
+            "job_type": "internship",
+        },
+        {
+            "id": "worst",
+            "requirements": ["Go", "Rust", "AWS"],
+            "location": "Paris, FR",
+            "job_type": "full-time",
+            "required_experience": "5 years",
+        },
+    ]
+
+    results = Matcher("test-key").match_user_with_jobs(USER, jobs)
+
+    assert [r.job_id for r in results] == ["best", "worst"]
+    assert results[0].score_category is MatchScore.EXCELLENT
+    assert results[0].overall_score == 100.0
+    assert results[1].score_category is MatchScore.POOR
+    assert results[1].user_id == "u1"
+    assert results[1].recommendations[0] == "Build experience with Go, Rust, AWS"
+    assert "has 0 of 3 listed skills" in results[1].reasoning
+
+
+def test_weights_change_ranking():
+    """Test configurable weights reorder jobs."""
+    jobs = [
+        {"id": "skills", "requirements": ["Python"], "location": "Paris, FR"},
+        {"id": "nearby", "requirements": ["Go"], "location": "Berlin, DE"},
+    ]
+    user = {"skills": ["Python"], "location": "Berlin, DE"}
+
+    by_skills = Matcher("k", MatchWeights(skills=1, location=0.1))
+    by_location = Matcher("k", MatchWeights(skills=0.1, location=1))
+
+    assert by_skills.match_user_with_jobs(user, jobs)[0].job_id == "skills"
+    assert by_location.match_user_with_jobs(user, jobs)[0].job_id == "nearby"
+    with pytest.raises(ValueError):
+        MatchWeights(skills=-1).normalized()
+
+
+def test_categorize_thresholds():
+    """Test MatchScore categories come from the overall score in bulk."""
+    categories = categorize(np.array([0.1, 0.4, 0.65, 0.8, 0.99]))
+
+    assert list(categories) == [
+        MatchScore.POOR,
+        MatchScore.FAIR,
+        MatchScore.GOOD,
+        MatchScore.EXCELLENT,
+        MatchScore.EXCELLENT,
+    ]
+
+
+def test_scores_100k_jobs_in_milliseconds():
+    """Test one user is scored against 100k jobs without a per-job loop."""
+    matrix = JobMatrix(_jobs(100_000))
+    matrix.score(USER)
+
+    started = time.perf_counter()
+    table = matrix.score(USER)
+    top = table.top(20)
+    elapsed = time.perf_counter() - started
+
+    assert len(table.overall) == 100_000
+    assert sum(table.category_counts().values()) == 100_000
+    assert table.overall[top[0]] == table.overall.max()
+    assert elapsed < 0.1
@@ -0,0 +1,262 @@
+"""
+BM25 inverted index over catalog jobs for hybrid retrieval.
+
+The index keeps per-term postings (document slot -> term frequency) over job
+titles and descriptions, with titles weighted higher. It is built from the
+catalog when first used (in the parent process under ``serve.py``) and
+catches up incrementally with ``JobCatalog.scan_changes`` whenever the
+catalog version moves, so every worker stays current without rebuilding.
+
+``fuse`` combines BM25 and embedding scores for ``/v1/match?mode=hybrid``.
+"""
+
+import math
+import re
+import threading
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+
+import numpy as np
+
+from .catalog import JobCatalog, get_catalog
+from .preload import register_preload
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+RRF_K = 60
+
+FUSION_MODES = ("rrf", "weighted", "rerank")
+
+# Keeps tech terms such as "c++", "c#" and "node.js" intact.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or our the to we "
+    "with will you your this that".split()
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase ``text`` and split it into index terms."""
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """Incrementally updatable Okapi BM25 index keyed by job id."""
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = {}
+        self._slot_of: dict[str, int] = {}
+        self._job_ids: list[str | None] = []
+        self._lengths: list[int] = []
+        self._doc_terms: list[tuple[str, ...]] = []
+        self._free: list[int] = []
+        self._total_length = 0
+        # Scoring works on NumPy copies of postings, rebuilt only for terms
+        # (and lengths) touched since the last search.
+        self._arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._length_array: np.ndarray | None = None
+        self._lock = threading.RLock()
+        self.version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, job_id: str, title: str | None, desc: str | None) -> None:
+        """Index a job, replacing any previous version of it."""
+        terms: dict[str, int] = {}
+        for term in tokenize(title):
+            terms[term] = terms.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(desc):
+            terms[term] = terms.get(term, 0) + 1
+        length = sum(terms.values())
+
+        with self._lock:
+            self.remove(job_id)
+            if self._free:
+                slot = self._free.pop()
+                self._job_ids[slot] = job_id
+                self._lengths[slot] = length
+                self._doc_terms[slot] = tuple(terms)
+            else:
+                slot = len(self._job_ids)
+                self._job_ids.append(job_id)
+                self._lengths.append(length)
+                self._doc_terms.append(tuple(terms))
+            self._slot_of[job_id] = slot
+            self._total_length += length
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[slot] = tf
+                self._arrays.pop(term, None)
+            self._length_array = None
+
+    def remove(self, job_id: str) -> None:
+        """Drop a job from the index if present."""
+        with self._lock:
+            slot = self._slot_of.pop(job_id, None)
+            if slot is None:
+                return
+            for term in self._doc_terms[slot]:
+                postings = self._postings[term]
+                del postings[slot]
+                if not postings:
+                    del self._postings[term]
+                self._arrays.pop(term, None)
+            self._length_array = None
+            self._total_length -= self._lengths[slot]
+            self._job_ids[slot] = None
+            self._lengths[slot] = 0
+            self._doc_terms[slot] = ()
+            self._free.append(slot)
+
+    def search(
+        self,
+        query: str | Iterable[str],
+        k: int,
+        accept: Callable[[list[str]], np.ndarray] | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Return the top ``k`` jobs for ``query`` by BM25 score.
+
+        Args:
+            query: Query text, or pre-tokenized terms
+            k: Number of results
+            accept: Given the ids of all matching jobs, returns a boolean
+                mask of those allowed in the results (e.g.
+                ``LocationIndex.matches``)
+
+        Returns:
+            List of (job_id, score), best first; jobs matching no term are
+            not returned
+        """
+        terms = set(tokenize(query) if isinstance(query, str) else query)
+        with self._lock:
+            n_docs = len(self._slot_of)
+            if not n_docs or not terms or k <= 0:
+                return []
+            if self._length_array is None:
+                self._length_array = np.asarray(self._lengths, dtype=np.float32)
+            norms = K1 * (
+                1 - B + B * self._length_array / (self._total_length / n_docs)
+            )
+            scores = np.zeros(len(self._job_ids), dtype=np.float32)
+            for term in terms:
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                slots, tfs = arrays
+                idf = math.log(1 + (n_docs - len(slots) + 0.5) / (len(slots) + 0.5))
+                scores[slots] += idf * tfs * (K1 + 1) / (tfs + norms[slots])
+
+            matched = np.flatnonzero(scores)
+            if accept is not None and len(matched):
+                matched = matched[accept([self._job_ids[slot] for slot in matched])]
+            if len(matched) > k:
+                matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+            matched = matched[np.argsort(-scores[matched], kind="stable")]
+            return [(self._job_ids[slot], float(scores[slot])) for slot in matched]
+
+    def _term_arrays(self, term: str) -> tuple[np.ndarray, np.ndarray] | None:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if not postings:
+                return None
+            arrays = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float32, count=len(postings)),
+            )
+            self._arrays[term] = arrays
+        return arrays
+
+    def sync(self, catalog: JobCatalog) -> int:
+        """
+        Bring the index up to date with ``catalog``.
+
+        The first call indexes every job; later calls only apply changes
+        made since the last sync.
+
+        Returns:
+            Catalog version the index now reflects
+        """
+        with self._lock:
+            if self.version is not None and catalog.version() == self.version:
+                return self.version
+            self.version = catalog.scan_changes(
+                self.version,
+                on_upsert=lambda job: self.add(job["id"], job["title"], job["desc"]),
+                on_delete=self.remove,
+            )
+            return self.version
+
+
+@lru_cache(maxsize=1)
+def _shared_index() -> BM25Index:
+    return BM25Index()
+
+
+@register_preload
+def get_bm25_index(catalog: JobCatalog | None = None) -> BM25Index:
+    """
+    Return the process-wide BM25 index, synced with the catalog.
+
+    Args:
+        catalog: Catalog to sync with; defaults to ``get_catalog()``
+    """
+    index = _shared_index()
+    index.sync(catalog or get_catalog())
+    return index
+
+
+def fuse(
+    lexical: list[tuple[str, float]],
+    semantic: dict[str, float],
+    mode: str = "rrf",
+    alpha: float = 0.3,
+) -> list[tuple[str, float]]:
+    """
+    Combine BM25 and embedding scores into one 0-100 ranking.
+
+    Args:
+        lexical: (job_id, bm25 score) candidates, best first
+        semantic: job_id -> cosine similarity (0-1) for the same candidates
+        mode: "rrf" (reciprocal rank fusion), "weighted" (``alpha`` times
+            max-normalized BM25 plus ``1 - alpha`` times cosine) or "rerank"
+            (cosine only)
+        alpha: Lexical weight for "weighted"
+
+    Returns:
+        List of (job_id, score in 0-100), best first
+    """
+    if mode not in FUSION_MODES:
+        raise ValueError(f"Unknown fusion mode: {mode}")
+
+    if mode == "rerank":
+        fused = {job_id: semantic.get(job_id, 0.0) for job_id, _ in lexical}
+    elif mode == "weighted":
+        top = max((score for _, score in lexical), default=0.0) or 1.0
+        fused = {
+            job_id: alpha * score / top + (1 - alpha) * semantic.get(job_id, 0.0)
+            for job_id, score in lexical
+        }
+    else:
+        semantic_rank = {
+            job_id: rank
+            for rank, job_id in enumerate(
+                sorted(semantic, key=semantic.get, reverse=True), start=1
+            )
+        }
+        # Normalized so a job ranked first by both lists scores 1.0.
+        best = 2 / (RRF_K + 1)
+        fused = {}
+        for rank, (job_id, _) in enumerate(lexical, start=1):
+            score = 1 / (RRF_K + rank)
+            if job_id in semantic_rank:
+                score += 1 / (RRF_K + semantic_rank[job_id])
+            fused[job_id] = score / best
+
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return [(job_id, round(min(1.0, max(0.0, s)) * 100, 1)) for job_id, s in ranked]
@@ -0,0 +1,127 @@
+"""
+Cohort matching: many profiles against many jobs in one pass.
+
+Profile vectors are stacked into a (profiles, dim) float32 matrix and
+multiplied against job vectors one tile of ``BULK_MATCH_TILE`` jobs at a
+time, so each tile is a single BLAS matrix product for the whole cohort and
+peak memory is ``profiles x tile`` scores, however large the catalog.
+``TopK`` keeps every profile's best jobs across tiles. Catalog tiles are
+dequantized from the vector snapshot once per tile and shared by all
+profiles; the surviving candidates are rescored with exact vectors.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+
+import numpy as np
+
+from .vector_store import VectorSnapshot
+
+Tile = tuple[np.ndarray, np.ndarray]
+
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (zero rows stay zero), as float32."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+class TopK:
+    """Best ``k`` columns of every row, merged one block of scores at a time."""
+
+    def __init__(self, rows: int, k: int):
+        self.k = k
+        self.scores = np.empty((rows, 0), dtype=np.float32)
+        self.columns = np.empty((rows, 0), dtype=np.int64)
+
+    def push(self, scores: np.ndarray, columns: np.ndarray) -> None:
+        """
+        Merge a block of scores into the running top ``k``.
+
+        Args:
+            scores: (rows, n) scores
+            columns: Column id of each score: (n,) shared by all rows, or
+                (rows, n)
+        """
+        merged = np.concatenate([self.scores, scores], axis=1)
+        ids = np.concatenate(
+            [self.columns, np.broadcast_to(columns, scores.shape)], axis=1
+        )
+        if merged.shape[1] > self.k:
+            keep = np.argpartition(-merged, self.k - 1, axis=1)[:, : self.k]
+            merged = np.take_along_axis(merged, keep, axis=1)
+            ids = np.take_along_axis(ids, keep, axis=1)
+        self.scores, self.columns = merged, ids
+
+    def result(self) -> tuple[np.ndarray, np.ndarray]:
+        """(scores, columns) per row, best first."""
+        order = np.argsort(-self.scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(self.scores, order, axis=1),
+            np.take_along_axis(self.columns, order, axis=1),
+        )
+
+
+def matrix_tiles(matrix: np.ndarray, tile: int) -> Iterator[Tile]:
+    """(columns, rows) tiles of an in-memory float32 job matrix."""
+    for start in range(0, len(matrix), tile):
+        stop = min(start + tile, len(matrix))
+        yield np.arange(start, stop), matrix[start:stop]
+
+
+def snapshot_tiles(snapshot: VectorSnapshot, tile: int) -> Iterator[Tile]:
+    """(rows, dequantized float32 vectors) tiles of a vector snapshot."""
+    for start in range(0, len(snapshot), tile):
+        rows = np.arange(start, min(start + tile, len(snapshot)))
+        yield rows, snapshot.approximate(rows)
+
+
+def tiled_top_k(queries: np.ndarray, tiles: Iterable[Tile], k: int) -> TopK:
+    """
+    Best ``k`` jobs per query by dot product, one GEMM per tile.
+
+    Args:
+        queries: (profiles, dim) unit float32 vectors
+        tiles: (columns, (n, dim) float32 vectors) blocks of jobs
+        k: Jobs kept per profile
+
+    Returns:
+        TopK over job columns
+    """
+    top = TopK(len(queries), k)
+    for columns, block in tiles:
+        top.push(queries @ block.T, columns)
+    return top
+
+
+def rerank_exact(
+    queries: np.ndarray,
+    candidates: TopK,
+    exact: Callable[[np.ndarray], np.ndarray],
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rescore each profile's candidates with exact vectors and keep ``k``.
+
+    Candidates shared by several profiles are fetched once.
+
+    Args:
+        queries: (profiles, dim) unit vectors
+        candidates: Approximate top candidates per profile
+        exact: Returns exact float32 vectors for an array of columns
+            (e.g. ``VectorSnapshot.vectors``)
+        k: Jobs kept per profile
+
+    Returns:
+        (scores, columns) per profile, best first
+    """
+    columns = candidates.columns
+    unique, inverse = np.unique(columns, return_inverse=True)
+    vectors = exact(unique) if len(unique) else np.empty((0, queries.shape[1]))
+    inverse = inverse.reshape(columns.shape)
+    scores = np.empty(columns.shape, dtype=np.float32)
+    for row, query in enumerate(queries):
+        scores[row] = vectors[inverse[row]] @ query
+    top = TopK(len(queries), k)
+    top.push(scores, columns)
+    return top.result()
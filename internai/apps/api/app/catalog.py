@@ -0,0 +1,702 @@
+"""
+SQLite-backed job catalog for InternAI API.
+
+Jobs live in a ``jobs`` table with indexed ``source`` and ``location``
+columns and an external-content FTS5 index over title, company and
+description. Listings are served a page at a time with keyset pagination on
+``rowid``, so the cost of a page does not grow with the catalog or with how
+deep the client has paged.
+
+Writes share one connection per process under a lock. File databases run in
+WAL mode and every thread reads through its own connection, so reads neither
+wait for writers nor for each other.
+"""
+
+import base64
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from .metrics import record_fallback
+from .models import JobItem
+from .preload import register_preload
+from .settings import get_settings
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+SAMPLE_JOBS_PATH = Path(__file__).parent / "data" / "sample_jobs.json"
+
+JOB_FIELDS = ("id", "source", "title", "company", "location", "url", "desc")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT COLLATE NOCASE,
+    url TEXT NOT NULL,
+    "desc" TEXT,
+    updated_version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs (source);
+CREATE INDEX IF NOT EXISTS jobs_location ON jobs (location);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (
+    title, company, "desc",
+    content='jobs', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('version', 0);
+CREATE TABLE IF NOT EXISTS catalog_deletes (
+    id TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS catalog_deletes_version ON catalog_deletes (version);
+CREATE TRIGGER IF NOT EXISTS jobs_ad_log AFTER DELETE ON jobs BEGIN
+    INSERT INTO catalog_deletes (id, version)
+    VALUES (old.id, (SELECT value + 1 FROM catalog_meta WHERE key = 'version'));
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, "desc")
+    VALUES (new.rowid, new.title, new.company, new."desc");
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, "desc")
+    VALUES ('delete', old.rowid, old.title, old.company, old."desc");
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, "desc")
+    VALUES ('delete', old.rowid, old.title, old.company, old."desc");
+    INSERT INTO jobs_fts (rowid, title, company, "desc")
+    VALUES (new.rowid, new.title, new.company, new."desc");
+END;
+"""
+
+# Near-duplicate bookkeeping for ``app.dedupe``: MinHash signatures and LSH
+# buckets of canonical jobs, and the postings folded into them.
+_DEDUPE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_signatures (
+    id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_lsh (
+    bucket INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (bucket, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_lsh_id ON job_lsh (id);
+CREATE TABLE IF NOT EXISTS job_duplicates (
+    id TEXT PRIMARY KEY,
+    canonical_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    similarity REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_duplicates_canonical
+    ON job_duplicates (canonical_id);
+CREATE TRIGGER IF NOT EXISTS jobs_ad_dedupe AFTER DELETE ON jobs BEGIN
+    DELETE FROM job_signatures WHERE id = old.id;
+    DELETE FROM job_lsh WHERE id = old.id;
+    DELETE FROM job_duplicates WHERE canonical_id = old.id;
+END;
+"""
+
+# Job embeddings for ``app.vector_store``. Rows are stamped with the vector
+# store version that wrote them; a deleted job keeps a row with a NULL vector
+# so other processes see the removal.
+_VECTOR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_vectors (
+    id TEXT PRIMARY KEY,
+    text_hash BLOB NOT NULL,
+    vector BLOB,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_vectors_version ON job_vectors (version);
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('vector_version', 0);
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('vector_synced', -1);
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('vector_sync_lease', 0);
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('vector_sync_owner', 0);
+"""
+
+# Resolved job locations for ``app.locations``, written with the jobs.
+# ``gazetteer_version`` records the gazetteer the rows were resolved with.
+_LOCATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_locations (
+    id TEXT PRIMARY KEY,
+    place TEXT,
+    region TEXT,
+    country TEXT,
+    lat REAL,
+    lon REAL,
+    remote INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('gazetteer_version', 0);
+CREATE TRIGGER IF NOT EXISTS jobs_ad_locations AFTER DELETE ON jobs BEGIN
+    DELETE FROM job_locations WHERE id = old.id;
+END;
+"""
+
+_UPSERT_LOCATION = """
+INSERT INTO job_locations (id, place, region, country, lat, lon, remote)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    place = excluded.place,
+    region = excluded.region,
+    country = excluded.country,
+    lat = excluded.lat,
+    lon = excluded.lon,
+    remote = excluded.remote
+"""
+
+_LOCATION_FIELDS = ("place", "region", "country", "lat", "lon", "remote")
+
+# Changed rows are stamped with the version their transaction commits as, so
+# per-process indexes can catch up with ``scan_changes``.
+_UPSERT = """
+INSERT INTO jobs (id, source, title, company, location, url, "desc", updated_version)
+VALUES (
+    :id, :source, :title, :company, :location, :url, :desc,
+    (SELECT value + 1 FROM catalog_meta WHERE key = 'version')
+)
+ON CONFLICT (id) DO UPDATE SET
+    updated_version = excluded.updated_version,
+    source = excluded.source,
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    url = excluded.url,
+    "desc" = excluded."desc"
+WHERE (source, title, company, location, url, "desc")
+    IS NOT (excluded.source, excluded.title, excluded.company,
+            excluded.location, excluded.url, excluded."desc")
+"""
+
+_SELECT_COLUMNS = ", ".join(
+    ["jobs.rowid"] + [f'jobs."{field}"' for field in JOB_FIELDS]
+)
+
+_LOOKUP_CHUNK = 500
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(rowid: int) -> str:
+    """Encode the last rowid of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(rowid).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+def fts_query(text: str) -> str | None:
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every word becomes a quoted term (so FTS5 operators in user input are
+    inert) and all terms must match; the last term is a prefix match so
+    search-as-you-type works.
+
+    Returns:
+        FTS5 query string, or None when ``text`` has no searchable words
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _like_prefix(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+class JobCatalog:
+    """Job postings stored in SQLite with a full-text index."""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) a catalog database.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            conn = self._connection()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if columns and "updated_version" not in columns:
+                conn.execute(
+                    "ALTER TABLE jobs "
+                    "ADD COLUMN updated_version INTEGER NOT NULL DEFAULT 0"
+                )
+            conn.executescript(_SCHEMA)
+            conn.executescript(_DEDUPE_SCHEMA)
+            conn.executescript(_VECTOR_SCHEMA)
+            conn.executescript(_LOCATION_SCHEMA)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_updated_version "
+                "ON jobs (updated_version)"
+            )
+            self._resolve_locations(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        # File connections must not cross fork(); each worker opens its own.
+        # An in-memory database only exists in its connection, so it is kept.
+        reopen = self._pid != os.getpid() and self.path != ":memory:"
+        if self._conn is None or reopen:
+            self._conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._conn.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """Connection for reads: the calling thread's own, for file databases."""
+        if self.path == ":memory:":
+            with self._lock:
+                yield self._connection()
+            return
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON")
+            local.conn, local.pid = conn, os.getpid()
+            # Not under the lock, which a writer may hold; append is atomic
+            self._readers.append(conn)
+        yield local.conn
+
+    def upsert_many(self, jobs: Iterable[dict]) -> int:
+        """
+        Insert or update jobs by ``id`` in a single transaction.
+
+        Jobs are validated as ``JobItem`` here, so rows read back can be
+        trusted without validating again.
+
+        Args:
+            jobs: Job dictionaries with the ``JobItem`` fields
+
+        Returns:
+            Number of rows inserted or changed
+
+        Raises:
+            pydantic.ValidationError: If a job is invalid; nothing is written
+        """
+        rows = validate_jobs(jobs)
+        with self.transaction() as conn:
+            return self.upsert_rows(conn, rows)
+
+    def delete(self, job_ids: Iterable[str]) -> int:
+        """Delete jobs by ``id``; returns the number removed."""
+        return self._write(
+            "DELETE FROM jobs WHERE id = ?", ((job_id,) for job_id in job_ids)
+        )
+
+    @contextmanager
+    def transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the catalog lock for a block of statements.
+
+        Commits when the block exits normally and rolls back on error.
+        Jobs written inside the block should go through ``upsert_rows`` so
+        the catalog version is bumped.
+
+        Args:
+            write: Take SQLite's write lock up front (``BEGIN IMMEDIATE``);
+                pass False for read-only blocks, which run on the thread's
+                reader connection without the catalog lock
+
+        Yields:
+            A connection, inside a transaction
+        """
+        if write:
+            with self._lock:
+                yield from _in_transaction(self._connection(), "BEGIN IMMEDIATE")
+        else:
+            with self._reading() as conn:
+                yield from _in_transaction(conn, "BEGIN")
+
+    def upsert_rows(self, conn: sqlite3.Connection, rows: list[dict]) -> int:
+        """
+        Upsert already-validated jobs inside ``transaction()``.
+
+        Lets ingestion stages write their own bookkeeping in the same
+        transaction as the jobs. Each job's location is resolved and stored
+        in ``job_locations`` alongside it.
+
+        Args:
+            conn: Connection yielded by ``transaction()``
+            rows: Dictionaries from ``validate_jobs``
+
+        Returns:
+            Number of rows inserted or changed
+        """
+        changed = self._apply(conn, _UPSERT, rows)
+        _write_locations(conn, ((row["id"], row["location"]) for row in rows))
+        return changed
+
+    def _resolve_locations(self, conn: sqlite3.Connection) -> None:
+        """Resolve jobs with no stored location, or all after a gazetteer update."""
+        from .locations import get_gazetteer
+
+        version = get_gazetteer().version
+        stored = conn.execute(
+            "SELECT value FROM catalog_meta WHERE key = 'gazetteer_version'"
+        ).fetchone()[0]
+        if stored == version:
+            sql = (
+                "SELECT jobs.id, jobs.location FROM jobs LEFT JOIN job_locations "
+                "ON job_locations.id = jobs.id WHERE job_locations.id IS NULL"
+            )
+        else:
+            sql = "SELECT id, location FROM jobs"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _write_locations(conn, conn.execute(sql).fetchall())
+            conn.execute(
+                "UPDATE catalog_meta SET value = ? WHERE key = 'gazetteer_version'",
+                (version,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _apply(self, conn: sqlite3.Connection, sql: str, rows: Iterable) -> int:
+        changed = conn.executemany(sql, rows).rowcount
+        if changed > 0:
+            conn.execute(
+                "UPDATE catalog_meta SET value = value + 1 WHERE key = 'version'"
+            )
+        return changed
+
+    def _write(self, sql: str, rows: Iterable) -> int:
+        """Apply ``sql`` to ``rows`` in one transaction, bumping the version."""
+        with self.transaction() as conn:
+            return self._apply(conn, sql, rows)
+
+    def version(self) -> int:
+        """
+        Return the catalog version, incremented by every committed change.
+
+        The counter lives in the database, so all worker processes agree on it.
+        """
+        with self._reading() as conn:
+            return conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'version'"
+            ).fetchone()[0]
+
+    def scan_changes(
+        self,
+        since: int | None,
+        on_upsert: Callable[[dict], None],
+        on_delete: Callable[[str], None],
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Stream catalog changes made after version ``since``.
+
+        Deletions are reported before upserts; a job deleted and re-added
+        is therefore left present. Changed rows are read a batch at a time and
+        the callbacks run between batches with no lock or transaction held,
+        so a long scan stalls neither writers nor readers. Changes committed
+        after the returned version are left for the next scan.
+
+        Args:
+            since: Version already seen, or None to stream every job
+            on_upsert: Called with each inserted or updated job
+            on_delete: Called with the id of each deleted job
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Catalog version the caller is now up to date with
+        """
+        with self.transaction(write=False) as conn:
+            version = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'version'"
+            ).fetchone()[0]
+            deleted = conn.execute(
+                "SELECT DISTINCT id FROM catalog_deletes "
+                "WHERE version > ? AND version <= ?",
+                (since, version),
+            ).fetchall()
+        if since is not None:
+            for (job_id,) in deleted:
+                on_delete(job_id)
+        # Keyset over the (updated_version, rowid) index: no sort, no offset
+        since = since if since is not None else -1
+        last = (since, 0)
+        while True:
+            with self._reading() as conn:
+                batch = conn.execute(
+                    f"SELECT {_SELECT_COLUMNS}, updated_version FROM jobs "
+                    "WHERE updated_version > ? AND updated_version <= ? "
+                    "AND (updated_version, jobs.rowid) > (?, ?) "
+                    "ORDER BY updated_version, jobs.rowid LIMIT ?",
+                    (since, version, *last, batch_size),
+                ).fetchall()
+            for row in batch:
+                on_upsert(_row_to_job(row))
+            if len(batch) < batch_size:
+                return version
+            last = (batch[-1]["updated_version"], batch[-1]["rowid"])
+
+    def count(self) -> int:
+        with self._reading() as conn:
+            return conn.execute("SELECT count(*) FROM jobs").fetchone()[0]
+
+    def get_many(self, job_ids: list[str]) -> list[dict]:
+        """Return jobs for ``job_ids`` in the given order, skipping unknown ids."""
+        rows = []
+        with self._reading() as conn:
+            # Stay under SQLite's bound-parameter limit for large lookups.
+            for start in range(0, len(job_ids), _LOOKUP_CHUNK):
+                chunk = job_ids[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(
+                    conn.execute(
+                        f"SELECT {_SELECT_COLUMNS} FROM jobs "
+                        f"WHERE id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        by_id = {row["id"]: _row_to_job(row) for row in rows}
+        return [by_id[job_id] for job_id in job_ids if job_id in by_id]
+
+    def get_locations(self, job_ids: list[str]) -> dict[str, dict]:
+        """
+        Return the stored resolved locations of ``job_ids``.
+
+        Returns:
+            job id -> {"place", "region", "country", "lat", "lon", "remote"};
+            unknown ids are skipped
+        """
+        locations = {}
+        with self._reading() as conn:
+            for start in range(0, len(job_ids), _LOOKUP_CHUNK):
+                chunk = job_ids[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    "SELECT id, place, region, country, lat, lon, remote "
+                    f"FROM job_locations WHERE id IN ({placeholders})",
+                    chunk,
+                ):
+                    locations[row["id"]] = {f: row[f] for f in _LOCATION_FIELDS}
+        return locations
+
+    def get_items(self, job_ids: list[str]) -> list[JobItem]:
+        """
+        Return catalog jobs as ``JobItem`` models without re-validation.
+
+        Args:
+            job_ids: Job ids, in the order wanted; unknown ids are skipped
+
+        Returns:
+            List of JobItem built with ``model_construct``
+        """
+        return [JobItem.model_construct(**job) for job in self.get_many(job_ids)]
+
+    def search(
+        self,
+        query: str | None = None,
+        source: str | None = None,
+        location: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        ids: Collection[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Return one page of jobs matching the filters.
+
+        Args:
+            query: Free-text search over title, company and description
+            source: Exact job source, e.g. "linkedin"
+            location: Case-insensitive location prefix, e.g. "new york"
+            limit: Page size, capped at ``MAX_PAGE_SIZE``
+            cursor: ``next_cursor`` from the previous page
+            ids: Only these jobs (e.g. from the skill index)
+
+        Returns:
+            Tuple of (jobs, next_cursor); ``next_cursor`` is None on the
+            last page
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if ids is not None and not ids:
+            return [], None
+        clauses: list[str] = []
+        params: list[object] = []
+
+        match = fts_query(query) if query else None
+        if match:
+            # Keying on the FTS rowid lets FTS5 apply the cursor and the
+            # ordering itself instead of sorting every match.
+            table = "jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid"
+            key = "jobs_fts.rowid"
+            clauses.append("jobs_fts MATCH ?")
+            params.append(match)
+        else:
+            table = "jobs"
+            key = "jobs.rowid"
+        if source:
+            clauses.append("jobs.source = ?")
+            params.append(source)
+        if location:
+            clauses.append("jobs.location LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(location))
+        if ids is not None:
+            # One bound JSON array, however many ids
+            clauses.append("jobs.id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(ids)))
+        if cursor:
+            clauses.append(f"{key} > ?")
+            params.append(decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT {_SELECT_COLUMNS} FROM {table} {where} " f"ORDER BY {key} LIMIT ?"
+        )
+        params.append(limit + 1)
+
+        with self._reading() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        next_cursor = (
+            encode_cursor(rows[limit - 1]["rowid"]) if len(rows) > limit else None
+        )
+        return [_row_to_job(row) for row in rows[:limit]], next_cursor
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._local = threading.local()
+
+
+def validate_jobs(jobs: Iterable[dict]) -> list[dict]:
+    """Validate jobs as ``JobItem`` and return them as plain dictionaries."""
+    return [JobItem.model_validate(job).model_dump() for job in jobs]
+
+
+def _write_locations(
+    conn: sqlite3.Connection, jobs: Iterable[tuple[str, str | None]]
+) -> None:
+    """Store the resolved location of each (job id, location text)."""
+    from .locations import resolve_location
+
+    rows = []
+    for job_id, text in jobs:
+        location = resolve_location(text)
+        if location is None:
+            rows.append((job_id, None, None, None, None, None, 0))
+        else:
+            rows.append(
+                (
+                    job_id,
+                    location.place,
+                    location.region,
+                    location.country,
+                    location.lat,
+                    location.lon,
+                    int(location.remote),
+                )
+            )
+    conn.executemany(_UPSERT_LOCATION, rows)
+
+
+def _in_transaction(
+    conn: sqlite3.Connection, begin: str
+) -> Iterator[sqlite3.Connection]:
+    """Yield ``conn`` inside a transaction, committing or rolling back after."""
+    conn.execute(begin)
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    return {field: row[field] for field in JOB_FIELDS}
+
+
+def catalog_path(database_url: str | None, storage_path: str) -> str:
+    """
+    Resolve the catalog database file from ``DATABASE_URL``.
+
+    Only ``sqlite:///`` URLs are supported; anything else falls back to
+    ``<STORAGE_PATH>/catalog.db`` with a warning.
+    """
+    if database_url and database_url.startswith("sqlite:///"):
+        return database_url[len("sqlite:///") :]
+    if database_url:
+        print(
+            "Warning: Job catalog only supports sqlite:/// DATABASE_URL values; "
+            f"using {storage_path}/catalog.db"
+        )
+    return str(Path(storage_path) / "catalog.db")
+
+
+def load_sample_jobs() -> list[dict]:
+    """Read the bundled sample jobs used to seed an empty catalog."""
+    with open(SAMPLE_JOBS_PATH) as f:
+        return json.load(f)
+
+
+@register_preload
+@lru_cache(maxsize=1)
+def get_catalog() -> JobCatalog:
+    """Return the shared job catalog, seeding it with sample jobs when empty."""
+    from .dedupe import JobDeduplicator
+
+    settings = get_settings()
+    catalog = JobCatalog(catalog_path(settings.DATABASE_URL, settings.STORAGE_PATH))
+    if catalog.count() == 0:
+        try:
+            JobDeduplicator(catalog).ingest(load_sample_jobs())
+        except Exception as e:
+            print(f"Warning: Could not seed job catalog: {e}")
+            record_fallback("catalog_seed")
+    return catalog
@@ -0,0 +1,307 @@
+"""
+Incremental re-embedding of the job catalog.
+
+``CatalogSync.run_once`` reads only the catalog changes since the last sync
+(``JobCatalog.scan_changes``), hashes each changed job's embedding text and
+compares it with the hash stored next to its vector. Only jobs that are new
+or whose text changed are embedded, in large batches; removed jobs get
+tombstones. Changes are embedded in batches as the scan streams them, so
+memory stays flat however many jobs changed. Each batch is committed as it
+completes, so an interrupted sync resumes without paying for the same
+embeddings twice, and the new vectors are published with
+``VectorStore.refresh``. Sync time and embedding spend therefore follow
+catalog churn, not catalog size.
+
+``CatalogSyncWorker`` runs the sync on a background thread. Under
+``serve.py`` only the first worker embeds (``CATALOG_SYNC_EMBED``); the others
+only refresh their snapshot. A lease row in the catalog still guards against
+any other process embedding at the same time: the holder renews it before
+every batch and stops as soon as it is lost, so a long sync never overlaps
+with the process that took over.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from .catalog import JobCatalog
+from .llm_scheduler import BATCH, llm_call, llm_context, text_tokens
+from .metrics import record_fallback
+from .models import JobItem
+from .vector_store import VectorStore, text_hash
+
+
+class _LeaseLost(Exception):
+    """Raised inside a pass when the sync lease has been taken over."""
+
+
+@dataclass
+class SyncStats:
+    """Outcome of one ``CatalogSync.run_once``."""
+
+    scanned: int = 0
+    embedded: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    # Jobs skipped as recorded near-duplicates of another job
+    duplicates: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    catalog_version: int = 0
+    vector_version: int = 0
+    # True when the lease was lost and the pass stopped early
+    interrupted: bool = False
+
+
+class CatalogSync:
+    """Keeps ``job_vectors`` in step with the catalog."""
+
+    def __init__(
+        self,
+        catalog: JobCatalog,
+        store: VectorStore,
+        build_text: Callable[[JobItem], str],
+        get_client: Callable[[], object | None],
+        batch_size: int = 128,
+    ):
+        """
+        Configure the sync.
+
+        Args:
+            catalog: Catalog to follow
+            store: Vector store to write to and refresh
+            build_text: Text embedded for a job (``routes._build_job_text``)
+            get_client: Returns the embeddings client, or None when
+                embeddings are unavailable
+            batch_size: Texts per embeddings request
+        """
+        self.catalog = catalog
+        self.store = store
+        self.build_text = build_text
+        self.get_client = get_client
+        self.batch_size = batch_size
+
+    def run_once(self, keep_lease: Callable[[], bool] | None = None) -> SyncStats:
+        """
+        Embed new and changed jobs, tombstone removed ones, and publish.
+
+        Args:
+            keep_lease: Called before each batch and before the sync marker
+                is advanced; when it returns False the pass stops, keeping
+                the batches already written, and the next holder resumes
+
+        Returns:
+            SyncStats for this pass
+
+        Raises:
+            Exception: Whatever the embeddings provider raises; batches
+                committed before the failure are kept
+        """
+        started = time.perf_counter()
+        stats = SyncStats()
+        client = self.get_client()
+        if client is None:
+            stats.vector_version = self.store.refresh().version
+            return stats
+
+        with self.catalog.transaction(write=False) as conn:
+            synced = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'vector_synced'"
+            ).fetchone()[0]
+
+        # Rows are hashed and embedded as the scan streams them, so at most
+        # about two batches of texts are held at once, however large the
+        # catalog or its churn
+        scanned: dict[str, tuple[bytes, str]] = {}
+        todo: list[tuple[str, bytes, str]] = []
+        deleted: set[str] = set()
+
+        def on_upsert(job: dict) -> None:
+            text = self.build_text(JobItem.model_construct(**job))
+            scanned[job["id"]] = (text_hash(client.model, text), text)
+            deleted.discard(job["id"])
+            stats.scanned += 1
+            if len(scanned) >= self.batch_size:
+                self._select(scanned, todo, stats)
+            while len(todo) >= self.batch_size:
+                self._embed(client, todo, stats, keep_lease)
+
+        def on_delete(job_id: str) -> None:
+            deleted.add(job_id)
+
+        try:
+            stats.catalog_version = self.catalog.scan_changes(
+                synced if synced >= 0 else None, on_upsert, on_delete
+            )
+            self._select(scanned, todo, stats)
+            while todo:
+                self._embed(client, todo, stats, keep_lease)
+        except _LeaseLost:
+            return self._interrupted(stats, started)
+
+        if keep_lease is not None and not keep_lease():
+            return self._interrupted(stats, started)
+        if deleted:
+            self.store.write(deleted=sorted(deleted))
+            stats.deleted = len(deleted)
+
+        with self.catalog.transaction() as conn:
+            conn.execute(
+                "UPDATE catalog_meta SET value = ? WHERE key = 'vector_synced'",
+                (stats.catalog_version,),
+            )
+        stats.vector_version = self.store.refresh().version
+        stats.seconds = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _select(
+        self,
+        scanned: dict[str, tuple[bytes, str]],
+        todo: list[tuple[str, bytes, str]],
+        stats: SyncStats,
+    ) -> None:
+        """Move scanned jobs whose text changed to ``todo``; clear ``scanned``."""
+        for job_id in self._duplicates(list(scanned)):
+            del scanned[job_id]
+            stats.duplicates += 1
+        stored = self.store.hashes(list(scanned))
+        for job_id, (digest, text) in scanned.items():
+            if stored.get(job_id) == digest:
+                stats.unchanged += 1
+            else:
+                todo.append((job_id, digest, text))
+        scanned.clear()
+
+    def _embed(
+        self,
+        client,
+        todo: list[tuple[str, bytes, str]],
+        stats: SyncStats,
+        keep_lease: Callable[[], bool] | None,
+    ) -> None:
+        """Embed and store the first batch of ``todo``, removing it."""
+        if keep_lease is not None and not keep_lease():
+            raise _LeaseLost
+        batch = todo[: self.batch_size]
+        texts = [text for _, _, text in batch]
+        with (
+            llm_context(BATCH, "catalog_sync"),
+            llm_call(
+                "embedding", "catalog_sync", client.model, text_tokens(texts)
+            ) as call,
+        ):
+            vectors = client.embed_texts(texts)
+            call.record_usage(getattr(client, "last_usage", None))
+        self.store.write(
+            [
+                (job_id, digest, np.asarray(vector, dtype=np.float32))
+                for (job_id, digest, _), vector in zip(batch, vectors, strict=True)
+            ]
+        )
+        del todo[: self.batch_size]
+        stats.embedded += len(batch)
+        stats.batches += 1
+
+    def _duplicates(self, job_ids: list[str]) -> list[str]:
+        """Ids among ``job_ids`` that ``app.dedupe`` recorded as reposts."""
+        with self.catalog.transaction(write=False) as conn:
+            return [
+                row[0]
+                for row in conn.execute(
+                    "SELECT id FROM job_duplicates "
+                    "WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(job_ids),),
+                )
+            ]
+
+    def _interrupted(self, stats: SyncStats, started: float) -> SyncStats:
+        """Publish what was written without advancing the sync marker."""
+        print("Warning: Catalog sync lease lost, stopping this pass")
+        record_fallback("catalog_sync_lease")
+        stats.interrupted = True
+        stats.vector_version = self.store.refresh().version
+        stats.seconds = round(time.perf_counter() - started, 3)
+        return stats
+
+    def acquire_lease(self, ttl: float) -> bool:
+        """
+        Claim (or renew) the right to embed for ``ttl`` seconds.
+
+        Returns:
+            True when this process holds the lease
+        """
+        now_ms = int(time.time() * 1000)
+        with self.catalog.transaction() as conn:
+            expires, owner = (
+                conn.execute(
+                    "SELECT value FROM catalog_meta WHERE key = ?", (key,)
+                ).fetchone()[0]
+                for key in ("vector_sync_lease", "vector_sync_owner")
+            )
+            if expires > now_ms and owner != os.getpid():
+                return False
+            conn.executemany(
+                "UPDATE catalog_meta SET value = ? WHERE key = ?",
+                [
+                    (now_ms + int(ttl * 1000), "vector_sync_lease"),
+                    (os.getpid(), "vector_sync_owner"),
+                ],
+            )
+        return True
+
+
+class CatalogSyncWorker:
+    """Runs a ``CatalogSync`` every ``interval`` seconds on a daemon thread."""
+
+    def __init__(self, sync: CatalogSync, interval: float, embed: bool = True):
+        """
+        Args:
+            sync: Sync to run
+            interval: Seconds between passes
+            embed: Whether this process may embed; when False every pass
+                only refreshes the vector snapshot
+        """
+        self.sync = sync
+        self.interval = interval
+        self.embed = embed
+        self.last_stats: SyncStats | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="catalog-sync", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def step(self) -> SyncStats | None:
+        """Run one pass: sync if this process holds the lease, else refresh."""
+        ttl = self.interval * 3
+        if self.embed and self.sync.acquire_lease(ttl):
+            self.last_stats = self.sync.run_once(
+                keep_lease=lambda: self.sync.acquire_lease(ttl)
+            )
+            return self.last_stats
+        self.sync.store.refresh()
+        return None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception as e:
+                print(f"Warning: Catalog sync failed: {e}")
+                record_fallback("catalog_sync")
+            self._stop.wait(self.interval)
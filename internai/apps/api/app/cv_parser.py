@@ -6,7 +6,10 @@ import json
 import re
 import unicodedata
 
-from .llm import mistral
+from .llm import chat_complete_async
+from .metrics import record_fallback
+from .prompts import get_prompts
+from .tracing import span
 
 
 def normalize_text(text: str) -> str:
@@ -168,70 +171,59 @@ def regex_scan_skills(text: str) -> list[str]:
 
 async def llm_extract_skills(text: str) -> dict[str, list[str]]:
     """Extract skills using Mistral LLM."""
-    system_prompt = """Extract skill keywords only, return JSON {skills:[], highlights:[]}
-
-Focus on:
-- Technical skills (programming languages, frameworks, tools)
-- Soft skills (leadership, communication, teamwork)
-- Domain expertise (AI/ML, security, blockchain, etc.)
-- Certifications and achievements
-
-Return only the JSON object, no additional text."""
-
-    user_prompt = (
-        f"Analyze this resume text and extract skills and highlights:\n\n{text[:2000]}"
-    )
-
     try:
-        response = mistral.chat.complete(
-            model="mistral-medium-2508",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=500,
-            temperature=0.3,
-        )
+        messages = get_prompts().render("cv_analyzer.extract_skills", resume_text=text)
+        with span("llm_call"):
+            response = await chat_complete_async(
+                "llm_extract_skills",
+                task="extract",
+                messages=messages,
+                max_tokens=500,
+                temperature=0.3,
+            )
 
         content = response.choices[0].message.content.strip()
 
-        # Try to parse JSON response
-        try:
-            # Clean the response to extract JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            # Remove any leading/trailing non-JSON text
-            content = content.strip()
-            if content.startswith("{"):
-                result = json.loads(content)
-                return {
-                    "skills": result.get("skills", []),
-                    "highlights": result.get("highlights", []),
-                }
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract skills from text
-            lines = content.split("\n")
-            skills = []
-            highlights = []
-
-            for line in lines:
-                line = line.strip()
-                if line and len(line) < 100:  # Reasonable skill length
-                    if any(
-                        keyword in line.lower()
-                        for keyword in ["skill", "experience", "proficient"]
-                    ):
-                        skills.append(line)
-                    else:
-                        highlights.append(line)
-
-            return {"skills": skills, "highlights": highlights}
+        with span("json_cleanup"):
+            # Try to parse JSON response
+            try:
+                # Clean the response to extract JSON
+                if "```json" in content:
+                    content = content.split("```json")[1].split("```")[0]
+                elif "```" in content:
+                    content = content.split("```")[1].split("```")[0]
+
+                # Remove any leading/trailing non-JSON text
+                content = content.strip()
+                if content.startswith("{"):
+                    result = json.loads(content)
+                    return {
+                        "skills": result.get("skills", []),
+                        "highlights": result.get("highlights", []),
+                    }
+            except json.JSONDecodeError:
+                # If JSON parsing fails, try to extract skills from text
+                record_fallback("llm_extract_skills_text_parse")
+                lines = content.split("\n")
+                skills = []
+                highlights = []
+
+                for line in lines:
+                    line = line.strip()
+                    if line and len(line) < 100:  # Reasonable skill length
+                        if any(
+                            keyword in line.lower()
+                            for keyword in ["skill", "experience", "proficient"]
+                        ):
+                            skills.append(line)
+                        else:
+                            highlights.append(line)
+
+                return {"skills": skills, "highlights": highlights}
 
     except Exception as e:
         print(f"Error in LLM skill extraction: {e}")
+        record_fallback("llm_extract_skills")
         return {"skills": [], "highlights": []}
 
     return {"skills": [], "highlights": []}
@@ -268,18 +260,22 @@ async def analyze_profile(text: str) -> dict[str, any]:
         return {"skills": [], "highlights": [], "profile_text": ""}
 
     # Normalize the input text
-    normalize_text(text)
+    with span("normalize_text"):
+        normalize_text(text)
 
     # Extract skills using regex
-    regex_skills = regex_scan_skills(text)
+    with span("regex_scan_skills"):
+        regex_skills = regex_scan_skills(text)
 
     # Extract skills using LLM
-    llm_result = await llm_extract_skills(text)
+    with span("llm_extract_skills"):
+        llm_result = await llm_extract_skills(text)
     llm_skills = llm_result.get("skills", [])
     llm_highlights = llm_result.get("highlights", [])
 
     # Merge and deduplicate skills
-    merged_skills = merge_and_dedupe_skills(regex_skills, llm_skills)
+    with span("merge_and_dedupe_skills"):
+        merged_skills = merge_and_dedupe_skills(regex_skills, llm_skills)
 
     # Create profile text summary
     profile_text = f"Skills: {', '.join(merged_skills[:10])}"
@@ -0,0 +1,387 @@
+"""
+Near-duplicate detection for multi-source job ingestion.
+
+The same internship is often posted on LinkedIn, Indeed and the company site
+with small edits. ``JobDeduplicator`` computes a MinHash signature over word
+shingles of each posting and finds candidate duplicates with LSH banding, so
+checking a posting costs a few indexed lookups instead of a catalog scan.
+The first posting of a cluster stays the canonical job; later near-duplicates
+are recorded in ``job_duplicates`` and never reach ``jobs``, so they are not
+listed, BM25-indexed or embedded. The catalog seed and ``POST /v1/jobs/ingest``
+both ingest through ``JobDeduplicator``.
+
+Signatures and band buckets live in the catalog database next to the jobs
+and ingestion streams fixed-size batches, so memory use does not grow with
+the catalog.
+
+Usage (from ``apps/api``):
+
+    python -m app.dedupe jobs.json
+"""
+
+import argparse
+import itertools
+import json
+import re
+import sqlite3
+import sys
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .catalog import JobCatalog, get_catalog, validate_jobs
+from .settings import get_settings
+
+SHINGLE_SIZE = 3
+INGEST_BATCH_SIZE = 1000
+# Candidates sharing the most bands are verified first; the rest are ignored.
+MAX_CANDIDATES = 32
+# Boilerplate-heavy postings can pile into one band bucket; buckets stop
+# growing here so lookups stay cheap. A later posting can still match the
+# members already in a full bucket, or through its other bands.
+MAX_BUCKET_SIZE = 64
+SEED = 1
+
+_SHIFT = np.uint64(32)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text: str | None, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word ``size``-grams of ``text``.
+
+    Text shorter than ``size`` words yields a single shingle of all its
+    words.
+
+    Returns:
+        Unique 32-bit shingle hashes as uint64, empty when ``text`` has no
+        words
+    """
+    words = _WORD_RE.findall((text or "").lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    grams = {
+        " ".join(words[i : i + size]) for i in range(max(1, len(words) - size + 1))
+    }
+    return np.fromiter(
+        (zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams)
+    )
+
+
+def lsh_bands(num_perm: int, threshold: float) -> int:
+    """
+    Choose the number of LSH bands for ``num_perm`` permutations.
+
+    Picks the banding whose S-curve midpoint ``(1 / bands) ** (1 / rows)``
+    is highest without exceeding ``threshold``. Near-duplicates then almost
+    always share a band; the false candidates this admits are dropped when
+    signatures are compared.
+    """
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands == 0 and (1 / bands) ** (bands / num_perm) <= threshold:
+            return bands
+    return num_perm
+
+
+class MinHasher:
+    """MinHash signatures from seeded multiply-shift hash functions."""
+
+    def __init__(self, num_perm: int = 128, seed: int = SEED):
+        rng = np.random.default_rng(seed)
+        top = np.iinfo(np.uint64).max
+        self.num_perm = num_perm
+        self._a = rng.integers(
+            0, top, size=(num_perm, 1), dtype=np.uint64, endpoint=True
+        ) | np.uint64(1)
+        self._b = rng.integers(
+            0, top, size=(num_perm, 1), dtype=np.uint64, endpoint=True
+        )
+
+    def signature(self, text: str | None) -> np.ndarray | None:
+        """
+        Return the MinHash signature of ``text``.
+
+        Returns:
+            uint32 array of length ``num_perm``, or None when ``text`` has no
+            words to compare
+        """
+        hashes = shingles(text)
+        if not len(hashes):
+            return None
+        # (a * x + b) mod 2**64, keeping the high 32 bits.
+        permuted = (self._a * hashes + self._b) >> _SHIFT
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def job_text(job: dict) -> str:
+    """Text a posting is compared on: title, company and description."""
+    return " ".join(
+        filter(None, (job.get("title"), job.get("company"), job.get("desc")))
+    )
+
+
+@dataclass
+class IngestStats:
+    """Outcome of one ``JobDeduplicator.ingest`` call."""
+
+    received: int = 0
+    changed: int = 0
+    duplicates: int = 0
+
+
+class JobDeduplicator:
+    """Ingestion stage that keeps one canonical job per near-duplicate cluster."""
+
+    def __init__(
+        self,
+        catalog: JobCatalog,
+        threshold: float | None = None,
+        num_perm: int | None = None,
+    ):
+        """
+        Attach to ``catalog``, re-signing it if the parameters changed.
+
+        Args:
+            catalog: Catalog jobs are ingested into
+            threshold: Estimated Jaccard similarity at or above which two
+                postings are duplicates; defaults to ``DEDUPE_THRESHOLD``
+            num_perm: MinHash permutations per signature; defaults to
+                ``DEDUPE_NUM_PERM``
+        """
+        settings = get_settings()
+        self.catalog = catalog
+        self.threshold = (
+            threshold if threshold is not None else settings.DEDUPE_THRESHOLD
+        )
+        self.hasher = MinHasher(num_perm or settings.DEDUPE_NUM_PERM)
+        self.bands = lsh_bands(self.hasher.num_perm, self.threshold)
+        self.rows = self.hasher.num_perm // self.bands
+        rng = np.random.default_rng(SEED + 1)
+        self._band_mix = rng.integers(
+            1, 1 << 63, size=self.rows, dtype=np.uint64
+        ) | np.uint64(1)
+        self._band_salt = rng.integers(0, 1 << 63, size=self.bands, dtype=np.uint64)
+        self._backfilled = False
+
+        params = self.hasher.num_perm << 16 | self.bands << 8 | SHINGLE_SIZE
+        with catalog.transaction() as conn:
+            stored = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'dedupe_params'"
+            ).fetchone()
+            if stored is not None and stored[0] != params:
+                print("Warning: Dedupe parameters changed; rebuilding job signatures")
+                conn.execute("DELETE FROM job_signatures")
+                conn.execute("DELETE FROM job_lsh")
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) "
+                "VALUES ('dedupe_params', ?)",
+                (params,),
+            )
+
+    def band_keys(self, signature: np.ndarray) -> list[int]:
+        """Hash each band of ``signature`` to a signed 64-bit bucket key."""
+        bands = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        keys = (bands * self._band_mix).sum(axis=1) ^ self._band_salt
+        return keys.view(np.int64).tolist()
+
+    def ingest(
+        self, jobs: Iterable[dict], batch_size: int = INGEST_BATCH_SIZE
+    ) -> IngestStats:
+        """
+        Upsert canonical jobs and record near-duplicates, batch by batch.
+
+        A job whose id is already in the catalog is updated in place. A new
+        job that matches an existing job (or an earlier job in the stream) at
+        or above the threshold is recorded as that job's duplicate instead of
+        being inserted.
+
+        Args:
+            jobs: Job dictionaries with the ``JobItem`` fields; may be a
+                generator over millions of postings
+            batch_size: Jobs validated and written per transaction
+
+        Returns:
+            IngestStats for the whole stream
+
+        Raises:
+            pydantic.ValidationError: If a job is invalid; earlier batches
+                stay committed
+        """
+        self.backfill()
+        stats = IngestStats()
+        iterator = iter(jobs)
+        while batch := validate_jobs(itertools.islice(iterator, batch_size)):
+            signatures = [self.hasher.signature(job_text(job)) for job in batch]
+            with self.catalog.transaction() as conn:
+                canonical = []
+                for job, signature in zip(batch, signatures, strict=True):
+                    match = self._classify(conn, job, signature)
+                    if match is None:
+                        canonical.append(job)
+                        continue
+                    canonical_id, score = match
+                    conn.execute(
+                        "INSERT OR REPLACE INTO job_duplicates "
+                        "(id, canonical_id, source, url, similarity) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (job["id"], canonical_id, job["source"], job["url"], score),
+                    )
+                    stats.duplicates += 1
+                stats.changed += self.catalog.upsert_rows(conn, canonical)
+            stats.received += len(batch)
+        return stats
+
+    def _classify(
+        self, conn: sqlite3.Connection, job: dict, signature: np.ndarray | None
+    ) -> tuple[str, float] | None:
+        """Index ``job`` and return None, or return (canonical id, similarity)."""
+        known = conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job["id"],)).fetchone()
+        keys = self.band_keys(signature) if signature is not None else []
+        if not known and keys:
+            match = self._best_match(conn, job["id"], signature, keys)
+            if match is not None:
+                return match
+
+        conn.execute("DELETE FROM job_duplicates WHERE id = ?", (job["id"],))
+        self._store(conn, job["id"], signature, keys)
+        return None
+
+    def _best_match(
+        self,
+        conn: sqlite3.Connection,
+        job_id: str,
+        signature: np.ndarray,
+        keys: list[int],
+    ) -> tuple[str, float] | None:
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(
+            "SELECT hits.id, job_signatures.signature FROM ("
+            f"  SELECT id, count(*) AS n FROM job_lsh WHERE bucket IN ({placeholders})"
+            "   AND id != ? GROUP BY id ORDER BY n DESC LIMIT ?"
+            ") AS hits JOIN job_signatures ON job_signatures.id = hits.id",
+            [*keys, job_id, MAX_CANDIDATES],
+        ).fetchall()
+        if not rows:
+            return None
+        candidates = np.frombuffer(
+            b"".join(row[1] for row in rows), dtype=np.uint32
+        ).reshape(len(rows), -1)
+        scores = np.count_nonzero(candidates == signature, axis=1) / len(signature)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return rows[best][0], round(float(scores[best]), 3)
+
+    def _store(
+        self,
+        conn: sqlite3.Connection,
+        job_id: str,
+        signature: np.ndarray | None,
+        keys: list[int],
+    ) -> None:
+        conn.execute("DELETE FROM job_lsh WHERE id = ?", (job_id,))
+        if signature is None:
+            conn.execute("DELETE FROM job_signatures WHERE id = ?", (job_id,))
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO job_signatures (id, signature) VALUES (?, ?)",
+            (job_id, signature.tobytes()),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_lsh (bucket, id) SELECT ?1, ?2 "
+            "WHERE (SELECT count(*) FROM job_lsh WHERE bucket = ?1) < ?3",
+            ((key, job_id, MAX_BUCKET_SIZE) for key in keys),
+        )
+
+    def backfill(self, batch_size: int = INGEST_BATCH_SIZE) -> int:
+        """
+        Sign catalog jobs that have no signature yet.
+
+        Covers jobs written with ``upsert_many`` (such as the seeded sample
+        jobs) so later postings are checked against them. Runs once per
+        deduplicator.
+
+        Returns:
+            Number of jobs signed
+        """
+        if self._backfilled:
+            return 0
+        signed, last_rowid = 0, 0
+        while True:
+            with self.catalog.transaction() as conn:
+                rows = conn.execute(
+                    'SELECT rowid, id, title, company, "desc" FROM jobs '
+                    "WHERE rowid > ? AND id NOT IN (SELECT id FROM job_signatures) "
+                    "ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size),
+                ).fetchall()
+                for row in rows:
+                    signature = self.hasher.signature(job_text(dict(row)))
+                    if signature is not None:
+                        self._store(
+                            conn, row["id"], signature, self.band_keys(signature)
+                        )
+                        signed += 1
+            if len(rows) < batch_size:
+                break
+            last_rowid = rows[-1]["rowid"]
+        self._backfilled = True
+        return signed
+
+    def duplicates(self, job_id: str) -> list[dict]:
+        """Return the postings recorded as duplicates of ``job_id``."""
+        with self.catalog.transaction(write=False) as conn:
+            rows = conn.execute(
+                "SELECT id, source, url, similarity FROM job_duplicates "
+                "WHERE canonical_id = ? ORDER BY similarity DESC",
+                (job_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+@lru_cache(maxsize=1)
+def get_deduplicator() -> JobDeduplicator:
+    """Return the deduplicator for the process-wide catalog."""
+    return JobDeduplicator(get_catalog())
+
+
+def ingest_jobs(jobs: Iterable[dict]) -> IngestStats:
+    """Ingest ``jobs`` into the catalog, skipping near-duplicates."""
+    return get_deduplicator().ingest(jobs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "paths", nargs="+", help="JSON array or JSON Lines files of jobs"
+    )
+    args = parser.parse_args(argv)
+
+    def read_jobs():
+        for path in args.paths:
+            with open(path) as f:
+                if f.read(1) == "[":
+                    f.seek(0)
+                    yield from json.load(f)
+                    continue
+                f.seek(0)
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    stats = ingest_jobs(read_jobs())
+    print(json.dumps(stats.__dict__))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Text extraction from uploaded resumes (PDF, DOCX, plain text).
+
+Extraction is CPU-bound and, for large PDFs, slow, so ``extract_in_pool``
+runs it in a process pool instead of the event loop. Uploads reach the
+workers as a temporary file path (``save_upload``), so the document is never
+held in API memory or pickled to a worker. ``extract_text`` only imports the
+standard library at module level: workers are started with ``spawn`` and
+stay cheap. DOCX is read with ``zipfile`` and ElementTree; PDF
+needs ``pypdf`` (the ``documents`` extra). Scanned PDFs without a text layer
+come out empty, since there is no OCR.
+"""
+
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import BinaryIO
+from xml.etree import ElementTree
+
+from .settings import settings
+
+PDF = "pdf"
+DOCX = "docx"
+TEXT = "text"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Uncompressed document.xml beyond this is treated as a zip bomb
+_MAX_DOCX_XML = 64 * 1024 * 1024
+
+
+class DocumentError(ValueError):
+    """Raised for an unsupported, malformed or unreadable document."""
+
+
+def detect_kind(filename: str | None, content_type: str | None, head: bytes) -> str:
+    """
+    Document kind from its leading bytes, falling back to name and type.
+
+    Args:
+        filename: Client-supplied file name
+        content_type: Client-supplied content type
+        head: First bytes of the file
+
+    Returns:
+        ``PDF``, ``DOCX`` or ``TEXT``
+
+    Raises:
+        DocumentError: If the file is none of these
+    """
+    name = (filename or "").lower()
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        return DOCX
+    if name.endswith((".txt", ".md")) or (content_type or "").startswith("text/"):
+        return TEXT
+    raise DocumentError("Unsupported document; upload a PDF, DOCX or text file")
+
+
+def extract_text(source: bytes | str, kind: str, max_pages: int | None = None) -> str:
+    """
+    Plain text of a document.
+
+    Args:
+        source: File contents, or the path of the file
+        kind: ``PDF``, ``DOCX`` or ``TEXT``
+        max_pages: Most PDF pages read
+
+    Raises:
+        DocumentError: If the document cannot be read
+    """
+    if kind == TEXT:
+        if isinstance(source, str):
+            with open(source, "rb") as file:
+                source = file.read()
+        return source.decode("utf-8", errors="replace")
+    # zipfile and pypdf read paths lazily; wrap bytes to look like a file
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if kind == DOCX:
+        return _docx_text(source)
+    if kind == PDF:
+        return _pdf_text(source, max_pages)
+    raise DocumentError(f"Unknown document kind: {kind}")
+
+
+def _docx_text(source: BinaryIO | str) -> str:
+    try:
+        with zipfile.ZipFile(source) as archive:
+            info = archive.getinfo("word/document.xml")
+            if info.file_size > _MAX_DOCX_XML:
+                raise DocumentError("DOCX document body is too large")
+            with archive.open(info) as xml:
+                paragraphs = []
+                parts = []
+                for _, element in ElementTree.iterparse(xml):
+                    if element.tag == f"{_W}t":
+                        parts.append(element.text or "")
+                    elif element.tag == f"{_W}tab":
+                        parts.append("\t")
+                    elif element.tag in (f"{_W}br", f"{_W}cr"):
+                        parts.append("\n")
+                    elif element.tag == f"{_W}p":
+                        paragraphs.append("".join(parts))
+                        parts = []
+                        element.clear()
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise DocumentError(f"Unreadable DOCX file: {e}") from None
+    return "\n".join(paragraphs)
+
+
+def _pdf_text(source: BinaryIO | str, max_pages: int | None) -> str:
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PyPdfError
+    except ImportError:
+        raise DocumentError(
+            "PDF uploads need pypdf (install the 'documents' extra)"
+        ) from None
+    try:
+        reader = PdfReader(source)
+        pages = reader.pages[:max_pages] if max_pages else reader.pages
+        return "\n".join(page.extract_text() or "" for page in pages)
+    except PyPdfError as e:
+        raise DocumentError(f"Unreadable PDF file: {e}") from None
+
+
+@lru_cache(maxsize=1)
+def get_extract_pool() -> ProcessPoolExecutor | None:
+    """Return the extraction process pool, or None when workers are disabled."""
+    if settings.UPLOAD_EXTRACT_WORKERS <= 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=settings.UPLOAD_EXTRACT_WORKERS, mp_context=get_context("spawn")
+    )
+
+
+def shutdown_extract_pool(wait: bool = True) -> None:
+    """
+    Stop the extraction workers, if they were started.
+
+    Args:
+        wait: Wait for running extractions; without it a stuck worker is
+            left to finish on its own while a fresh pool takes new work
+    """
+    if get_extract_pool.cache_info().currsize:
+        pool = get_extract_pool()
+        get_extract_pool.cache_clear()
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def save_upload(file: BinaryIO) -> str:
+    """
+    Copy an uploaded file to a named temporary file, in chunks.
+
+    Returns:
+        Path of the copy; the caller deletes it
+    """
+    file.seek(0)
+    with tempfile.NamedTemporaryFile(prefix="upload-", delete=False) as copy:
+        shutil.copyfileobj(file, copy)
+    return copy.name
+
+
+def remove_upload(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def extract_in_pool(path: str, kind: str) -> str:
+    """
+    Run ``extract_text`` on the file at ``path`` in the process pool (or a
+    thread when it is off), giving up after ``UPLOAD_EXTRACT_TIMEOUT``.
+
+    Raises:
+        DocumentError: If the document cannot be read
+        TimeoutError: If extraction took too long
+    """
+    max_pages = settings.UPLOAD_MAX_PAGES
+    pool = get_extract_pool()
+    if pool is None:
+        extraction = asyncio.to_thread(extract_text, path, kind, max_pages)
+    else:
+        loop = asyncio.get_running_loop()
+        extraction = loop.run_in_executor(pool, extract_text, path, kind, max_pages)
+    return await asyncio.wait_for(extraction, settings.UPLOAD_EXTRACT_TIMEOUT)
@@ -0,0 +1,249 @@
+"""
+Fake Mistral backend for load testing without API spend.
+
+``FakeMistral`` mirrors the parts of the ``mistralai.Mistral`` client the API
+uses (``chat.complete``, ``embeddings.create`` and their ``*_async``
+variants) and returns realistic payloads after a simulated latency drawn
+from a configurable distribution. A configurable fraction of calls fail, so
+fallback paths get exercised under load as well.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from .settings import Settings
+
+EMBEDDING_DIM = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+_FAKE_SKILLS = [
+    "Python",
+    "FastAPI",
+    "PostgreSQL",
+    "Docker",
+    "React",
+    "TypeScript",
+    "Machine Learning",
+    "Git",
+    "Communication",
+    "Teamwork",
+]
+
+
+class FakeLLMError(Exception):
+    """Simulated provider failure raised by the fake backend."""
+
+
+def hash_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Embed text by feature-hashing its tokens into ``dim`` buckets.
+
+    Deterministic across processes (unlike ``hash()``), and texts that share
+    vocabulary get correlated vectors, so rankings behave plausibly. Counts
+    are non-negative, which keeps cosine similarities in ``[0, 1]`` like
+    real ``mistral-embed`` scores.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in _TOKEN_RE.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        vector[int.from_bytes(digest[:4], "little") % dim] += 1.0
+    return vector
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _usage(messages: list[dict], content: str) -> SimpleNamespace:
+    prompt_tokens = sum(_estimate_tokens(m.get("content", "")) for m in messages)
+    completion_tokens = _estimate_tokens(content)
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
+def _fake_content(messages: list[dict]) -> str:
+    """Produce a realistic response body for the prompt being sent."""
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    user = next((m["content"] for m in messages if m["role"] == "user"), "")
+
+    if "Extract skill keywords" in system:
+        return json.dumps(
+            {
+                "skills": _FAKE_SKILLS[:6],
+                "highlights": [
+                    "Built a REST API serving 10k daily users",
+                    "Led a team of 3 in a university hackathon",
+                ],
+            }
+        )
+
+    if "interview coach" in system or user.startswith("Fix this JSON"):
+        return json.dumps(
+            {
+                "questions": [
+                    {
+                        "q": f"Walk me through a project where you used {skill}.",
+                        "ideal_answer": "Describe the problem, your approach and the measurable outcome.",
+                    }
+                    for skill in _FAKE_SKILLS[:5]
+                ],
+                "tips": [
+                    "Research the company's products before the interview.",
+                    "Prepare two STAR stories about teamwork.",
+                    "Practice explaining trade-offs in your past projects.",
+                ],
+            }
+        )
+
+    if "resume analyzer" in system:
+        return "\n".join(_FAKE_SKILLS)
+
+    return (
+        "Dear Hiring Manager,\n\n"
+        "I am excited to apply for this internship. My experience building "
+        "backend services with Python and FastAPI, together with my coursework "
+        "in distributed systems, has prepared me to contribute from day one.\n\n"
+        "I admire your team's focus on shipping reliable products, and I would "
+        "welcome the chance to learn from experienced engineers while delivering "
+        "real value.\n\n"
+        "Thank you for your consideration.\n\nBest regards,\nCandidate"
+    )
+
+
+class _LatencyModel:
+    """Draws simulated call latencies and failures."""
+
+    def __init__(
+        self,
+        mean_ms: float,
+        distribution: str,
+        sigma: float,
+        failure_rate: float,
+        rng: random.Random,
+    ):
+        self.mean_ms = mean_ms
+        self.distribution = distribution
+        self.sigma = sigma
+        self.failure_rate = failure_rate
+        self.rng = rng
+
+    def sample_seconds(self) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed":
+            ms = self.mean_ms
+        elif self.distribution == "uniform":
+            ms = self.rng.uniform(0, 2 * self.mean_ms)
+        elif self.distribution == "exponential":
+            ms = self.rng.expovariate(1 / self.mean_ms)
+        else:
+            # Lognormal with the configured mean: heavy right tail like real APIs
+            mu = np.log(self.mean_ms) - self.sigma**2 / 2
+            ms = self.rng.lognormvariate(mu, self.sigma)
+        return ms / 1000
+
+    def should_fail(self) -> bool:
+        return self.rng.random() < self.failure_rate
+
+
+class _FakeChat:
+    def __init__(self, latency: _LatencyModel):
+        self._latency = latency
+
+    def _respond(self, model: str, messages: list[dict]) -> SimpleNamespace:
+        if self._latency.should_fail():
+            raise FakeLLMError(f"Simulated failure calling {model}")
+        content = _fake_content(messages)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=_usage(messages, content),
+        )
+
+    def complete(self, model: str, messages: list[dict], **kwargs) -> SimpleNamespace:
+        # The real SDK call is blocking, so the fake blocks too.
+        time.sleep(self._latency.sample_seconds())
+        return self._respond(model, messages)
+
+    async def complete_async(
+        self, model: str, messages: list[dict], **kwargs
+    ) -> SimpleNamespace:
+        await asyncio.sleep(self._latency.sample_seconds())
+        return self._respond(model, messages)
+
+
+class _FakeEmbeddings:
+    def __init__(self, latency: _LatencyModel):
+        self._latency = latency
+
+    def _respond(self, model: str, inputs: list[str]) -> SimpleNamespace:
+        if self._latency.should_fail():
+            raise FakeLLMError(f"Simulated failure calling {model}")
+        prompt_tokens = sum(_estimate_tokens(text) for text in inputs)
+        return SimpleNamespace(
+            model=model,
+            data=[
+                SimpleNamespace(index=i, embedding=hash_embedding(text).tolist())
+                for i, text in enumerate(inputs)
+            ],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=0,
+                total_tokens=prompt_tokens,
+            ),
+        )
+
+    def create(self, model: str, inputs: list[str], **kwargs) -> SimpleNamespace:
+        time.sleep(self._latency.sample_seconds())
+        return self._respond(model, inputs)
+
+    async def create_async(
+        self, model: str, inputs: list[str], **kwargs
+    ) -> SimpleNamespace:
+        await asyncio.sleep(self._latency.sample_seconds())
+        return self._respond(model, inputs)
+
+
+class FakeMistral:
+    """Drop-in stand-in for ``mistralai.Mistral`` with simulated latency."""
+
+    def __init__(
+        self,
+        chat_latency_ms: float = 800,
+        embed_latency_ms: float = 60,
+        distribution: str = "lognormal",
+        sigma: float = 0.5,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        rng = random.Random(seed)
+        self.chat = _FakeChat(
+            _LatencyModel(chat_latency_ms, distribution, sigma, failure_rate, rng)
+        )
+        self.embeddings = _FakeEmbeddings(
+            _LatencyModel(embed_latency_ms, distribution, sigma, failure_rate, rng)
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FakeMistral":
+        """Build a fake client from the ``FAKE_LLM_*`` settings."""
+        return cls(
+            chat_latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            embed_latency_ms=settings.FAKE_EMBED_LATENCY_MS,
+            distribution=settings.FAKE_LLM_LATENCY_DIST,
+            sigma=settings.FAKE_LLM_LATENCY_SIGMA,
+            failure_rate=settings.FAKE_LLM_FAILURE_RATE,
+            seed=settings.FAKE_LLM_SEED,
+        )
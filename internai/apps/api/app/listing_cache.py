@@ -0,0 +1,195 @@
+"""
+Pre-serialized, pre-compressed job listing responses.
+
+Listing payloads only change when the catalog does, so each distinct page is
+serialized once per catalog version and then served as bytes with a strong
+``ETag``. Clients that poll with ``If-None-Match`` get a bodyless
+``304 Not Modified``. A page is compressed the first time a client asks for
+an encoding, in a worker thread, and that encoding is kept with the page.
+Brotli is used when the ``brotli`` package is installed and the client
+accepts it; gzip otherwise.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from fastapi import Request, Response
+
+from .metrics import record_cache
+from .settings import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+# Close to quality 11's ratio on JSON at a small fraction of the CPU
+BROTLI_QUALITY = 5
+# Below this size compression costs more on the client than it saves.
+MIN_COMPRESS_BYTES = 512
+
+_CACHE_CONTROL = "no-cache"
+
+
+class EncodedListing:
+    """A listing payload, its encodings as they are requested, and validators."""
+
+    __slots__ = ("body", "encodings", "encoded", "etag", "headers")
+
+    def __init__(self, payload: object, headers: dict[str, str] | None = None):
+        self.body = json.dumps(payload, separators=(",", ":")).encode()
+        self.headers = {k: v for k, v in (headers or {}).items() if v is not None}
+        self.encodings: tuple[str, ...] = ()
+        if len(self.body) >= MIN_COMPRESS_BYTES:
+            self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self.encoded: dict[str, bytes] = {}
+        self.etag = hashlib.blake2b(self.body, digest_size=12).hexdigest()
+
+    def encode(self, encoding: str | None) -> bytes:
+        """
+        Body in ``encoding`` (None for identity), compressing on first use.
+
+        Compression is CPU-bound; async callers run this in a thread.
+        """
+        if encoding is None:
+            return self.body
+        data = self.encoded.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.body, quality=BROTLI_QUALITY)
+            else:
+                data = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+            # Concurrent misses compress twice at worst; the bytes are equal
+            self.encoded[encoding] = data
+        return data
+
+    def etag_for(self, encoding: str | None) -> str:
+        """Strong ETag of one representation (each encoding has its own)."""
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+    def negotiate(self, accept_encoding: str) -> str | None:
+        """Pick the best available encoding the client accepts."""
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in self.encodings:
+            if encoding in accepted or "*" in accepted:
+                return encoding
+        return None
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Whether ``If-None-Match`` names any representation of this listing."""
+        if not if_none_match:
+            return False
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        if "*" in candidates:
+            return True
+        tags = {self.etag_for(None)} | {self.etag_for(enc) for enc in self.encodings}
+        return not candidates.isdisjoint(tags)
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+class ListingCache:
+    """LRU of encoded listings for the current catalog version."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, EncodedListing] = OrderedDict()
+        self._version: int | None = None
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        version: int,
+        build: Callable[[], tuple[object, dict[str, str]]],
+    ) -> EncodedListing:
+        """
+        Return the encoded listing for ``key``, building it on a miss.
+
+        Args:
+            key: Endpoint and filter values identifying the page
+            version: Current catalog version; a new version drops all entries
+            build: Returns (payload, extra headers) for a miss
+
+        Returns:
+            EncodedListing for this page at this version
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            listing = self._entries.get(key)
+            if listing is not None:
+                self._entries.move_to_end(key)
+        record_cache("job_listing", listing is not None)
+        if listing is not None:
+            return listing
+
+        payload, headers = build()
+        listing = EncodedListing(payload, headers)
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = listing
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return listing
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+listing_cache = ListingCache(settings.LISTING_CACHE_SIZE)
+
+
+async def listing_response(request: Request, listing: EncodedListing) -> Response:
+    """
+    Serve ``listing`` for ``request``, honouring If-None-Match.
+
+    Returns:
+        304 with validators when the client copy is current, otherwise 200
+        with the best accepted encoding, compressed in a thread on first use
+    """
+    encoding = listing.negotiate(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": listing.etag_for(encoding),
+        "Cache-Control": _CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+        **listing.headers,
+    }
+    if listing.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    content = listing.encoded.get(encoding) if encoding else listing.body
+    if content is None:
+        content = await asyncio.to_thread(listing.encode, encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -2,15 +2,140 @@
 LLM integration module for InternAI using Mistral AI.
 """
 
+import asyncio
 import json
 import re
+from functools import lru_cache
 
-from mistralai import Mistral
-
+from .llm_scheduler import llm_call, llm_call_async, text_tokens
+from .metrics import record_fallback
+from .model_router import get_model_router
+from .prompts import get_prompts
+from .semantic_cache import SemanticCache, coaching_key
 from .settings import settings
 
-# Initialize Mistral client
-mistral = Mistral(api_key=settings.MISTRAL_API_KEY)
+
+@lru_cache(maxsize=1)
+def get_mistral():
+    """
+    Return the shared Mistral client, constructing it on first use.
+
+    The SDK import and client construction are deferred so that importing
+    the API (worker spawn, tests) does not pay for them. With
+    ``LLM_BACKEND=fake`` the fake backend is returned instead.
+    """
+    if settings.LLM_BACKEND == "fake":
+        from .fake_llm import FakeMistral
+
+        return FakeMistral.from_settings(settings)
+
+    from mistralai import Mistral
+
+    return Mistral(api_key=settings.MISTRAL_API_KEY)
+
+
+def __getattr__(name: str):
+    # Backwards compatibility for ``from app.llm import mistral``.
+    if name == "mistral":
+        return get_mistral()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def chat_complete(function: str, task: str | None = None, **kwargs):
+    """
+    Call Mistral chat completion, recording latency, token usage and errors.
+
+    Args:
+        function: Name of the calling function, used as the metrics label
+        task: Task type for the model router ("generate", "extract",
+            "repair"); it picks ``model``, moving down the task's model chain
+            when a model fails. Without a task, ``model`` must be given.
+        **kwargs: Arguments forwarded to ``chat.complete`` on the client
+
+    Returns:
+        The Mistral chat completion response
+
+    Raises:
+        Exception: What the client raised for the last model tried
+    """
+    if task is None:
+        return _chat_complete(function, **kwargs)
+
+    models = get_model_router().candidates(task)
+    for i, model in enumerate(models):
+        try:
+            return _chat_complete(function, task, **{**kwargs, "model": model})
+        except Exception as e:
+            if i == len(models) - 1:
+                raise
+            print(f"Warning: {function} failed on {model}, falling back: {e}")
+            record_fallback(f"{task}_model_fallback")
+
+
+def _chat_complete(function: str, task: str | None = None, **kwargs):
+    """
+    One chat call through the scheduler; with a ``task``, the provider
+    latency alone (not the queue wait) is reported to the model router.
+    """
+    model = kwargs.get("model", "")
+    with llm_call("chat", function, model, _chat_tokens(kwargs)) as call:
+        try:
+            response = get_mistral().chat.complete(**kwargs)
+        except Exception:
+            _observe(task, model, call, ok=False)
+            raise
+        _observe(task, model, call)
+        call.record_usage(getattr(response, "usage", None))
+    return response
+
+
+async def chat_complete_async(function: str, task: str | None = None, **kwargs):
+    """
+    ``chat_complete`` for coroutines, using ``chat.complete_async``.
+
+    Waiting for rate-limit budget and for the provider both yield to the
+    event loop, so other requests keep being served meanwhile.
+    """
+    if task is None:
+        return await _chat_complete_async(function, **kwargs)
+
+    models = get_model_router().candidates(task)
+    for i, model in enumerate(models):
+        try:
+            return await _chat_complete_async(
+                function, task, **{**kwargs, "model": model}
+            )
+        except Exception as e:
+            if i == len(models) - 1:
+                raise
+            print(f"Warning: {function} failed on {model}, falling back: {e}")
+            record_fallback(f"{task}_model_fallback")
+
+
+async def _chat_complete_async(function: str, task: str | None = None, **kwargs):
+    model = kwargs.get("model", "")
+    async with llm_call_async("chat", function, model, _chat_tokens(kwargs)) as call:
+        try:
+            response = await get_mistral().chat.complete_async(**kwargs)
+        except Exception:
+            _observe(task, model, call, ok=False)
+            raise
+        _observe(task, model, call)
+        call.record_usage(getattr(response, "usage", None))
+    return response
+
+
+def _chat_tokens(kwargs: dict) -> int:
+    """Estimated input plus output tokens of a chat call."""
+    tokens = text_tokens(m["content"] for m in kwargs.get("messages", ()))
+    return tokens + (kwargs.get("max_tokens") or 0)
+
+
+def _observe(task: str | None, model: str, call, ok: bool = True) -> None:
+    if task is not None:
+        get_model_router().observe(
+            task, model, call.elapsed(), ok=ok, queued=call.queued
+        )
 
 
 async def draft_cover_letter(job, profile) -> str:
@@ -24,45 +149,27 @@ async def draft_cover_letter(job, profile) -> str:
     Returns:
         Generated cover letter text
     """
-    system_prompt = """You are a concise, professional cover letter writer specializing in internship applications.
-Your cover letters should be:
-- Professional but enthusiastic
-- 3-4 paragraphs maximum
-- Specific to the role and company
-- Highlight relevant skills and experience
-- Show genuine interest in the company/role
-- Use proper business letter format
-
-Focus on how the candidate's skills align with the job requirements and what they can contribute to the team."""
-
-    # Build job description
-    job_text = f"""Position: {job.title}
-Company: {job.company}
-Location: {job.location or 'Not specified'}
-Description: {job.desc}"""
-
-    # Build profile summary
-    profile_text = f"""Name: {profile.name or 'Candidate'}
-Skills: {', '.join(profile.skills) if profile.skills else 'Various technical skills'}
-LinkedIn: {profile.linkedin_url or 'Available upon request'}
-Email: {profile.email or 'Available upon request'}"""
-
-    user_prompt = f"""JOB:
-{job_text}
-
-PROFILE:
-{profile_text}
-
-Write a compelling 1-page cover letter that connects the candidate's background to this specific opportunity.
-Make it personal, professional, and demonstrate clear value proposition for the hiring manager."""
-
     try:
-        response = mistral.chat.complete(
-            model="mistral-medium-2508",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+        messages = get_prompts().render(
+            "application_writer.draft_cover_letter",
+            name=profile.name or "Candidate",
+            skills=(
+                ", ".join(profile.skills)
+                if profile.skills
+                else "Various technical skills"
+            ),
+            linkedin_url=profile.linkedin_url or "Available upon request",
+            email=profile.email or "Available upon request",
+            title=job.title,
+            company=job.company,
+            location=job.location or "Not specified",
+            description=job.desc,
+        )
+
+        response = await chat_complete_async(
+            "draft_cover_letter",
+            task="generate",
+            messages=messages,
             max_tokens=800,
             temperature=0.7,
         )
@@ -71,6 +178,7 @@ Make it personal, professional, and demonstrate clear value proposition for the
 
     except Exception as e:
         print(f"Error generating cover letter: {e}")
+        record_fallback("draft_cover_letter")
         # Fallback to template-based response
         return f"""Dear Hiring Manager,
 
@@ -84,7 +192,12 @@ Best regards,
 {profile.name or 'Candidate'}"""
 
 
-async def interview_coach(role: str, company: str, skills: list[str]) -> dict:
+async def interview_coach(
+    role: str,
+    company: str,
+    skills: list[str],
+    cache: SemanticCache | None = None,
+) -> dict:
     """
     Generate interview coaching questions and tips using Mistral AI.
 
@@ -92,154 +205,166 @@ async def interview_coach(role: str, company: str, skills: list[str]) -> dict:
         role: Job role/title
         company: Company name
         skills: List of candidate skills
+        cache: Semantic cache consulted first; coaching for a similar role
+            and skill set at the same company is returned from it, and new
+            LLM results (not the template fallback) are stored in it
 
     Returns:
         Dictionary with questions and tips
     """
-    system_prompt = """Return JSON {questions:[{q,ideal_answer}], tips:[...]}
-
-You are a practical interview coach specializing in tech internships and entry-level positions.
-Your coaching should be:
-- Specific to the role and company
-- Practical and actionable
-- Focused on common internship interview scenarios
-- Include both technical and behavioral aspects
+    if cache is not None:
+        key, scope = coaching_key(role, company, skills)
+        # Embedding the key is a blocking provider call
+        cached, vector = await asyncio.to_thread(cache.lookup, key, scope)
+        if cached is not None:
+            return cached
 
-Format questions as: {"q": "question text", "ideal_answer": "brief guidance"}
-Provide exactly 5 targeted interview questions and 3 improvement tips.
-Return only valid JSON, no additional text."""
+    try:
+        result = await _generate_coaching(role, company, skills)
+    except Exception as e:
+        print(f"Error generating interview coaching: {e}")
+        record_fallback("interview_coach")
+        # Fallback to template-based response
+        return _coaching_template(role, company)
 
-    skills_text = ", ".join(skills) if skills else "various technical skills"
+    if cache is not None:
+        cache.store(key, result, vector, scope)
+    return result
 
-    user_prompt = f"""ROLE: {role}
-COMPANY: {company}
-SKILLS: {skills_text}
 
-Generate interview coaching for this specific role and company combination."""
+async def _generate_coaching(role: str, company: str, skills: list[str]) -> dict:
+    """
+    Ask the LLM for coaching, repairing or text-parsing malformed JSON.
 
+    Raises:
+        Exception: Whatever the Mistral client raises
+    """
+    messages = get_prompts().render(
+        "coach.interview_coach",
+        role=role,
+        company=company,
+        skills=", ".join(skills) if skills else "various technical skills",
+    )
+
+    response = await chat_complete_async(
+        "interview_coach",
+        task="generate",
+        messages=messages,
+        max_tokens=1200,
+        temperature=0.6,
+    )
+
+    content = response.choices[0].message.content.strip()
+
+    # Try to parse JSON response
     try:
-        response = mistral.chat.complete(
-            model="mistral-medium-2508",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=1200,
-            temperature=0.6,
-        )
-
-        content = response.choices[0].message.content.strip()
-
-        # Try to parse JSON response
+        # Clean the response to extract JSON
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+
+        # Remove any leading/trailing non-JSON text
+        content = content.strip()
+        if content.startswith("{"):
+            result = json.loads(content)
+
+            # Ensure proper format
+            questions = []
+            if "questions" in result:
+                for q in result["questions"]:
+                    if isinstance(q, dict) and "q" in q:
+                        questions.append(
+                            {
+                                "q": q["q"],
+                                "ideal_answer": q.get(
+                                    "ideal_answer",
+                                    "Provide a specific example from your experience.",
+                                ),
+                            }
+                        )
+                    elif isinstance(q, str):
+                        questions.append(
+                            {
+                                "q": q,
+                                "ideal_answer": "Provide a specific example from your experience.",
+                            }
+                        )
+
+            tips = result.get("tips", [])
+            if isinstance(tips, list):
+                tips = [str(tip) for tip in tips if tip]
+
+            return {
+                "questions": questions[:5],  # Ensure max 5 questions
+                "tips": tips[:3],  # Ensure max 3 tips
+            }
+    except json.JSONDecodeError:
+        # If JSON parsing fails, try repair prompt
+        record_fallback("interview_coach_json_repair")
         try:
-            # Clean the response to extract JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            # Remove any leading/trailing non-JSON text
-            content = content.strip()
-            if content.startswith("{"):
-                result = json.loads(content)
-
-                # Ensure proper format
-                questions = []
-                if "questions" in result:
-                    for q in result["questions"]:
-                        if isinstance(q, dict) and "q" in q:
-                            questions.append(
-                                {
-                                    "q": q["q"],
-                                    "ideal_answer": q.get(
-                                        "ideal_answer",
-                                        "Provide a specific example from your experience.",
-                                    ),
-                                }
-                            )
-                        elif isinstance(q, str):
-                            questions.append(
-                                {
-                                    "q": q,
-                                    "ideal_answer": "Provide a specific example from your experience.",
-                                }
-                            )
-
-                tips = result.get("tips", [])
-                if isinstance(tips, list):
-                    tips = [str(tip) for tip in tips if tip]
-
+            repair_response = await chat_complete_async(
+                "interview_coach_repair",
+                task="repair",
+                messages=get_prompts().render(
+                    "coach.interview_coach_repair", content=content
+                ),
+                max_tokens=800,
+                temperature=0.3,
+            )
+
+            repair_content = repair_response.choices[0].message.content.strip()
+            if "```json" in repair_content:
+                repair_content = repair_content.split("```json")[1].split("```")[0]
+            elif "```" in repair_content:
+                repair_content = repair_content.split("```")[1].split("```")[0]
+
+            repair_content = repair_content.strip()
+            if repair_content.startswith("{"):
+                result = json.loads(repair_content)
                 return {
-                    "questions": questions[:5],  # Ensure max 5 questions
-                    "tips": tips[:3],  # Ensure max 3 tips
+                    "questions": result.get("questions", [])[:5],
+                    "tips": result.get("tips", [])[:3],
                 }
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try repair prompt
-            repair_prompt = f"""Fix this JSON response for interview coaching:
-
-{content}
-
-Return valid JSON with format: {{"questions":[{{"q":"question","ideal_answer":"guidance"}}],"tips":["tip1","tip2"]}}"""
-
-            try:
-                repair_response = mistral.chat.complete(
-                    model="mistral-medium-2508",
-                    messages=[{"role": "user", "content": repair_prompt}],
-                    max_tokens=800,
-                    temperature=0.3,
-                )
-
-                repair_content = repair_response.choices[0].message.content.strip()
-                if "```json" in repair_content:
-                    repair_content = repair_content.split("```json")[1].split("```")[0]
-                elif "```" in repair_content:
-                    repair_content = repair_content.split("```")[1].split("```")[0]
-
-                repair_content = repair_content.strip()
-                if repair_content.startswith("{"):
-                    result = json.loads(repair_content)
-                    return {
-                        "questions": result.get("questions", [])[:5],
-                        "tips": result.get("tips", [])[:3],
-                    }
-            except Exception:
-                pass
-
-        # Fallback to text parsing
-        return _parse_coaching_response(content)
+        except Exception:
+            pass
 
-    except Exception as e:
-        print(f"Error generating interview coaching: {e}")
-        # Fallback to template-based response
-        return {
-            "questions": [
-                {
-                    "q": f"Tell me about your experience with {role} and what interests you most about this field.",
-                    "ideal_answer": "Focus on specific projects, technologies, or experiences that demonstrate your passion and relevant skills.",
-                },
-                {
-                    "q": f"What do you know about {company} and why do you want to work here?",
-                    "ideal_answer": "Research their products, mission, recent news, and company culture. Show genuine interest and alignment with their values.",
-                },
-                {
-                    "q": "Describe a challenging project you've worked on and how you overcame obstacles.",
-                    "ideal_answer": "Use the STAR method: describe the Situation, Task, Action you took, and Result achieved. Show problem-solving skills.",
-                },
-                {
-                    "q": f"Where do you see yourself in 5 years, and how does this {role} role fit into your career goals?",
-                    "ideal_answer": "Show long-term thinking while demonstrating how this role is a stepping stone toward your career aspirations.",
-                },
-                {
-                    "q": "Do you have any questions about the role or company culture?",
-                    "ideal_answer": "Ask thoughtful questions about team dynamics, growth opportunities, or specific projects you'd work on.",
-                },
-            ],
-            "tips": [
-                f"Research {company} thoroughly - understand their products, mission, and recent news.",
-                "Prepare specific examples of your work using the STAR method (Situation, Task, Action, Result).",
-                "Practice explaining technical concepts in simple terms for non-technical interviewers.",
-            ],
-        }
+    # Fallback to text parsing
+    record_fallback("interview_coach_text_parse")
+    return _parse_coaching_response(content)
+
+
+def _coaching_template(role: str, company: str) -> dict:
+    """Template coaching used when the LLM is unavailable."""
+    return {
+        "questions": [
+            {
+                "q": f"Tell me about your experience with {role} and what interests you most about this field.",
+                "ideal_answer": "Focus on specific projects, technologies, or experiences that demonstrate your passion and relevant skills.",
+            },
+            {
+                "q": f"What do you know about {company} and why do you want to work here?",
+                "ideal_answer": "Research their products, mission, recent news, and company culture. Show genuine interest and alignment with their values.",
+            },
+            {
+                "q": "Describe a challenging project you've worked on and how you overcame obstacles.",
+                "ideal_answer": "Use the STAR method: describe the Situation, Task, Action you took, and Result achieved. Show problem-solving skills.",
+            },
+            {
+                "q": f"Where do you see yourself in 5 years, and how does this {role} role fit into your career goals?",
+                "ideal_answer": "Show long-term thinking while demonstrating how this role is a stepping stone toward your career aspirations.",
+            },
+            {
+                "q": "Do you have any questions about the role or company culture?",
+                "ideal_answer": "Ask thoughtful questions about team dynamics, growth opportunities, or specific projects you'd work on.",
+            },
+        ],
+        "tips": [
+            f"Research {company} thoroughly - understand their products, mission, and recent news.",
+            "Prepare specific examples of your work using the STAR method (Situation, Task, Action, Result).",
+            "Practice explaining technical concepts in simple terms for non-technical interviewers.",
+        ],
+    }
 
 
 def _parse_coaching_response(content: str) -> dict:
@@ -333,23 +458,12 @@ async def extract_skills_from_text(text: str) -> list[str]:
     Returns:
         List of extracted skills
     """
-    system_prompt = """You are a resume analyzer specializing in extracting technical and soft skills from candidate profiles.
-Extract only the most relevant and specific skills mentioned in the text.
-Return them as a clean list without explanations or formatting."""
-
-    user_prompt = f"""Analyze this text and extract all relevant skills (technical, programming languages, frameworks, tools, soft skills, etc.):
-
-{text[:2000]}  # Limit text length
-
-Return only a simple list of skills, one per line, without numbering or bullet points."""
-
     try:
-        response = mistral.chat.complete(
-            model="mistral-medium-2508",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+        messages = get_prompts().render("cv_analyzer.extract_skill_list", text=text)
+        response = await chat_complete_async(
+            "extract_skills_from_text",
+            task="extract",
+            messages=messages,
             max_tokens=300,
             temperature=0.3,
         )
@@ -369,6 +483,7 @@ Return only a simple list of skills, one per line, without numbering or bullet p
 
     except Exception as e:
         print(f"Error extracting skills: {e}")
+        record_fallback("extract_skills_from_text")
         # Fallback to keyword-based extraction
         return _extract_skills_fallback(text)
 
@@ -0,0 +1,384 @@
+"""
+Process-wide scheduler for Mistral chat and embedding calls.
+
+Every provider call is admitted through ``llm_call``, which waits for the
+shared request and token budgets (token buckets refilled at
+``LLM_REQUESTS_PER_MINUTE`` and ``LLM_TOKENS_PER_MINUTE``) before timing the
+call like ``track_llm_call``. Token costs are estimated up front and settled
+against the usage the provider reports.
+
+Waiting calls queue by priority and tenant. Interactive calls (requests to
+``/v1/write``, ``/v1/coach``, ...) always go before batch calls (catalog
+sync, bulk matching, requests sent with ``X-Priority: batch``), and batch
+calls may not dip into the last ``LLM_INTERACTIVE_RESERVE`` fraction of
+either budget. That keeps headroom for interactive traffic while a bulk
+job runs. Within a priority, tenants (``X-API-Key`` or ``X-Tenant-ID``,
+else the client address) take turns, so one heavy client cannot starve
+the others. Queue depth, waits and timeouts are exported as
+``internai_llm_queue_*`` metrics.
+
+``llm_call`` waits on a condition variable and suits threads; coroutines
+use ``llm_call_async``, whose waits yield to the event loop, so a call
+queued for budget does not stall other requests.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .metrics import (
+    LLM_QUEUE_DEPTH,
+    LLM_QUEUE_TIMEOUTS,
+    LLM_QUEUE_WAIT,
+    LLMCall,
+    track_llm_call,
+)
+from .prompts import estimate_tokens
+from .settings import settings
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Paths whose LLM calls are batch work regardless of headers
+BATCH_PATHS = frozenset({"/v1/match/bulk"})
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default=INTERACTIVE)
+_tenant: ContextVar[str] = ContextVar("llm_tenant", default="default")
+
+
+class LLMQueueTimeout(RuntimeError):
+    """Raised when a call waits longer than the queue timeout for budget."""
+
+
+@contextmanager
+def llm_context(priority: str | None = None, tenant: str | None = None):
+    """Run the block's LLM calls with ``priority`` and/or ``tenant``."""
+    tokens = []
+    if priority is not None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM priority: {priority}")
+        tokens.append((_priority, _priority.set(priority)))
+    if tenant is not None:
+        tokens.append((_tenant, _tenant.set(tenant)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class TokenBucket:
+    """Budget refilled continuously at ``per_minute`` up to one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def wait_time(self, amount: float, reserve: float, now: float) -> float:
+        """
+        Seconds until ``amount`` can be taken, leaving ``reserve`` (a fraction
+        of capacity) untouched. Amounts beyond what could ever fit are capped.
+        """
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+        floor = reserve * self.capacity
+        amount = min(amount, self.capacity - floor)
+        return max(0.0, (amount + floor - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+@dataclass
+class Ticket:
+    """An admitted call and the token cost charged for it."""
+
+    priority: str
+    tenant: str
+    tokens: int
+    waited: float = 0.0
+
+
+class LLMScheduler:
+    """Admits calls within rate budgets, interactive first, tenants in turn."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        interactive_reserve: float = 0.2,
+        timeout: float = 60,
+    ):
+        """
+        Args:
+            requests_per_minute: Request budget; 0 disables the limit
+            tokens_per_minute: Input plus output token budget; 0 disables it
+            interactive_reserve: Fraction of each budget batch calls leave
+                for interactive ones
+            timeout: Most seconds a call waits before ``LLMQueueTimeout``
+        """
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.interactive_reserve = interactive_reserve
+        self.timeout = timeout
+        # priority -> tenant -> waiting tickets; tenants in turn order
+        self._queues: dict[str, OrderedDict[str, deque[Ticket]]] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        self._cond = threading.Condition()
+        # Event loops and events of coroutines waiting in ``acquire_async``
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = (
+            set()
+        )
+
+    def __len__(self) -> int:
+        with self._cond:
+            return sum(
+                len(queue)
+                for tenants in self._queues.values()
+                for queue in tenants.values()
+            )
+
+    def acquire(
+        self, tokens: int, priority: str | None = None, tenant: str | None = None
+    ) -> Ticket:
+        """
+        Wait for this call's turn and budget, then charge it.
+
+        Args:
+            tokens: Estimated input plus output tokens
+            priority: Defaults to the current ``llm_context``
+            tenant: Defaults to the current ``llm_context``
+
+        Returns:
+            The ticket to ``settle`` once actual usage is known
+
+        Raises:
+            LLMQueueTimeout: If the call waited longer than ``timeout``
+        """
+        ticket = Ticket(priority or _priority.get(), tenant or _tenant.get(), tokens)
+        started = time.monotonic()
+        with self._cond:
+            self._enqueue(ticket)
+            try:
+                while (delay := self._poll(ticket, started)) is not None:
+                    self._cond.wait(delay)
+            finally:
+                self._leave(ticket)
+        return self._admitted(ticket, started)
+
+    async def acquire_async(
+        self, tokens: int, priority: str | None = None, tenant: str | None = None
+    ) -> Ticket:
+        """
+        ``acquire`` for coroutines: waits without blocking the event loop.
+
+        Raises:
+            LLMQueueTimeout: If the call waited longer than ``timeout``
+        """
+        ticket = Ticket(priority or _priority.get(), tenant or _tenant.get(), tokens)
+        started = time.monotonic()
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            self._enqueue(ticket)
+            self._async_waiters.add(waiter)
+        try:
+            while True:
+                with self._cond:
+                    # Cleared under the lock, so a wake-up sent after this
+                    # poll is never lost
+                    waiter[1].clear()
+                    delay = self._poll(ticket, started)
+                if delay is None:
+                    break
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), delay)
+                except TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+                self._leave(ticket)
+        return self._admitted(ticket, started)
+
+    def settle(self, ticket: Ticket, tokens: int | None) -> None:
+        """Correct the charge of ``ticket`` to the ``tokens`` actually used."""
+        if tokens is None or self.tokens is None or tokens == ticket.tokens:
+            return
+        with self._cond:
+            self.tokens.level = min(
+                self.tokens.capacity, self.tokens.level + ticket.tokens - tokens
+            )
+            self._notify()
+
+    def _enqueue(self, ticket: Ticket) -> None:
+        self._queues[ticket.priority].setdefault(ticket.tenant, deque()).append(ticket)
+        LLM_QUEUE_DEPTH.inc(priority=ticket.priority)
+
+    def _poll(self, ticket: Ticket, started: float) -> float | None:
+        """
+        Charge ``ticket`` if it is next in line and its budget is there.
+
+        Returns:
+            None once charged, else the seconds to sleep before polling again
+
+        Raises:
+            LLMQueueTimeout: If the call has waited ``timeout`` seconds
+        """
+        now = time.monotonic()
+        # Only the next ticket in line may take budget; the rest sleep until
+        # the line moves
+        wait = None
+        if self._next() is ticket:
+            wait = self._wait_time(ticket, now)
+            if wait == 0:
+                self._take(ticket)
+                return None
+        remaining = started + self.timeout - now
+        if remaining <= 0:
+            LLM_QUEUE_TIMEOUTS.inc(priority=ticket.priority)
+            raise LLMQueueTimeout(
+                f"No LLM budget for {ticket.priority} call after {self.timeout:g}s"
+            )
+        return remaining if wait is None else min(wait, remaining)
+
+    def _leave(self, ticket: Ticket) -> None:
+        self._dequeue(ticket)
+        LLM_QUEUE_DEPTH.dec(priority=ticket.priority)
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake every waiter, in threads and event loops, to re-check its turn."""
+        self._cond.notify_all()
+        for loop, event in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    @staticmethod
+    def _admitted(ticket: Ticket, started: float) -> Ticket:
+        ticket.waited = time.monotonic() - started
+        LLM_QUEUE_WAIT.observe(ticket.waited, priority=ticket.priority)
+        return ticket
+
+    def _next(self) -> Ticket | None:
+        for priority in PRIORITIES:
+            tenants = self._queues[priority]
+            if tenants:
+                return next(iter(tenants.values()))[0]
+        return None
+
+    def _wait_time(self, ticket: Ticket, now: float) -> float:
+        reserve = self.interactive_reserve if ticket.priority == BATCH else 0.0
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.wait_time(1, reserve, now)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(ticket.tokens, reserve, now))
+        return wait
+
+    def _take(self, ticket: Ticket) -> None:
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(ticket.tokens)
+
+    def _dequeue(self, ticket: Ticket) -> None:
+        """Remove ``ticket`` and send its tenant to the back of the line."""
+        tenants = self._queues[ticket.priority]
+        queue = tenants[ticket.tenant]
+        queue.remove(ticket)
+        if queue:
+            tenants.move_to_end(ticket.tenant)
+        else:
+            del tenants[ticket.tenant]
+
+
+@lru_cache(maxsize=1)
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler."""
+    return LLMScheduler(
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+        interactive_reserve=settings.LLM_INTERACTIVE_RESERVE,
+        timeout=settings.LLM_QUEUE_TIMEOUT,
+    )
+
+
+def text_tokens(texts: Iterable[str]) -> int:
+    """Estimated tokens of ``texts`` together."""
+    return sum(estimate_tokens(text) for text in texts)
+
+
+@contextmanager
+def llm_call(kind: str, function: str, model: str, tokens: int) -> Iterator[LLMCall]:
+    """
+    Wait for the scheduler to admit an LLM call, then time it.
+
+    Args:
+        kind: "chat" or "embedding"
+        function: Calling function name, e.g. "draft_cover_letter"
+        model: Model name sent to the provider
+        tokens: Estimated input plus output tokens
+
+    Raises:
+        LLMQueueTimeout: If no budget frees up within the queue timeout
+    """
+    scheduler = get_llm_scheduler()
+    ticket = scheduler.acquire(tokens)
+    with track_llm_call(kind, function, model) as call:
+        call.queued = ticket.waited
+        yield call
+    scheduler.settle(ticket, call.tokens)
+
+
+@asynccontextmanager
+async def llm_call_async(
+    kind: str, function: str, model: str, tokens: int
+) -> AsyncIterator[LLMCall]:
+    """``llm_call`` for coroutines; the queue wait yields to the event loop."""
+    scheduler = get_llm_scheduler()
+    ticket = await scheduler.acquire_async(tokens)
+    with track_llm_call(kind, function, model) as call:
+        call.queued = ticket.waited
+        yield call
+    scheduler.settle(ticket, call.tokens)
+
+
+class LLMContextMiddleware:
+    """ASGI middleware setting the LLM priority and tenant of each request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        requested = headers.get("x-priority", "").strip().lower()
+        batch = scope["path"] in BATCH_PATHS or requested == BATCH
+        client = scope.get("client")
+        tenant = (
+            headers.get("x-api-key")
+            or headers.get("x-tenant-id")
+            or (client[0] if client else "default")
+        )
+        with llm_context(BATCH if batch else INTERACTIVE, tenant):
+            await self.app(scope, receive, send)
@@ -0,0 +1,564 @@
+"""
+Job locations resolved against an offline gazetteer.
+
+``JobItem.location`` is free text ("New York, NY", "Remote - US", "Hybrid -
+Berlin"). ``Gazetteer.resolve`` maps it to canonical place, region and country
+ids plus coordinates, using ``app/data/gazetteer.json`` (no network calls).
+The catalog stores the result per job in ``job_locations`` when the job is
+written, so locations are resolved once, at ingest.
+
+``LocationIndex`` keeps those locations per process as integer codes (one
+array per level, aligned to index slots) with postings per place, region and
+country. A ``LocationFilter`` ("within 50 km of Austin, or remote") finds the
+places in range through a coarse grid over the gazetteer, so queries touch
+only the postings of nearby places and never scan the catalog; checking a
+list of candidate jobs against it is a few integer array lookups.
+"""
+
+import json
+import math
+import re
+import threading
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .catalog import JobCatalog, get_catalog
+from .preload import register_preload
+
+GAZETTEER_PATH = Path(__file__).parent / "data" / "gazetteer.json"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Grid cell size over gazetteer places; a 50 km query probes about 4 cells.
+GRID_DEGREES = 1.0
+MAX_RADIUS_KM = 20_000.0
+
+# Placeholder code for a level that did not resolve.
+UNKNOWN = -1
+
+_REMOTE_RE = re.compile(
+    r"\b(?:remote|anywhere|work from home|wfh|distributed|telecommute)\b"
+)
+_MODE_RE = re.compile(r"\b(?:hybrid|on-?site|in[- ]office|office)\b")
+_AREA_RE = re.compile(r"^(?:greater )?(.+?)(?: (?:metro|metropolitan))?(?: area)?$")
+_SPLIT_RE = re.compile(r"[,;/|()\[\]]|\s[-–—:]\s")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+class UnknownLocationError(ValueError):
+    """Raised when a location filter's place is not in the gazetteer."""
+
+
+@dataclass(frozen=True)
+class Location:
+    """A resolved location; levels that did not resolve are None."""
+
+    place: str | None = None
+    region: str | None = None
+    country: str | None = None
+    lat: float | None = None
+    lon: float | None = None
+    remote: bool = False
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace and dots."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().replace(".", " ").split())
+
+
+def haversine_km(
+    lat: float, lon: float, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class Gazetteer:
+    """Places, regions and countries with integer codes and a coarse grid."""
+
+    def __init__(self, data: dict):
+        """
+        Build lookup tables from gazetteer data.
+
+        Args:
+            data: Parsed ``gazetteer.json``: "version", "countries" and
+                "regions" (id -> names and abbreviations) and "places"
+                (id, name, region, lat, lon, aliases), most prominent first
+        """
+        self.version: int = data["version"]
+        self.countries = list(data["countries"])
+        self.regions = list(data["regions"])
+        places = data["places"]
+        self.places = [place["id"] for place in places]
+
+        self._country_code = {c: i for i, c in enumerate(self.countries)}
+        self._region_code = {r: i for i, r in enumerate(self.regions)}
+        self._place_code = {p: i for i, p in enumerate(self.places)}
+        self.region_country = np.array(
+            [self._country_code[r.split("-")[0]] for r in self.regions],
+            dtype=np.int32,
+        )
+        self.place_region = np.array(
+            [self._region_code[place["region"]] for place in places], dtype=np.int32
+        )
+        self.place_country = self.region_country[self.place_region]
+        self.lat = np.array([place["lat"] for place in places], dtype=np.float64)
+        self.lon = np.array([place["lon"] for place in places], dtype=np.float64)
+
+        self._countries_by_name: dict[str, int] = {}
+        for code, (country, names) in enumerate(data["countries"].items()):
+            for name in (country, *names):
+                self._countries_by_name.setdefault(normalize_name(name), code)
+        self._regions_by_name: dict[str, list[int]] = {}
+        for code, names in enumerate(data["regions"].values()):
+            for name in names:
+                self._regions_by_name.setdefault(normalize_name(name), []).append(code)
+        self._places_by_name: dict[str, list[int]] = {}
+        for code, place in enumerate(places):
+            for name in (place["name"], *place.get("aliases", ())):
+                candidates = self._places_by_name.setdefault(normalize_name(name), [])
+                if code not in candidates:
+                    candidates.append(code)
+
+        cells: dict[tuple[int, int], list[int]] = {}
+        for code, (lat, lon) in enumerate(zip(self.lat, self.lon, strict=True)):
+            cells.setdefault(_cell(lat, lon), []).append(code)
+        self._cells = {
+            cell: np.array(codes, dtype=np.int32) for cell, codes in cells.items()
+        }
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_PATH) -> "Gazetteer":
+        """Load a gazetteer from a JSON file."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def resolve(self, text: str | None) -> Location | None:
+        """
+        Resolve free-text location to canonical ids and coordinates.
+
+        The first comma- or dash-separated part is looked up as a place; the
+        other parts ("NY", "Canada") pick between places sharing a name. When
+        no place matches, the parts are tried as a region, then a country.
+
+        Args:
+            text: Location as written in the posting
+
+        Returns:
+            Resolved Location, or None when nothing in ``text`` is known
+        """
+        if not text:
+            return None
+        lowered = normalize_name(text)
+        remote = bool(_REMOTE_RE.search(lowered))
+        lowered = _MODE_RE.sub(" ", _REMOTE_RE.sub(" ", lowered))
+        lowered = _DIGITS_RE.sub(" ", lowered)
+        parts = [part.strip(" -") for part in _SPLIT_RE.split(lowered)]
+        parts = [" ".join(part.split()) for part in parts if part]
+
+        if parts:
+            first = parts[0]
+            candidates = self._places_by_name.get(first) or self._places_by_name.get(
+                _AREA_RE.match(first).group(1)
+            )
+            if candidates:
+                qualifiers = parts[1:]
+                best = max(
+                    candidates, key=lambda c: (self._qualifier_score(c, qualifiers), -c)
+                )
+                return self.place_location(best, remote)
+
+        regions: list[int] = []
+        country = None
+        for part in parts:
+            if not regions and part in self._regions_by_name:
+                regions = self._regions_by_name[part]
+            elif country is None and part in self._countries_by_name:
+                country = self._countries_by_name[part]
+        region = None
+        if regions:
+            # "Victoria, Australia": prefer the region in the named country
+            region = next(
+                (r for r in regions if self.region_country[r] == country), regions[0]
+            )
+            country = int(self.region_country[region])
+        if region is None and country is None:
+            return Location(remote=True) if remote else None
+        return Location(
+            region=self.regions[region] if region is not None else None,
+            country=self.countries[country],
+            remote=remote,
+        )
+
+    def place_location(self, code: int, remote: bool = False) -> Location:
+        """The Location of gazetteer place ``code``."""
+        return Location(
+            place=self.places[code],
+            region=self.regions[self.place_region[code]],
+            country=self.countries[self.place_country[code]],
+            lat=float(self.lat[code]),
+            lon=float(self.lon[code]),
+            remote=remote,
+        )
+
+    def codes(
+        self,
+        place: str | None,
+        region: str | None,
+        country: str | None,
+    ) -> tuple[int, int, int]:
+        """Integer codes of stored ids; ids no longer known become ``UNKNOWN``."""
+        return (
+            self._place_code.get(place, UNKNOWN) if place else UNKNOWN,
+            self._region_code.get(region, UNKNOWN) if region else UNKNOWN,
+            self._country_code.get(country, UNKNOWN) if country else UNKNOWN,
+        )
+
+    def encode(
+        self, locations: Iterable[Location | None]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Integer code arrays for a list of resolved locations.
+
+        Returns:
+            Tuple of (place, region, country, remote) arrays
+        """
+        locations = list(locations)
+        codes = np.array(
+            [
+                (
+                    self.codes(loc.place, loc.region, loc.country)
+                    if loc
+                    else (UNKNOWN,) * 3
+                )
+                for loc in locations
+            ],
+            dtype=np.int32,
+        ).reshape(-1, 3)
+        remote = np.array([bool(loc and loc.remote) for loc in locations], dtype=bool)
+        return codes[:, 0], codes[:, 1], codes[:, 2], remote
+
+    def near(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """
+        Codes of places within ``radius_km`` of a point.
+
+        Only grid cells overlapping the radius are probed; the exact
+        great-circle distance is checked for the places in them.
+        """
+        lat_span = math.ceil(radius_km / KM_PER_DEGREE / GRID_DEGREES)
+        widest = min(abs(lat) + radius_km / KM_PER_DEGREE, 90.0)
+        shrink = math.cos(math.radians(widest))
+        lon_cells = int(360 / GRID_DEGREES)
+        lon_span = (
+            math.ceil(radius_km / (KM_PER_DEGREE * shrink) / GRID_DEGREES)
+            if shrink > 1e-6
+            else lon_cells
+        )
+        if (2 * lat_span + 1) * min(2 * lon_span + 1, lon_cells) > len(self._cells):
+            candidates = np.arange(len(self.places), dtype=np.int32)
+        else:
+            row, col = _cell(lat, lon)
+            columns = (
+                range(lon_cells)
+                if 2 * lon_span + 1 >= lon_cells
+                else [(col + d) % lon_cells for d in range(-lon_span, lon_span + 1)]
+            )
+            found = [
+                self._cells[(r, c)]
+                for r in range(row - lat_span, row + lat_span + 1)
+                for c in columns
+                if (r, c) in self._cells
+            ]
+            if not found:
+                return np.empty(0, dtype=np.int32)
+            candidates = np.concatenate(found)
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        return candidates[distances <= radius_km]
+
+    def _qualifier_score(self, code: int, qualifiers: list[str]) -> int:
+        region = int(self.place_region[code])
+        country = int(self.place_country[code])
+        score = 0
+        for qualifier in qualifiers:
+            if region in self._regions_by_name.get(qualifier, ()):
+                score += 2
+            elif self._countries_by_name.get(qualifier) == country:
+                score += 1
+        return score
+
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    return (
+        math.floor(lat / GRID_DEGREES),
+        math.floor((lon + 180) / GRID_DEGREES) % int(360 / GRID_DEGREES),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> Gazetteer:
+    """Return the bundled gazetteer, loaded once per process."""
+    return Gazetteer.load()
+
+
+@lru_cache(maxsize=8192)
+def resolve_location(text: str | None) -> Location | None:
+    """Resolve ``text`` with the bundled gazetteer; repeated strings are cached."""
+    return get_gazetteer().resolve(text)
+
+
+class LocationFilter:
+    """ "Near this place (or remote)" as masks over integer location codes."""
+
+    def __init__(
+        self,
+        origin: Location,
+        radius_km: float,
+        include_remote: bool = True,
+        gazetteer: Gazetteer | None = None,
+    ):
+        """
+        Precompute which codes pass the filter.
+
+        A place origin matches places within ``radius_km``; a region or
+        country origin (no coordinates) matches jobs in that region or
+        country; a remote-only origin matches remote jobs.
+
+        Args:
+            origin: Resolved location to filter around
+            radius_km: Search radius for place origins
+            include_remote: Also match remote jobs
+            gazetteer: Gazetteer the codes come from; defaults to the bundled one
+        """
+        gazetteer = gazetteer or get_gazetteer()
+        self.origin = origin
+        self.radius_km = radius_km
+        self.include_remote = include_remote or origin == Location(remote=True)
+        place, region, country = gazetteer.codes(
+            origin.place, origin.region, origin.country
+        )
+        if place != UNKNOWN:
+            self.level, self.codes = "place", gazetteer.near(
+                origin.lat, origin.lon, radius_km
+            )
+        elif region != UNKNOWN:
+            self.level, self.codes = "region", np.array([region], dtype=np.int32)
+        elif country != UNKNOWN:
+            self.level, self.codes = "country", np.array([country], dtype=np.int32)
+        else:
+            self.level, self.codes = None, np.empty(0, dtype=np.int32)
+        # One extra False entry, so UNKNOWN (-1) codes index it.
+        size = {
+            "place": len(gazetteer.places),
+            "region": len(gazetteer.regions),
+            "country": len(gazetteer.countries),
+            None: 0,
+        }[self.level]
+        self._allowed = np.zeros(size + 1, dtype=bool)
+        self._allowed[self.codes] = True
+
+    def mask(
+        self,
+        place: np.ndarray,
+        region: np.ndarray,
+        country: np.ndarray,
+        remote: np.ndarray,
+    ) -> np.ndarray:
+        """Which jobs, given as code arrays, pass the filter."""
+        if self.level is None:
+            allowed = np.zeros(len(remote), dtype=bool)
+        else:
+            codes = {"place": place, "region": region, "country": country}
+            allowed = self._allowed[codes[self.level]]
+        return allowed | remote if self.include_remote else allowed
+
+
+def location_filter(
+    near: str, radius_km: float, include_remote: bool = True
+) -> LocationFilter:
+    """
+    Build a filter around a free-text location.
+
+    Raises:
+        UnknownLocationError: If ``near`` does not resolve
+    """
+    origin = resolve_location(near)
+    if origin is None:
+        raise UnknownLocationError(f"Unknown location: {near!r}")
+    return LocationFilter(origin, min(radius_km, MAX_RADIUS_KM), include_remote)
+
+
+class LocationIndex:
+    """Per-process location codes of catalog jobs, synced incrementally."""
+
+    _LEVELS = ("place", "region", "country")
+
+    def __init__(self, gazetteer: Gazetteer | None = None):
+        self.gazetteer = gazetteer or get_gazetteer()
+        self._slot_of: dict[str, int] = {}
+        self._job_ids: list[str | None] = []
+        self._free: list[int] = []
+        # Codes per slot; freed slots are UNKNOWN and not remote.
+        self._columns = {
+            "place": np.empty(0, dtype=np.int32),
+            "region": np.empty(0, dtype=np.int32),
+            "country": np.empty(0, dtype=np.int32),
+            "remote": np.empty(0, dtype=bool),
+        }
+        self._postings: dict[tuple[str, int], set[int]] = {}
+        self._lock = threading.RLock()
+        self.version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, job_id: str, stored: dict | None) -> None:
+        """
+        Index a job's stored location, replacing any previous one.
+
+        Args:
+            job_id: Catalog job id
+            stored: ``job_locations`` row from ``JobCatalog.get_locations``,
+                or None when the job has no location
+        """
+        stored = stored or {}
+        codes = dict(
+            zip(
+                self._LEVELS,
+                self.gazetteer.codes(
+                    stored.get("place"), stored.get("region"), stored.get("country")
+                ),
+                strict=True,
+            )
+        )
+        codes["remote"] = bool(stored.get("remote"))
+        with self._lock:
+            self.remove(job_id)
+            slot = self._free.pop() if self._free else self._grow(job_id)
+            self._job_ids[slot] = job_id
+            self._slot_of[job_id] = slot
+            for name, code in codes.items():
+                self._columns[name][slot] = code
+            for key in self._keys(codes):
+                self._postings.setdefault(key, set()).add(slot)
+
+    def remove(self, job_id: str) -> None:
+        """Drop a job from the index if present."""
+        with self._lock:
+            slot = self._slot_of.pop(job_id, None)
+            if slot is None:
+                return
+            codes = {name: column[slot] for name, column in self._columns.items()}
+            for key in self._keys(codes):
+                postings = self._postings[key]
+                postings.discard(slot)
+                if not postings:
+                    del self._postings[key]
+            for name, column in self._columns.items():
+                column[slot] = False if name == "remote" else UNKNOWN
+            self._job_ids[slot] = None
+            self._free.append(slot)
+
+    def within(self, location: LocationFilter) -> list[str]:
+        """Ids of every indexed job that passes ``location``."""
+        keys = [(location.level, int(code)) for code in location.codes]
+        if location.include_remote:
+            keys.append(("remote", 1))
+        with self._lock:
+            slots = set().union(*(self._postings.get(key, ()) for key in keys))
+            return [self._job_ids[slot] for slot in sorted(slots)]
+
+    def matches(self, job_ids: list[str], location: LocationFilter) -> np.ndarray:
+        """
+        Which of ``job_ids`` pass ``location``.
+
+        Jobs not in the index do not match.
+
+        Returns:
+            Boolean array aligned with ``job_ids``
+        """
+        with self._lock:
+            slots = np.fromiter(
+                (self._slot_of.get(job_id, -1) for job_id in job_ids),
+                dtype=np.int64,
+                count=len(job_ids),
+            )
+            known = slots >= 0
+            if not known.any():
+                return known
+            slots = np.where(known, slots, 0)
+            columns = [self._columns[name][slots] for name in (*self._LEVELS, "remote")]
+        return location.mask(*columns) & known
+
+    def sync(self, catalog: JobCatalog) -> int:
+        """
+        Bring the index up to date with ``catalog``.
+
+        Returns:
+            Catalog version the index now reflects
+        """
+        with self._lock:
+            if self.version is not None and catalog.version() == self.version:
+                return self.version
+            changed: list[str] = []
+            self.version = catalog.scan_changes(
+                self.version,
+                on_upsert=lambda job: changed.append(job["id"]),
+                on_delete=self.remove,
+            )
+            stored = catalog.get_locations(changed)
+            for job_id in changed:
+                self.add(job_id, stored.get(job_id))
+            return self.version
+
+    def _grow(self, job_id: str) -> int:
+        slot = len(self._job_ids)
+        self._job_ids.append(job_id)
+        capacity = len(self._columns["place"])
+        if slot >= capacity:
+            size = max(1024, capacity * 2)
+            for name, column in self._columns.items():
+                grown = np.full(
+                    size, False if name == "remote" else UNKNOWN, dtype=column.dtype
+                )
+                grown[:capacity] = column
+                self._columns[name] = grown
+        return slot
+
+    def _keys(self, codes: dict) -> list[tuple[str, int]]:
+        keys = [
+            (name, int(codes[name])) for name in self._LEVELS if codes[name] != UNKNOWN
+        ]
+        if codes["remote"]:
+            keys.append(("remote", 1))
+        return keys
+
+
+@lru_cache(maxsize=1)
+def _shared_index() -> LocationIndex:
+    return LocationIndex()
+
+
+@register_preload
+def get_location_index(catalog: JobCatalog | None = None) -> LocationIndex:
+    """
+    Return the process-wide location index, synced with the catalog.
+
+    Args:
+        catalog: Catalog to sync with; defaults to ``get_catalog()``
+    """
+    index = _shared_index()
+    index.sync(catalog or get_catalog())
+    return index
@@ -0,0 +1,420 @@
+"""
+Prometheus-compatible metrics for InternAI API.
+
+A small in-process registry rendering the Prometheus text exposition format,
+so ``/metrics`` can be scraped without adding a client library dependency.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+from starlette.routing import Match
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LLM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values, strict=True):
+        escaped = (
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: tuple[str, ...], value: object) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = HTTP_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _render_sample(self, key: tuple[str, ...], value: object) -> list[str]:
+        bucket_counts, total, count = value
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, bucket_counts, strict=True):
+            cumulative += bucket_count
+            labels = _format_labels(names, key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        _refresh_cache_ratios()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "internai_http_request_duration_seconds",
+        "HTTP request latency by route.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "internai_http_requests_in_flight",
+        "HTTP requests currently being served by route.",
+        ("method", "route"),
+    )
+)
+LLM_CALL_DURATION = REGISTRY.register(
+    Histogram(
+        "internai_llm_call_duration_seconds",
+        "Latency of Mistral chat and embedding calls.",
+        ("kind", "function", "model"),
+        buckets=LLM_BUCKETS,
+    )
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter(
+        "internai_llm_tokens_total",
+        "Tokens sent to and received from Mistral, from response usage.",
+        ("kind", "function", "direction"),
+    )
+)
+LLM_ERRORS = REGISTRY.register(
+    Counter(
+        "internai_llm_errors_total",
+        "Failed Mistral chat and embedding calls.",
+        ("kind", "function"),
+    )
+)
+LLM_TASK_CALLS = REGISTRY.register(
+    Counter(
+        "internai_llm_task_calls_total",
+        "Routed LLM chat calls by task, model and outcome.",
+        ("task", "model", "outcome"),
+    )
+)
+LLM_TASK_DURATION = REGISTRY.register(
+    Histogram(
+        "internai_llm_task_duration_seconds",
+        "Latency of routed LLM chat calls by task and model.",
+        ("task", "model"),
+        buckets=LLM_BUCKETS,
+    )
+)
+LLM_TASK_QUEUE_WAIT = REGISTRY.register(
+    Histogram(
+        "internai_llm_task_queue_wait_seconds",
+        "Time routed LLM calls waited for rate-limit budget, by task.",
+        ("task",),
+    )
+)
+LLM_TASK_P95 = REGISTRY.register(
+    Gauge(
+        "internai_llm_task_p95_seconds",
+        "Recent p95 latency the model router sees per task and model.",
+        ("task", "model"),
+    )
+)
+LLM_TASK_DOWNSHIFTS = REGISTRY.register(
+    Counter(
+        "internai_llm_task_downshifts_total",
+        "Calls routed past a task's primary model because of its latency SLO.",
+        ("task", "model"),
+    )
+)
+LLM_QUEUE_DEPTH = REGISTRY.register(
+    Gauge(
+        "internai_llm_queue_depth",
+        "LLM calls waiting for rate-limit budget by priority.",
+        ("priority",),
+    )
+)
+LLM_QUEUE_WAIT = REGISTRY.register(
+    Histogram(
+        "internai_llm_queue_wait_seconds",
+        "Time LLM calls waited for rate-limit budget by priority.",
+        ("priority",),
+    )
+)
+LLM_QUEUE_TIMEOUTS = REGISTRY.register(
+    Counter(
+        "internai_llm_queue_timeouts_total",
+        "LLM calls abandoned after waiting too long for budget.",
+        ("priority",),
+    )
+)
+FALLBACKS = REGISTRY.register(
+    Counter(
+        "internai_fallbacks_total",
+        "Requests answered from a fallback path after an error.",
+        ("site",),
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "internai_cache_requests_total",
+        "Cache lookups by outcome.",
+        ("cache", "result"),
+    )
+)
+CACHE_HIT_RATIO = REGISTRY.register(
+    Gauge(
+        "internai_cache_hit_ratio",
+        "Fraction of cache lookups that were hits since startup.",
+        ("cache",),
+    )
+)
+
+
+def record_fallback(site: str) -> None:
+    """Count a request served from the fallback path at ``site``."""
+    FALLBACKS.inc(site=site)
+
+
+def record_cache(cache: str, hit: bool, count: int = 1) -> None:
+    """Count ``count`` cache lookups for ``cache``."""
+    CACHE_REQUESTS.inc(count, cache=cache, result="hit" if hit else "miss")
+
+
+def _refresh_cache_ratios() -> None:
+    with CACHE_REQUESTS._lock:
+        items = list(CACHE_REQUESTS._values.items())
+    totals: dict[str, list[float]] = {}
+    for (cache, result), value in items:
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        hits_and_total[1] += value
+        if result == "hit":
+            hits_and_total[0] += value
+    for cache, (hits, total) in totals.items():
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+class LLMCall:
+    """Handle for recording the outcome of an instrumented LLM call."""
+
+    def __init__(self, kind: str, function: str):
+        self.kind = kind
+        self.function = function
+        # Total tokens from the response usage, once recorded
+        self.tokens: int | None = None
+        # Seconds spent queued for rate-limit budget before the call started
+        self.queued = 0.0
+        self.started = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """Seconds since the provider call started (queueing excluded)."""
+        return time.perf_counter() - self.started
+
+    def record_usage(self, usage: object) -> None:
+        """Record token counts from a Mistral ``response.usage`` object."""
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        self.tokens = prompt_tokens + completion_tokens
+        LLM_TOKENS.inc(
+            prompt_tokens, kind=self.kind, function=self.function, direction="in"
+        )
+        if completion_tokens:
+            LLM_TOKENS.inc(
+                completion_tokens,
+                kind=self.kind,
+                function=self.function,
+                direction="out",
+            )
+
+
+@contextmanager
+def track_llm_call(kind: str, function: str, model: str) -> Iterator[LLMCall]:
+    """
+    Time an LLM call and count its errors.
+
+    Args:
+        kind: "chat" or "embedding"
+        function: Calling function name, e.g. "draft_cover_letter"
+        model: Model name sent to the provider
+    """
+    call = LLMCall(kind, function)
+    try:
+        yield call
+    except Exception:
+        LLM_ERRORS.inc(kind=kind, function=function)
+        raise
+    finally:
+        LLM_CALL_DURATION.observe(
+            call.elapsed(), kind=kind, function=function, model=model
+        )
+
+
+@lru_cache(maxsize=1024)
+def _route_for(app: object, method: str, path: str) -> str:
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            # Mounted/included routers may not expose a path template; the
+            # API has no path parameters, so the concrete path is equivalent.
+            return getattr(route, "path", path)
+    return "unmatched"
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_for(scope["app"], method, scope["path"])
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method, route=route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method, route=route)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=method,
+                route=route,
+                status=str(status["code"]),
+            )
@@ -0,0 +1,196 @@
+"""
+Latency-tiered model routing for LLM chat calls.
+
+Callers name a task type instead of a model. Each task maps to an ordered
+chain of models (the primary first, then faster fallbacks) and a latency
+SLO. The router keeps the latencies of recent calls per task and model and
+sends a call to the first model in the chain whose observed p95 is within
+the SLO, so extraction traffic stops queueing behind a slow generation
+model. Models with fewer than ``min_samples`` calls in the window count as
+healthy, which means a downshifted model is tried again once its slow
+samples age out. Failed calls count as infinitely slow, and a call whose
+model fails moves on down the chain.
+
+Tasks:
+    generate: Long-form writing (cover letters, interview coaching)
+    extract: Structured extraction (skills from resumes)
+    repair: Rewriting malformed JSON into the expected shape
+
+Routes can be overridden with ``LLM_ROUTES`` (see ``parse_routes``). Calls,
+latencies, p95s and downshifts are exported per task and model as the
+``internai_llm_task_*`` metrics.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .metrics import (
+    LLM_TASK_CALLS,
+    LLM_TASK_DOWNSHIFTS,
+    LLM_TASK_DURATION,
+    LLM_TASK_P95,
+    LLM_TASK_QUEUE_WAIT,
+)
+from .settings import settings
+
+# Most recent calls kept per task and model, bounding the cost of a p95
+_MAX_SAMPLES = 256
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Models for one task type, primary first, and its p95 latency SLO."""
+
+    task: str
+    models: tuple[str, ...]
+    slo_ms: float
+
+
+DEFAULT_ROUTES = (
+    ModelRoute("generate", ("mistral-medium-2508", "mistral-small-2506"), 8000),
+    ModelRoute("extract", ("mistral-small-2506", "ministral-8b-2410"), 2000),
+    ModelRoute("repair", ("mistral-small-2506", "ministral-8b-2410"), 2000),
+)
+
+
+def parse_routes(spec: str) -> list[ModelRoute]:
+    """
+    Parse route overrides.
+
+    Entries look like ``task=model[,fallback...]@slo_ms`` and are separated
+    by ``;``, e.g. ``extract=mistral-small-2506,ministral-8b-2410@1500``.
+
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    routes = []
+    for entry in spec.split(";"):
+        if not entry.strip():
+            continue
+        task, sep, rest = entry.partition("=")
+        models, at, slo = rest.rpartition("@")
+        names = tuple(name.strip() for name in models.split(",") if name.strip())
+        if not (sep and at and task.strip() and names):
+            raise ValueError(f"Invalid LLM route: {entry.strip()!r}")
+        routes.append(ModelRoute(task.strip(), names, float(slo)))
+    return routes
+
+
+class ModelRouter:
+    """Chooses a model per task from recent latencies against its SLO."""
+
+    def __init__(
+        self, routes: Iterable[ModelRoute], window: float, min_samples: int = 5
+    ):
+        """
+        Args:
+            routes: One route per task type
+            window: Seconds of call history used for the p95
+            min_samples: Fewest calls in the window before a p95 is trusted
+        """
+        self.routes = {route.task: route for route in routes}
+        self.window = window
+        self.min_samples = min_samples
+        # (task, model) -> (finished at, seconds), oldest first
+        self._samples: dict[tuple[str, str], deque[tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def route(self, task: str) -> ModelRoute:
+        try:
+            return self.routes[task]
+        except KeyError:
+            raise ValueError(f"Unknown LLM task: {task}") from None
+
+    def candidates(self, task: str) -> list[str]:
+        """
+        Models to try for ``task``, in order.
+
+        The first is the first model in the chain meeting the SLO (or, when
+        none does, the one with the lowest p95); the rest are its fallbacks.
+
+        Raises:
+            ValueError: If ``task`` has no route
+        """
+        route = self.route(task)
+        p95s = [self.p95(task, model) for model in route.models]
+        slo = route.slo_ms / 1000
+        start = next(
+            (i for i, p95 in enumerate(p95s) if p95 is None or p95 <= slo), None
+        )
+        if start is None:
+            start = min(range(len(p95s)), key=p95s.__getitem__)
+        if start:
+            LLM_TASK_DOWNSHIFTS.inc(task=task, model=route.models[start])
+        return list(route.models[start:])
+
+    def observe(
+        self,
+        task: str,
+        model: str,
+        seconds: float,
+        ok: bool = True,
+        queued: float = 0.0,
+    ) -> None:
+        """
+        Record a call to ``model`` for ``task``; failures count as too slow.
+
+        Args:
+            task: Task type
+            model: Model that served the call
+            seconds: Provider latency, excluding time queued for rate limits
+            ok: Whether the call succeeded
+            queued: Seconds the call waited for the scheduler, recorded
+                separately so rate limiting never looks like a slow model
+        """
+        LLM_TASK_CALLS.inc(task=task, model=model, outcome="ok" if ok else "error")
+        LLM_TASK_DURATION.observe(seconds, task=task, model=model)
+        LLM_TASK_QUEUE_WAIT.observe(queued, task=task)
+        now = time.monotonic()
+        with self._lock:
+            samples = self._samples.setdefault(
+                (task, model), deque(maxlen=_MAX_SAMPLES)
+            )
+            samples.append((now, seconds if ok else math.inf))
+        p95 = self.p95(task, model)
+        if p95 is not None:
+            LLM_TASK_P95.set(p95, task=task, model=model)
+
+    def p95(self, task: str, model: str) -> float | None:
+        """p95 seconds of recent calls, or None with too few samples."""
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            samples = self._samples.get((task, model))
+            if not samples:
+                return None
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            if len(samples) < self.min_samples:
+                return None
+            latencies = sorted(seconds for _, seconds in samples)
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+@lru_cache(maxsize=1)
+def get_model_router() -> ModelRouter:
+    """Return the process-wide router, applying ``LLM_ROUTES`` overrides."""
+    routes = {route.task: route for route in DEFAULT_ROUTES}
+    try:
+        routes.update(
+            (route.task, route) for route in parse_routes(settings.LLM_ROUTES)
+        )
+    except ValueError as e:
+        print(f"Warning: Ignoring LLM_ROUTES: {e}")
+    return ModelRouter(
+        routes.values(),
+        window=settings.LLM_ROUTE_WINDOW,
+        min_samples=settings.LLM_ROUTE_MIN_SAMPLES,
+    )
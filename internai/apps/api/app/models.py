@@ -39,6 +39,35 @@ class MatchResult(BaseModel):
     )
 
 
+class MatchStreamSummary(BaseModel):
+    """Trailing line of /match/stream: the best results across all chunks."""
+
+    count: int = Field(..., description="Number of jobs scored")
+    top: list[MatchResult] = Field(..., description="Best matches, highest first")
+
+
+class BulkMatchRequest(BaseModel):
+    """Request for matching a cohort of profiles in one call."""
+
+    profiles: list[UserProfile] = Field(
+        default_factory=list, description="Profiles to match"
+    )
+    profile_handles: list[str] = Field(
+        default_factory=list,
+        description="Handles from /analyze or /profile/embed, after profiles",
+    )
+    jobs: list[JobItem] | None = Field(
+        None, description="Jobs to match against; the whole catalog if omitted"
+    )
+
+
+class ProfileMatches(BaseModel):
+    """One profile's shortlist from /match/bulk."""
+
+    profile_handle: str = Field(..., description="Handle of the matched profile")
+    matches: list[MatchResult] = Field(..., description="Best matches first")
+
+
 class WriteRequest(BaseModel):
     """Request for writing application materials."""
 
@@ -71,6 +100,32 @@ class AnalyzeResponse(BaseModel):
         default_factory=list, description="Key highlights from the profile"
     )
     profile_text: str = Field("", description="Summarized profile text")
+    profile_handle: str | None = Field(
+        None, description="Opaque handle to pass to /match instead of a profile"
+    )
+
+
+class AnalyzeUploadResponse(AnalyzeResponse):
+    """Response from analyzing an uploaded resume file."""
+
+    filename: str | None = Field(None, description="Uploaded file name")
+    kind: str = Field(..., description="Detected format: pdf, docx or text")
+    size_bytes: int = Field(..., description="Uploaded file size")
+    timings_ms: dict[str, float] = Field(
+        default_factory=dict,
+        description="Milliseconds spent per stage (receive, extract, analyze)",
+    )
+
+
+class ProfileEmbedResponse(BaseModel):
+    """Response from profile embedding."""
+
+    profile_handle: str = Field(
+        ..., description="Opaque handle to pass to /match instead of a profile"
+    )
+    embedded: bool = Field(
+        False, description="Whether the profile vector is cached on the server"
+    )
 
 
 class WriteResponse(BaseModel):
@@ -0,0 +1,38 @@
+"""
+Read-only data preloading for multi-process serving.
+
+Modules register loaders with ``register_preload``; ``serve.py`` runs them in
+the parent process before forking workers, so catalog data, skill tables and
+compiled indexes are built once and shared copy-on-write. Pages stay shared
+until a worker writes to them; the indexes sync incrementally, so a worker
+only copies the pages that catalog changes touch after the fork.
+"""
+
+import time
+from collections.abc import Callable
+
+_PRELOADERS: list[tuple[str, Callable[[], object]]] = []
+
+
+def register_preload(func: Callable[[], object]) -> Callable[[], object]:
+    """Register ``func`` to run once in the parent process before forking."""
+    _PRELOADERS.append((func.__qualname__, func))
+    return func
+
+
+def preload() -> dict[str, float]:
+    """
+    Run all registered preloaders.
+
+    Returns:
+        Mapping of preloader name to elapsed milliseconds
+    """
+    timings = {}
+    for name, func in _PRELOADERS:
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            print(f"Warning: Preload {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
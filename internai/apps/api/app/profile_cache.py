@@ -0,0 +1,169 @@
+"""
+Reusable profile handles for repeat matching.
+
+A session usually runs ``/v1/analyze`` once and ``/v1/match`` many times.
+``/analyze`` and ``/profile/embed`` return a profile handle that ``/match``
+accepts in place of a ``UserProfile``. Each worker keeps a TTL/LRU cache of
+``ProfileEntry`` objects keyed by handle: the profile's embedding text, its
+skill bitset and, once computed, its vector, so repeat matches skip the
+profile embedding round trip.
+
+Handles are self-describing (the compressed skill list plus a digest), so
+any worker process can serve one: a worker that has not seen the handle, or
+whose entry expired, rebuilds the entry from it and embeds the profile once.
+Profiles too large for ``MAX_HANDLE_LENGTH`` get a digest-only handle
+instead, which only the worker that cached the entry can serve until it
+expires. Clients should treat handles as opaque.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+from .metrics import record_cache
+from .settings import settings
+
+HANDLE_PREFIX = "p1"
+# Longest handle accepted; a few hundred skills fit comfortably.
+MAX_HANDLE_LENGTH = 4096
+_MAX_PAYLOAD_BYTES = 65536
+_DIGEST_SIZE = 9
+
+
+class InvalidProfileHandleError(ValueError):
+    """Raised when a profile handle cannot be decoded."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode((text + "=" * (-len(text) % 4)).encode())
+
+
+def _digest(payload: str) -> str:
+    return _b64encode(
+        hashlib.blake2b(payload.encode(), digest_size=_DIGEST_SIZE).digest()
+    )
+
+
+def encode_handle(skills: Sequence[str]) -> str:
+    """
+    Encode a profile's skills as an opaque handle; equal skills, equal handle.
+
+    A handle that would exceed ``MAX_HANDLE_LENGTH`` is cut to its digest,
+    ``p1.<digest>``, which ``decode_handle`` rejects; it only resolves from
+    the profile cache.
+    """
+    data = json.dumps(list(skills), separators=(",", ":")).encode()
+    payload = _b64encode(zlib.compress(data, 9))
+    handle = f"{HANDLE_PREFIX}.{_digest(payload)}.{payload}"
+    if len(handle) > MAX_HANDLE_LENGTH:
+        return f"{HANDLE_PREFIX}.{_digest(payload)}"
+    return handle
+
+
+def decode_handle(handle: str) -> tuple[str, ...]:
+    """Decode the skills from a handle produced by ``encode_handle``."""
+    parts = handle.split(".", 2)
+    if len(parts) == 2 and parts[0] == HANDLE_PREFIX:
+        raise InvalidProfileHandleError(
+            "Profile handle has expired; send the profile instead"
+        )
+    try:
+        if len(handle) > MAX_HANDLE_LENGTH:
+            raise ValueError("too long")
+        prefix, digest, payload = handle.split(".")
+        if prefix != HANDLE_PREFIX or digest != _digest(payload):
+            raise ValueError("digest mismatch")
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(_b64decode(payload), _MAX_PAYLOAD_BYTES)
+        if decompressor.unconsumed_tail:
+            raise ValueError("payload too large")
+        skills = json.loads(data)
+        if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+            raise ValueError("not a skill list")
+        return tuple(skills)
+    except (ValueError, zlib.error) as e:
+        raise InvalidProfileHandleError("Invalid profile handle") from e
+
+
+class ProfileEntry:
+    """What matching needs from a profile, computed once per handle."""
+
+    __slots__ = ("skills", "text", "skill_bits", "_embedding")
+
+    def __init__(self, skills: tuple[str, ...], text: str, skill_bits: int):
+        self.skills = skills
+        self.text = text
+        self.skill_bits = skill_bits
+        self._embedding: tuple[str, np.ndarray] | None = None
+
+    def vector(self, model: str) -> np.ndarray | None:
+        """The profile vector embedded with ``model``, if already computed."""
+        embedding = self._embedding
+        if embedding is None or embedding[0] != model:
+            return None
+        return embedding[1]
+
+    def set_vector(self, model: str, vector: np.ndarray) -> None:
+        # One assignment, so concurrent readers see the old or new pair.
+        self._embedding = (model, vector)
+
+
+class ProfileCache:
+    """LRU of profile entries that expire ``ttl`` seconds after creation."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, ProfileEntry]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self, handle: str, build: Callable[[], ProfileEntry]
+    ) -> ProfileEntry:
+        """
+        Return the entry for ``handle``, building it on a miss or expiry.
+
+        Args:
+            handle: Profile handle from ``encode_handle``
+            build: Returns a fresh entry for the handle's profile
+
+        Returns:
+            ProfileEntry for the handle
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(handle)
+            if cached is not None and cached[0] <= now:
+                del self._entries[handle]
+                cached = None
+            if cached is not None:
+                self._entries.move_to_end(handle)
+        record_cache("profile", cached is not None)
+        if cached is not None:
+            return cached[1]
+
+        entry = build()
+        with self._lock:
+            self._entries[handle] = (now + self.ttl, entry)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+profile_cache = ProfileCache(settings.PROFILE_CACHE_SIZE, settings.PROFILE_CACHE_TTL)
@@ -0,0 +1,226 @@
+"""
+Prompt templates from ``packages/prompts``, compiled once.
+
+Each YAML file holds named templates with a ``system`` and/or ``user``
+message using ``{{variable}}`` placeholders, and optionally a ``budget``
+(estimated input tokens) and ``trim`` (variables that may be shortened to
+fit it, most expendable first). Templates are addressed as
+``"<file stem>.<name>"``, e.g. ``"coach.interview_coach"``.
+
+Loading splits every message into static text and variables once, so
+rendering is a join. System messages must be static: they are rendered to
+the same string object on every call, and user templates put their fixed
+instructions before any variable, so the start of each request is
+byte-identical and the provider can reuse its prompt cache. Token counts are
+estimated locally (``estimate_tokens``); when a rendered prompt would exceed
+its budget, the ``trim`` variables are cut at a word boundary until it fits.
+"""
+
+import math
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+from .preload import register_preload
+
+PROMPTS_PATH = Path(__file__).parent.parent.parent.parent / "packages" / "prompts"
+
+_VARIABLE_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# Words, numbers and single punctuation marks; long words count extra
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_CHARS_PER_TOKEN = 6
+
+
+class PromptError(ValueError):
+    """Raised for a malformed template or missing template variables."""
+
+
+def _piece_tokens(piece: str) -> int:
+    return 1 + (len(piece) - 1) // _CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the tokens a text costs, without a tokenizer.
+
+    Counts one token per word or punctuation mark, plus one for every further
+    six characters of a long word. This errs slightly high for English prose
+    on BPE tokenizers, which is the safe side for budgets.
+    """
+    return sum(_piece_tokens(piece) for piece in _PIECE_RE.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of ``text`` estimated at no more than ``max_tokens``."""
+    used = 0
+    end = 0
+    for match in _PIECE_RE.finditer(text):
+        used += _piece_tokens(match.group())
+        if used > max_tokens:
+            return text[:end].rstrip()
+        end = match.end()
+    return text
+
+
+@dataclass(frozen=True)
+class CompiledMessage:
+    """A message template split into static text and variable names."""
+
+    # parts[0], var[0], parts[1], var[1], ..., parts[-1]
+    parts: tuple[str, ...]
+    variables: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, template: str) -> "CompiledMessage":
+        pieces = _VARIABLE_RE.split(template)
+        return cls(tuple(pieces[::2]), tuple(pieces[1::2]))
+
+    def render(self, values: dict[str, str]) -> str:
+        out = [self.parts[0]]
+        for name, part in zip(self.variables, self.parts[1:], strict=True):
+            out.append(values[name])
+            out.append(part)
+        return "".join(out)
+
+    @cached_property
+    def static_tokens(self) -> int:
+        return sum(estimate_tokens(part) for part in self.parts)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A compiled prompt: static system message plus a user message template."""
+
+    name: str
+    system: str | None
+    user: CompiledMessage
+    budget: int | None = None
+    trim: tuple[str, ...] = ()
+
+    @cached_property
+    def variables(self) -> frozenset[str]:
+        return frozenset(self.user.variables)
+
+    @cached_property
+    def fixed_tokens(self) -> int:
+        """Estimated tokens of the system message and static user text."""
+        return estimate_tokens(self.system or "") + self.user.static_tokens
+
+    def render(self, **values: object) -> list[dict[str, str]]:
+        """
+        Render chat messages, trimming ``trim`` variables to the budget.
+
+        Args:
+            **values: One value per template variable; non-strings are
+                converted with ``str``
+
+        Returns:
+            Chat messages: the system message (if any), then the user message
+
+        Raises:
+            PromptError: If a template variable has no value
+        """
+        missing = self.variables - values.keys()
+        if missing:
+            raise PromptError(f"{self.name}: missing {', '.join(sorted(missing))}")
+        text = {name: str(values[name]) for name in self.variables}
+        if self.budget is not None:
+            text = self._fit(text)
+
+        messages = []
+        if self.system is not None:
+            messages.append({"role": "system", "content": self.system})
+        messages.append({"role": "user", "content": self.user.render(text)})
+        return messages
+
+    def estimate(self, **values: object) -> int:
+        """Estimated input tokens of the rendered messages."""
+        return sum(
+            estimate_tokens(message["content"]) for message in self.render(**values)
+        )
+
+    def _fit(self, text: dict[str, str]) -> dict[str, str]:
+        """Shorten ``trim`` variables until the estimate is within budget."""
+        tokens = {name: estimate_tokens(value) for name, value in text.items()}
+        uses = {name: self.user.variables.count(name) for name in text}
+        total = self.fixed_tokens + sum(tokens[name] * uses[name] for name in text)
+        over = total - self.budget
+        for name in self.trim:
+            if over <= 0:
+                break
+            keep = max(0, tokens[name] - math.ceil(over / uses[name]))
+            text[name] = truncate_tokens(text[name], keep)
+            over -= (tokens[name] - estimate_tokens(text[name])) * uses[name]
+        return text
+
+
+class PromptRegistry:
+    """Compiled templates from a directory of YAML files."""
+
+    def __init__(self, templates: Iterable[PromptTemplate]):
+        self._templates = {template.name: template for template in templates}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def __getitem__(self, name: str) -> PromptTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise PromptError(f"Unknown prompt: {name}") from None
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def render(self, prompt: str, /, **values: object) -> list[dict[str, str]]:
+        """Render the messages of template ``prompt`` (see ``PromptTemplate``)."""
+        return self[prompt].render(**values)
+
+    @classmethod
+    def load(cls, path: Path = PROMPTS_PATH) -> "PromptRegistry":
+        """
+        Load and compile every ``*.yaml`` file in ``path``.
+
+        Raises:
+            PromptError: If a template is malformed or its system message
+                has variables
+        """
+        import yaml
+
+        templates = []
+        for file in sorted(path.glob("*.yaml")):
+            with open(file, encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            for key, spec in data.items():
+                templates.append(_compile(f"{file.stem}.{key}", spec))
+        return cls(templates)
+
+
+def _compile(name: str, spec: object) -> PromptTemplate:
+    if not isinstance(spec, dict) or not isinstance(spec.get("user"), str):
+        raise PromptError(f"{name}: a template needs a 'user' message")
+    system = spec.get("system")
+    if system is not None and _VARIABLE_RE.search(system):
+        raise PromptError(f"{name}: the system message must be static")
+    user = CompiledMessage.compile(spec["user"])
+    trim = tuple(spec.get("trim") or ())
+    unknown = set(trim) - set(user.variables)
+    if unknown:
+        raise PromptError(f"{name}: cannot trim {', '.join(sorted(unknown))}")
+    budget = spec.get("budget")
+    return PromptTemplate(
+        name=name,
+        system=system,
+        user=user,
+        budget=int(budget) if budget is not None else None,
+        trim=trim,
+    )
+
+
+@register_preload
+@lru_cache(maxsize=1)
+def get_prompts() -> PromptRegistry:
+    """Return the prompt registry, loading ``packages/prompts`` on first use."""
+    return PromptRegistry.load()
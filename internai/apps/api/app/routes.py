@@ -2,223 +2,317 @@
 API routes for InternAI services.
 """
 
-# Import embeddings from the local package
-import json
+import asyncio
+import heapq
+import importlib.util
+import secrets
 import sys
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
 
 import numpy as np
-from fastapi import APIRouter
-
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from .bm25 import fuse, get_bm25_index, tokenize
+from .bulk_match import (
+    matrix_tiles,
+    rerank_exact,
+    snapshot_tiles,
+    tiled_top_k,
+    unit_rows,
+)
+from .catalog import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    JobCatalog,
+    get_catalog,
+)
+from .catalog_sync import CatalogSync, CatalogSyncWorker
 from .cv_parser import analyze_profile
-from .llm import draft_cover_letter, interview_coach
+from .dedupe import ingest_jobs
+from .documents import (
+    DocumentError,
+    detect_kind,
+    extract_in_pool,
+    remove_upload,
+    save_upload,
+    shutdown_extract_pool,
+)
+from .listing_cache import EncodedListing, listing_cache, listing_response
+from .llm import draft_cover_letter, get_mistral, interview_coach
+from .llm_scheduler import llm_call, text_tokens
+from .locations import (
+    MAX_RADIUS_KM,
+    LocationFilter,
+    UnknownLocationError,
+    get_gazetteer,
+    get_location_index,
+    location_filter,
+    resolve_location,
+)
+from .metrics import record_cache, record_fallback
 from .models import (
     AnalyzeRequest,
     AnalyzeResponse,
+    AnalyzeUploadResponse,
+    BulkMatchRequest,
     CoachRequest,
     CoachResponse,
     JobItem,
     MatchResult,
+    MatchStreamSummary,
+    ProfileEmbedResponse,
+    ProfileMatches,
     QuestionItem,
     UserProfile,
     WriteRequest,
     WriteResponse,
 )
+from .preload import register_preload
+from .profile_cache import (
+    InvalidProfileHandleError,
+    ProfileEntry,
+    decode_handle,
+    encode_handle,
+    profile_cache,
+)
+from .semantic_cache import SemanticCache
+from .serialization import NDJSON_MEDIA_TYPE, ndjson_lines, serialize_response
 from .settings import get_settings
+from .skill_index import (
+    CANONICAL_SKILLS,
+    SkillQuery,
+    UnknownSkillError,
+    detect_skills,
+    get_skill_index,
+    profile_skills,
+    skill_query,
+)
+from .tracing import span
+from .vector_store import current_snapshot, get_vector_store, text_hash
 
-# Add the embeddings package to the path
+# Local embeddings package (packages/embeddings)
 embeddings_path = Path(__file__).parent.parent.parent.parent / "packages" / "embeddings"
-sys.path.insert(0, str(embeddings_path))
 
-try:
-    # Import from the local embeddings package
-    import importlib.util
 
-    spec = importlib.util.spec_from_file_location(
-        "embeddings", embeddings_path / "__init__.py"
-    )
-    embeddings_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(embeddings_module)
+@register_preload
+@lru_cache(maxsize=1)
+def _load_embeddings_module():
+    """Import the local embeddings package on first use, or None if unavailable."""
+    sys.path.insert(0, str(embeddings_path))
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "embeddings", embeddings_path / "__init__.py"
+        )
+        embeddings_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(embeddings_module)
+        return embeddings_module
+    except Exception as e:
+        print(f"Warning: Could not import embeddings module: {e}")
+        print(
+            "Embeddings functionality will be disabled. Install the embeddings package."
+        )
+        return None
 
-    EmbeddingsClient = embeddings_module.EmbeddingsClient
-    cosine_sim = embeddings_module.cosine_sim
-except Exception as e:
-    print(f"Warning: Could not import embeddings module: {e}")
-    print("Embeddings functionality will be disabled. Install the embeddings package.")
-    EmbeddingsClient = None
-    cosine_sim = None
 
-router = APIRouter()
+def get_cosine_sim():
+    """Return the embeddings package's ``cosine_sim``, or None if unavailable."""
+    embeddings_module = _load_embeddings_module()
+    return embeddings_module.cosine_sim if embeddings_module else None
 
-# Load and cache sample jobs
-_sample_jobs_cache = None
 
+@lru_cache(maxsize=1)
+def get_embeddings_client():
+    """
+    Return the shared EmbeddingsClient, constructing it on first use.
 
-def _load_sample_jobs():
-    """Load sample jobs from the API's data directory."""
-    global _sample_jobs_cache
-    if _sample_jobs_cache is None:
-        try:
-            # Path to the sample jobs JSON file in the API data directory
-            sample_jobs_path = Path(__file__).parent / "data" / "sample_jobs.json"
-            with open(sample_jobs_path) as f:
-                _sample_jobs_cache = json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not load sample jobs: {e}")
-            _sample_jobs_cache = []
-    return _sample_jobs_cache
+    Returns None when the embeddings package or an API key is unavailable.
+    """
+    embeddings_module = _load_embeddings_module()
+    if embeddings_module is None:
+        return None
 
+    if settings.LLM_BACKEND == "fake":
+        return embeddings_module.EmbeddingsClient(
+            api_key="fake", model="mistral-embed", client=get_mistral()
+        )
 
-# Initialize EmbeddingsClient with settings
-settings = get_settings()
-embeddings_client = None
+    if not settings.MISTRAL_API_KEY:
+        return None
 
-if EmbeddingsClient and settings.MISTRAL_API_KEY:
     try:
-        embeddings_client = EmbeddingsClient(
+        return embeddings_module.EmbeddingsClient(
             api_key=settings.MISTRAL_API_KEY, model="mistral-embed"
         )
     except Exception as e:
         print(f"Warning: Could not initialize EmbeddingsClient: {e}")
-        embeddings_client = None
-
-# Curated set of skill keywords for missing skills detection
-SKILL_KEYWORDS = {
-    # Programming Languages
-    "python",
-    "java",
-    "javascript",
-    "typescript",
-    "c++",
-    "c#",
-    "go",
-    "rust",
-    "swift",
-    "kotlin",
-    "php",
-    "ruby",
-    "scala",
-    "r",
-    "matlab",
-    "sql",
-    # Frameworks & Libraries
-    "react",
-    "vue",
-    "angular",
-    "node.js",
-    "express",
-    "django",
-    "flask",
-    "fastapi",
-    "spring",
-    "laravel",
-    "rails",
-    "tensorflow",
-    "pytorch",
-    "scikit-learn",
-    "pandas",
-    "numpy",
-    "matplotlib",
-    "seaborn",
-    # Databases
-    "postgresql",
-    "mysql",
-    "mongodb",
-    "redis",
-    "elasticsearch",
-    "sqlite",
-    "cassandra",
-    "dynamodb",
-    "neo4j",
-    # Cloud Platforms
-    "aws",
-    "azure",
-    "gcp",
-    "google cloud",
-    "amazon web services",
-    "microsoft azure",
-    "cloudflare",
-    # DevOps Tools
-    "docker",
-    "kubernetes",
-    "terraform",
-    "jenkins",
-    "gitlab",
-    "github actions",
-    "ansible",
-    "prometheus",
-    "grafana",
-    "elk stack",
-    # AI/ML
-    "machine learning",
-    "deep learning",
-    "neural networks",
-    "nlp",
-    "natural language processing",
-    "computer vision",
-    "reinforcement learning",
-    "data science",
-    "data analysis",
-    "mlops",
-    # Blockchain
-    "blockchain",
-    "web3",
-    "solidity",
-    "ethereum",
-    "smart contracts",
-    "defi",
-    "nft",
-    "cairo",
-    "starknet",
-    "zkproofs",
-    "zero knowledge",
-    # Security
-    "cybersecurity",
-    "penetration testing",
-    "vulnerability assessment",
-    "security auditing",
-    "cryptography",
-    "network security",
-    # DevRel
-    "developer relations",
-    "technical writing",
-    "community management",
-    "developer advocacy",
-    "content creation",
-    "documentation",
-    # Data Engineering
-    "data engineering",
-    "etl",
-    "data pipelines",
-    "apache spark",
-    "kafka",
-    "airflow",
-    "data warehousing",
-    "big data",
-    # General
-    "git",
-    "linux",
-    "bash",
-    "agile",
-    "scrum",
-    "devops",
-    "ci/cd",
-    "rest api",
-    "graphql",
-    "microservices",
-    "api development",
-}
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_catalog_sync() -> CatalogSyncWorker:
+    """Return the background worker that keeps job vectors in step with the catalog."""
+    sync = CatalogSync(
+        get_catalog(),
+        get_vector_store(),
+        build_text=_build_job_text,
+        get_client=get_embeddings_client,
+        batch_size=settings.CATALOG_SYNC_BATCH_SIZE,
+    )
+    return CatalogSyncWorker(
+        sync, settings.CATALOG_SYNC_INTERVAL, embed=settings.CATALOG_SYNC_EMBED
+    )
+
+
+def _embed_cache_key(text: str) -> np.ndarray | None:
+    """Embed a semantic cache key, or None when embeddings are unavailable."""
+    embeddings_client = get_embeddings_client()
+    if embeddings_client is None:
+        return None
+    with llm_call(
+        "embedding", "semantic_cache", embeddings_client.model, text_tokens([text])
+    ) as call:
+        embeddings = embeddings_client.embed_texts([text])
+        call.record_usage(getattr(embeddings_client, "last_usage", None))
+    return np.array(embeddings[0])
+
+
+router = APIRouter()
+
+MAX_HYBRID_CANDIDATES = 1000
+MAX_STREAM_CHUNK = 2048
+MAX_BULK_PROFILES = 1000
+MAX_INGEST_JOBS = 1000
+
+_JOB_ITEMS = TypeAdapter(list[JobItem])
+_MATCH_RESULTS = TypeAdapter(list[MatchResult])
+_WRAPPED_MATCH_RESULTS = TypeAdapter(dict[str, list[MatchResult]])
+_MATCH_RESULT = TypeAdapter(MatchResult)
+_STREAM_SUMMARY = TypeAdapter(dict[str, MatchStreamSummary])
+_PROFILE_MATCHES = TypeAdapter(list[ProfileMatches])
+
+settings = get_settings()
+
+# Bit of each canonical skill (sorted, so bits are stable across processes);
+# a profile's covered skills fit in one int bitset
+_SKILL_BITS = {skill: bit for bit, skill in enumerate(CANONICAL_SKILLS)}
+
+# Interview coaching reused across similar roles at the same company
+coaching_cache = SemanticCache(
+    "coaching",
+    settings.COACH_CACHE_SIZE,
+    settings.COACH_CACHE_TTL,
+    settings.COACH_CACHE_THRESHOLD,
+    embed=_embed_cache_key,
+)
+
+
+def _search_catalog(
+    query: str | None,
+    source: str | None,
+    location: str | None,
+    limit: int,
+    cursor: str | None,
+    skills: SkillQuery | None = None,
+) -> tuple[list[dict], str | None]:
+    """Fetch one page of jobs from the catalog, mapping bad cursors to 400."""
+    catalog = get_catalog()
+    ids = None
+    if skills is not None:
+        with span("skill_filter"):
+            ids = get_skill_index(catalog).within(skills)
+    try:
+        with span("catalog_search"):
+            return catalog.search(
+                query=query,
+                source=source,
+                location=location,
+                limit=limit,
+                cursor=cursor,
+                ids=ids,
+            )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
 
 @router.get("/jobs/sample")
-async def get_sample_jobs():
+async def get_sample_jobs(
+    request: Request,
+    q: str | None = Query(None, description="Full-text search query"),
+    source: str | None = Query(None, description="Job source, e.g. 'linkedin'"),
+    location: str | None = Query(None, description="Location prefix"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Cursor from X-Next-Cursor"),
+):
+    """
+    Get a page of job opportunities from the catalog.
+
+    Args:
+        q: Free-text search over title, company and description
+        source: Only jobs from this source
+        location: Only jobs whose location starts with this (case-insensitive)
+        limit: Page size
+        cursor: Opaque cursor from the previous page's ``X-Next-Cursor`` header
+
+    Returns:
+        List of JobItem objects; ``X-Next-Cursor`` is set when more pages exist.
+        The body is cached per catalog version and validated with ``ETag``.
+    """
+
+    def build():
+        jobs, next_cursor = _search_catalog(q, source, location, limit, cursor)
+        return jobs, {"X-Next-Cursor": next_cursor}
+
+    # Catalog reads may wait on SQLite or an index sync; keep them off the loop
+    listing = await asyncio.to_thread(
+        _cached_listing, ("jobs_sample", q, source, location, limit, cursor), build
+    )
+    return await listing_response(request, listing)
+
+
+@router.post("/jobs/ingest")
+async def ingest_catalog_jobs(request: Request, jobs: list[JobItem] = Body(...)):
     """
-    Get sample job opportunities for testing and demonstration.
+    Add scraped postings to the catalog, skipping near-duplicates.
+
+    Postings go through ``JobDeduplicator.ingest``, so a repost of a catalog
+    job is recorded against it instead of being listed and embedded again.
+    Needs an ``X-API-Key`` header matching ``JOB_INGEST_API_KEY``; the
+    endpoint is off when that is unset.
+
+    Args:
+        jobs: Up to ``MAX_INGEST_JOBS`` postings, e.g. from
+            ``JobOpportunity.to_job_item``
 
     Returns:
-        List of sample JobItem objects
+        {"received", "changed", "duplicates"} counts
     """
-    return _load_sample_jobs()
+    key = settings.JOB_INGEST_API_KEY
+    if not key:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(request.headers.get("x-api-key", ""), key):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    if len(jobs) > MAX_INGEST_JOBS:
+        raise HTTPException(
+            status_code=422, detail=f"Send at most {MAX_INGEST_JOBS} jobs per request"
+        )
+    stats = await asyncio.to_thread(ingest_jobs, [job.model_dump() for job in jobs])
+    return vars(stats)
+
+
+def _cached_listing(
+    key: tuple, build: Callable[[], tuple[object, dict[str, str]]]
+) -> EncodedListing:
+    """Listing for ``key`` at the current catalog version, building on a miss."""
+    return listing_cache.get_or_build(key, get_catalog().version(), build)
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
@@ -230,18 +324,15 @@ async def analyze_profile_endpoint(request: AnalyzeRequest) -> AnalyzeResponse:
         request: AnalyzeRequest with text or resume_text
 
     Returns:
-        AnalyzeResponse: Extracted skills, highlights, and profile text
+        AnalyzeResponse: Extracted skills, highlights, profile text and a
+        profile handle for /match
     """
     try:
         # Get text from either field
         text = request.text or request.resume_text or ""
 
         if not text.strip():
-            return AnalyzeResponse(
-                skills=["Python", "JavaScript", "Git", "Problem Solving"],
-                highlights=["Strong analytical skills", "Team collaboration"],
-                profile_text="Basic technical profile",
-            )
+            return _fallback_analysis()
 
         # Use CV parser for comprehensive analysis
         result = await analyze_profile(text)
@@ -250,33 +341,262 @@ async def analyze_profile_endpoint(request: AnalyzeRequest) -> AnalyzeResponse:
             skills=result["skills"],
             highlights=result["highlights"],
             profile_text=result["profile_text"],
+            profile_handle=_profile_handle(result["skills"]),
         )
 
     except Exception as e:
         print(f"Error in profile analysis: {e}")
+        record_fallback("analyze")
         # Fallback response
-        return AnalyzeResponse(
-            skills=["Python", "JavaScript", "Git", "Problem Solving"],
-            highlights=["Strong analytical skills", "Team collaboration"],
-            profile_text="Basic technical profile",
+        return _fallback_analysis()
+
+
+def _fallback_analysis() -> AnalyzeResponse:
+    skills = ["Python", "JavaScript", "Git", "Problem Solving"]
+    return AnalyzeResponse(
+        skills=skills,
+        highlights=["Strong analytical skills", "Team collaboration"],
+        profile_text="Basic technical profile",
+        profile_handle=_profile_handle(skills),
+    )
+
+
+@router.post("/analyze/upload", response_model=AnalyzeUploadResponse)
+async def analyze_upload_endpoint(request: Request) -> AnalyzeUploadResponse:
+    """
+    Analyze an uploaded resume file (PDF, DOCX or plain text).
+
+    The multipart body (one ``file`` field) is streamed into a spooled
+    temporary file and cut off once it exceeds ``UPLOAD_MAX_BYTES``. Only its
+    first bytes are read here, to detect the format; the document worker
+    pool reads the file itself, so large files neither block the event loop
+    nor sit in API memory. The text is then analyzed like ``/analyze``.
+
+    Args:
+        request: Multipart request with the resume in its ``file`` field
+
+    Returns:
+        AnalyzeUploadResponse: The analysis, plus the detected format, size
+        and per-stage timings
+
+    Raises:
+        HTTPException: 413 if the upload is too large, 415 for unsupported
+            formats, 400 for malformed multipart bodies, 422 if no text
+            could be extracted, 504 if extraction times out
+    """
+    timings: dict[str, float] = {}
+    max_bytes = settings.UPLOAD_MAX_BYTES
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise HTTPException(status_code=413, detail=_upload_too_large(max_bytes))
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    with _timed(timings, "receive"):
+        parser = MultiPartParser(
+            request.headers,
+            _limited_stream(request.stream(), max_bytes),
+            max_files=1,
+            max_fields=4,
         )
+        try:
+            form = await parser.parse()
+        except MultiPartException as e:
+            raise HTTPException(status_code=400, detail=e.message) from e
 
+    path = None
+    try:
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=422, detail="Expected a 'file' upload")
+        try:
+            kind = detect_kind(
+                upload.filename, upload.content_type, await upload.read(8)
+            )
+        except DocumentError as e:
+            raise HTTPException(status_code=415, detail=str(e)) from e
+
+        with _timed(timings, "extract"):
+            path = await asyncio.to_thread(save_upload, upload.file)
+            try:
+                text = await extract_in_pool(path, kind)
+            except DocumentError as e:
+                raise HTTPException(status_code=422, detail=str(e)) from e
+            except TimeoutError as e:
+                # The stuck worker finishes on its own; new uploads get a
+                # fresh pool
+                print(f"Warning: Document extraction timed out ({kind})")
+                record_fallback("analyze_upload_timeout")
+                shutdown_extract_pool(wait=False)
+                raise HTTPException(
+                    status_code=504, detail="Document extraction timed out"
+                ) from e
+            except Exception as e:
+                # A crashed worker breaks the whole pool; start a fresh one
+                print(f"Warning: Document extraction failed: {e}")
+                record_fallback("analyze_upload_extract")
+                shutdown_extract_pool()
+                raise HTTPException(
+                    status_code=503, detail="Document extraction is unavailable"
+                ) from e
+        if not text.strip():
+            raise HTTPException(
+                status_code=422,
+                detail="No text found; scanned documents are not supported",
+            )
 
-def _build_profile_text(profile: UserProfile) -> str:
-    """Build a comprehensive profile text from user data."""
-    parts = []
+        with _timed(timings, "analyze"):
+            result = await analyze_profile(text)
+    finally:
+        await form.close()
+        if path is not None:
+            remove_upload(path)
+
+    return AnalyzeUploadResponse(
+        skills=result["skills"],
+        highlights=result["highlights"],
+        profile_text=result["profile_text"],
+        profile_handle=_profile_handle(result["skills"]),
+        filename=upload.filename,
+        kind=kind,
+        size_bytes=upload.size,
+        timings_ms=timings,
+    )
 
-    # Add skills
-    if profile.skills:
-        parts.append(f"Skills: {', '.join(profile.skills)}")
 
-    # Add name and email for context
-    if profile.name:
-        parts.append(f"Name: {profile.name}")
-    if profile.email:
-        parts.append(f"Email: {profile.email}")
+def _upload_too_large(max_bytes: int) -> str:
+    for unit, size in (("MB", 1024 * 1024), ("KB", 1024)):
+        if max_bytes >= size:
+            return f"Upload exceeds {max_bytes / size:.4g} {unit}"
+    return f"Upload exceeds {max_bytes} bytes"
 
-    return " | ".join(parts)
+
+async def _limited_stream(
+    stream: AsyncIterator[bytes], max_bytes: int
+) -> AsyncIterator[bytes]:
+    """Pass ``stream`` through, failing with 413 past ``max_bytes``."""
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > max_bytes:
+            raise HTTPException(status_code=413, detail=_upload_too_large(max_bytes))
+        yield chunk
+
+
+@contextmanager
+def _timed(timings: dict[str, float], stage: str):
+    """Time a stage into ``timings`` (milliseconds) and the request trace."""
+    started = time.perf_counter()
+    with span(stage):
+        yield
+    timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+
+@router.post("/profile/embed", response_model=ProfileEmbedResponse)
+async def embed_profile_endpoint(profile: UserProfile) -> ProfileEmbedResponse:
+    """
+    Embed a profile once and return a handle for repeat matching.
+
+    Args:
+        profile: User profile information
+
+    Returns:
+        ProfileEmbedResponse: Profile handle to pass to /match, and whether
+        its vector is cached (False when embeddings are unavailable)
+    """
+    entry = _profile_entry(profile)
+    try:
+        vector = await asyncio.to_thread(_profile_vector, entry, "embed_profile")
+        embedded = vector is not None
+    except Exception as e:
+        print(f"Warning: Could not embed profile: {e}")
+        record_fallback("embed_profile")
+        embedded = False
+    return ProfileEmbedResponse(
+        profile_handle=encode_handle(entry.skills), embedded=embedded
+    )
+
+
+def _profile_vector(profile: ProfileEntry, function: str) -> np.ndarray | None:
+    """
+    Return the profile's vector, embedding and caching it on first use.
+
+    Returns:
+        The vector, or None when embeddings are unavailable
+
+    Raises:
+        Exception: Whatever the embeddings provider raises
+    """
+    embeddings_client = get_embeddings_client()
+    if embeddings_client is None:
+        return None
+    vector = profile.vector(embeddings_client.model)
+    if vector is None:
+        with llm_call(
+            "embedding", function, embeddings_client.model, text_tokens([profile.text])
+        ) as call:
+            vector = np.array(embeddings_client.embed_texts([profile.text])[0])
+            call.record_usage(getattr(embeddings_client, "last_usage", None))
+        profile.set_vector(embeddings_client.model, vector)
+    return vector
+
+
+def _build_profile_text(skills: Sequence[str]) -> str:
+    """
+    Build the text embedded for a profile.
+
+    Only skills are embedded; name and email add noise, not signal.
+    """
+    return f"Skills: {', '.join(skills)}" if skills else ""
+
+
+def _skill_bits(skills: Sequence[str]) -> int:
+    """Bitset over ``_SKILL_BITS`` of the canonical skills a profile covers."""
+    bits = 0
+    for skill in profile_skills(skills):
+        bits |= 1 << _SKILL_BITS[skill]
+    return bits
+
+
+@lru_cache(maxsize=4096)
+def _desc_skills(desc: str) -> tuple[str, ...]:
+    """Canonical skills a job description mentions, sorted."""
+    return tuple(sorted(detect_skills(desc)))
+
+
+def _profile_entry(profile: UserProfile | ProfileEntry | str) -> ProfileEntry:
+    """
+    Return the cached matching state for a profile or profile handle.
+
+    Raises:
+        InvalidProfileHandleError: If ``profile`` is a malformed handle
+    """
+    if isinstance(profile, ProfileEntry):
+        return profile
+    if isinstance(profile, str):
+        # Decoded only on a miss, so digest-only handles resolve from the cache
+        return profile_cache.get_or_build(
+            profile, lambda: _new_profile_entry(decode_handle(profile))
+        )
+    skills = tuple(profile.skills or ())
+    return profile_cache.get_or_build(
+        encode_handle(skills), lambda: _new_profile_entry(skills)
+    )
+
+
+def _new_profile_entry(skills: tuple[str, ...]) -> ProfileEntry:
+    return ProfileEntry(skills, _build_profile_text(skills), _skill_bits(skills))
+
+
+def _profile_handle(skills: Sequence[str]) -> str:
+    """
+    Handle returned for ``skills``; its entry is cached too, so a digest-only
+    handle (see ``encode_handle``) resolves in this worker.
+    """
+    skills = tuple(skills)
+    handle = encode_handle(skills)
+    profile_cache.get_or_build(handle, lambda: _new_profile_entry(skills))
+    return handle
 
 
 def _build_job_text(job: JobItem) -> str:
@@ -292,110 +612,818 @@ def _build_job_text(job: JobItem) -> str:
     return " | ".join(parts)
 
 
-def _find_missing_skills(profile: UserProfile, job: JobItem) -> list[str]:
+def _clamp_score(score: float) -> float:
+    """Round a similarity score to 1 decimal within MatchResult's 0-100 range."""
+    return round(min(100.0, max(0.0, float(score))), 1)
+
+
+def _find_missing_skills(profile: ProfileEntry, job: JobItem) -> list[str]:
     """Find skills present in job description but missing from profile."""
     if not profile.skills or not job.desc:
         return []
 
-    # Normalize profile skills for comparison
-    profile_skills_lower = {skill.lower() for skill in profile.skills}
-    job_desc_lower = job.desc.lower()
-
+    # Whole-word skills in the description the profile doesn't cover; first
+    # 5 alphabetically
+    has_skills = profile.skill_bits
     missing_skills = []
+    for skill in _desc_skills(job.desc):
+        if not has_skills >> _SKILL_BITS[skill] & 1:
+            missing_skills.append(skill.title())
+            if len(missing_skills) == 5:
+                break
+    return missing_skills
+
 
-    # Check each skill keyword against job description
-    for skill in SKILL_KEYWORDS:
-        skill_lower = skill.lower()
+@router.post("/match", response_model=list[MatchResult])
+async def match_jobs_endpoint(
+    request: Request,
+    profile: UserProfile | None = None,
+    profile_handle: str | None = Body(None),
+    jobs: list[JobItem] | None = None,
+    mode: str = Query("embedding", pattern="^(embedding|hybrid|semantic)$"),
+    fusion: str | None = Query(None, pattern="^(rrf|weighted|rerank)$"),
+    candidates: int | None = Query(None, ge=1, le=MAX_HYBRID_CANDIDATES),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    near: str | None = Query(None, description="Only jobs near this place"),
+    radius_km: float | None = Query(None, gt=0, le=MAX_RADIUS_KM),
+    remote: bool = Query(True, description="Keep remote jobs when using near"),
+    skills: list[str] | None = Query(None, description="Jobs need all of these"),
+    any_skills: list[str] | None = Query(None, description="Jobs need one of these"),
+    exclude_skills: list[str] | None = Query(None, description="Jobs need none"),
+    max_missing: int | None = Query(None, ge=0, description="Most skills lacked"),
+) -> Response:
+    """
+    Match user profile with job opportunities.
 
-        # Check if skill appears in job description
-        if skill_lower in job_desc_lower:
-            # Check if user doesn't have this skill (exact match or partial match)
-            has_skill = False
-            for profile_skill in profile_skills_lower:
-                if skill_lower in profile_skill or profile_skill in skill_lower:
-                    has_skill = True
-                    break
+    Args:
+        request: Incoming request, for JSON/MessagePack negotiation
+        profile: User profile information
+        profile_handle: Handle from /analyze or /profile/embed, used instead
+            of ``profile``; skips re-embedding the profile
+        jobs: Jobs to match against (``mode=embedding``)
+        mode: "embedding" scores every given job; "hybrid" retrieves BM25
+            candidates from the catalog and reranks only those; "semantic"
+            ranks the whole catalog by stored job vectors
+        fusion: Hybrid score fusion ("rrf", "weighted" or "rerank");
+            defaults to ``HYBRID_FUSION``
+        candidates: Hybrid BM25 candidate count (default
+            ``HYBRID_CANDIDATES``), or semantic exact-rerank depth (default
+            ``VECTOR_RERANK``)
+        limit: Maximum hybrid or semantic results
+        near: Only jobs within ``radius_km`` of this place (a region or
+            country matches jobs in it), e.g. "Austin, TX"
+        radius_km: Radius for ``near`` (default ``LOCATION_RADIUS_KM``)
+        remote: Also keep remote jobs when filtering by ``near``
+        skills: Only jobs mentioning every one of these skills (repeat the
+            parameter or separate with commas)
+        any_skills: Only jobs mentioning at least one of these skills
+        exclude_skills: Only jobs mentioning none of these skills
+        max_missing: Only jobs mentioning at most this many skills the
+            profile lacks
 
-            if not has_skill:
-                missing_skills.append(skill.title())
+    Returns:
+        List[MatchResult] serialized once (JSON, or MessagePack on request)
+    """
+    profile = _request_profile(profile, profile_handle)
+    location = _location_filter(near, radius_km, remote)
+    skill_filter = _skill_query(
+        profile, skills, any_skills, exclude_skills, max_missing
+    )
 
-    # Remove duplicates and return top 5 missing skills
-    unique_missing = list(dict.fromkeys(missing_skills))
-    return unique_missing[:5]
+    if mode == "hybrid":
+        results = await hybrid_match_jobs(
+            profile,
+            fusion=fusion or settings.HYBRID_FUSION,
+            candidates=candidates or settings.HYBRID_CANDIDATES,
+            limit=limit,
+            location=location,
+            skills=skill_filter,
+        )
+    elif mode == "semantic":
+        results = await semantic_match_jobs(
+            profile,
+            rerank=candidates or settings.VECTOR_RERANK,
+            limit=limit,
+            location=location,
+            skills=skill_filter,
+        )
+    else:
+        results = await match_jobs(
+            profile, jobs or [], location=location, skills=skill_filter
+        )
+    return serialize_response(request, results, _MATCH_RESULTS)
+
+
+@router.post("/match/stream")
+async def match_jobs_stream_endpoint(
+    profile: UserProfile | None = None,
+    profile_handle: str | None = Body(None),
+    jobs: list[JobItem] | None = None,
+    chunk_size: int | None = Query(None, ge=1, le=MAX_STREAM_CHUNK),
+    top_k: int = Query(0, ge=0, le=MAX_PAGE_SIZE),
+    near: str | None = Query(None, description="Only jobs near this place"),
+    radius_km: float | None = Query(None, gt=0, le=MAX_RADIUS_KM),
+    remote: bool = Query(True, description="Keep remote jobs when using near"),
+    skills: list[str] | None = Query(None, description="Jobs need all of these"),
+    any_skills: list[str] | None = Query(None, description="Jobs need one of these"),
+    exclude_skills: list[str] | None = Query(None, description="Jobs need none"),
+    max_missing: int | None = Query(None, ge=0, description="Most skills lacked"),
+) -> StreamingResponse:
+    """
+    Match a profile against a large job list, streaming NDJSON.
 
+    Jobs are scored ``chunk_size`` at a time and each chunk is written as
+    soon as its embeddings return, in request order, one MatchResult per
+    line. The next chunk is embedded while the previous one is sent, and no
+    more than two chunks of results are held at once.
 
-@router.post("/match", response_model=list[MatchResult])
-async def match_jobs(profile: UserProfile, jobs: list[JobItem]) -> list[MatchResult]:
+    Args:
+        profile: User profile information
+        profile_handle: Handle from /analyze or /profile/embed
+        jobs: Jobs to match against
+        chunk_size: Jobs scored per chunk (default ``MATCH_STREAM_CHUNK``)
+        top_k: When set, end with a ``{"summary": {"count", "top"}}`` line
+            holding the ``top_k`` best results, highest first
+        near: Only jobs within ``radius_km`` of this place
+        radius_km: Radius for ``near`` (default ``LOCATION_RADIUS_KM``)
+        remote: Also keep remote jobs when filtering by ``near``
+        skills: Only jobs mentioning every one of these skills
+        any_skills: Only jobs mentioning at least one of these skills
+        exclude_skills: Only jobs mentioning none of these skills
+        max_missing: Only jobs mentioning at most this many skills the
+            profile lacks
+
+    Returns:
+        ``application/x-ndjson`` streaming response
+    """
+    profile = _request_profile(profile, profile_handle)
+    location = _location_filter(near, radius_km, remote)
+    skill_filter = _skill_query(
+        profile, skills, any_skills, exclude_skills, max_missing
+    )
+    jobs = jobs or []
+    if location is not None:
+        jobs = _filter_by_location(jobs, location)
+    if skill_filter is not None:
+        jobs = _filter_by_skills(jobs, skill_filter)
+    return StreamingResponse(
+        stream_match_jobs(
+            profile, jobs, chunk_size or settings.MATCH_STREAM_CHUNK, top_k
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def stream_match_jobs(
+    profile: ProfileEntry,
+    jobs: list[JobItem],
+    chunk_size: int = 256,
+    top_k: int = 0,
+) -> AsyncIterator[bytes]:
+    """
+    Score ``jobs`` chunk by chunk, yielding NDJSON lines.
+
+    Scoring runs in a worker thread, one chunk ahead of the chunk being
+    sent; only a ``top_k`` heap is kept across chunks.
+
+    Args:
+        profile: Cached profile entry
+        jobs: Jobs to score, in output order
+        chunk_size: Jobs per chunk
+        top_k: Size of the trailing summary (none when 0)
+
+    Yields:
+        One chunk of MatchResult lines at a time, then the summary line
+    """
+
+    def score(start: int) -> asyncio.Future:
+        chunk = jobs[start : start + chunk_size]
+        return asyncio.ensure_future(
+            asyncio.to_thread(_score_jobs, profile, chunk, start)
+        )
+
+    # (score, -position, result): a min-heap of the best results, where
+    # earlier jobs win ties as in /match
+    best: list[tuple[float, int, MatchResult]] = []
+    pending = score(0) if jobs else None
+    start = 0
+    try:
+        while pending is not None:
+            results = await pending
+            following = start + chunk_size
+            pending = score(following) if following < len(jobs) else None
+            for offset, result in enumerate(results):
+                item = (result.score, -(start + offset), result)
+                if len(best) < top_k:
+                    heapq.heappush(best, item)
+                elif top_k and item[:2] > best[0][:2]:
+                    heapq.heapreplace(best, item)
+            yield ndjson_lines(results, _MATCH_RESULT)
+            start = following
+    finally:
+        # The client went away mid-stream; don't keep scoring for it
+        if pending is not None:
+            pending.cancel()
+
+    if top_k:
+        summary = MatchStreamSummary.model_construct(
+            count=len(jobs), top=[result for *_, result in sorted(best, reverse=True)]
+        )
+        yield ndjson_lines([{"summary": summary}], _STREAM_SUMMARY)
+
+
+@router.post("/match/bulk", response_model=list[ProfileMatches])
+async def bulk_match_endpoint(
+    request: Request,
+    body: BulkMatchRequest,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    candidates: int | None = Query(None, ge=1, le=MAX_HYBRID_CANDIDATES),
+) -> Response:
+    """
+    Match a cohort of profiles against the catalog (or given jobs) at once.
+
+    Every profile is embedded once, in batches, and scored against all jobs
+    with tiled matrix products, instead of one /match call per profile.
+
+    Args:
+        request: Incoming request, for JSON/MessagePack negotiation
+        body: Profiles and/or profile handles, and optional jobs
+        limit: Shortlist size per profile
+        candidates: Catalog candidates per profile rescored with exact
+            vectors (default ``BULK_MATCH_RERANK``)
+
+    Returns:
+        List[ProfileMatches], one per profile in request order (``profiles``
+        then ``profile_handles``)
+    """
+    count = len(body.profiles) + len(body.profile_handles)
+    if not count or count > MAX_BULK_PROFILES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Send between 1 and {MAX_BULK_PROFILES} profiles or handles",
+        )
+    try:
+        entries = [_profile_entry(p) for p in (*body.profiles, *body.profile_handles)]
+    except InvalidProfileHandleError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    shortlists = await bulk_match_jobs(
+        entries,
+        body.jobs,
+        limit=limit,
+        rerank=candidates or settings.BULK_MATCH_RERANK,
+    )
+    results = [
+        ProfileMatches.model_construct(
+            profile_handle=encode_handle(entry.skills), matches=matches
+        )
+        for entry, matches in zip(entries, shortlists, strict=True)
+    ]
+    return serialize_response(request, results, _PROFILE_MATCHES)
+
+
+async def bulk_match_jobs(
+    profiles: list[ProfileEntry],
+    jobs: list[JobItem] | None = None,
+    limit: int = 10,
+    rerank: int = 50,
+) -> list[list[MatchResult]]:
+    """
+    Shortlist jobs for many profiles with one matrix product per job tile.
+
+    Catalog jobs are scored from the (quantized) vector snapshot and each
+    profile's best ``rerank`` are rescored exactly. Given jobs are looked up
+    in the snapshot or embedded once for all profiles. Without embeddings,
+    profiles are matched one by one with the fallbacks of /match.
+
+    Args:
+        profiles: Cached profile entries
+        jobs: Jobs to match against; the catalog when None
+        limit: Results per profile
+        rerank: Catalog candidates per profile rescored exactly
+
+    Returns:
+        One best-first list of MatchResult per profile
+    """
+    if jobs is not None and not jobs:
+        return [[] for _ in profiles]
+    snapshot = current_snapshot() if jobs is None else None
+    queries = matrix = None
+    if jobs is not None or len(snapshot):
+        try:
+            queries = await asyncio.to_thread(_profile_matrix, profiles, "bulk_match")
+            if queries is not None and jobs is not None:
+                with span("embed_jobs"):
+                    matrix = await asyncio.to_thread(_job_matrix, jobs)
+        except Exception as e:
+            print(f"Embeddings failed, matching profiles one by one: {e}")
+            queries = None
+
+    if queries is None:
+        record_fallback("match_bulk")
+        if jobs is not None:
+            return [(await match_jobs(profile, jobs))[:limit] for profile in profiles]
+        return [
+            await hybrid_match_jobs(
+                profile,
+                fusion=settings.HYBRID_FUSION,
+                candidates=settings.HYBRID_CANDIDATES,
+                limit=limit,
+            )
+            for profile in profiles
+        ]
+
+    tile = settings.BULK_MATCH_TILE
+    if jobs is None:
+        with span("bulk_scan"):
+            top = tiled_top_k(queries, snapshot_tiles(snapshot, tile), rerank)
+        with span("bulk_rerank"):
+            scores, columns = rerank_exact(queries, top, snapshot.vectors, limit)
+        ids = np.asarray(snapshot.ids, dtype=object)
+        found = await asyncio.to_thread(
+            get_catalog().get_items, list(dict.fromkeys(ids[columns].flat))
+        )
+        by_id = {job.id: job for job in found}
+        shortlists = [[by_id.get(job_id) for job_id in ids[row]] for row in columns]
+    else:
+        with span("bulk_scan"):
+            scores, columns = tiled_top_k(
+                queries, matrix_tiles(matrix, tile), limit
+            ).result()
+        shortlists = [[jobs[i] for i in row] for row in columns]
+
+    with span("build_results"):
+        return [
+            [
+                MatchResult.model_construct(
+                    job=job,
+                    score=_clamp_score(float(score) * 100),
+                    missing_skills=_find_missing_skills(profile, job),
+                )
+                for job, score in zip(shortlist, row_scores, strict=True)
+                if job is not None
+            ]
+            for profile, shortlist, row_scores in zip(
+                profiles, shortlists, scores, strict=True
+            )
+        ]
+
+
+def _profile_matrix(profiles: list[ProfileEntry], function: str) -> np.ndarray | None:
+    """
+    Unit vectors of ``profiles``, embedding the uncached ones in batches.
+
+    Returns:
+        (profiles, dim) float32 matrix, or None when embeddings are unavailable
+
+    Raises:
+        Exception: Whatever the embeddings provider raises
+    """
+    client = get_embeddings_client()
+    if client is None:
+        return None
+    # Profiles with the same skills share one cache entry
+    pending = list(
+        {id(p): p for p in profiles if p.vector(client.model) is None}.values()
+    )
+    record_cache("profile_vectors", True, len(profiles) - len(pending))
+    record_cache("profile_vectors", False, len(pending))
+    for batch in _batches(pending, settings.CATALOG_SYNC_BATCH_SIZE):
+        texts = [profile.text for profile in batch]
+        with llm_call("embedding", function, client.model, text_tokens(texts)) as call:
+            vectors = client.embed_texts(texts)
+            call.record_usage(getattr(client, "last_usage", None))
+        for profile, vector in zip(batch, vectors, strict=True):
+            profile.set_vector(client.model, np.array(vector))
+    return unit_rows(np.stack([profile.vector(client.model) for profile in profiles]))
+
+
+def _job_matrix(jobs: list[JobItem]) -> np.ndarray:
+    """
+    Unit vectors of ``jobs``: stored where the text is unchanged, otherwise
+    embedded in batches.
+
+    Raises:
+        Exception: Whatever the embeddings provider raises
+    """
+    client = get_embeddings_client()
+    texts = [_build_job_text(job) for job in jobs]
+    vectors = _stored_job_vectors(jobs, texts, client.model)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    for batch in _batches(missing, settings.CATALOG_SYNC_BATCH_SIZE):
+        pending = [texts[i] for i in batch]
+        with llm_call(
+            "embedding", "bulk_match", client.model, text_tokens(pending)
+        ) as call:
+            embedded = client.embed_texts(pending)
+            call.record_usage(getattr(client, "last_usage", None))
+        for i, vector in zip(batch, embedded, strict=True):
+            vectors[i] = np.array(vector)
+    return unit_rows(np.stack(vectors))
+
+
+def _batches(items: list, size: int) -> list[list]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def _request_profile(
+    profile: UserProfile | None, profile_handle: str | None
+) -> ProfileEntry:
+    """Resolve a request's profile or handle, mapping errors to 422/400."""
+    if profile_handle is None and profile is None:
+        raise HTTPException(
+            status_code=422, detail="Either profile or profile_handle is required"
+        )
+    try:
+        return _profile_entry(profile_handle or profile)
+    except InvalidProfileHandleError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _location_filter(
+    near: str | None, radius_km: float | None, remote: bool
+) -> LocationFilter | None:
+    """Build the ``near`` filter, mapping unknown places to 400."""
+    if not near:
+        return None
+    try:
+        return location_filter(
+            near, radius_km or settings.LOCATION_RADIUS_KM, include_remote=remote
+        )
+    except UnknownLocationError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _filter_by_location(jobs: list[JobItem], location: LocationFilter) -> list[JobItem]:
+    """Keep the given jobs that pass ``location``, resolving their text."""
+    codes = get_gazetteer().encode(resolve_location(job.location) for job in jobs)
+    keep = location.mask(*codes)
+    return [job for job, ok in zip(jobs, keep, strict=True) if ok]
+
+
+def _skill_query(
+    profile: ProfileEntry,
+    skills: list[str] | None,
+    any_skills: list[str] | None,
+    exclude_skills: list[str] | None,
+    max_missing: int | None,
+) -> SkillQuery | None:
+    """Build the skill filter, mapping unknown skills to 400."""
+    try:
+        return skill_query(
+            skills, any_skills, exclude_skills, profile.skills, max_missing
+        )
+    except UnknownSkillError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _filter_by_skills(jobs: list[JobItem], skills: SkillQuery) -> list[JobItem]:
+    """Keep the given jobs that pass ``skills``, detecting their skills."""
+    return [job for job in jobs if skills.accepts(detect_skills(job.title, job.desc))]
+
+
+def _bm25_candidates(
+    profile: ProfileEntry,
+    candidates: int,
+    location: LocationFilter | None,
+    skills: SkillQuery | None,
+) -> tuple[list[tuple[str, float]], list[JobItem]]:
+    """BM25 hits for the profile's skills and the catalog jobs behind them."""
+    catalog = get_catalog()
+    lexical = get_bm25_index(catalog).search(
+        tokenize(" ".join(profile.skills or [])),
+        candidates,
+        accept=_catalog_accept(catalog, location, skills),
+    )
+    return lexical, catalog.get_items([job_id for job_id, _ in lexical])
+
+
+def _catalog_accept(
+    catalog: JobCatalog, location: LocationFilter | None, skills: SkillQuery | None
+) -> Callable[[list[str]], np.ndarray] | None:
+    """Mask of which catalog job ids pass the location and skill filters."""
+    checks = []
+    if location is not None:
+        checks.append(partial(get_location_index(catalog).matches, location=location))
+    if skills is not None:
+        checks.append(partial(get_skill_index(catalog).matches, query=skills))
+    if not checks:
+        return None
+    return lambda job_ids: np.logical_and.reduce([check(job_ids) for check in checks])
+
+
+def _catalog_ids(
+    catalog: JobCatalog, location: LocationFilter | None, skills: SkillQuery | None
+) -> list[str]:
+    """Ids of catalog jobs that pass the location and skill filters."""
+    if skills is None:
+        return get_location_index(catalog).within(location)
+    job_ids = get_skill_index(catalog).within(skills)
+    if location is None:
+        return job_ids
+    keep = get_location_index(catalog).matches(job_ids, location)
+    return [job_id for job_id, ok in zip(job_ids, keep, strict=True) if ok]
+
+
+def _embedding_similarities(
+    profile: ProfileEntry, jobs: list[JobItem]
+) -> list[float] | None:
+    """
+    Cosine similarity (0-1) of each job to the profile.
+
+    Returns:
+        One similarity per job, or None when embeddings are unavailable
+
+    Raises:
+        Exception: Whatever the embeddings provider raises
+    """
+    # Check if embeddings client is available
+    embeddings_client = get_embeddings_client()
+    cosine_sim = get_cosine_sim()
+    if not (embeddings_client and cosine_sim):
+        return None
+
+    with span("build_texts"):
+        # Build job texts (the profile text is cached on its entry)
+        job_texts = [_build_job_text(job) for job in jobs]
+
+    # Reuse vectors the catalog sync already embedded from the same text
+    with span("vector_lookup"):
+        vectors = _stored_job_vectors(jobs, job_texts, embeddings_client.model)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        profile_embedding = profile.vector(embeddings_client.model)
+        record_cache("profile_vectors", profile_embedding is not None)
+
+        # Prepare the texts still to embed (profile if new + jobs without vectors)
+        all_texts = [job_texts[i] for i in missing]
+        if profile_embedding is None:
+            all_texts.insert(0, profile.text)
+
+    # Get embeddings for all texts
+    embeddings = []
+    if all_texts:
+        with (
+            span("embed"),
+            llm_call(
+                "embedding",
+                "match_jobs",
+                embeddings_client.model,
+                text_tokens(all_texts),
+            ) as call,
+        ):
+            embeddings = embeddings_client.embed_texts(all_texts)
+            call.record_usage(getattr(embeddings_client, "last_usage", None))
+
+    with span("score"):
+        if profile_embedding is None:
+            # Profile embedding comes first; keep it for the next match
+            profile_embedding = np.array(embeddings[0])
+            profile.set_vector(embeddings_client.model, profile_embedding)
+            embeddings = embeddings[1:]
+        for i, embedding in zip(missing, embeddings, strict=True):
+            vectors[i] = np.array(embedding)
+
+        # Cosine similarity per job
+        return [float(cosine_sim(profile_embedding, vector)) for vector in vectors]
+
+
+def _stored_job_vectors(
+    jobs: list[JobItem], texts: list[str], model: str
+) -> list[np.ndarray | None]:
+    """
+    Stored vectors of jobs whose text is unchanged since they were embedded.
+
+    Returns:
+        Exact float32 vector per job (even when the snapshot is quantized),
+        or None where the job must be embedded
+    """
+    snapshot = current_snapshot()
+    rows = [
+        snapshot.lookup(job.id, text_hash(model, text)) if len(snapshot) else None
+        for job, text in zip(jobs, texts, strict=True)
+    ]
+    vectors: list[np.ndarray | None] = [None] * len(jobs)
+    found = [i for i, row in enumerate(rows) if row is not None]
+    if found:
+        for i, vector in zip(
+            found, snapshot.vectors([rows[i] for i in found]), strict=True
+        ):
+            vectors[i] = vector
+    record_cache("job_vectors", True, len(found))
+    record_cache("job_vectors", False, len(jobs) - len(found))
+    return vectors
+
+
+async def match_jobs(
+    profile: UserProfile | ProfileEntry,
+    jobs: list[JobItem],
+    location: LocationFilter | None = None,
+    skills: SkillQuery | None = None,
+) -> list[MatchResult]:
     """
     Match user profile with job opportunities using embeddings-based similarity.
 
     Args:
-        profile: User profile information
+        profile: User profile information, or its cached entry
         jobs: List of job opportunities to match against
+        location: Only score jobs that pass this location filter
+        skills: Only score jobs that pass this skill filter
 
     Returns:
         List[MatchResult]: Matched jobs with scores and missing skills
     """
+    if location is not None:
+        jobs = _filter_by_location(jobs, location)
+    if skills is not None:
+        jobs = _filter_by_skills(jobs, skills)
     if not jobs:
         return []
+    # Embedding is a blocking provider call, so score off the event loop
+    results = await asyncio.to_thread(_score_jobs, _profile_entry(profile), jobs)
+    # Sort by score (highest first)
+    results.sort(key=lambda x: x.score, reverse=True)
+    return results
 
-    # Build profile text
-    profile_text = _build_profile_text(profile)
 
-    # Build job texts
-    job_texts = [_build_job_text(job) for job in jobs]
+def _score_jobs(
+    profile: ProfileEntry, jobs: list[JobItem], offset: int = 0
+) -> list[MatchResult]:
+    """
+    Score jobs against a profile, in the order given.
 
-    # Prepare all texts for embedding (profile + all jobs)
-    all_texts = [profile_text] + job_texts
+    Args:
+        profile: Cached profile entry
+        jobs: Jobs to score
+        offset: Position of ``jobs[0]`` in the full request, for fallback
+            scores
 
-    # Check if embeddings client is available
-    if embeddings_client and cosine_sim:
-        try:
-            # Get embeddings for all texts
-            embeddings = embeddings_client.embed_texts(all_texts)
+    Returns:
+        One MatchResult per job
+    """
+    try:
+        similarities = _embedding_similarities(profile, jobs)
+    except Exception as e:
+        # Fallback to simple scoring if embeddings fail
+        print(f"Embeddings failed, using fallback: {e}")
+        record_fallback("match_embeddings")
+        similarities = None
+
+    if similarities is not None:
+        # Converted to a 0-100 score rounded to 1 decimal
+        scores = [_clamp_score(similarity * 100) for similarity in similarities]
+    else:
+        # Simple fallback scoring if the embeddings client is not available
+        scores = [max(60, 95 - ((offset + i) * 5)) for i in range(len(jobs))]
+
+    with span("missing_skills"):
+        missing = [_find_missing_skills(profile, job) for job in jobs]
+
+    with span("build_results"):
+        # Inputs are validated models and scores are clamped, so skip
+        # re-validating every result.
+        return [
+            MatchResult.model_construct(
+                job=job, score=score, missing_skills=missing_skills
+            )
+            for job, score, missing_skills in zip(jobs, scores, missing, strict=True)
+        ]
 
-            # Extract profile embedding (first one)
-            profile_embedding = np.array(embeddings[0])
 
-            # Calculate similarities and build results
-            results = []
-            for i, (job, _job_text) in enumerate(zip(jobs, job_texts, strict=False)):
-                # Get job embedding (i+1 because profile is at index 0)
-                job_embedding = np.array(embeddings[i + 1])
+async def hybrid_match_jobs(
+    profile: UserProfile | ProfileEntry,
+    fusion: str = "rrf",
+    candidates: int = 200,
+    limit: int = DEFAULT_PAGE_SIZE,
+    location: LocationFilter | None = None,
+    skills: SkillQuery | None = None,
+) -> list[MatchResult]:
+    """
+    Match a profile against the whole catalog in two stages.
 
-                # Calculate cosine similarity
-                similarity = cosine_sim(profile_embedding, job_embedding)
+    BM25 over the profile's skills pulls ``candidates`` jobs from the catalog
+    (exact tech terms match lexically), then only those are embedded and
+    scored against the profile, and the two rankings are fused.
 
-                # Convert to score (0-100) and round to 1 decimal
-                score = round(similarity * 100, 1)
+    Args:
+        profile: User profile information, or its cached entry
+        fusion: "rrf", "weighted" or "rerank" (see ``bm25.fuse``)
+        candidates: Number of BM25 candidates to rerank
+        limit: Maximum number of results
+        location: Only retrieve jobs that pass this location filter
+        skills: Only retrieve jobs that pass this skill filter
 
-                # Find missing skills
-                missing_skills = _find_missing_skills(profile, job)
+    Returns:
+        List[MatchResult]: Best matches first
+    """
+    profile = _profile_entry(profile)
+    with span("bm25"):
+        # Index syncs and catalog reads block; run them off the event loop
+        lexical, jobs = await asyncio.to_thread(
+            _bm25_candidates, profile, candidates, location, skills
+        )
+    if not jobs:
+        return []
 
-                results.append(
-                    MatchResult(job=job, score=score, missing_skills=missing_skills)
-                )
+    by_id = {job.id: job for job in jobs}
+    lexical = [(job_id, score) for job_id, score in lexical if job_id in by_id]
 
-            # Sort by score (highest first)
-            results.sort(key=lambda x: x.score, reverse=True)
+    try:
+        similarities = await asyncio.to_thread(_embedding_similarities, profile, jobs)
+    except Exception as e:
+        print(f"Embeddings failed, using BM25 ranking: {e}")
+        record_fallback("match_hybrid_embeddings")
+        similarities = None
+
+    with span("fuse"):
+        if similarities is None:
+            # Lexical ranking only, scaled to 0-100
+            fused = fuse(lexical, {}, mode="weighted", alpha=1.0)
+        else:
+            semantic = {
+                job.id: sim for job, sim in zip(jobs, similarities, strict=True)
+            }
+            fused = fuse(lexical, semantic, mode=fusion, alpha=settings.HYBRID_ALPHA)
+
+    with span("build_results"):
+        return [
+            MatchResult.model_construct(
+                job=by_id[job_id],
+                score=score,
+                missing_skills=_find_missing_skills(profile, by_id[job_id]),
+            )
+            for job_id, score in fused[:limit]
+        ]
 
-            return results
 
-        except Exception as e:
-            # Fallback to simple scoring if embeddings fail
-            print(f"Embeddings failed, using fallback: {e}")
+async def semantic_match_jobs(
+    profile: UserProfile | ProfileEntry,
+    rerank: int = 200,
+    limit: int = DEFAULT_PAGE_SIZE,
+    location: LocationFilter | None = None,
+    skills: SkillQuery | None = None,
+) -> list[MatchResult]:
+    """
+    Match a profile against every job with a stored vector.
 
-    # Fallback to simple scoring if embeddings client is not available
-    results = []
-    for i, job in enumerate(jobs):
-        # Simple fallback scoring
-        score = max(60, 95 - (i * 5))
-        missing_skills = _find_missing_skills(profile, job)
+    The snapshot is scanned in its quantized form to pick ``rerank``
+    candidates, which are rescored with exact float32 vectors. Falls back to
+    hybrid matching until the catalog sync has published vectors.
 
-        results.append(MatchResult(job=job, score=score, missing_skills=missing_skills))
+    Args:
+        profile: User profile information, or its cached entry
+        rerank: Candidates rescored exactly
+        limit: Maximum number of results
+        location: Only rank jobs that pass this location filter
+        skills: Only rank jobs that pass this skill filter
 
-    results.sort(key=lambda x: x.score, reverse=True)
-    return results
+    Returns:
+        List[MatchResult]: Best matches first
+    """
+    profile = _profile_entry(profile)
+    snapshot = current_snapshot()
+    try:
+        vector = (
+            await asyncio.to_thread(_profile_vector, profile, "semantic_match")
+            if len(snapshot)
+            else None
+        )
+    except Exception as e:
+        print(f"Embeddings failed, using hybrid matching: {e}")
+        vector = None
+    if vector is None:
+        record_fallback("match_semantic")
+        return await hybrid_match_jobs(
+            profile,
+            fusion=settings.HYBRID_FUSION,
+            candidates=settings.HYBRID_CANDIDATES,
+            limit=limit,
+            location=location,
+            skills=skills,
+        )
+
+    rows = None
+    if location is not None or skills is not None:
+        with span("catalog_filter"):
+            job_ids = await asyncio.to_thread(
+                _catalog_ids, get_catalog(), location, skills
+            )
+            rows = snapshot.rows_of(job_ids)
+    with span("vector_search"):
+        hits = snapshot.search(vector, limit, rerank=rerank, rows=rows)
+    with span("build_results"):
+        found = await asyncio.to_thread(
+            get_catalog().get_items, [job_id for job_id, _ in hits]
+        )
+        by_id = {job.id: job for job in found}
+        return [
+            MatchResult.model_construct(
+                job=by_id[job_id],
+                score=_clamp_score(similarity * 100),
+                missing_skills=_find_missing_skills(profile, by_id[job_id]),
+            )
+            for job_id, similarity in hits
+            if job_id in by_id
+        ]
 
 
 @router.post("/write", response_model=WriteResponse)
@@ -416,6 +1444,7 @@ async def write_application(request: WriteRequest) -> WriteResponse:
 
     except Exception as e:
         print(f"Error generating cover letter: {e}")
+        record_fallback("write")
         # Fallback to template-based cover letter
         cover_letter = f"""
 Dear Hiring Manager,
@@ -453,7 +1482,7 @@ async def get_coaching(request: CoachRequest) -> CoachResponse:
 
         # Use LLM to generate coaching content
         coaching_data = await interview_coach(
-            request.role, request.company or "", skills
+            request.role, request.company or "", skills, cache=coaching_cache
         )
 
         # Convert questions to QuestionItem objects
@@ -481,6 +1510,7 @@ async def get_coaching(request: CoachRequest) -> CoachResponse:
 
     except Exception as e:
         print(f"Error generating coaching: {e}")
+        record_fallback("coach")
         # Fallback to template-based coaching
         fallback_questions = [
             QuestionItem(
@@ -568,6 +1598,7 @@ async def cv_analyzer(request: dict):
 
     except Exception as e:
         print(f"Error in CV analyzer: {e}")
+        record_fallback("local_cv_analyzer")
         # Fallback to basic extraction
         return {
             "skills": ["Python", "JavaScript", "Git"],
@@ -577,51 +1608,92 @@ async def cv_analyzer(request: dict):
 
 
 @router.post("/local/job_scout")
-async def job_scout(request: dict):
+async def job_scout(request: dict, http_request: Request):
     """
     Job Scout agent endpoint.
 
     Args:
-        request: {"filters": {...}} (ignored for now)
+        request: {"filters": {"query", "source", "location", "limit", "cursor",
+            "skills", "any_skills", "exclude_skills"}}, all optional; skill
+            filters are lists of names (or comma-separated strings)
+        http_request: Incoming request, for If-None-Match and Accept-Encoding
 
     Returns:
-        {"jobs": [...]} - same as /jobs/sample
+        {"jobs": [...], "next_cursor": str | None} - a page of catalog jobs,
+        cached per catalog version and validated with ``ETag``
     """
-    # Return the same sample jobs as /jobs/sample
-    sample_jobs = _load_sample_jobs()
-    return {"jobs": sample_jobs}
+    filters = request.get("filters") or {}
+    try:
+        limit = int(filters.get("limit") or DEFAULT_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        skills = skill_query(
+            filters.get("skills"),
+            filters.get("any_skills"),
+            filters.get("exclude_skills"),
+        )
+    except UnknownSkillError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    args = (
+        filters.get("query") or filters.get("q"),
+        filters.get("source"),
+        filters.get("location"),
+        limit,
+        filters.get("cursor"),
+        skills,
+    )
+
+    def build():
+        jobs, next_cursor = _search_catalog(*args)
+        return {"jobs": jobs, "next_cursor": next_cursor}, {}
+
+    listing = await asyncio.to_thread(_cached_listing, ("job_scout",) + args, build)
+    return await listing_response(http_request, listing)
 
 
 @router.post("/local/matcher")
-async def matcher(request: dict):
+async def matcher(request: dict, http_request: Request):
     """
     Matcher agent endpoint.
 
     Args:
-        request: {"profile": {...}, "jobs": [...]}
+        request: {"profile": {...}, "jobs": [...]} or, for catalog jobs,
+            {"profile": {...}, "job_ids": [...]}; "profile_handle" from
+            /analyze may replace "profile"
+        http_request: Incoming request, for JSON/MessagePack negotiation
 
     Returns:
         {"matches": [...]} - same logic as /match but wrapped
     """
     profile_data = request.get("profile", {})
+    profile_handle = request.get("profile_handle")
     jobs_data = request.get("jobs", [])
+    job_ids = request.get("job_ids", [])
 
-    if not profile_data or not jobs_data:
+    if not (profile_data or profile_handle) or not (jobs_data or job_ids):
         return {"matches": []}
 
     # Convert to proper models
     try:
-        profile = UserProfile(**profile_data)
-        jobs = [JobItem(**job) for job in jobs_data]
+        profile = _profile_entry(profile_handle or UserProfile(**profile_data))
+        if job_ids:
+            # Catalog jobs were validated at ingest
+            jobs = await asyncio.to_thread(get_catalog().get_items, job_ids)
+        else:
+            jobs = _JOB_ITEMS.validate_python(jobs_data)
 
         # Use existing match logic
         matches = await match_jobs(profile, jobs)
 
         # Wrap in matches format
-        return {"matches": matches}
+        return serialize_response(
+            http_request, {"matches": matches}, _WRAPPED_MATCH_RESULTS
+        )
 
     except Exception as e:
         print(f"Error in matcher: {e}")
+        record_fallback("local_matcher")
         return {"matches": []}
 
 
@@ -653,6 +1725,7 @@ async def app_writer(request: dict):
 
     except Exception as e:
         print(f"Error in app_writer: {e}")
+        record_fallback("local_app_writer")
         return {"cover_letter": f"Error generating cover letter: {str(e)}"}
 
 
@@ -679,9 +1752,12 @@ async def coach(request: dict):
 
     try:
         # Use LLM directly for coaching generation
-        coaching_data = await interview_coach(role, company, skills)
+        coaching_data = await interview_coach(
+            role, company, skills, cache=coaching_cache
+        )
         return {"questions": coaching_data["questions"], "tips": coaching_data["tips"]}
 
     except Exception as e:
         print(f"Error in coach: {e}")
+        record_fallback("local_coach")
         return {"questions": [], "tips": [f"Error getting coaching advice: {str(e)}"]}
@@ -0,0 +1,199 @@
+"""
+Semantic cache for LLM results keyed by text similarity.
+
+Interview coaching for "Backend Developer Intern @ StartupXYZ" serves just as
+well for "Backend Engineering Intern @ StartupXYZ", but an exact-match cache
+would miss. ``SemanticCache`` embeds each key and keeps the unit vectors of
+its entries in one small matrix, so a lookup is a single matrix-vector
+product: the nearest live entry at or above ``threshold`` cosine similarity
+is a hit. Identical keys hit without embedding at all.
+
+Entries are only compared within the same ``scope`` (for coaching, the
+company), so similar roles at different companies never share results. The
+cache holds at most ``maxsize`` entries (least recently used evicted first)
+and each expires ``ttl`` seconds after it was stored. Hits and misses are
+recorded as ``record_cache(name, ...)``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+from .metrics import record_cache, record_fallback
+
+
+class SemanticCache:
+    """TTL/LRU cache whose lookups match embedded keys by cosine similarity."""
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        threshold: float,
+        embed: Callable[[str], np.ndarray | None],
+    ):
+        """
+        Args:
+            name: Cache label for metrics
+            maxsize: Most entries kept; 0 disables the cache
+            ttl: Seconds an entry stays valid
+            threshold: Least cosine similarity counted as a hit
+            embed: Returns the vector of a key, or None when embeddings are
+                unavailable (exact keys still hit)
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.embed = embed
+        # key -> slot, least recently used first
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._keys: list[str | None] = [None] * maxsize
+        self._scopes: list[str | None] = [None] * maxsize
+        self._values: list[Any] = [None] * maxsize
+        # Expiry per slot; 0 marks a free slot
+        self._expires = np.zeros(maxsize, dtype=np.float64)
+        # Unit key vectors per slot (zero rows never match); sized on first use
+        self._vectors: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def lookup(self, key: str, scope: str = "") -> tuple[Any, np.ndarray | None]:
+        """
+        Find a cached value for ``key`` or a similar key in ``scope``.
+
+        Args:
+            key: Text describing the request
+            scope: Only entries stored with the same scope can match
+
+        Returns:
+            (value or None, key vector); pass the vector to ``store`` on a
+            miss so the key is not embedded twice
+        """
+        if not self.maxsize:
+            return None, None
+        now = time.monotonic()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and self._live(slot, scope, now):
+                self._slots.move_to_end(key)
+                value = self._values[slot]
+            else:
+                value = None
+        if value is not None:
+            record_cache(self.name, True)
+            return value, None
+
+        vector = self._embed(key)
+        if vector is not None:
+            with self._lock:
+                slot = self._nearest(vector, scope, now)
+                if slot is not None:
+                    self._slots.move_to_end(self._keys[slot])
+                    value = self._values[slot]
+        record_cache(self.name, value is not None)
+        return value, vector
+
+    def store(
+        self, key: str, value: Any, vector: np.ndarray | None, scope: str = ""
+    ) -> None:
+        """
+        Cache ``value`` for ``key``.
+
+        Args:
+            key: Text describing the request
+            value: Result to return for this and similar keys
+            vector: Key vector from ``lookup``; None stores an exact-only entry
+            scope: Scope the entry can be matched in
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            if vector is not None and (
+                self._vectors is None or self._vectors.shape[1] != len(vector)
+            ):
+                # First vector, or the embedding model changed
+                self._vectors = np.zeros((self.maxsize, len(vector)), np.float32)
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                slot = self._free_slot()
+            self._slots[key] = slot
+            self._keys[slot] = key
+            self._scopes[slot] = scope
+            self._values[slot] = value
+            self._expires[slot] = time.monotonic() + self.ttl
+            if self._vectors is not None:
+                self._vectors[slot] = 0 if vector is None else vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._keys = [None] * self.maxsize
+            self._scopes = [None] * self.maxsize
+            self._values = [None] * self.maxsize
+            self._expires[:] = 0
+            self._vectors = None
+
+    def _embed(self, key: str) -> np.ndarray | None:
+        try:
+            vector = self.embed(key)
+        except Exception as e:
+            print(f"Warning: {self.name} cache embedding failed: {e}")
+            record_fallback(f"{self.name}_cache_embed")
+            return None
+        if vector is None:
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    def _live(self, slot: int, scope: str, now: float) -> bool:
+        return self._expires[slot] > now and self._scopes[slot] == scope
+
+    def _nearest(self, vector: np.ndarray, scope: str, now: float) -> int | None:
+        """Most similar live slot in ``scope`` at or above the threshold."""
+        if self._vectors is None or self._vectors.shape[1] != len(vector):
+            return None
+        live = (self._expires > now) & np.fromiter(
+            (entry == scope for entry in self._scopes), dtype=bool, count=self.maxsize
+        )
+        if not live.any():
+            return None
+        similarity = np.where(live, self._vectors @ vector, -np.inf)
+        slot = int(np.argmax(similarity))
+        return slot if similarity[slot] >= self.threshold else None
+
+    def _free_slot(self) -> int:
+        """A free or expired slot, else the least recently used one."""
+        free = np.flatnonzero(self._expires <= time.monotonic())
+        if len(free):
+            slot = int(free[0])
+            if self._keys[slot] is not None:
+                del self._slots[self._keys[slot]]
+            return slot
+        return self._slots.popitem(last=False)[1]
+
+
+def coaching_key(
+    role: str, company: str, skills: Sequence[str] | None
+) -> tuple[str, str]:
+    """
+    Cache key text and scope for interview coaching.
+
+    Returns:
+        (key embedding the role, company and skill set, normalized company)
+    """
+    company = " ".join((company or "").lower().split())
+    skill_set = sorted({s.strip().lower() for s in skills or () if s.strip()})
+    key = (
+        f"Role: {' '.join(role.lower().split())} | Company: {company} | "
+        f"Skills: {', '.join(skill_set)}"
+    )
+    return key, company
@@ -0,0 +1,59 @@
+"""
+Single-pass response serialization for InternAI API.
+
+Endpoints that return many models hand them to ``serialize_response`` with a
+``TypeAdapter`` for the response shape. The models are dumped once by
+pydantic-core's Rust serializer, with no re-validation against
+``response_model`` and no ``jsonable_encoder`` pass. Clients sending
+``Accept: application/msgpack`` get MessagePack instead, when ``msgpack`` is
+installed. Streaming endpoints write one model per line as NDJSON.
+"""
+
+from collections.abc import Iterable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_MSGPACK_ACCEPT = ("application/msgpack", "application/x-msgpack")
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Whether the client asked for MessagePack and it can be produced."""
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in _MSGPACK_ACCEPT)
+
+
+def serialize_response(
+    request: Request, value: object, adapter: TypeAdapter
+) -> Response:
+    """
+    Serialize ``value`` once into a JSON or MessagePack response.
+
+    Args:
+        request: Incoming request, for content negotiation
+        value: Already-validated response data
+        adapter: TypeAdapter describing ``value``'s type
+
+    Returns:
+        Response with the encoded body
+    """
+    if wants_msgpack(request):
+        return Response(
+            msgpack.packb(adapter.dump_python(value, mode="json")),
+            media_type=MSGPACK_MEDIA_TYPE,
+        )
+    return Response(adapter.dump_json(value), media_type="application/json")
+
+
+def ndjson_lines(values: Iterable[object], adapter: TypeAdapter) -> bytes:
+    """Encode each value as one JSON line, newline-terminated."""
+    return b"".join(adapter.dump_json(value) + b"\n" for value in values)
@@ -26,6 +26,28 @@ class Settings:
     # Mistral AI Configuration
     MISTRAL_API_KEY: str | None = os.getenv("MISTRAL_API_KEY")
 
+    # LLM Backend ("mistral", or "fake" for load testing without API spend)
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "mistral")
+    FAKE_LLM_LATENCY_MS: float = float(os.getenv("FAKE_LLM_LATENCY_MS", "800"))
+    FAKE_EMBED_LATENCY_MS: float = float(os.getenv("FAKE_EMBED_LATENCY_MS", "60"))
+    FAKE_LLM_LATENCY_DIST: str = os.getenv("FAKE_LLM_LATENCY_DIST", "lognormal")
+    FAKE_LLM_LATENCY_SIGMA: float = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5"))
+    FAKE_LLM_FAILURE_RATE: float = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0.0"))
+    FAKE_LLM_SEED: int | None = (
+        int(os.getenv("FAKE_LLM_SEED")) if os.getenv("FAKE_LLM_SEED") else None
+    )
+
+    # LLM Routing (task=model[,fallback...]@slo_ms;... overrides, p95 window)
+    LLM_ROUTES: str = os.getenv("LLM_ROUTES", "")
+    LLM_ROUTE_WINDOW: float = float(os.getenv("LLM_ROUTE_WINDOW", "300"))
+    LLM_ROUTE_MIN_SAMPLES: int = int(os.getenv("LLM_ROUTE_MIN_SAMPLES", "5"))
+
+    # LLM Scheduler (shared rate limits, 0 disables; batch leaves the reserve)
+    LLM_REQUESTS_PER_MINUTE: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "300"))
+    LLM_TOKENS_PER_MINUTE: float = float(os.getenv("LLM_TOKENS_PER_MINUTE", "500000"))
+    LLM_INTERACTIVE_RESERVE: float = float(os.getenv("LLM_INTERACTIVE_RESERVE", "0.2"))
+    LLM_QUEUE_TIMEOUT: float = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+
     # Coral Configuration
     CORAL_SERVER_URL: str = os.getenv("CORAL_SERVER_URL", "http://localhost:8080")
     CORAL_API_KEY: str | None = os.getenv("CORAL_API_KEY")
@@ -34,6 +56,58 @@ class Settings:
     DATABASE_URL: str | None = os.getenv("DATABASE_URL")
     REDIS_URL: str | None = os.getenv("REDIS_URL")
 
+    # Job Catalog (encoded listing pages kept per catalog version)
+    LISTING_CACHE_SIZE: int = int(os.getenv("LISTING_CACHE_SIZE", "256"))
+
+    # Hybrid Retrieval (BM25 candidates reranked by embeddings)
+    HYBRID_CANDIDATES: int = int(os.getenv("HYBRID_CANDIDATES", "200"))
+    HYBRID_FUSION: str = os.getenv("HYBRID_FUSION", "rrf")
+    HYBRID_ALPHA: float = float(os.getenv("HYBRID_ALPHA", "0.3"))
+
+    # Profile Handles (per-worker cache of profile vectors for /match)
+    PROFILE_CACHE_SIZE: int = int(os.getenv("PROFILE_CACHE_SIZE", "1024"))
+    PROFILE_CACHE_TTL: float = float(os.getenv("PROFILE_CACHE_TTL", "1800"))
+
+    # Catalog Sync (incremental job re-embedding; 0 disables the worker)
+    CATALOG_SYNC_INTERVAL: float = float(os.getenv("CATALOG_SYNC_INTERVAL", "60"))
+    CATALOG_SYNC_BATCH_SIZE: int = int(os.getenv("CATALOG_SYNC_BATCH_SIZE", "128"))
+    # Whether this process embeds (serve.py keeps it on in its first worker
+    # only; the others just reload vectors)
+    CATALOG_SYNC_EMBED: bool = os.getenv("CATALOG_SYNC_EMBED", "true").lower() == "true"
+
+    # Vector Store (in-memory precision of job vectors: float32, float16, int8;
+    # quantizing saves memory, not scan time)
+    VECTOR_DTYPE: str = os.getenv("VECTOR_DTYPE", "float32")
+    VECTOR_RERANK: int = int(os.getenv("VECTOR_RERANK", "200"))
+
+    # Streaming Match (jobs scored per chunk by /match/stream)
+    MATCH_STREAM_CHUNK: int = int(os.getenv("MATCH_STREAM_CHUNK", "256"))
+
+    # Bulk Match (jobs per GEMM tile, and exact-rerank depth per profile)
+    BULK_MATCH_TILE: int = int(os.getenv("BULK_MATCH_TILE", "4096"))
+    BULK_MATCH_RERANK: int = int(os.getenv("BULK_MATCH_RERANK", "50"))
+
+    # Coaching Cache (semantic cache of interview coaching; size 0 disables it)
+    COACH_CACHE_SIZE: int = int(os.getenv("COACH_CACHE_SIZE", "512"))
+    COACH_CACHE_TTL: float = float(os.getenv("COACH_CACHE_TTL", "86400"))
+    COACH_CACHE_THRESHOLD: float = float(os.getenv("COACH_CACHE_THRESHOLD", "0.92"))
+
+    # Resume Uploads (request size cap, PDF pages read, extraction processes,
+    # seconds before extraction gives up; 0 workers extracts in a thread)
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_MAX_PAGES: int = int(os.getenv("UPLOAD_MAX_PAGES", "20"))
+    UPLOAD_EXTRACT_WORKERS: int = int(os.getenv("UPLOAD_EXTRACT_WORKERS", "2"))
+    UPLOAD_EXTRACT_TIMEOUT: float = float(os.getenv("UPLOAD_EXTRACT_TIMEOUT", "30"))
+
+    # Locations (default radius for /match?near=...)
+    LOCATION_RADIUS_KM: float = float(os.getenv("LOCATION_RADIUS_KM", "50"))
+
+    # Ingestion (MinHash/LSH near-duplicate detection)
+    DEDUPE_THRESHOLD: float = float(os.getenv("DEDUPE_THRESHOLD", "0.8"))
+    DEDUPE_NUM_PERM: int = int(os.getenv("DEDUPE_NUM_PERM", "128"))
+    # X-API-Key for POST /v1/jobs/ingest (unset disables the endpoint)
+    JOB_INGEST_API_KEY: str | None = os.getenv("JOB_INGEST_API_KEY")
+
     # Security
     JWT_SECRET_KEY: str | None = os.getenv("JWT_SECRET_KEY")
     CORS_ORIGINS: list[str] = os.getenv(
@@ -57,6 +131,19 @@ class Settings:
     SENTRY_DSN: str | None = os.getenv("SENTRY_DSN")
     ANALYTICS_ID: str | None = os.getenv("ANALYTICS_ID")
 
+    # Request Tracing
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+    TRACE_SLOW_MS: float = float(os.getenv("TRACE_SLOW_MS", "1000"))
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "100"))
+    TRACE_SERVER_TIMING: bool = (
+        os.getenv("TRACE_SERVER_TIMING", "false").lower() == "true"
+    )
+    # Serve buffered traces at /debug/traces (they expose request paths and
+    # timings, so keep this off on public deployments)
+    DEBUG_TRACES_ENABLED: bool = (
+        os.getenv("DEBUG_TRACES_ENABLED", "false").lower() == "true"
+    )
+
     @classmethod
     def validate(cls) -> None:
         """Validate required settings."""
@@ -0,0 +1,488 @@
+"""
+Skill -> job inverted index over catalog jobs.
+
+Each job's title and description are scanned once, when the job is indexed,
+for the curated ``SKILL_KEYWORDS`` (whole words only, so "go" does not match
+"good"), with aliases such as "k8s" or "golang" folded into one canonical
+skill. The index keeps a posting list of job slots per skill, held as sorted
+NumPy arrays, so a ``SkillQuery`` ("rust and python, not java", or "missing
+at most one of my skills") is answered with array intersections, unions and
+differences instead of scanning descriptions.
+
+Like the BM25 and location indexes, it is built from the catalog on first use
+and catches up incrementally with ``JobCatalog.scan_changes``.
+"""
+
+import re
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .catalog import JobCatalog, get_catalog
+from .preload import register_preload
+
+# Curated set of skill keywords, for missing skills and the skill index
+SKILL_KEYWORDS = {
+    # Programming Languages
+    "python",
+    "java",
+    "javascript",
+    "typescript",
+    "c++",
+    "c#",
+    "go",
+    "rust",
+    "swift",
+    "kotlin",
+    "php",
+    "ruby",
+    "scala",
+    "r",
+    "matlab",
+    "sql",
+    # Frameworks & Libraries
+    "react",
+    "vue",
+    "angular",
+    "node.js",
+    "express",
+    "django",
+    "flask",
+    "fastapi",
+    "spring",
+    "laravel",
+    "rails",
+    "tensorflow",
+    "pytorch",
+    "scikit-learn",
+    "pandas",
+    "numpy",
+    "matplotlib",
+    "seaborn",
+    # Databases
+    "postgresql",
+    "mysql",
+    "mongodb",
+    "redis",
+    "elasticsearch",
+    "sqlite",
+    "cassandra",
+    "dynamodb",
+    "neo4j",
+    # Cloud Platforms
+    "aws",
+    "azure",
+    "gcp",
+    "google cloud",
+    "amazon web services",
+    "microsoft azure",
+    "cloudflare",
+    # DevOps Tools
+    "docker",
+    "kubernetes",
+    "terraform",
+    "jenkins",
+    "gitlab",
+    "github actions",
+    "ansible",
+    "prometheus",
+    "grafana",
+    "elk stack",
+    # AI/ML
+    "machine learning",
+    "deep learning",
+    "neural networks",
+    "nlp",
+    "natural language processing",
+    "computer vision",
+    "reinforcement learning",
+    "data science",
+    "data analysis",
+    "mlops",
+    # Blockchain
+    "blockchain",
+    "web3",
+    "solidity",
+    "ethereum",
+    "smart contracts",
+    "defi",
+    "nft",
+    "cairo",
+    "starknet",
+    "zkproofs",
+    "zero knowledge",
+    # Security
+    "cybersecurity",
+    "penetration testing",
+    "vulnerability assessment",
+    "security auditing",
+    "cryptography",
+    "network security",
+    # DevRel
+    "developer relations",
+    "technical writing",
+    "community management",
+    "developer advocacy",
+    "content creation",
+    "documentation",
+    # Data Engineering
+    "data engineering",
+    "etl",
+    "data pipelines",
+    "apache spark",
+    "kafka",
+    "airflow",
+    "data warehousing",
+    "big data",
+    # General
+    "git",
+    "linux",
+    "bash",
+    "agile",
+    "scrum",
+    "devops",
+    "ci/cd",
+    "rest api",
+    "graphql",
+    "microservices",
+    "api development",
+}
+
+
+# Alternative spellings -> canonical skill. Keyword pairs such as "aws" and
+# "amazon web services" stay separate for missing-skill reporting but index
+# as one skill.
+SKILL_ALIASES = {
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "natural language processing": "nlp",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "nodejs": "node.js",
+    "js": "javascript",
+    "reactjs": "react",
+    "react.js": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "sklearn": "scikit-learn",
+    "spark": "apache spark",
+    "apache kafka": "kafka",
+    "apache airflow": "airflow",
+    "cpp": "c++",
+    "cicd": "ci/cd",
+    "ml": "machine learning",
+    "zk proofs": "zkproofs",
+    "restful api": "rest api",
+}
+
+CANONICAL_SKILLS = tuple(
+    sorted(skill for skill in SKILL_KEYWORDS if skill not in SKILL_ALIASES)
+)
+
+_SPACE_RE = re.compile(r"[\s-]+")
+
+
+def _key(name: str) -> str:
+    """Lookup form of a skill name: lowercase, hyphens and spaces as one space."""
+    return _SPACE_RE.sub(" ", name.strip().lower())
+
+
+# Lookup form of every canonical name and alias -> canonical skill
+_NAMES = {_key(skill): skill for skill in CANONICAL_SKILLS} | {
+    _key(alias): skill for alias, skill in SKILL_ALIASES.items()
+}
+
+# Longest names first so "google cloud platform" wins over "google cloud";
+# skills must not touch other word characters (or "+", "#", "&": "r&d").
+_SKILL_RE = re.compile(
+    r"(?<![\w+#&])(?:"
+    + "|".join(
+        re.escape(name).replace(r"\ ", r"[\s-]+")
+        for name in sorted(_NAMES, key=len, reverse=True)
+    )
+    + r")(?![\w+#&])"
+)
+
+
+class UnknownSkillError(ValueError):
+    """Raised when a query names a skill the index does not know."""
+
+
+def canonical_skill(name: str) -> str:
+    """
+    Canonical skill for a name or alias, e.g. "K8s" -> "kubernetes".
+
+    Raises:
+        UnknownSkillError: If ``name`` is not a known skill
+    """
+    skill = _NAMES.get(_key(name))
+    if skill is None:
+        raise UnknownSkillError(f"Unknown skill: {name!r}")
+    return skill
+
+
+def detect_skills(*texts: str | None) -> frozenset[str]:
+    """Canonical skills mentioned in any of ``texts``."""
+    return frozenset(
+        _NAMES[_key(match)]
+        for text in texts
+        if text
+        for match in _SKILL_RE.findall(text.lower())
+    )
+
+
+def profile_skills(skills: Iterable[str]) -> frozenset[str]:
+    """Canonical skills a profile's free-text skills cover ("Python 3")."""
+    return detect_skills(*skills)
+
+
+@dataclass(frozen=True)
+class SkillQuery:
+    """
+    Boolean skill filter over jobs.
+
+    A job passes when it mentions every ``required`` skill, at least one
+    ``any_of`` skill (when given), none of the ``excluded`` skills, and, when
+    ``max_missing`` is set, at most that many skills outside ``have``.
+    """
+
+    required: frozenset[str] = frozenset()
+    any_of: frozenset[str] = frozenset()
+    excluded: frozenset[str] = frozenset()
+    have: frozenset[str] = frozenset()
+    max_missing: int | None = None
+
+    def accepts(self, skills: frozenset[str]) -> bool:
+        """Whether a job mentioning ``skills`` passes the query."""
+        return (
+            self.required <= skills
+            and (not self.any_of or not self.any_of.isdisjoint(skills))
+            and self.excluded.isdisjoint(skills)
+            and (
+                self.max_missing is None or len(skills - self.have) <= self.max_missing
+            )
+        )
+
+
+def skill_query(
+    required: Iterable[str] | None = None,
+    any_of: Iterable[str] | None = None,
+    excluded: Iterable[str] | None = None,
+    have: Iterable[str] | None = None,
+    max_missing: int | None = None,
+) -> SkillQuery | None:
+    """
+    Build a skill query from request values.
+
+    Each list may also hold comma-separated names ("rust,python").
+
+    Args:
+        required: Skills every job must mention
+        any_of: Jobs must mention at least one of these
+        excluded: Jobs must mention none of these
+        have: The profile's own skills (free text), for ``max_missing``
+        max_missing: Most skills a job may mention that ``have`` lacks
+
+    Returns:
+        SkillQuery, or None when nothing is filtered
+
+    Raises:
+        UnknownSkillError: If a required, any-of or excluded skill is unknown
+    """
+    names = [_split(values) for values in (required, any_of, excluded)]
+    if not any(names) and max_missing is None:
+        return None
+    required, any_of, excluded = (
+        frozenset(canonical_skill(name) for name in values) for values in names
+    )
+    return SkillQuery(
+        required=required,
+        any_of=any_of,
+        excluded=excluded,
+        have=profile_skills(have or ()) if max_missing is not None else frozenset(),
+        max_missing=max_missing,
+    )
+
+
+def _split(values: Iterable[str] | str | None) -> list[str]:
+    if isinstance(values, str):
+        values = [values]
+    return [name for value in values or () for name in value.split(",") if name.strip()]
+
+
+class SkillIndex:
+    """Per-process skill postings of catalog jobs, synced incrementally."""
+
+    def __init__(self):
+        self._slot_of: dict[str, int] = {}
+        self._job_ids: list[str | None] = []
+        self._skills: list[frozenset[str]] = []
+        self._free: list[int] = []
+        self._postings: dict[str, set[int]] = {}
+        # Skills per slot (-1 for free slots), for "missing at most" queries
+        self._counts = np.empty(0, dtype=np.int32)
+        # Sorted slot arrays, rebuilt only for skills touched since last query
+        self._arrays: dict[str, np.ndarray] = {}
+        self._lock = threading.RLock()
+        self.version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, job_id: str, title: str | None, desc: str | None) -> None:
+        """Index a job's skills, replacing any previous version of it."""
+        skills = detect_skills(title, desc)
+        with self._lock:
+            self.remove(job_id)
+            slot = self._free.pop() if self._free else self._grow()
+            self._job_ids[slot] = job_id
+            self._skills[slot] = skills
+            self._slot_of[job_id] = slot
+            self._counts[slot] = len(skills)
+            for skill in skills:
+                self._postings.setdefault(skill, set()).add(slot)
+                self._arrays.pop(skill, None)
+
+    def remove(self, job_id: str) -> None:
+        """Drop a job from the index if present."""
+        with self._lock:
+            slot = self._slot_of.pop(job_id, None)
+            if slot is None:
+                return
+            for skill in self._skills[slot]:
+                postings = self._postings[skill]
+                postings.discard(slot)
+                if not postings:
+                    del self._postings[skill]
+                self._arrays.pop(skill, None)
+            self._job_ids[slot] = None
+            self._skills[slot] = frozenset()
+            self._counts[slot] = -1
+            self._free.append(slot)
+
+    def skills(self, job_id: str) -> frozenset[str]:
+        """Canonical skills an indexed job mentions (empty if not indexed)."""
+        with self._lock:
+            slot = self._slot_of.get(job_id)
+            return self._skills[slot] if slot is not None else frozenset()
+
+    def select(self, query: SkillQuery) -> np.ndarray:
+        """Sorted slots of every indexed job that passes ``query``."""
+        with self._lock:
+            if query.required:
+                # Intersect from the shortest posting list up
+                lists = sorted(
+                    (self._slot_array(skill) for skill in query.required), key=len
+                )
+                slots = lists[0]
+                for postings in lists[1:]:
+                    if not len(slots):
+                        break
+                    slots = np.intersect1d(slots, postings, assume_unique=True)
+            else:
+                slots = np.flatnonzero(self._counts >= 0)
+            if query.any_of and len(slots):
+                slots = np.intersect1d(
+                    slots, self._union(query.any_of), assume_unique=True
+                )
+            if query.excluded and len(slots):
+                slots = np.setdiff1d(
+                    slots, self._union(query.excluded), assume_unique=True
+                )
+            if query.max_missing is not None and len(slots):
+                covered = np.zeros(len(self._counts), dtype=np.int32)
+                for skill in query.have:
+                    covered[self._slot_array(skill)] += 1
+                missing = self._counts[slots] - covered[slots]
+                slots = slots[missing <= query.max_missing]
+            return slots
+
+    def within(self, query: SkillQuery) -> list[str]:
+        """Ids of every indexed job that passes ``query``."""
+        with self._lock:
+            return [self._job_ids[slot] for slot in self.select(query)]
+
+    def matches(self, job_ids: list[str], query: SkillQuery) -> np.ndarray:
+        """
+        Which of ``job_ids`` pass ``query``.
+
+        Jobs not in the index do not match.
+
+        Returns:
+            Boolean array aligned with ``job_ids``
+        """
+        with self._lock:
+            slots = np.fromiter(
+                (self._slot_of.get(job_id, -1) for job_id in job_ids),
+                dtype=np.int64,
+                count=len(job_ids),
+            )
+            return np.isin(slots, self.select(query))
+
+    def sync(self, catalog: JobCatalog) -> int:
+        """
+        Bring the index up to date with ``catalog``.
+
+        Returns:
+            Catalog version the index now reflects
+        """
+        with self._lock:
+            if self.version is not None and catalog.version() == self.version:
+                return self.version
+            self.version = catalog.scan_changes(
+                self.version,
+                on_upsert=lambda job: self.add(job["id"], job["title"], job["desc"]),
+                on_delete=self.remove,
+            )
+            return self.version
+
+    def _slot_array(self, skill: str) -> np.ndarray:
+        array = self._arrays.get(skill)
+        if array is None:
+            postings = self._postings.get(skill, ())
+            array = np.fromiter(sorted(postings), dtype=np.int64, count=len(postings))
+            self._arrays[skill] = array
+        return array
+
+    def _union(self, skills: Iterable[str]) -> np.ndarray:
+        return np.unique(
+            np.concatenate(
+                [np.empty(0, dtype=np.int64)]
+                + [self._slot_array(skill) for skill in skills]
+            )
+        )
+
+    def _grow(self) -> int:
+        slot = len(self._job_ids)
+        self._job_ids.append(None)
+        self._skills.append(frozenset())
+        capacity = len(self._counts)
+        if slot >= capacity:
+            grown = np.full(max(1024, capacity * 2), -1, dtype=np.int32)
+            grown[:capacity] = self._counts
+            self._counts = grown
+        return slot
+
+
+@lru_cache(maxsize=1)
+def _shared_index() -> SkillIndex:
+    return SkillIndex()
+
+
+@register_preload
+def get_skill_index(catalog: JobCatalog | None = None) -> SkillIndex:
+    """
+    Return the process-wide skill index, synced with the catalog.
+
+    Args:
+        catalog: Catalog to sync with; defaults to ``get_catalog()``
+    """
+    index = _shared_index()
+    index.sync(catalog or get_catalog())
+    return index
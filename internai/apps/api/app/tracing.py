@@ -0,0 +1,185 @@
+"""
+Lightweight in-process request tracing for InternAI API.
+
+Requests are sampled by ``TracingMiddleware``; code inside a sampled request
+opens nested spans with ``span("name")``. Outside a sampled request ``span``
+is a shared no-op, so instrumented hot paths cost one context-variable read.
+Finished traces slower than ``TRACE_SLOW_MS`` are kept in a ring buffer for
+the ``/debug/traces`` endpoint, and span timings can be returned in a
+``Server-Timing`` response header.
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar
+
+from .settings import settings
+
+
+class Span(AbstractContextManager):
+    """A timed section of work, possibly containing child spans."""
+
+    __slots__ = ("name", "start", "end", "children", "_token")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+        self.end = 0.0
+        self.children: list[Span] = []
+        self._token = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if parent is not None:
+            parent.children.append(self)
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_NOOP = nullcontext()
+
+
+def span(name: str) -> AbstractContextManager:
+    """
+    Open a child span of the current trace.
+
+    Args:
+        name: Stage name (a token without spaces, e.g. "regex_scan_skills")
+
+    Returns:
+        Context manager timing the enclosed block, or a no-op when the
+        current request is not being traced
+    """
+    if _current_span.get() is None:
+        return _NOOP
+    return Span(name)
+
+
+class TraceBuffer:
+    """Thread-safe ring buffer of recent slow traces."""
+
+    def __init__(self, maxlen: int):
+        self._traces: deque[dict] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, trace: dict) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def snapshot(self) -> list[dict]:
+        """Return buffered traces, most recent first."""
+        with self._lock:
+            return list(reversed(self._traces))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+
+slow_traces = TraceBuffer(settings.TRACE_BUFFER_SIZE)
+
+
+def _server_timing(root: Span) -> bytes:
+    """Flatten spans into a Server-Timing header value."""
+    entries = [f"total;dur={root.duration_ms:.1f}"]
+    stack = [(child, child.name) for child in reversed(root.children)]
+    while stack:
+        current, path = stack.pop()
+        entries.append(f"{path};dur={current.duration_ms:.1f}")
+        stack.extend(
+            (child, f"{path}.{child.name}") for child in reversed(current.children)
+        )
+    return ", ".join(entries).encode("latin-1")
+
+
+class TracingMiddleware:
+    """ASGI middleware that samples requests and records their span trees."""
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float | None = None,
+        slow_ms: float | None = None,
+        server_timing: bool | None = None,
+        allow_forced: bool | None = None,
+    ):
+        """
+        Args:
+            app: ASGI app to wrap
+            sample_rate: Fraction of requests traced
+            slow_ms: Traces at least this slow are buffered
+            server_timing: Add a ``Server-Timing`` header to traced responses
+            allow_forced: Trace requests sending ``X-Trace: 1`` regardless of
+                the sample rate; defaults to ``DEBUG_TRACES_ENABLED``, since
+                otherwise any client could fill the slow-trace buffer
+        """
+        self.app = app
+        self.sample_rate = (
+            settings.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+        self.slow_ms = settings.TRACE_SLOW_MS if slow_ms is None else slow_ms
+        self.server_timing = (
+            settings.TRACE_SERVER_TIMING if server_timing is None else server_timing
+        )
+        self.allow_forced = (
+            settings.DEBUG_TRACES_ENABLED if allow_forced is None else allow_forced
+        )
+
+    def _sampled(self, scope) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        if self.allow_forced and (b"x-trace", b"1") in scope["headers"]:
+            return True
+        return random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(f"{scope['method']} {scope['path']}")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                root.end = time.perf_counter()
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", _server_timing(root))
+                ]
+            await send(message)
+
+        with root:
+            await self.app(scope, receive, send_wrapper)
+
+        if root.duration_ms >= self.slow_ms:
+            slow_traces.add(
+                {
+                    "trace_id": uuid.uuid4().hex,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "timestamp": time.time(),
+                    "duration_ms": round(root.duration_ms, 3),
+                    "spans": [child.to_dict(root.start) for child in root.children],
+                }
+            )
@@ -0,0 +1,401 @@
+"""
+Job embedding vectors, persisted next to the job catalog.
+
+``app.catalog_sync`` writes one ``job_vectors`` row per job: a hash of the
+text that was embedded, the unit-normalized vector, and the vector store
+version the row was written at. Every process serves matches from an
+immutable ``VectorSnapshot``. ``VectorStore.refresh`` reads only the rows
+written since its snapshot and publishes the next snapshot with a single
+assignment, so requests never see a half-applied sync.
+
+Snapshots can hold the vectors quantized (``VECTOR_DTYPE``): float16, or
+int8 with one scale per dimension, which cuts per-worker memory 2x or 4x
+against float32. The win is memory only: NumPy has no BLAS kernels for
+float16 or integer products, so quantized rows are converted to float32 in
+cache-sized blocks before scoring. An int8 scan takes about as long as a
+float32 one, and a float16 scan several times longer (half floats are
+converted in software). float32 is therefore the default. Candidate
+selection scores the whole snapshot; the best ``rerank`` candidates, and any
+vector used to score a given job, are then read back from the float32 rows
+in the database so final scores are exact.
+"""
+
+import hashlib
+from collections.abc import Callable
+from functools import lru_cache
+
+import numpy as np
+
+from .catalog import JobCatalog, get_catalog
+from .preload import register_preload
+from .settings import settings
+
+DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+_LOOKUP_CHUNK = 500
+# Rows converted to float32 at a time while scanning a quantized snapshot;
+# small enough for the converted block to stay in cache.
+_SCAN_CHUNK = 256
+_INT8_MAX = 127
+
+
+def text_hash(model: str, text: str) -> bytes:
+    """Content hash deciding whether a job's stored vector is still valid."""
+    return hashlib.blake2b(f"{model}\n{text}".encode(), digest_size=16).digest()
+
+
+ExactFetch = Callable[[list[str], list[bytes]], list[np.ndarray | None]]
+
+
+class VectorSnapshot:
+    """One published version of the job vectors; never mutated."""
+
+    __slots__ = ("version", "ids", "codes", "scale", "hashes", "_fetch", "_rows")
+
+    def __init__(
+        self,
+        version: int,
+        ids: list[str],
+        codes: np.ndarray,
+        hashes: list[bytes],
+        scale: np.ndarray | None = None,
+        fetch: ExactFetch | None = None,
+    ):
+        """
+        Wrap one version of the vectors.
+
+        Args:
+            version: Vector store version this snapshot reflects
+            ids: Job id of each row
+            codes: (rows, dim) float32, float16 or int8 matrix
+            hashes: Text hash of each row
+            scale: Per-dimension scale of int8 codes
+            fetch: Returns the stored float32 vector for each (id, hash), or
+                None where it is gone; required for quantized codes
+        """
+        self.version = version
+        self.ids = ids
+        self.codes = codes
+        self.hashes = hashes
+        self.scale = scale
+        self._fetch = fetch
+        self._rows = {job_id: row for row, job_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the vectors themselves."""
+        return self.codes.nbytes + (0 if self.scale is None else self.scale.nbytes)
+
+    def lookup(self, job_id: str, expected_hash: bytes) -> int | None:
+        """Return the job's row if it was embedded from the expected text."""
+        row = self._rows.get(job_id)
+        if row is None or self.hashes[row] != expected_hash:
+            return None
+        return row
+
+    def rows_of(self, job_ids: list[str]) -> np.ndarray:
+        """Rows of those ``job_ids`` that have a vector, in the given order."""
+        rows = (self._rows.get(job_id) for job_id in job_ids)
+        return np.array([row for row in rows if row is not None], dtype=np.intp)
+
+    def approximate(self, rows) -> np.ndarray:
+        """Dequantized float32 vectors of ``rows``."""
+        vectors = self.codes[rows].astype(np.float32)
+        return vectors * self.scale if self.scale is not None else vectors
+
+    def vectors(self, rows) -> np.ndarray:
+        """
+        Exact float32 vectors of ``rows``.
+
+        Quantized snapshots read them from the store; a row whose stored
+        vector has since changed falls back to its dequantized codes.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        if self.codes.dtype == np.float32 or self._fetch is None:
+            return self.approximate(rows)
+        exact = self._fetch(
+            [self.ids[row] for row in rows], [self.hashes[row] for row in rows]
+        )
+        vectors = np.empty((len(rows), self.codes.shape[1]), dtype=np.float32)
+        for i, (row, vector) in enumerate(zip(rows, exact, strict=True)):
+            vectors[i] = vector if vector is not None else self.approximate(row)
+        return vectors
+
+    def scores(self, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """Approximate dot product of every row (or of ``rows``) with ``query``."""
+        query = np.asarray(query, dtype=np.float32)
+        if self.scale is not None:
+            # (codes * scale) . q == codes . (scale * q)
+            query = query * self.scale
+        if rows is None and self.codes.dtype == np.float32:
+            return self.codes @ query
+        size = len(self) if rows is None else len(rows)
+        scores = np.empty(size, dtype=np.float32)
+        block = np.empty((_SCAN_CHUNK, self.codes.shape[1]), dtype=np.float32)
+        for start in range(0, size, _SCAN_CHUNK):
+            if rows is None:
+                chunk = self.codes[start : start + _SCAN_CHUNK]
+            else:
+                chunk = self.codes[rows[start : start + _SCAN_CHUNK]]
+            converted = block[: len(chunk)]
+            np.copyto(converted, chunk)
+            scores[start : start + len(chunk)] = converted @ query
+        return scores
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        rerank: int = 200,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Nearest jobs to ``query`` by cosine similarity.
+
+        Args:
+            query: Query vector (any scale)
+            k: Number of results
+            rerank: Candidates picked by approximate score and rescored
+                with exact vectors
+            rows: Only search these rows (see ``rows_of``); all when None
+
+        Returns:
+            (job_id, cosine similarity) pairs, most similar first
+        """
+        size = len(self) if rows is None else len(rows)
+        if not size or k <= 0:
+            return []
+        query = _normalize(query)
+        approximate = self.scores(query, rows)
+        if rows is None:
+            rows = np.arange(len(self))
+        depth = min(len(rows), max(k, rerank))
+        if depth < len(rows):
+            candidates = rows[np.argpartition(-approximate, depth - 1)[:depth]]
+        else:
+            candidates = rows
+        exact = self.vectors(candidates) @ query
+        order = np.argsort(-exact, kind="stable")[:k]
+        return [(self.ids[candidates[i]], float(exact[i])) for i in order]
+
+
+_EMPTY = VectorSnapshot(0, [], np.empty((0, 0), dtype=np.float32), [])
+
+
+class VectorStore:
+    """Reads and writes ``job_vectors`` and publishes snapshots of them."""
+
+    def __init__(self, catalog: JobCatalog, dtype: str = "float32"):
+        """
+        Configure the store.
+
+        Args:
+            catalog: Catalog whose database holds the vectors
+            dtype: In-memory precision, "float32", "float16" or "int8"
+
+        Raises:
+            ValueError: If ``dtype`` is not supported
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype!r}")
+        self.catalog = catalog
+        self.dtype = dtype
+        self.snapshot = _EMPTY
+
+    def hashes(self, job_ids: list[str]) -> dict[str, bytes]:
+        """Stored text hashes of live vectors for ``job_ids``."""
+        found = {}
+        with self.catalog.transaction(write=False) as conn:
+            for start in range(0, len(job_ids), _LOOKUP_CHUNK):
+                chunk = job_ids[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    conn.execute(
+                        "SELECT id, text_hash FROM job_vectors "
+                        f"WHERE vector IS NOT NULL AND id IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                )
+        return found
+
+    def exact(self, job_ids: list[str], hashes: list[bytes]) -> list[np.ndarray | None]:
+        """Stored float32 vectors for ``job_ids``, None where the hash differs."""
+        found = {}
+        with self.catalog.transaction(write=False) as conn:
+            for start in range(0, len(job_ids), _LOOKUP_CHUNK):
+                chunk = job_ids[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    "SELECT id, text_hash, vector FROM job_vectors "
+                    f"WHERE vector IS NOT NULL AND id IN ({placeholders})",
+                    chunk,
+                ):
+                    found[row["id"]] = (row["text_hash"], row["vector"])
+        vectors = []
+        for job_id, digest in zip(job_ids, hashes, strict=True):
+            stored = found.get(job_id)
+            vectors.append(
+                np.frombuffer(stored[1], dtype=np.float32)
+                if stored and stored[0] == digest
+                else None
+            )
+        return vectors
+
+    def write(
+        self,
+        vectors: list[tuple[str, bytes, np.ndarray]] = (),
+        deleted: list[str] = (),
+    ) -> int:
+        """
+        Store new vectors and tombstones as one vector store version.
+
+        Args:
+            vectors: (job_id, text_hash, vector) rows; vectors are
+                normalized to unit length before storing
+            deleted: Ids of jobs that left the catalog
+
+        Returns:
+            The vector store version written, or the current one when there
+            was nothing to write
+        """
+        with self.catalog.transaction() as conn:
+            version = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'vector_version'"
+            ).fetchone()[0]
+            if not vectors and not deleted:
+                return version
+            version += 1
+            conn.executemany(
+                "INSERT OR REPLACE INTO job_vectors (id, text_hash, vector, version) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (job_id, digest, _normalize(vector).tobytes(), version)
+                    for job_id, digest, vector in vectors
+                ),
+            )
+            conn.executemany(
+                "UPDATE job_vectors SET vector = NULL, version = ? WHERE id = ?",
+                ((version, job_id) for job_id in deleted),
+            )
+            conn.execute(
+                "UPDATE catalog_meta SET value = ? WHERE key = 'vector_version'",
+                (version,),
+            )
+        return version
+
+    def refresh(self) -> VectorSnapshot:
+        """
+        Publish a snapshot including every row written since the current one.
+
+        Only changed rows are read; unchanged vectors are carried over. For
+        int8 a dimension's scale only grows: when new rows exceed it, the
+        kept rows are re-read and quantized again from their float32 source.
+
+        Returns:
+            The current snapshot
+        """
+        current = self.snapshot
+        with self.catalog.transaction(write=False) as conn:
+            version = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'vector_version'"
+            ).fetchone()[0]
+            if version == current.version:
+                return current
+            rows = conn.execute(
+                "SELECT id, text_hash, vector FROM job_vectors WHERE version > ?",
+                (current.version,),
+            ).fetchall()
+
+        changed = {row["id"]: row for row in rows}
+        keep = [i for i, job_id in enumerate(current.ids) if job_id not in changed]
+        ids = [current.ids[i] for i in keep]
+        hashes = [current.hashes[i] for i in keep]
+        kept = current.codes[keep]
+        scale = current.scale
+        added = [row for row in changed.values() if row["vector"] is not None]
+        if added:
+            vectors = np.frombuffer(
+                b"".join(row["vector"] for row in added), dtype=np.float32
+            ).reshape(len(added), -1)
+            if keep and kept.shape[1] != vectors.shape[1]:
+                # The embedding model changed; old vectors are being replaced.
+                ids, hashes, keep, scale = [], [], [], None
+            codes, scale = self._quantize(
+                vectors, kept if keep else None, scale, ids, hashes
+            )
+            ids.extend(row["id"] for row in added)
+            hashes.extend(row["text_hash"] for row in added)
+        elif keep:
+            codes = kept
+        else:
+            codes, scale = _EMPTY.codes, None
+        codes.flags.writeable = False
+        self.snapshot = VectorSnapshot(
+            version, ids, codes, hashes, scale=scale, fetch=self.exact
+        )
+        return self.snapshot
+
+    def _quantize(
+        self,
+        vectors: np.ndarray,
+        kept: np.ndarray | None,
+        scale: np.ndarray | None,
+        kept_ids: list[str],
+        kept_hashes: list[bytes],
+    ) -> tuple[np.ndarray, np.ndarray | None]:
+        """Encode ``vectors`` and append them to ``kept`` codes."""
+        if self.dtype != "int8":
+            codes = vectors.astype(DTYPES[self.dtype])
+            return (codes if kept is None else np.concatenate([kept, codes])), None
+
+        needed = np.maximum(np.abs(vectors).max(axis=0), 1e-6) / _INT8_MAX
+        new_scale = needed if scale is None else np.maximum(scale, needed)
+        codes = _to_int8(vectors / new_scale)
+        if kept is None:
+            return codes, new_scale
+        if scale is not None and not np.array_equal(new_scale, scale):
+            # Rescaling the codes themselves would round twice
+            source = self.exact(kept_ids, kept_hashes)
+            kept = np.stack(
+                [
+                    _to_int8(
+                        (vector if vector is not None else kept[i] * scale) / new_scale
+                    )
+                    for i, vector in enumerate(source)
+                ]
+            )
+        return np.concatenate([kept, codes]), new_scale
+
+
+def _to_int8(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(values), -_INT8_MAX, _INT8_MAX).astype(np.int8)
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+@register_preload
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """Return the vector store for the process-wide catalog, loaded."""
+    store = VectorStore(get_catalog(), dtype=settings.VECTOR_DTYPE)
+    store.refresh()
+    return store
+
+
+def current_snapshot() -> VectorSnapshot:
+    """
+    Return the published snapshot without loading the store.
+
+    Empty until ``get_vector_store`` has run (at preload or in the catalog
+    sync worker), so requests never pay for the initial load.
+    """
+    if not get_vector_store.cache_info().currsize:
+        return _EMPTY
+    return get_vector_store().snapshot
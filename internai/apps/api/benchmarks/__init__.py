@@ -0,0 +1,3 @@
+"""
+Benchmark suites for InternAI API hot paths.
+"""
@@ -0,0 +1,76 @@
+"""
+Cohort matching: tiled matrix products against one search per profile.
+
+Builds an int8 vector store over synthetic clustered job vectors, then
+shortlists ``k`` jobs for a cohort of profiles twice: with
+``bulk_match.tiled_top_k`` plus exact rerank (what ``/v1/match/bulk`` does)
+and with one ``VectorSnapshot.search`` per profile (what a client looping
+over ``/v1/match?mode=semantic`` gets). Prints one JSON line per cohort size
+with both timings and the overlap of their shortlists.
+
+Usage (from ``apps/api``):
+
+    python -m benchmarks.bulk_match
+    python -m benchmarks.bulk_match --size 50000 --profiles 100,1000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.bulk_match import rerank_exact, snapshot_tiles, tiled_top_k
+from benchmarks.vector_quantization import build_store, clustered_vectors
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=20_000, help="Jobs (20k)")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector size (1024)")
+    parser.add_argument("--profiles", default="10,100,500", help="Cohort sizes")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank", type=int, default=50)
+    parser.add_argument("--tile", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    snapshot = build_store(
+        "int8", clustered_vectors(args.size, args.dim, 64, 0)
+    ).snapshot
+    for count in (int(n) for n in args.profiles.split(",")):
+        queries = clustered_vectors(count, args.dim, 64, seed=1)
+
+        started = time.perf_counter()
+        top = tiled_top_k(queries, snapshot_tiles(snapshot, args.tile), args.rerank)
+        _, columns = rerank_exact(queries, top, snapshot.vectors, args.k)
+        bulk_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loop = [snapshot.search(q, args.k, rerank=args.rerank) for q in queries]
+        loop_s = time.perf_counter() - started
+
+        overlap = np.mean(
+            [
+                len({snapshot.ids[c] for c in row} & {i for i, _ in hits}) / args.k
+                for row, hits in zip(columns, loop, strict=True)
+            ]
+        )
+        print(
+            json.dumps(
+                {
+                    "profiles": count,
+                    "n": args.size,
+                    "dim": args.dim,
+                    "bulk_s": bulk_s,
+                    "per_profile_s": loop_s,
+                    "speedup": loop_s / bulk_s,
+                    f"overlap_at_{args.k}": float(overlap),
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
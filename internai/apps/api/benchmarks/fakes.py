@@ -0,0 +1,116 @@
+"""
+Deterministic fakes and synthetic data for benchmarks.
+"""
+
+import random
+
+import numpy as np
+
+from app.cv_parser import SKILL_SETS
+from app.fake_llm import hash_embedding
+from app.models import JobItem, UserProfile
+
+_TITLES = [
+    "Software Engineering Intern",
+    "Backend Developer Intern",
+    "Frontend Developer Intern",
+    "Data Science Intern",
+    "Machine Learning Intern",
+    "DevOps Engineering Intern",
+    "Security Research Intern",
+    "Blockchain Developer Intern",
+    "Developer Relations Intern",
+    "Data Engineering Intern",
+]
+
+_COMPANIES = [
+    "TechCorp AI",
+    "StartupXYZ",
+    "DataInsights Co.",
+    "CloudBuilders Inc.",
+    "SecureNet Labs",
+    "ChainWorks",
+    "DevHub",
+    "PipelineWorks",
+]
+
+_LOCATIONS = [
+    "New York, NY",
+    "San Francisco, CA",
+    "Remote",
+    "Austin, TX",
+    "Seattle, WA",
+    "London, UK",
+    "Berlin, Germany",
+    None,
+]
+
+_SOURCES = ["linkedin", "indeed", "company_website"]
+
+_FILLER = (
+    "Join our team to build scalable systems and ship features used by "
+    "thousands of customers. You will collaborate with senior engineers, "
+    "write tests, review code and own projects end to end."
+)
+
+ALL_SKILLS = list(
+    dict.fromkeys(skill for skills in SKILL_SETS.values() for skill in skills)
+)
+
+
+def synthetic_jobs(n: int, seed: int = 42) -> list[JobItem]:
+    """Build a deterministic catalog of ``n`` synthetic job postings."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        skills = rng.sample(ALL_SKILLS, 6)
+        desc = (
+            f"{_FILLER} Experience with {', '.join(skills[:4])} required. "
+            f"Familiarity with {skills[4]} and {skills[5]} is a plus."
+        )
+        jobs.append(
+            JobItem(
+                id=str(i),
+                source=rng.choice(_SOURCES),
+                title=rng.choice(_TITLES),
+                company=rng.choice(_COMPANIES),
+                location=rng.choice(_LOCATIONS),
+                url=f"https://example.com/jobs/{i}",
+                desc=desc,
+            )
+        )
+    return jobs
+
+
+def synthetic_profile(seed: int = 7) -> UserProfile:
+    """Build a deterministic user profile with a realistic skill list."""
+    rng = random.Random(seed)
+    return UserProfile(
+        name="Bench User",
+        email="bench@example.com",
+        skills=[skill.title() for skill in rng.sample(ALL_SKILLS, 8)],
+    )
+
+
+class FrozenEmbeddings:
+    """
+    Precomputed embedding table served by text lookup.
+
+    Vectors are computed once with :func:`hash_embedding` during benchmark
+    setup so that timed runs measure the code under test, not the fake.
+    """
+
+    def __init__(self, texts: list[str], dim: int = 64):
+        self.index = {text: i for i, text in enumerate(dict.fromkeys(texts))}
+        self.matrix = np.zeros((len(self.index), dim), dtype=np.float32)
+        for text, row in self.index.items():
+            self.matrix[row] = hash_embedding(text, dim)
+
+    def embed_texts(self, texts: list[str], *args, **kwargs) -> list[list[float]]:
+        """Return embeddings as plain float lists, like the Mistral SDK."""
+        rows = [self.index[text] for text in texts]
+        return self.matrix[rows].tolist()
+
+    def embed_text(self, text: str, *args, **kwargs) -> list[float]:
+        """Return a single embedding as a plain float list."""
+        return self.matrix[self.index[text]].tolist()
@@ -0,0 +1,332 @@
+"""
+Micro-benchmarks for the matching and extraction hot paths.
+
+Each (benchmark, size) case runs in a fresh interpreter so that peak RSS is
+attributable to that case alone. Results are printed as JSON lines, one per
+case, and optionally written to a file for comparison between builds.
+
+Usage (from ``apps/api``):
+
+    python -m benchmarks.hot_paths
+    python -m benchmarks.hot_paths --sizes 10,1000 --only match_jobs,cosine_sim
+    python -m benchmarks.hot_paths --output bench.jsonl
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from . import fakes
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+EMBEDDING_DIM = 64
+MIN_RUN_SECONDS = 0.5
+
+_EMBEDDINGS_CLIENT_PATH = (
+    Path(__file__).resolve().parents[3] / "packages" / "embeddings" / "client.py"
+)
+
+
+def _load_embeddings_client_module():
+    """Load ``packages/embeddings/client.py`` without installing the package."""
+    spec = importlib.util.spec_from_file_location(
+        "embeddings_client", _EMBEDDINGS_CLIENT_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Each setup function builds its inputs (untimed) and returns a zero-argument
+# callable that performs one run over ``n`` items.
+
+
+def _setup_match_jobs(n: int) -> Callable[[], object]:
+    from app import routes
+
+    profile = fakes.synthetic_profile()
+    jobs = fakes.synthetic_jobs(n)
+    texts = [routes._build_profile_text(profile.skills)] + [
+        routes._build_job_text(job) for job in jobs
+    ]
+    embeddings = fakes.FrozenEmbeddings(texts, EMBEDDING_DIM)
+    routes.get_embeddings_client = lambda: embeddings
+    if routes.get_cosine_sim() is None:
+        raise RuntimeError("embeddings package could not be imported")
+
+    return lambda: asyncio.run(routes.match_jobs(profile, jobs))
+
+
+def _setup_find_missing_skills(n: int) -> Callable[[], object]:
+    from app.routes import _find_missing_skills, _profile_entry
+
+    profile = _profile_entry(fakes.synthetic_profile())
+    jobs = fakes.synthetic_jobs(n)
+
+    return lambda: [_find_missing_skills(profile, job) for job in jobs]
+
+
+def _setup_regex_scan_skills(n: int) -> Callable[[], object]:
+    from app.cv_parser import regex_scan_skills
+
+    descs = [job.desc for job in fakes.synthetic_jobs(n)]
+
+    return lambda: [regex_scan_skills(desc) for desc in descs]
+
+
+def _setup_normalize_text(n: int) -> Callable[[], object]:
+    from app.cv_parser import normalize_text
+
+    descs = [job.desc for job in fakes.synthetic_jobs(n)]
+
+    return lambda: [normalize_text(desc) for desc in descs]
+
+
+def _setup_merge_and_dedupe_skills(n: int) -> Callable[[], object]:
+    from app.cv_parser import merge_and_dedupe_skills
+
+    # Half the skills come from each extractor, with realistic case/spacing
+    # variations so deduplication actually has work to do.
+    pool = fakes.ALL_SKILLS
+    regex_skills = [pool[i % len(pool)].title() for i in range(n // 2)]
+    llm_skills = [f" {pool[(i * 7) % len(pool)]} " for i in range(n - n // 2)]
+
+    return lambda: merge_and_dedupe_skills(regex_skills, llm_skills)
+
+
+def _setup_cosine_sim(n: int) -> Callable[[], object]:
+    from app.routes import get_cosine_sim
+
+    cosine_sim = get_cosine_sim()
+    if cosine_sim is None:
+        raise RuntimeError("embeddings package could not be imported")
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(EMBEDDING_DIM)
+    vectors = list(rng.standard_normal((n, EMBEDDING_DIM)))
+
+    return lambda: [cosine_sim(query, vector) for vector in vectors]
+
+
+def _setup_find_most_similar(n: int) -> Callable[[], object]:
+    client_module = _load_embeddings_client_module()
+
+    query = fakes.synthetic_profile().model_dump_json()
+    candidates = [job.desc for job in fakes.synthetic_jobs(n)]
+    client = client_module.EmbeddingsClient(api_key="bench", provider="local")
+    client.provider = fakes.FrozenEmbeddings([query] + candidates, EMBEDDING_DIM)
+    client.config.batch_size = max(n, 1)
+
+    return lambda: client.find_most_similar(query, candidates, top_k=10)
+
+
+def _setup_catalog_search(n: int) -> Callable[[], object]:
+    from app.catalog import JobCatalog, encode_cursor
+
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(job.model_dump() for job in fakes.synthetic_jobs(n))
+    # Start halfway through the catalog to show page cost is independent of depth.
+    cursor = encode_cursor(n // 2)
+
+    def run() -> object:
+        catalog.search(limit=50, cursor=cursor)
+        catalog.search(query="python", limit=50, cursor=cursor)
+        return catalog.search(query="python", source="linkedin", limit=50)
+
+    return run
+
+
+def _setup_bm25_search(n: int) -> Callable[[], object]:
+    from app.bm25 import BM25Index
+
+    index = BM25Index()
+    for job in fakes.synthetic_jobs(n):
+        index.add(job.id, job.title, job.desc)
+    query = " ".join(fakes.synthetic_profile().skills)
+
+    return lambda: index.search(query, k=200)
+
+
+def _setup_dedupe_ingest(n: int) -> Callable[[], object]:
+    from app.catalog import JobCatalog
+    from app.dedupe import JobDeduplicator
+
+    jobs = [job.model_dump() for job in fakes.synthetic_jobs(n)]
+    deduplicator = JobDeduplicator(JobCatalog(":memory:"))
+    deduplicator.ingest(jobs)
+    reposts = [
+        {**job, "id": f"repost-{job['id']}", "desc": job["desc"] + " Apply now."}
+        for job in jobs[:100]
+    ]
+
+    # Reposts are all recorded as duplicates, so every run does the same work.
+    return lambda: deduplicator.ingest(reposts)
+
+
+def _setup_serialize_matches(n: int) -> Callable[[], object]:
+    from app import routes
+    from app.models import MatchResult
+
+    results = [
+        MatchResult.model_construct(job=job, score=50.0, missing_skills=["Docker"])
+        for job in fakes.synthetic_jobs(n)
+    ]
+
+    return lambda: routes._MATCH_RESULTS.dump_json(results)
+
+
+BENCHMARKS: dict[str, Callable[[int], Callable[[], object]]] = {
+    "match_jobs": _setup_match_jobs,
+    "find_missing_skills": _setup_find_missing_skills,
+    "regex_scan_skills": _setup_regex_scan_skills,
+    "normalize_text": _setup_normalize_text,
+    "merge_and_dedupe_skills": _setup_merge_and_dedupe_skills,
+    "cosine_sim": _setup_cosine_sim,
+    "find_most_similar": _setup_find_most_similar,
+    "catalog_search": _setup_catalog_search,
+    "serialize_matches": _setup_serialize_matches,
+    "bm25_search": _setup_bm25_search,
+    "dedupe_ingest": _setup_dedupe_ingest,
+}
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(name: str, n: int, measure_allocations: bool = True) -> dict:
+    """
+    Run a single benchmark case in the current process.
+
+    Args:
+        name: Benchmark name (key of ``BENCHMARKS``)
+        n: Input size (number of jobs, texts or skills)
+        measure_allocations: Whether to do an extra run under tracemalloc
+
+    Returns:
+        Dictionary of machine-readable results for this case
+    """
+    run = BENCHMARKS[name](n)
+    rss_after_setup = _peak_rss_bytes()
+
+    # Warm-up run so lazy imports and caches don't skew the first timing.
+    run()
+
+    timings = []
+    started = time.perf_counter()
+    while not timings or time.perf_counter() - started < MIN_RUN_SECONDS:
+        t0 = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - t0)
+
+    result = {
+        "benchmark": name,
+        "n": n,
+        "runs": len(timings),
+        "mean_s": sum(timings) / len(timings),
+        "min_s": min(timings),
+        "ops_per_s": len(timings) / sum(timings),
+        "items_per_s": n / min(timings) if min(timings) > 0 else None,
+        "setup_rss_bytes": rss_after_setup,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+    if measure_allocations:
+        tracemalloc.start()
+        run()
+        _current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        result["alloc_peak_bytes"] = peak
+        result["alloc_live_blocks"] = sum(
+            stat.count for stat in snapshot.statistics("filename")
+        )
+
+    return result
+
+
+def _run_isolated(name: str, n: int, measure_allocations: bool) -> dict:
+    """Run one case in a child interpreter and parse its JSON result."""
+    cmd = [sys.executable, "-m", "benchmarks.hot_paths", "--case", f"{name}:{n}"]
+    if not measure_allocations:
+        cmd.append("--no-alloc")
+    proc = subprocess.run(
+        cmd,
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return {"benchmark": name, "n": n, "error": proc.stderr.strip()[-500:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(n) for n in DEFAULT_SIZES),
+        help="Comma-separated input sizes (default: 10 to 1M)",
+    )
+    parser.add_argument(
+        "--only", default="", help="Comma-separated subset of benchmarks to run"
+    )
+    parser.add_argument("--output", help="Append JSON-lines results to this file")
+    parser.add_argument(
+        "--no-alloc", action="store_true", help="Skip the tracemalloc run"
+    )
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    measure_allocations = not args.no_alloc
+
+    if args.case:
+        name, n = args.case.split(":")
+        print(json.dumps(run_case(name, int(n), measure_allocations)))
+        return 0
+
+    names = [name for name in args.only.split(",") if name] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    environment = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+
+    output = open(args.output, "a") if args.output else None
+    try:
+        for name in names:
+            for n in sizes:
+                result = _run_isolated(name, n, measure_allocations)
+                result["env"] = environment
+                line = json.dumps(result)
+                print(line, flush=True)
+                if output:
+                    output.write(line + "\n")
+    finally:
+        if output:
+            output.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Startup import-time benchmark for the InternAI API.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+reports the total import time and the slowest modules by cumulative and
+self time, so regressions in worker spawn and cold-start latency show up
+before deploy.
+
+Usage (from ``apps/api``):
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --top 30 --budget-ms 800
+    python -m benchmarks.import_time --module app.routes --output startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def measure(module: str = "main", repeat: int = 3) -> dict:
+    """
+    Import ``module`` in fresh interpreters and collect per-module timings.
+
+    Args:
+        module: Module to import
+        repeat: Number of interpreter runs; the fastest run is reported
+
+    Returns:
+        Dictionary with the total and per-module import times in milliseconds
+    """
+    best = None
+    for _ in range(repeat):
+        run = _run_once(module)
+        if best is None or run["total_ms"] < best["total_ms"]:
+            best = run
+    return best
+
+
+def _run_once(module: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("LLM_BACKEND", "fake")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+
+    total_ms = sum(m["cumulative_ms"] for m in modules if m["depth"] == 0)
+    return {"module": module, "total_ms": round(total_ms, 2), "modules": modules}
+
+
+def _print_table(result: dict, top: int) -> None:
+    print(f"\nimport {result['module']}: {result['total_ms']} ms", file=sys.stderr)
+    for key in ("cumulative_ms", "self_ms"):
+        print(f"  top {top} by {key}:", file=sys.stderr)
+        ranked = sorted(result["modules"], key=lambda m: m[key], reverse=True)
+        for entry in ranked[:top]:
+            print(f"    {entry[key]:>10.2f}  {entry['module']}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs; best is kept")
+    parser.add_argument("--top", type=int, default=15, help="Modules to list")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="Exit non-zero when the total import time exceeds this budget",
+    )
+    parser.add_argument("--output", help="Append a JSON-lines result to this file")
+    args = parser.parse_args(argv)
+
+    result = measure(args.module, args.repeat)
+    _print_table(result, args.top)
+
+    summary = {
+        "module": result["module"],
+        "total_ms": result["total_ms"],
+        "top_cumulative": [
+            {"module": m["module"], "ms": m["cumulative_ms"]}
+            for m in sorted(
+                result["modules"], key=lambda m: m["cumulative_ms"], reverse=True
+            )[: args.top]
+        ],
+    }
+    line = json.dumps(summary)
+    print(line)
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(line + "\n")
+
+    if args.budget_ms is not None and result["total_ms"] > args.budget_ms:
+        print(
+            f"Import time {result['total_ms']} ms exceeds budget "
+            f"{args.budget_ms} ms",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
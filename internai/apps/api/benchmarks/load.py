@@ -0,0 +1,273 @@
+"""
+HTTP load driver for the InternAI API.
+
+Sends mixed traffic to the ``/v1`` endpoints at increasing concurrency levels
+and reports throughput and latency percentiles per endpoint, plus event-loop
+lag. By default the app is served in-process through ``httpx.ASGITransport``
+with the fake LLM backend, so the lag probe measures the server's own event
+loop and no Mistral credits are spent.
+
+Usage (from ``apps/api``):
+
+    python -m benchmarks.load
+    python -m benchmarks.load --concurrency 1,8,32 --duration 5
+    python -m benchmarks.load --base-url http://localhost:8000 --output load.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+DEFAULT_MIX = {
+    "analyze": 20,
+    "match": 25,
+    "write": 10,
+    "coach": 10,
+    "local/cv_analyzer": 10,
+    "local/job_scout": 10,
+    "local/matcher": 5,
+    "local/app_writer": 5,
+    "local/coach": 5,
+}
+
+LAG_PROBE_INTERVAL_S = 0.01
+
+_SAMPLE_JOBS = json.loads(
+    (
+        Path(__file__).resolve().parents[1] / "app" / "data" / "sample_jobs.json"
+    ).read_text()
+)
+
+_RESUME = (
+    "Computer science student with internship experience building REST APIs "
+    "in Python and FastAPI, deploying services with Docker and Kubernetes on "
+    "AWS, and training machine learning models with PyTorch and pandas. "
+    "Led a hackathon team of four and wrote technical documentation."
+)
+
+_PROFILE = {
+    "name": "Load Tester",
+    "email": "load@example.com",
+    "skills": ["Python", "FastAPI", "Docker", "React", "SQL"],
+}
+
+
+def _request_for(endpoint: str, rng: random.Random) -> tuple[str, str, dict | None]:
+    """Build (method, path, json body) for one call to ``endpoint``."""
+    job = rng.choice(_SAMPLE_JOBS)
+    jobs = rng.sample(_SAMPLE_JOBS, min(10, len(_SAMPLE_JOBS)))
+    bodies = {
+        "analyze": {"text": _RESUME},
+        "match": {"profile": _PROFILE, "jobs": jobs},
+        "write": {"job": job, "profile": _PROFILE},
+        "coach": {"role": job["title"], "company": job["company"]},
+        "local/cv_analyzer": {"text": _RESUME},
+        "local/job_scout": {"filters": {}},
+        "local/matcher": {"profile": _PROFILE, "jobs": jobs},
+        "local/app_writer": {"job": job, "profile": _PROFILE},
+        "local/coach": {
+            "role": job["title"],
+            "company": job["company"],
+            "skills": _PROFILE["skills"],
+        },
+    }
+    return "POST", f"/v1/{endpoint}", bodies[endpoint]
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float | None:
+    if not sorted_values:
+        return None
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def _summarize(values: list[float]) -> dict:
+    ordered = sorted(values)
+    return {
+        "p50_ms": _ms(_percentile(ordered, 50)),
+        "p90_ms": _ms(_percentile(ordered, 90)),
+        "p99_ms": _ms(_percentile(ordered, 99)),
+        "max_ms": _ms(ordered[-1] if ordered else None),
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+async def _lag_probe(stop: asyncio.Event, lags: list[float]) -> None:
+    """Record how late the event loop wakes us up compared to the schedule."""
+    while not stop.is_set():
+        expected = time.perf_counter() + LAG_PROBE_INTERVAL_S
+        await asyncio.sleep(LAG_PROBE_INTERVAL_S)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    duration: float,
+    mix: dict[str, int],
+    seed: int,
+) -> dict:
+    """Drive ``concurrency`` closed-loop workers for ``duration`` seconds."""
+    endpoints = list(mix)
+    weights = [mix[endpoint] for endpoint in endpoints]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        while not stop.is_set():
+            endpoint = rng.choices(endpoints, weights)[0]
+            method, path, body = _request_for(endpoint, rng)
+            t0 = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies[endpoint].append(time.perf_counter() - t0)
+            if not ok:
+                errors[endpoint] += 1
+            # In-process requests that only block (never suspend) would
+            # otherwise starve the timer and the lag probe.
+            await asyncio.sleep(0)
+
+    probe = asyncio.create_task(_lag_probe(stop, lags))
+    workers = [asyncio.create_task(worker(i)) for i in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*workers, probe)
+    elapsed = time.perf_counter() - started
+
+    per_endpoint = {}
+    for endpoint in endpoints:
+        values = latencies.get(endpoint, [])
+        per_endpoint[endpoint] = {
+            "requests": len(values),
+            "errors": errors.get(endpoint, 0),
+            "rps": round(len(values) / elapsed, 2),
+            **_summarize(values),
+        }
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "rps": round(len(all_latencies) / elapsed, 2),
+        "latency": _summarize(all_latencies),
+        "loop_lag": _summarize(lags),
+        "endpoints": per_endpoint,
+    }
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in value.split(","):
+        endpoint, _, weight = item.partition("=")
+        if endpoint not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint: {endpoint}")
+        mix[endpoint] = int(weight or 1)
+    return mix
+
+
+def _print_table(result: dict) -> None:
+    print(
+        f"\nconcurrency={result['concurrency']} rps={result['rps']} "
+        f"errors={result['errors']} loop_lag_p99={result['loop_lag']['p99_ms']}ms "
+        f"loop_lag_max={result['loop_lag']['max_ms']}ms",
+        file=sys.stderr,
+    )
+    print(
+        f"  {'endpoint':<20}{'reqs':>7}{'err':>6}{'rps':>9}"
+        f"{'p50':>9}{'p90':>9}{'p99':>9}",
+        file=sys.stderr,
+    )
+    for endpoint, stats in result["endpoints"].items():
+        print(
+            f"  {endpoint:<20}{stats['requests']:>7}{stats['errors']:>6}"
+            f"{stats['rps']:>9}{stats['p50_ms'] or '-':>9}"
+            f"{stats['p90_ms'] or '-':>9}{stats['p99_ms'] or '-':>9}",
+            file=sys.stderr,
+        )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        # Select the fake backend before the app (and its clients) is imported.
+        os.environ.setdefault("LLM_BACKEND", "fake")
+        from main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    output = open(args.output, "a") if args.output else None
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=base_url, timeout=args.timeout
+        ) as client:
+            for concurrency in args.concurrency:
+                result = await run_level(
+                    client, concurrency, args.duration, args.mix, args.seed
+                )
+                result["target"] = args.base_url or "in-process"
+                line = json.dumps(result)
+                print(line, flush=True)
+                _print_table(result)
+                if output:
+                    output.write(line + "\n")
+    finally:
+        if output:
+            output.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--base-url", help="Target a running server instead of in-process ASGI"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda v: [int(c) for c in v.split(",") if c],
+        default=[1, 4, 16, 64],
+        help="Comma-separated concurrency levels (default: 1,4,16,64)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds per level"
+    )
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=dict(DEFAULT_MIX),
+        help="Traffic mix, e.g. analyze=2,match=5,local/coach=1",
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Append JSON-lines results to this file")
+    args = parser.parse_args(argv)
+
+    asyncio.run(_main(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
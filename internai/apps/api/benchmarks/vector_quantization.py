@@ -0,0 +1,100 @@
+"""
+Memory, speed and ranking quality of quantized job vector snapshots.
+
+For each ``VECTOR_DTYPE`` this builds a vector store over synthetic clustered
+unit vectors (``mistral-embed`` sized by default), then runs nearest-job
+searches and compares the top ``k`` against exact float32 search. Prints one
+JSON line per dtype with snapshot bytes, mean search latency and recall@k.
+
+Usage (from ``apps/api``):
+
+    python -m benchmarks.vector_quantization
+    python -m benchmarks.vector_quantization --size 50000 --rerank 300
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.catalog import JobCatalog
+from app.vector_store import DTYPES, VectorStore, text_hash
+
+WRITE_BATCH = 5000
+
+
+def clustered_vectors(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Unit vectors scattered around ``clusters`` centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((clusters, dim))
+    vectors = centroids[rng.integers(0, clusters, n)]
+    vectors = vectors + 0.8 * rng.standard_normal((n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build_store(dtype: str, vectors: np.ndarray) -> VectorStore:
+    store = VectorStore(JobCatalog(":memory:"), dtype=dtype)
+    for start in range(0, len(vectors), WRITE_BATCH):
+        store.write(
+            [
+                (f"job-{i}", text_hash("bench", str(i)), vectors[i])
+                for i in range(start, min(start + WRITE_BATCH, len(vectors)))
+            ]
+        )
+    store.refresh()
+    return store
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=20_000, help="Jobs (20k)")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector size (1024)")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    vectors = clustered_vectors(args.size, args.dim, args.clusters, seed=0)
+    queries = clustered_vectors(args.queries, args.dim, args.clusters, seed=1)
+    truth = [
+        {job_id for job_id, _ in hits}
+        for hits in (
+            build_store("float32", vectors).snapshot.search(q, args.k, rerank=args.k)
+            for q in queries
+        )
+    ]
+
+    for dtype in DTYPES:
+        snapshot = build_store(dtype, vectors).snapshot
+        snapshot.search(queries[0], args.k, rerank=args.rerank)
+        hits, started = [], time.perf_counter()
+        for query in queries:
+            hits.append(snapshot.search(query, args.k, rerank=args.rerank))
+        elapsed = time.perf_counter() - started
+        recall = np.mean(
+            [
+                len(expected & {job_id for job_id, _ in found}) / args.k
+                for expected, found in zip(truth, hits, strict=True)
+            ]
+        )
+        print(
+            json.dumps(
+                {
+                    "dtype": dtype,
+                    "n": args.size,
+                    "dim": args.dim,
+                    "snapshot_bytes": snapshot.nbytes,
+                    "mean_search_s": elapsed / len(queries),
+                    f"recall_at_{args.k}": float(recall),
+                    "rerank": args.rerank,
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,14 +2,18 @@
 FastAPI application for InternAI backend services.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from app.agents_registry import AGENTS, ensure_agents_registered
 from app.coral_client import CoralClient
-from app.routes import router
+from app.documents import shutdown_extract_pool
+from app.llm_scheduler import LLMContextMiddleware
+from app.metrics import CONTENT_TYPE, REGISTRY, PrometheusMiddleware
+from app.routes import get_catalog_sync, router
 from app.settings import settings
+from app.tracing import TracingMiddleware, slow_traces
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,6 +33,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency and in-flight requests for /metrics
+app.add_middleware(PrometheusMiddleware)
+
+# Tag each request's LLM calls with its priority and tenant for the scheduler
+app.add_middleware(LLMContextMiddleware)
+
+# Sample requests into stage traces (Server-Timing, /debug/traces)
+app.add_middleware(TracingMiddleware)
+
 
 # Response models
 class HealthResponse(BaseModel):
@@ -49,10 +62,20 @@ app.include_router(router, prefix="/v1", tags=["api"])
 # Startup event
 @app.on_event("startup")
 async def _startup():
-    """Initialize Coral client and register agents on startup."""
+    """Register agents with Coral and start the catalog sync worker."""
     if settings.CORAL_SERVER_URL and settings.CORAL_API_KEY:
         coral = CoralClient(settings.CORAL_SERVER_URL, settings.CORAL_API_KEY)
         await ensure_agents_registered(coral)
+    if settings.CATALOG_SYNC_INTERVAL > 0:
+        get_catalog_sync().start()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    """Stop the catalog sync worker and document extraction processes."""
+    if settings.CATALOG_SYNC_INTERVAL > 0:
+        get_catalog_sync().stop(timeout=5)
+    shutdown_extract_pool()
 
 
 # Root routes
@@ -72,6 +95,26 @@ async def health_check():
     return HealthResponse(ok=True, status="healthy")
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/traces", include_in_schema=False)
+async def debug_traces():
+    """Recent slow request traces with nested stage timings."""
+    if not settings.DEBUG_TRACES_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    traces = slow_traces.snapshot()
+    return {
+        "sample_rate": settings.TRACE_SAMPLE_RATE,
+        "slow_ms": settings.TRACE_SLOW_MS,
+        "count": len(traces),
+        "traces": traces,
+    }
+
+
 @app.get("/api/info")
 async def api_info():
     """API information endpoint."""
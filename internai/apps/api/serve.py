@@ -0,0 +1,147 @@
+"""
+Production entry point for InternAI API.
+
+Imports the app and preloads read-only data (job catalog, vector snapshot,
+skill and BM25 indexes) once in a parent process, freezes those objects out
+of the garbage collector, then forks ``API_WORKERS`` uvicorn workers that accept on
+a shared listening socket. Workers inherit the preloaded pages copy-on-write,
+so memory per additional worker stays roughly constant as the catalog grows.
+The parent supervises the workers and restarts any that exit unexpectedly.
+Only the first worker (and its replacements) embeds catalog changes; the
+others reload the vectors it writes.
+
+Usage (from ``apps/api``):
+
+    python serve.py
+    python serve.py --workers 8 --port 8080
+
+For development with auto-reload, keep using ``python main.py``.
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+from app.settings import settings
+
+RESPAWN_DELAY_S = 1.0
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(app, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(app, log_level=log_level.lower(), lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """Forks worker processes and keeps ``workers`` of them running."""
+
+    def __init__(self, app, sock: socket.socket, workers: int, log_level: str):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.log_level = log_level
+        # pid -> worker slot, so a restarted worker takes over its slot
+        self.children: dict[int, int] = {}
+        self.should_exit = False
+
+    def spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            gc.enable()
+            # One catalog sync embeds; the other workers only reload vectors
+            settings.CATALOG_SYNC_EMBED = settings.CATALOG_SYNC_EMBED and slot == 0
+            code = 0
+            try:
+                _serve(self.app, self.sock, self.log_level)
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = slot
+
+    def handle_exit(self, signum, frame) -> None:
+        self.should_exit = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        signal.signal(signal.SIGINT, self.handle_exit)
+        for slot in range(self.workers):
+            self.spawn(slot)
+        print(f"Started {self.workers} workers: {sorted(self.children)}")
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            slot = self.children.pop(pid, None)
+            if slot is None:
+                continue
+            if not self.should_exit:
+                print(
+                    f"Warning: Worker {pid} exited with status {status}, restarting",
+                    file=sys.stderr,
+                )
+                time.sleep(RESPAWN_DELAY_S)
+                if not self.should_exit:
+                    self.spawn(slot)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=settings.API_PORT)
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS)
+    parser.add_argument("--log-level", default=settings.LOG_LEVEL)
+    args = parser.parse_args(argv)
+
+    # Keep collections from touching (and un-sharing) preloaded objects
+    gc.disable()
+
+    from app.preload import preload
+    from main import app
+
+    timings = preload()
+    print(f"Preloaded {len(timings)} data sets in {sum(timings.values()):.0f} ms")
+
+    sock = _bind(args.host, args.port)
+    gc.collect()
+    gc.freeze()
+
+    try:
+        if args.workers <= 1 or not hasattr(os, "fork"):
+            gc.enable()
+            _serve(app, sock, args.log_level)
+        else:
+            Supervisor(app, sock, args.workers, args.log_level).run()
+    finally:
+        sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Tests for the BM25 index and hybrid matching.
+"""
+
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.bm25 import BM25Index, fuse, tokenize
+from app.catalog import JobCatalog, load_sample_jobs
+from main import app
+
+
+def _catalog() -> JobCatalog:
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(load_sample_jobs())
+    catalog.upsert_many(
+        [
+            {
+                "id": "sol",
+                "source": "company_website",
+                "title": "Smart Contract Intern",
+                "company": "ChainCo",
+                "url": "https://example.com/sol",
+                "desc": "Write Solidity contracts and audit them with Cairo tooling.",
+            }
+        ]
+    )
+    return catalog
+
+
+def test_tokenize_keeps_tech_terms():
+    """Test tokenization keeps C++, C# and Node.js intact and drops stopwords."""
+    assert tokenize("C++ and C# with Node.js, the API.") == [
+        "c++",
+        "c#",
+        "node.js",
+        "api",
+    ]
+
+
+def test_exact_terms_rank_first():
+    """Test rare exact terms pull the matching job to the top."""
+    index = BM25Index()
+    index.sync(_catalog())
+
+    results = index.search("cairo", k=5)
+    assert [job_id for job_id, _ in results] == ["sol"]
+    assert index.search("solidity cairo", k=5)[0][0] == "sol"
+    assert index.search("python machine learning", k=3)[0][1] > 0
+
+
+def test_sync_applies_incremental_changes():
+    """Test the index follows catalog upserts and deletes without a rebuild."""
+    catalog = _catalog()
+    index = BM25Index()
+    index.sync(catalog)
+    size = len(index)
+
+    job = dict(load_sample_jobs()[0], desc="Rust and WebAssembly tooling")
+    catalog.upsert_many([job])
+    catalog.delete(["sol"])
+    version = index.sync(catalog)
+
+    assert version == catalog.version()
+    assert len(index) == size - 1
+    assert index.search("cairo", k=5) == []
+    assert index.search("webassembly", k=5)[0][0] == job["id"]
+    assert job["id"] not in dict(index.search("tensorflow pytorch", k=50))
+
+
+def test_fuse_modes():
+    """Test fusion modes produce 0-100 scores in the expected order."""
+    lexical = [("a", 10.0), ("b", 5.0), ("c", 1.0)]
+    semantic = {"a": 0.2, "b": 0.9, "c": 0.5}
+
+    assert [job_id for job_id, _ in fuse(lexical, semantic, "rerank")] == [
+        "b",
+        "c",
+        "a",
+    ]
+    weighted = fuse(lexical, semantic, "weighted", alpha=0.5)
+    assert weighted[0] == ("b", 70.0)
+    rrf = fuse(lexical, semantic, "rrf")
+    assert rrf[0][0] in {"a", "b"}
+    assert all(0 <= score <= 100 for _, score in rrf)
+
+
+def test_hybrid_match_endpoint(monkeypatch):
+    """Test hybrid mode retrieves candidates from the catalog."""
+    catalog = _catalog()
+    index = BM25Index()
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(
+        routes, "get_bm25_index", lambda c: index.sync(c) is not None and index
+    )
+    client = TestClient(app)
+
+    response = client.post(
+        "/v1/match",
+        params={"mode": "hybrid", "candidates": 10, "limit": 3},
+        json={"profile": {"skills": ["Solidity", "Cairo"]}},
+    )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["job"]["id"] == "sol"
+    assert len(results) <= 3
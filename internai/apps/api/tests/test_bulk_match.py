@@ -0,0 +1,158 @@
+"""
+Tests for cohort matching with tiled matrix products.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.bulk_match import TopK, matrix_tiles, rerank_exact, tiled_top_k, unit_rows
+from app.catalog import JobCatalog, load_sample_jobs
+from app.vector_store import VectorStore, text_hash
+from main import app
+
+client = TestClient(app)
+
+SKILLS = ["Python", "Docker", "React", "SQL", "Go", "AWS"]
+
+PROFILES = [{"skills": SKILLS[i : i + 2]} for i in range(5)]
+
+JOBS = [
+    {
+        "id": f"job-{i}",
+        "source": "linkedin",
+        "title": f"Intern {i}",
+        "company": "TechCorp",
+        "url": f"https://example.com/job/{i}",
+        "desc": " ".join(SKILLS[i % 6 :] + SKILLS[: i % 3]),
+    }
+    for i in range(30)
+]
+
+
+class HashEmbeddings:
+    """Deterministic embeddings that record every request's size."""
+
+    model = "test-embed"
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.batches: list[int] = []
+
+    def vector(self, text: str) -> list[float]:
+        rng = np.random.default_rng(sum(map(ord, text)) + len(text))
+        return rng.standard_normal(self.dim).tolist()
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(len(texts))
+        return [self.vector(text) for text in texts]
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    fake = HashEmbeddings()
+    monkeypatch.setattr(routes, "get_embeddings_client", lambda: fake)
+    routes.profile_cache.clear()
+    yield fake
+    routes.profile_cache.clear()
+
+
+def test_tiled_top_k_matches_full_sort():
+    """Test merging tiles gives the same top k as sorting the full product."""
+    rng = np.random.default_rng(0)
+    queries = unit_rows(rng.standard_normal((7, 32)))
+    jobs = unit_rows(rng.standard_normal((1000, 32)))
+    full = queries @ jobs.T
+
+    for tile in (1, 64, 333, 5000):
+        scores, columns = tiled_top_k(queries, matrix_tiles(jobs, tile), 10).result()
+        expected = np.argsort(-full, axis=1)[:, :10]
+        assert np.array_equal(columns, expected)
+        assert np.allclose(scores, np.take_along_axis(full, expected, axis=1))
+
+
+def test_rerank_fetches_shared_candidates_once():
+    """Test exact rescoring fetches each candidate column a single time."""
+    queries = unit_rows(np.eye(3, 4))
+    jobs = unit_rows(np.eye(4) + 0.1)
+    top = TopK(3, 3)
+    top.push(queries @ jobs.T, np.arange(4))
+    fetched = []
+
+    def exact(columns):
+        fetched.append(list(columns))
+        return jobs[columns]
+
+    scores, columns = rerank_exact(queries, top, exact, 1)
+
+    assert len(fetched) == 1 and len(fetched[0]) == len(set(fetched[0]))
+    assert columns[:, 0].tolist() == [0, 1, 2]
+
+
+def test_bulk_matches_each_profile_like_match(embeddings):
+    """Test shortlists equal per-profile /match, embedding each job once."""
+    response = client.post(
+        "/v1/match/bulk?limit=5", json={"profiles": PROFILES, "jobs": JOBS}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == len(PROFILES)
+    # 5 profiles in one request, then 30 jobs in batches
+    assert embeddings.batches[0] == 5
+    assert sum(embeddings.batches[1:]) == len(JOBS)
+    for profile, result in zip(PROFILES, data, strict=True):
+        single = client.post("/v1/match", json={"profile": profile, "jobs": JOBS})
+        expected = single.json()[:5]
+        assert [m["job"]["id"] for m in result["matches"]] == [
+            m["job"]["id"] for m in expected
+        ]
+        assert [m["score"] for m in result["matches"]] == pytest.approx(
+            [m["score"] for m in expected], abs=0.11
+        )
+        assert result["matches"][0]["missing_skills"] == expected[0]["missing_skills"]
+        assert result["profile_handle"].startswith("p1.")
+
+
+def test_bulk_ranks_whole_catalog(embeddings, monkeypatch):
+    """Test catalog mode scans the quantized snapshot for every profile."""
+    catalog = JobCatalog(":memory:")
+    jobs = load_sample_jobs()
+    catalog.upsert_many(jobs)
+    store = VectorStore(catalog, dtype="int8")
+    store.write(
+        [
+            (
+                job["id"],
+                text_hash("test-embed", job["id"]),
+                np.array(embeddings.vector(job["id"])),
+            )
+            for job in jobs
+        ]
+    )
+    store.refresh()
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(routes, "current_snapshot", lambda: store.snapshot)
+    monkeypatch.setattr(routes.settings, "BULK_MATCH_TILE", 4)
+
+    response = client.post(
+        "/v1/match/bulk?limit=3&candidates=6", json={"profiles": PROFILES}
+    )
+
+    data = response.json()
+    assert len(data) == len(PROFILES)
+    for result in data:
+        query = routes.profile_cache.get_or_build(
+            result["profile_handle"], lambda: None
+        ).vector("test-embed")
+        expected = store.snapshot.search(query, 3, rerank=len(jobs))
+        assert len(result["matches"]) == 3
+        assert [m["job"]["id"] for m in result["matches"]] == [i for i, _ in expected]
+
+
+def test_bulk_validates_profiles(embeddings):
+    """Test empty cohorts get 422 and malformed handles 400."""
+    assert client.post("/v1/match/bulk", json={"jobs": JOBS}).status_code == 422
+    response = client.post("/v1/match/bulk", json={"profile_handles": ["bad"]})
+    assert response.status_code == 400
@@ -0,0 +1,163 @@
+"""
+Tests for the SQLite job catalog.
+"""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.catalog import (
+    InvalidCursorError,
+    JobCatalog,
+    catalog_path,
+    fts_query,
+    load_sample_jobs,
+)
+from app.listing_cache import listing_cache
+from main import app
+
+
+def _job(i: int, **overrides) -> dict:
+    job = {
+        "id": f"job-{i}",
+        "source": "linkedin" if i % 2 else "indeed",
+        "title": f"Backend Intern {i}",
+        "company": f"Company {i}",
+        "location": "New York, NY" if i % 3 == 0 else "Remote",
+        "url": f"https://example.com/{i}",
+        "desc": "Python and FastAPI services" if i % 4 == 0 else "React frontend",
+    }
+    job.update(overrides)
+    return job
+
+
+@pytest.fixture
+def catalog():
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(_job(i) for i in range(1, 101))
+    yield catalog
+    catalog.close()
+
+
+def test_keyset_pagination_walks_all_jobs(catalog):
+    """Test following next_cursor returns every job exactly once."""
+    seen, cursor = [], None
+    while True:
+        page, cursor = catalog.search(limit=30, cursor=cursor)
+        seen.extend(job["id"] for job in page)
+        if cursor is None:
+            break
+
+    assert seen == [f"job-{i}" for i in range(1, 101)]
+
+
+def test_search_filters_combine(catalog):
+    """Test full-text, source and location filters are ANDed together."""
+    page, cursor = catalog.search(
+        query="python", source="indeed", location="new york", limit=200
+    )
+
+    assert cursor is None
+    assert [job["id"] for job in page] == [f"job-{i}" for i in range(12, 101, 12)]
+
+
+def test_upsert_updates_index(catalog):
+    """Test re-upserting changes the row and the full-text index, not the count."""
+    assert catalog.upsert_many([_job(1)]) == 0
+    assert catalog.upsert_many([_job(1, title="Quantum Intern")]) == 1
+
+    assert catalog.count() == 100
+    assert [job["id"] for job in catalog.search(query="quantum")[0]] == ["job-1"]
+    assert catalog.search(query="quantum intern company 1")[0][0]["id"] == "job-1"
+    assert catalog.delete(["job-1"]) == 1
+    assert catalog.search(query="quantum")[0] == []
+
+
+def test_scan_changes_runs_callbacks_outside_the_lock(tmp_path):
+    """Test callbacks may write to the catalog, and later writes wait a scan."""
+    catalog = JobCatalog(str(tmp_path / "catalog.db"))
+    catalog.upsert_many(_job(i) for i in range(1, 6))
+    seen = []
+
+    def on_upsert(job):
+        seen.append(job["id"])
+        if job["id"] == "job-1":
+            catalog.upsert_many([_job(6)])
+
+    version = catalog.scan_changes(None, on_upsert, print, batch_size=2)
+
+    assert seen == [f"job-{i}" for i in range(1, 6)]
+    assert version == catalog.version() - 1
+    seen.clear()
+    assert catalog.scan_changes(version, on_upsert, print) == catalog.version()
+    assert seen == ["job-6"]
+    catalog.close()
+
+
+def test_file_catalog_reads_skip_the_write_lock(tmp_path):
+    """Test reads on a WAL database do not wait for the writer's lock."""
+    catalog = JobCatalog(str(tmp_path / "catalog.db"))
+    catalog.upsert_many(_job(i) for i in range(1, 4))
+    found = []
+
+    with catalog._lock:
+        reader = threading.Thread(
+            target=lambda: found.append(catalog.search(limit=10)[0])
+        )
+        reader.start()
+        reader.join(timeout=5)
+
+    assert [job["id"] for job in found[0]] == ["job-1", "job-2", "job-3"]
+    catalog.close()
+
+
+def test_fts_query_neutralizes_operators():
+    """Test user text cannot inject FTS5 syntax."""
+    assert fts_query('c++ OR "title": NEAR(') == '"c" "or" "title" "near"*'
+    assert fts_query("  ?! ") is None
+
+
+def test_invalid_cursor_rejected(catalog):
+    """Test malformed cursors raise a clear error."""
+    with pytest.raises(InvalidCursorError):
+        catalog.search(cursor="not-a-cursor!")
+
+
+def test_catalog_path_from_database_url():
+    """Test only sqlite URLs select the database file."""
+    assert catalog_path("sqlite:///data/jobs.db", "./storage") == "data/jobs.db"
+    assert catalog_path(None, "/tmp/store") == "/tmp/store/catalog.db"
+    assert catalog_path("postgresql://db/x", "/tmp/store") == "/tmp/store/catalog.db"
+
+
+def test_jobs_endpoints_serve_pages(monkeypatch):
+    """Test /jobs/sample and /local/job_scout page through the catalog."""
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(load_sample_jobs())
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    listing_cache.clear()
+    client = TestClient(app)
+
+    response = client.get("/v1/jobs/sample", params={"limit": 15})
+    assert response.status_code == 200
+    assert len(response.json()) == 15
+    cursor = response.headers["x-next-cursor"]
+
+    response = client.get("/v1/jobs/sample", params={"limit": 15, "cursor": cursor})
+    assert len(response.json()) == 5
+    assert "x-next-cursor" not in response.headers
+
+    response = client.post(
+        "/v1/local/job_scout", json={"filters": {"query": "machine learning"}}
+    )
+    data = response.json()
+    assert data["next_cursor"] is None
+    assert data["jobs"]
+    assert all(
+        "machine learning" in (job["title"] + job["desc"]).lower()
+        for job in data["jobs"]
+    )
+
+    assert client.get("/v1/jobs/sample", params={"cursor": "!!"}).status_code == 400
@@ -0,0 +1,216 @@
+"""
+Tests for incremental catalog re-embedding and the vector store.
+"""
+
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from app import catalog_sync as catalog_sync_module
+from app import routes
+from app.catalog import JobCatalog, load_sample_jobs
+from app.catalog_sync import CatalogSync, CatalogSyncWorker
+from app.models import UserProfile
+from app.vector_store import VectorStore
+
+
+class CountingEmbeddings:
+    """Deterministic embeddings client that records every text it embeds."""
+
+    model = "test-embed"
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [
+            list(np.frombuffer(hashlib.sha256(t.encode()).digest(), dtype=np.uint8))
+            for t in texts
+        ]
+
+    @property
+    def embedded(self) -> int:
+        return sum(len(call) for call in self.calls)
+
+
+@pytest.fixture
+def catalog():
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(load_sample_jobs())
+    yield catalog
+    catalog.close()
+
+
+def _sync(catalog, client, store=None, batch_size=8):
+    return CatalogSync(
+        catalog,
+        store or VectorStore(catalog),
+        build_text=routes._build_job_text,
+        get_client=lambda: client,
+        batch_size=batch_size,
+    )
+
+
+def test_only_new_or_changed_jobs_are_embedded(catalog):
+    """Test embedding spend follows churn, not catalog size."""
+    client = CountingEmbeddings()
+    sync = _sync(catalog, client)
+
+    first = sync.run_once()
+    assert (first.scanned, first.embedded, first.batches) == (20, 20, 3)
+    assert len(sync.store.snapshot) == 20
+
+    assert sync.run_once().scanned == 0
+    job, other = load_sample_jobs()[:2]
+    catalog.upsert_many(
+        [
+            {**job, "desc": job["desc"] + " Updated."},
+            {**other, "url": other["url"] + "?ref=feed"},
+        ]
+    )
+    stats = sync.run_once()
+
+    assert (stats.scanned, stats.embedded, stats.unchanged) == (2, 1, 1)
+    assert client.embedded == 21
+    assert client.calls[-1] == [
+        routes._build_job_text(catalog.get_items([job["id"]])[0])
+    ]
+
+
+def test_deleted_jobs_leave_the_snapshot(catalog):
+    """Test removed jobs are tombstoned and the old snapshot stays intact."""
+    sync = _sync(catalog, CountingEmbeddings())
+    sync.run_once()
+    before = sync.store.snapshot
+    removed = load_sample_jobs()[3]["id"]
+
+    catalog.delete([removed])
+    stats = sync.run_once()
+
+    assert stats.deleted == 1
+    assert removed not in sync.store.snapshot.ids
+    assert removed in before.ids and len(before) == 20
+    assert not sync.store.snapshot.codes.flags.writeable
+
+
+def test_restart_reuses_stored_vectors(catalog):
+    """Test a new process re-embeds nothing, even if the sync marker is lost."""
+    client = CountingEmbeddings()
+    _sync(catalog, client).run_once()
+
+    restarted = _sync(catalog, client)
+    assert restarted.run_once().scanned == 0
+    assert len(restarted.store.snapshot) == 20
+
+    with catalog.transaction() as conn:
+        conn.execute("UPDATE catalog_meta SET value = -1 WHERE key = 'vector_synced'")
+    stats = _sync(catalog, client).run_once()
+
+    assert (stats.scanned, stats.unchanged, stats.embedded) == (20, 20, 0)
+    assert client.embedded == 20
+
+
+def test_one_process_holds_the_lease(catalog, monkeypatch):
+    """Test only the lease holder embeds; other workers just refresh."""
+    client = CountingEmbeddings()
+    leader = CatalogSyncWorker(_sync(catalog, client), interval=60)
+    follower = CatalogSyncWorker(_sync(catalog, client), interval=60)
+
+    assert leader.step().embedded == 20
+    monkeypatch.setattr(catalog_sync_module.os, "getpid", lambda: -1)
+    assert follower.step() is None
+    assert len(follower.sync.store.snapshot) == 20
+    assert client.embedded == 20
+
+
+def test_changes_are_embedded_while_scanning(catalog):
+    """Test batches are embedded as the scan streams, not after it ends."""
+    client = CountingEmbeddings()
+    built = []
+    built_at_embed = []
+
+    def build_text(job):
+        built.append(job.id)
+        return routes._build_job_text(job)
+
+    def embed_texts(texts):
+        built_at_embed.append(len(built))
+        return CountingEmbeddings.embed_texts(client, texts)
+
+    client.embed_texts = embed_texts
+    sync = _sync(catalog, client)
+    sync.build_text = build_text
+
+    assert sync.run_once().embedded == 20
+    assert built_at_embed == [8, 16, 20]
+
+
+def test_non_embedding_worker_only_refreshes(catalog):
+    """Test a worker started with embed=False never takes the lease."""
+    client = CountingEmbeddings()
+    follower = CatalogSyncWorker(_sync(catalog, client), interval=60, embed=False)
+
+    assert follower.step() is None
+    assert client.embedded == 0
+    assert CatalogSyncWorker(_sync(catalog, client), interval=60).step().embedded == 20
+    assert follower.step() is None
+    assert len(follower.sync.store.snapshot) == 20
+
+
+def test_sync_stops_when_the_lease_is_lost(catalog, monkeypatch):
+    """Test a holder whose lease expires mid-run stops before the next batch."""
+    taken_over = CountingEmbeddings()
+    client = CountingEmbeddings()
+    worker = CatalogSyncWorker(_sync(catalog, client), interval=60)
+
+    def embed_then_stall(texts):
+        # The batch outlives the lease, and process -1 claims it
+        with catalog.transaction() as conn:
+            conn.execute(
+                "UPDATE catalog_meta SET value = 0 WHERE key = 'vector_sync_lease'"
+            )
+        with monkeypatch.context() as m:
+            m.setattr(catalog_sync_module.os, "getpid", lambda: -1)
+            assert _sync(catalog, taken_over).acquire_lease(ttl=60)
+        return CountingEmbeddings.embed_texts(client, texts)
+
+    monkeypatch.setattr(client, "embed_texts", embed_then_stall)
+    stats = worker.step()
+
+    assert stats.interrupted
+    assert (stats.embedded, stats.batches) == (8, 1)
+    assert len(worker.sync.store.snapshot) == 8
+    with catalog.transaction(write=False) as conn:
+        synced = conn.execute(
+            "SELECT value FROM catalog_meta WHERE key = 'vector_synced'"
+        ).fetchone()[0]
+    assert synced == -1
+
+    # The new holder resumes without re-embedding the committed batch
+    monkeypatch.setattr(catalog_sync_module.os, "getpid", lambda: -1)
+    resumed = _sync(catalog, taken_over).run_once()
+    assert (resumed.unchanged, resumed.embedded) == (8, 12)
+
+
+def test_match_reuses_catalog_vectors(catalog, monkeypatch):
+    """Test /match only embeds the profile when job vectors are current."""
+    client = CountingEmbeddings()
+    sync = _sync(catalog, client)
+    sync.run_once()
+    client.calls.clear()
+    routes.profile_cache.clear()
+    monkeypatch.setattr(routes, "get_embeddings_client", lambda: client)
+    monkeypatch.setattr(routes, "current_snapshot", lambda: sync.store.snapshot)
+
+    jobs = catalog.get_items([job["id"] for job in load_sample_jobs()[:5]])
+    edited = jobs[0].model_copy(update={"desc": "Rewritten description"})
+    profile = UserProfile(skills=["Python"])
+    results = asyncio.run(routes.match_jobs(profile, [edited] + jobs[1:]))
+
+    assert len(results) == 5
+    assert client.calls == [
+        [routes._build_profile_text(profile.skills), routes._build_job_text(edited)]
+    ]
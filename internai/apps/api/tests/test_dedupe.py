@@ -0,0 +1,180 @@
+"""
+Tests for MinHash/LSH near-duplicate ingestion.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import dedupe, routes
+from app.bm25 import BM25Index
+from app.catalog import JobCatalog, load_sample_jobs
+from app.catalog_sync import CatalogSync
+from app.dedupe import JobDeduplicator, MinHasher, lsh_bands, similarity
+from app.vector_store import VectorStore
+from main import app
+
+
+def _repost(job: dict, job_id: str, source: str = "indeed") -> dict:
+    return {
+        **job,
+        "id": job_id,
+        "source": source,
+        "url": f"https://{source}.com/{job_id}",
+        "desc": job["desc"] + " Apply today!",
+    }
+
+
+@pytest.fixture
+def catalog():
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(load_sample_jobs())
+    yield catalog
+    catalog.close()
+
+
+def test_signatures_estimate_similarity():
+    """Test small edits keep signatures close and unrelated text far apart."""
+    hasher = MinHasher(128)
+    job = load_sample_jobs()[0]
+    original = hasher.signature(job["desc"])
+    edited = hasher.signature(job["desc"] + " Apply today!")
+    unrelated = hasher.signature(load_sample_jobs()[1]["desc"])
+
+    assert similarity(original, original) == 1.0
+    assert similarity(original, edited) > 0.8
+    assert similarity(original, unrelated) < 0.3
+    assert hasher.signature("  ?! ") is None
+
+
+def test_lsh_bands_keep_threshold_reachable():
+    """Test banding puts the S-curve midpoint at or below the threshold."""
+    assert lsh_bands(128, 0.8) == 16
+    assert lsh_bands(128, 0.5) == 32
+    assert lsh_bands(100, 0.9) == 10
+
+
+def test_reposts_are_not_indexed(catalog):
+    """Test a repost from another source is recorded, not added to the catalog."""
+    deduplicator = JobDeduplicator(catalog)
+    original = load_sample_jobs()[0]
+    version = catalog.version()
+
+    stats = deduplicator.ingest([_repost(original, "indeed-1")])
+
+    assert (stats.received, stats.changed, stats.duplicates) == (1, 0, 1)
+    assert catalog.version() == version
+    assert catalog.get_many(["indeed-1"]) == []
+    [duplicate] = deduplicator.duplicates(original["id"])
+    assert duplicate["id"] == "indeed-1"
+    assert duplicate["source"] == "indeed"
+    assert duplicate["similarity"] >= deduplicator.threshold
+
+    index = BM25Index()
+    index.sync(catalog)
+    assert "indeed-1" not in {job_id for job_id, _ in index.search("ai ml", 100)}
+
+
+def test_duplicates_within_one_stream():
+    """Test the first posting of a cluster wins, even inside one batch."""
+    catalog = JobCatalog(":memory:")
+    deduplicator = JobDeduplicator(catalog)
+    first = load_sample_jobs()[2]
+    other = load_sample_jobs()[3]
+
+    stats = deduplicator.ingest(
+        [first, _repost(first, "copy-a"), other, _repost(first, "copy-b", "site")]
+    )
+
+    assert stats.duplicates == 2
+    assert catalog.count() == 2
+    assert {d["id"] for d in deduplicator.duplicates(first["id"])} == {
+        "copy-a",
+        "copy-b",
+    }
+
+
+def test_known_ids_update_in_place(catalog):
+    """Test re-ingesting a canonical job updates it instead of flagging it."""
+    deduplicator = JobDeduplicator(catalog)
+    job = load_sample_jobs()[4]
+
+    stats = deduplicator.ingest([{**job, "desc": job["desc"] + " Now hiring."}])
+
+    assert (stats.changed, stats.duplicates) == (1, 0)
+    assert catalog.get_many([job["id"]])[0]["desc"].endswith("Now hiring.")
+
+
+def test_deleting_canonical_releases_duplicates(catalog):
+    """Test a repost becomes canonical once the original leaves the catalog."""
+    deduplicator = JobDeduplicator(catalog)
+    original = load_sample_jobs()[5]
+    repost = _repost(original, "indeed-5")
+    deduplicator.ingest([repost])
+
+    catalog.delete([original["id"]])
+    assert deduplicator.duplicates(original["id"]) == []
+
+    stats = deduplicator.ingest([repost])
+    assert (stats.changed, stats.duplicates) == (1, 0)
+    assert catalog.get_many(["indeed-5"])[0]["source"] == "indeed"
+
+
+def test_parameter_change_rebuilds_signatures(catalog, capsys):
+    """Test changing the signature length re-signs the catalog."""
+    JobDeduplicator(catalog, num_perm=128).backfill()
+    deduplicator = JobDeduplicator(catalog, num_perm=64)
+
+    assert "rebuilding job signatures" in capsys.readouterr().out
+    assert deduplicator.backfill() == catalog.count()
+    stats = deduplicator.ingest([_repost(load_sample_jobs()[6], "indeed-6")])
+    assert stats.duplicates == 1
+
+
+def test_ingest_endpoint_skips_reposts(catalog, monkeypatch):
+    """Test /v1/jobs/ingest needs its key and routes jobs through dedupe."""
+    deduplicator = JobDeduplicator(catalog)
+    monkeypatch.setattr(dedupe, "get_deduplicator", lambda: deduplicator)
+    client = TestClient(app)
+    original = load_sample_jobs()[7]
+    jobs = [_repost(original, "indeed-7")]
+
+    monkeypatch.setattr(routes.settings, "JOB_INGEST_API_KEY", None)
+    assert client.post("/v1/jobs/ingest", json=jobs).status_code == 404
+    monkeypatch.setattr(routes.settings, "JOB_INGEST_API_KEY", "secret")
+    wrong = client.post("/v1/jobs/ingest", json=jobs, headers={"X-API-Key": "x"})
+    assert wrong.status_code == 401
+
+    response = client.post(
+        "/v1/jobs/ingest", json=jobs, headers={"X-API-Key": "secret"}
+    )
+
+    assert response.json() == {"received": 1, "changed": 0, "duplicates": 1}
+    assert catalog.get_many(["indeed-7"]) == []
+
+
+def test_catalog_sync_skips_recorded_duplicates(catalog):
+    """Test a duplicate written straight to ``jobs`` is not embedded."""
+    original = load_sample_jobs()[8]
+    JobDeduplicator(catalog).ingest([_repost(original, "indeed-8")])
+    catalog.upsert_many([_repost(original, "indeed-8")])
+
+    class Embeddings:
+        model = "test-embed"
+        texts = []
+
+        def embed_texts(self, texts):
+            self.texts.extend(texts)
+            return [[1.0, 0.0] for _ in texts]
+
+    client = Embeddings()
+    sync = CatalogSync(
+        catalog,
+        VectorStore(catalog),
+        build_text=routes._build_job_text,
+        get_client=lambda: client,
+    )
+    stats = sync.run_once()
+
+    assert stats.duplicates == 1
+    assert stats.embedded == len(client.texts) == catalog.count() - 1
+    assert "indeed-8" not in sync.store.snapshot.ids
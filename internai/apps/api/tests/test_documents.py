@@ -0,0 +1,173 @@
+"""
+Tests for resume uploads and document text extraction.
+"""
+
+import io
+import os
+import time
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import documents, routes
+from app.documents import (
+    DOCX,
+    PDF,
+    DocumentError,
+    detect_kind,
+    extract_text,
+    shutdown_extract_pool,
+)
+from main import app
+
+client = TestClient(app)
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    """A minimal DOCX file with one run per paragraph."""
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{W}"><w:body>{body}</w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+def make_pdf(text: str) -> bytes:
+    """A one-page PDF showing ``text`` in Helvetica."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    """Capture the text handed to ``analyze_profile``."""
+    texts = []
+
+    async def analyze(text):
+        texts.append(text)
+        return {"skills": ["Python"], "highlights": [], "profile_text": "Python"}
+
+    monkeypatch.setattr(routes, "analyze_profile", analyze)
+    return texts
+
+
+def test_docx_upload_is_extracted_in_worker_process(analyzed):
+    """Test a DOCX upload is extracted in the pool and analyzed."""
+    docx = make_docx("Jane Doe", "Built FastAPI services in Python")
+    try:
+        response = client.post("/v1/analyze/upload", files={"file": ("cv.docx", docx)})
+    finally:
+        shutdown_extract_pool()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert analyzed == ["Jane Doe\nBuilt FastAPI services in Python"]
+    assert data["skills"] == ["Python"]
+    assert data["profile_handle"]
+    assert (data["filename"], data["kind"], data["size_bytes"]) == (
+        "cv.docx",
+        DOCX,
+        len(docx),
+    )
+    assert set(data["timings_ms"]) == {"receive", "extract", "analyze"}
+
+
+def test_pdf_text_is_extracted():
+    """Test PDF text layers are read with pypdf."""
+    pytest.importorskip("pypdf")
+    pdf = make_pdf("Data engineer skilled in SQL")
+
+    assert detect_kind("cv.pdf", "application/pdf", pdf[:8]) == PDF
+    assert "Data engineer skilled in SQL" in extract_text(pdf, PDF)
+    with pytest.raises(DocumentError):
+        extract_text(b"%PDF-1.4 truncated", PDF)
+
+
+def test_uploads_over_the_limit_are_rejected(monkeypatch, analyzed):
+    """Test the size cap applies to declared and streamed bodies alike."""
+    monkeypatch.setattr(routes.settings, "UPLOAD_MAX_BYTES", 1024)
+    too_big = client.post(
+        "/v1/analyze/upload", files={"file": ("cv.txt", b"Python " * 400)}
+    )
+    assert too_big.status_code == 413
+    assert too_big.json()["detail"] == "Upload exceeds 1 KB"
+
+    def chunks():
+        yield b"--b\r\nContent-Disposition: form-data; name=file; filename=cv.txt"
+        yield b"\r\n\r\n"
+        for _ in range(10):
+            yield b"x" * 512
+
+    streamed = client.post(
+        "/v1/analyze/upload",
+        content=chunks(),
+        headers={"Content-Type": "multipart/form-data; boundary=b"},
+    )
+    assert streamed.status_code == 413
+    assert analyzed == []
+
+
+def test_unusable_uploads_are_rejected(monkeypatch, analyzed):
+    """Test unsupported formats, broken files and empty text get clear errors."""
+    monkeypatch.setattr(routes.settings, "UPLOAD_EXTRACT_WORKERS", 0)
+    shutdown_extract_pool()
+
+    def upload(name, content):
+        return client.post("/v1/analyze/upload", files={"file": (name, content)})
+
+    assert upload("cv.png", b"\x89PNG\r\n\x1a\n").status_code == 415
+    assert upload("cv.docx", b"PK\x03\x04 not a zip").status_code == 422
+    assert upload("cv.txt", b"   \n").status_code == 422
+    assert client.post("/v1/analyze/upload", json={"text": "x"}).status_code == 415
+    assert upload("cv.txt", b"Go and Rust").status_code == 200
+    assert analyzed == ["Go and Rust"]
+    shutdown_extract_pool()
+
+
+def test_slow_extraction_times_out(monkeypatch, analyzed):
+    """Test extraction is abandoned after the timeout and its file removed."""
+    monkeypatch.setattr(routes.settings, "UPLOAD_EXTRACT_WORKERS", 0)
+    monkeypatch.setattr(routes.settings, "UPLOAD_EXTRACT_TIMEOUT", 0.05)
+    shutdown_extract_pool()
+    saved = []
+
+    def save(file):
+        saved.append(documents.save_upload(file))
+        return saved[-1]
+
+    def slow(path, kind, max_pages):
+        time.sleep(0.5)
+        return "too late"
+
+    monkeypatch.setattr(routes, "save_upload", save)
+    monkeypatch.setattr(documents, "extract_text", slow)
+    response = client.post("/v1/analyze/upload", files={"file": ("cv.txt", b"Python")})
+
+    assert response.status_code == 504
+    assert analyzed == []
+    assert saved and not os.path.exists(saved[0])
+    shutdown_extract_pool()
@@ -0,0 +1,41 @@
+"""
+Tests for the fake LLM backend used in load testing.
+"""
+
+import json
+
+import pytest
+
+from app.fake_llm import FakeLLMError, FakeMistral, hash_embedding
+
+
+def test_fake_chat_returns_parseable_skills():
+    """Test skill extraction prompts get a JSON payload with usage."""
+    client = FakeMistral(chat_latency_ms=0, seed=1)
+    response = client.chat.complete(
+        model="mistral-medium-2508",
+        messages=[
+            {"role": "system", "content": "Extract skill keywords only"},
+            {"role": "user", "content": "Python developer"},
+        ],
+    )
+    data = json.loads(response.choices[0].message.content)
+    assert data["skills"]
+    assert response.usage.prompt_tokens > 0
+    assert response.usage.completion_tokens > 0
+
+
+def test_fake_embeddings_are_deterministic():
+    """Test fake embeddings are stable and have mistral-embed dimensions."""
+    client = FakeMistral(embed_latency_ms=0)
+    response = client.embeddings.create(model="mistral-embed", inputs=["a b", "c"])
+    assert len(response.data) == 2
+    assert len(response.data[0].embedding) == 1024
+    assert response.data[0].embedding == hash_embedding("a b").tolist()
+
+
+def test_fake_failure_rate():
+    """Test a failure rate of 1.0 makes every call fail."""
+    client = FakeMistral(chat_latency_ms=0, failure_rate=1.0)
+    with pytest.raises(FakeLLMError):
+        client.chat.complete(model="m", messages=[{"role": "user", "content": "x"}])
@@ -0,0 +1,96 @@
+"""
+Tests for pre-compressed, ETag-validated listing responses.
+"""
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.catalog import JobCatalog, load_sample_jobs
+from app.listing_cache import EncodedListing, ListingCache, listing_cache
+from main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(load_sample_jobs())
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    listing_cache.clear()
+    yield TestClient(app), catalog
+    listing_cache.clear()
+
+
+def test_listing_served_compressed_with_etag(client):
+    """Test listings are gzip-encoded and carry a strong ETag."""
+    http, _ = client
+    response = http.get("/v1/jobs/sample", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].startswith('"')
+    assert len(response.json()) == 20
+
+
+def test_if_none_match_returns_304(client):
+    """Test repeated polls with the ETag get an empty 304."""
+    http, _ = client
+    first = http.get("/v1/jobs/sample", params={"limit": 5})
+    etag = first.headers["etag"]
+
+    second = http.get(
+        "/v1/jobs/sample", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert second.headers["x-next-cursor"] == first.headers["x-next-cursor"]
+
+    scout = {"filters": {"query": "python"}}
+    etag = http.post("/v1/local/job_scout", json=scout).headers["etag"]
+    response = http.post(
+        "/v1/local/job_scout", json=scout, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_catalog_change_invalidates_listing(client):
+    """Test a catalog write changes the ETag of affected listings."""
+    http, catalog = client
+    etag = http.get("/v1/jobs/sample").headers["etag"]
+
+    job = dict(load_sample_jobs()[0], title="Renamed Intern")
+    catalog.upsert_many([job])
+
+    response = http.get("/v1/jobs/sample", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()[0]["title"] == "Renamed Intern"
+
+
+def test_encoding_negotiation_and_reuse():
+    """Test q-values are honoured and cached pages are built once per version."""
+    listing = EncodedListing([{"desc": "x" * 1000}])
+    assert listing.negotiate("gzip;q=0, identity") is None
+    assert listing.negotiate("deflate, gzip;q=0.5") == "gzip"
+    assert listing.encoded == {}
+    assert gzip.decompress(listing.encode("gzip")) == listing.body
+    assert listing.encode("gzip") is listing.encoded["gzip"]
+    assert listing.matches(f'W/{listing.etag_for("gzip")}')
+    assert EncodedListing([]).negotiate("gzip") is None
+    assert not listing.matches('"other"')
+
+    cache = ListingCache(maxsize=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return [], {}
+
+    first = cache.get_or_build("page", 1, build)
+    assert cache.get_or_build("page", 1, build) is first
+    cache.get_or_build("page", 2, build)
+    assert len(builds) == 2
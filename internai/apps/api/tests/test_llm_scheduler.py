@@ -0,0 +1,189 @@
+"""
+Tests for the priority-aware LLM scheduler.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.llm_scheduler import (
+    BATCH,
+    INTERACTIVE,
+    LLMContextMiddleware,
+    LLMQueueTimeout,
+    LLMScheduler,
+    _priority,
+    _tenant,
+    llm_context,
+)
+from app.metrics import LLM_QUEUE_TIMEOUTS
+from main import app
+
+
+def _drained(**overrides) -> LLMScheduler:
+    """A scheduler with an empty request budget refilling at 20 per second."""
+    options = {
+        "requests_per_minute": 1200,
+        "tokens_per_minute": 0,
+        "interactive_reserve": 0,
+    } | overrides
+    scheduler = LLMScheduler(**options)
+    scheduler.requests.level = 0
+    return scheduler
+
+
+def _admit_in_order(scheduler: LLMScheduler, calls) -> list[str]:
+    """Queue ``(label, priority, tenant)`` calls in order; return admit order."""
+    admitted = []
+    threads = []
+    for label, priority, tenant in calls:
+
+        def run(label=label, priority=priority, tenant=tenant):
+            scheduler.acquire(1, priority, tenant)
+            admitted.append(label)
+
+        thread = threading.Thread(target=run)
+        queued = len(scheduler)
+        thread.start()
+        while len(scheduler) == queued and not admitted:
+            time.sleep(0.001)
+        threads.append(thread)
+    for thread in threads:
+        thread.join(timeout=5)
+    return admitted
+
+
+def test_interactive_calls_go_before_batch():
+    """Test queued interactive calls are admitted ahead of earlier batch ones."""
+    scheduler = _drained()
+    admitted = _admit_in_order(
+        scheduler,
+        [
+            ("batch-1", BATCH, "sync"),
+            ("batch-2", BATCH, "sync"),
+            ("coach", INTERACTIVE, "alice"),
+        ],
+    )
+    assert admitted == ["coach", "batch-1", "batch-2"]
+
+
+def test_tenants_take_turns():
+    """Test a tenant with a backlog cannot starve a later tenant."""
+    scheduler = _drained()
+    admitted = _admit_in_order(
+        scheduler,
+        [
+            ("a1", INTERACTIVE, "a"),
+            ("a2", INTERACTIVE, "a"),
+            ("a3", INTERACTIVE, "a"),
+            ("b1", INTERACTIVE, "b"),
+        ],
+    )
+    assert admitted.index("b1") < admitted.index("a3")
+
+
+def test_batch_leaves_interactive_reserve():
+    """Test batch calls time out below the reserve while interactive ones pass."""
+    scheduler = LLMScheduler(
+        requests_per_minute=0,
+        tokens_per_minute=6000,
+        interactive_reserve=0.2,
+        timeout=0.05,
+    )
+    scheduler.tokens.level = 1500
+    timeouts = LLM_QUEUE_TIMEOUTS.get(priority=BATCH)
+
+    with pytest.raises(LLMQueueTimeout):
+        scheduler.acquire(500, BATCH, "sync")
+    ticket = scheduler.acquire(500, INTERACTIVE, "alice")
+
+    assert LLM_QUEUE_TIMEOUTS.get(priority=BATCH) == timeouts + 1
+    assert ticket.waited < 0.05
+    assert len(scheduler) == 0
+    assert scheduler.tokens.level == pytest.approx(1000, abs=20)
+
+
+def test_settle_corrects_token_estimates():
+    """Test overestimated calls are refunded and underestimated ones charged."""
+    scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=60)
+    ticket = scheduler.acquire(40)
+    scheduler.settle(ticket, 10)
+    assert scheduler.tokens.level == pytest.approx(50, abs=1)
+
+    ticket = scheduler.acquire(10)
+    scheduler.settle(ticket, 70)
+    assert scheduler.tokens.level == pytest.approx(-20, abs=1)
+
+
+def test_requests_are_tagged_with_priority_and_tenant():
+    """Test the middleware reads X-Priority, X-API-Key and batch paths."""
+    assert any(
+        getattr(m, "cls", None) is LLMContextMiddleware for m in app.user_middleware
+    )
+    context_app = FastAPI()
+    context_app.add_middleware(LLMContextMiddleware)
+
+    @context_app.get("/_llm_context")
+    @context_app.get("/v1/match/bulk")
+    async def context():
+        return {"priority": _priority.get(), "tenant": _tenant.get()}
+
+    client = TestClient(context_app)
+
+    assert client.get("/_llm_context", headers={"X-API-Key": "k1"}).json() == {
+        "priority": INTERACTIVE,
+        "tenant": "k1",
+    }
+    assert client.get(
+        "/_llm_context", headers={"X-Priority": "batch", "X-Tenant-ID": "t"}
+    ).json() == {"priority": BATCH, "tenant": "t"}
+    assert client.get("/v1/match/bulk").json()["priority"] == BATCH
+    with llm_context(BATCH, "job"):
+        assert (_priority.get(), _tenant.get()) == (BATCH, "job")
+    assert _priority.get() == INTERACTIVE
+    with pytest.raises(ValueError):
+        with llm_context("urgent"):
+            pass
+
+
+def test_async_waits_do_not_block_the_event_loop():
+    """Test a coroutine queued for budget lets other coroutines run."""
+    scheduler = _drained(requests_per_minute=60)  # next request in ~1s
+    ticks = []
+
+    async def ticker():
+        while len(ticks) < 10:
+            ticks.append(len(scheduler))
+            await asyncio.sleep(0.01)
+
+    async def main():
+        queued = asyncio.create_task(scheduler.acquire_async(1))
+        await ticker()
+        assert not queued.done()
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        scheduler.requests.level = 0.99  # refills within ~10ms
+        ticket = await asyncio.wait_for(scheduler.acquire_async(1), 1)
+        assert ticket.waited < 0.5
+
+    asyncio.run(main())
+    assert ticks[-1] == 1
+    assert len(scheduler) == 0
+
+
+def test_async_waiters_wake_when_budget_is_returned():
+    """Test settling a ticket from a thread admits a waiting coroutine."""
+    scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=60, timeout=5)
+    ticket = scheduler.acquire(60)
+
+    async def main():
+        threading.Timer(0.05, scheduler.settle, (ticket, 0)).start()
+        return await scheduler.acquire_async(30)
+
+    assert asyncio.run(main()).waited < 1
@@ -0,0 +1,197 @@
+"""
+Tests for gazetteer location resolution and the location index.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.bm25 import BM25Index
+from app.catalog import JobCatalog
+from app.locations import (
+    LocationIndex,
+    get_gazetteer,
+    haversine_km,
+    location_filter,
+)
+from main import app
+
+CITIES = [
+    "New York, NY",
+    "Jersey City, NJ",
+    "Boston, MA",
+    "Remote",
+    "Austin, TX",
+    "Remote - US",
+    "California",
+    "Mars",
+]
+
+
+def _jobs(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"job-{i}",
+            "source": "linkedin",
+            "title": "Python Intern",
+            "company": f"Company {i}",
+            "location": CITIES[i % len(CITIES)],
+            "url": f"https://example.com/{i}",
+            "desc": "Python services",
+        }
+        for i in range(n)
+    ]
+
+
+def _catalog(n: int = 40) -> JobCatalog:
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(_jobs(n))
+    return catalog
+
+
+def _ids(*cities: int, n: int = 40) -> set[str]:
+    """Ids of the jobs whose location is one of ``CITIES[cities]``."""
+    return {f"job-{i}" for i in range(n) if i % len(CITIES) in cities}
+
+
+@pytest.mark.parametrize(
+    "text,place,region,country,remote",
+    [
+        ("New York, NY", "us-ny-new-york", "US-NY", "US", False),
+        ("NYC", "us-ny-new-york", "US-NY", "US", False),
+        ("Portland, ME", "us-me-portland", "US-ME", "US", False),
+        ("Portland", "us-or-portland", "US-OR", "US", False),
+        ("London, Canada", "ca-on-london", "CA-ON", "CA", False),
+        ("Hybrid - Zürich", "ch-zh-zurich", "CH-ZH", "CH", False),
+        ("Greater Boston Area", "us-ma-boston", "US-MA", "US", False),
+        ("Remote (Canada)", None, None, "CA", True),
+        ("Boise, ID 83702", "us-id-boise", "US-ID", "US", False),
+        ("California", None, "US-CA", "US", False),
+        ("Remote", None, None, None, True),
+    ],
+)
+def test_resolve_location(text, place, region, country, remote):
+    """Test free text resolves to canonical ids, with qualifiers disambiguating."""
+    location = get_gazetteer().resolve(text)
+
+    assert (location.place, location.region, location.country) == (
+        place,
+        region,
+        country,
+    )
+    assert location.remote is remote
+    assert (location.lat is not None) is (place is not None)
+
+
+def test_unknown_location_is_none():
+    """Test text with no known place, region or country does not resolve."""
+    assert get_gazetteer().resolve("Mars") is None
+    assert get_gazetteer().resolve(None) is None
+    with pytest.raises(ValueError):
+        location_filter("Mars", 50)
+
+
+def test_grid_lookup_matches_brute_force():
+    """Test the grid returns exactly the places a full distance scan finds."""
+    gazetteer = get_gazetteer()
+    rng = np.random.default_rng(0)
+    for lat, lon, radius in zip(
+        rng.uniform(-60, 70, 50),
+        rng.uniform(-180, 180, 50),
+        rng.choice([10, 50, 300, 2000], 50),
+        strict=True,
+    ):
+        expected = np.flatnonzero(
+            haversine_km(lat, lon, gazetteer.lat, gazetteer.lon) <= radius
+        )
+        assert sorted(gazetteer.near(lat, lon, radius)) == list(expected)
+
+
+def test_catalog_stores_locations_at_ingest(tmp_path):
+    """Test upserts store resolved locations, and reopening fills in gaps."""
+    catalog = _catalog(8)
+
+    stored = catalog.get_locations(["job-0", "job-3", "job-7"])
+    assert stored["job-0"]["place"] == "us-ny-new-york"
+    assert stored["job-0"]["lat"] == pytest.approx(40.7128)
+    assert stored["job-3"]["remote"] == 1
+    assert stored["job-7"]["place"] is None
+
+    catalog.delete(["job-0"])
+    assert catalog.get_locations(["job-0"]) == {}
+
+    path = str(tmp_path / "catalog.db")
+    disk = JobCatalog(path)
+    disk.upsert_many(_jobs(3))
+    with disk.transaction() as conn:
+        conn.execute("DELETE FROM job_locations WHERE id = 'job-1'")
+    disk.close()
+
+    reopened = JobCatalog(path)
+    assert reopened.get_locations(["job-1"])["job-1"]["region"] == "US-NJ"
+
+
+def test_index_filters_by_radius_and_remote():
+    """Test radius, region and remote filters over the synced index."""
+    catalog = _catalog()
+    index = LocationIndex()
+    index.sync(catalog)
+    ids = [f"job-{i}" for i in range(40)]
+
+    assert set(index.within(location_filter("Manhattan", 20))) == _ids(0, 1, 3, 5)
+    onsite = index.matches(ids, location_filter("Manhattan", 20, False))
+    assert {ids[i] for i in np.flatnonzero(onsite)} == _ids(0, 1)
+    assert set(index.within(location_filter("Boston", 500, False))) == _ids(0, 1, 2)
+    in_texas = index.matches(ids, location_filter("Texas", 1, False))
+    assert {ids[i] for i in np.flatnonzero(in_texas)} == _ids(4)
+    assert not index.matches(["unknown"], location_filter("Remote", 1)).any()
+
+    catalog.upsert_many([dict(_jobs(5)[4], location="Newark, NJ")])
+    catalog.delete(["job-0"])
+    index.sync(catalog)
+
+    expected = (_ids(0, 1) | {"job-4"}) - {"job-0"}
+    assert set(index.within(location_filter("NYC", 20, False))) == expected
+
+
+def test_match_near_filters_catalog_and_given_jobs(monkeypatch):
+    """Test /match?near= filters catalog retrieval and given jobs."""
+    catalog = _catalog()
+    bm25 = BM25Index()
+    index = LocationIndex()
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(
+        routes, "get_bm25_index", lambda c: bm25.sync(c) is not None and bm25
+    )
+    monkeypatch.setattr(
+        routes, "get_location_index", lambda c: index.sync(c) is not None and index
+    )
+    client = TestClient(app)
+    profile = {"skills": ["Python"]}
+
+    response = client.post(
+        "/v1/match",
+        params={"mode": "hybrid", "near": "Austin, TX", "remote": "false"},
+        json={"profile": profile},
+    )
+    assert response.status_code == 200
+    assert {m["job"]["location"] for m in response.json()} == {"Austin, TX"}
+
+    jobs = catalog.get_many([f"job-{i}" for i in range(8)])
+    response = client.post(
+        "/v1/match?near=Atlantis",
+        json={"profile": profile, "jobs": jobs},
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/v1/match?near=Brooklyn&radius_km=30",
+        json={"profile": profile, "jobs": jobs},
+    )
+    assert {m["job"]["location"] for m in response.json()} == {
+        "New York, NY",
+        "Jersey City, NJ",
+        "Remote",
+        "Remote - US",
+    }
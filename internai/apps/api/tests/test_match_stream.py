@@ -0,0 +1,106 @@
+"""
+Tests for NDJSON streaming of /match results.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from main import app
+
+client = TestClient(app)
+
+PROFILE = {"skills": ["Python", "Docker"]}
+
+JOBS = [
+    {
+        "id": f"job-{i}",
+        "source": "linkedin",
+        "title": f"Backend Intern {i}",
+        "company": "TechCorp",
+        "location": "Austin, TX" if i % 2 else "Remote",
+        "url": f"https://example.com/job/{i}",
+        "desc": "Python services" + " on Docker" * (i % 5),
+    }
+    for i in range(50)
+]
+
+
+class BatchEmbeddings:
+    """Embeddings client that records the size of every request."""
+
+    model = "test-embed"
+
+    def __init__(self):
+        self.batches: list[int] = []
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(len(texts))
+        return [
+            [float(len(text) % 7), 1.0, float(sum(map(ord, text)) % 5)]
+            for text in texts
+        ]
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    batches = BatchEmbeddings()
+    monkeypatch.setattr(routes, "get_embeddings_client", lambda: batches)
+    routes.profile_cache.clear()
+    yield batches
+    routes.profile_cache.clear()
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_scores_in_chunks(embeddings):
+    """Test results stream in request order, one embed call per chunk."""
+    response = client.post(
+        "/v1/match/stream?chunk_size=16", json={"profile": PROFILE, "jobs": JOBS}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = _lines(response)
+    assert [line["job"]["id"] for line in lines] == [job["id"] for job in JOBS]
+    # The profile is embedded once, with the first chunk
+    assert embeddings.batches == [17, 16, 16, 2]
+
+
+def test_stream_summary_matches_match_endpoint(embeddings):
+    """Test the trailing top-k summary equals the head of /match's ranking."""
+    ranked = client.post("/v1/match", json={"profile": PROFILE, "jobs": JOBS}).json()
+
+    response = client.post(
+        "/v1/match/stream?chunk_size=7&top_k=10",
+        json={"profile": PROFILE, "jobs": JOBS},
+    )
+
+    *results, summary = _lines(response)
+    assert len(results) == len(JOBS)
+    assert summary["summary"]["count"] == len(JOBS)
+    assert summary["summary"]["top"] == ranked[:10]
+    by_id = {result["job"]["id"]: result for result in results}
+    assert all(by_id[match["job"]["id"]] == match for match in ranked)
+
+
+def test_stream_filters_and_validates(embeddings):
+    """Test near filtering, and errors raised before the stream starts."""
+    response = client.post(
+        "/v1/match/stream?near=Austin&remote=false",
+        json={"profile": PROFILE, "jobs": JOBS},
+    )
+    assert {line["job"]["location"] for line in _lines(response)} == {"Austin, TX"}
+
+    assert client.post("/v1/match/stream", json={"jobs": JOBS}).status_code == 422
+    response = client.post(
+        "/v1/match/stream", json={"profile_handle": "bad", "jobs": JOBS}
+    )
+    assert response.status_code == 400
+    response = client.post("/v1/match/stream", json={"profile": PROFILE})
+    assert response.status_code == 200
+    assert response.text == ""
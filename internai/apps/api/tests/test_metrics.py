@@ -0,0 +1,77 @@
+"""
+Tests for Prometheus metrics.
+"""
+
+import threading
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.metrics import Counter, Histogram, record_cache
+from app.routes import _load_embeddings_module
+from main import app
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histograms render cumulative buckets, sum and count."""
+    histogram = Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 2' in lines
+    assert 'test_seconds_count{route="/a"} 2' in lines
+
+
+def test_counter_escapes_label_values():
+    """Test label values are escaped per the exposition format."""
+    counter = Counter("test_total", "Test.", ("site",))
+    counter.inc(site='a"b')
+    assert 'test_total{site="a\\"b"} 1' in counter.render()
+
+
+def test_metrics_endpoint_reports_routes_and_caches():
+    """Test /metrics exposes request latency per route and cache ratios."""
+    client.get("/health")
+    record_cache("test_cache", hit=True)
+    record_cache("test_cache", hit=False)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'internai_http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        in body
+    )
+    assert 'internai_cache_hit_ratio{cache="test_cache"} 0.5' in body
+
+
+def test_embedding_usage_is_per_thread():
+    """Test concurrent calls on one shared client each read their own usage."""
+    both_embedded = threading.Barrier(2)
+
+    def create(model, inputs):
+        item = SimpleNamespace(embedding=[0.0])
+        return SimpleNamespace(data=[item], usage=len(inputs))
+
+    embeddings = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+    shared = _load_embeddings_module().EmbeddingsClient("k", client=embeddings)
+    seen = {}
+
+    def embed(count):
+        shared.embed_texts(["x"] * count)
+        both_embedded.wait(timeout=5)
+        seen[count] = shared.last_usage
+
+    threads = [threading.Thread(target=embed, args=(n,)) for n in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert seen == {1: 1, 2: 2}
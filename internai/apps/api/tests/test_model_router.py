@@ -0,0 +1,136 @@
+"""
+Tests for latency-tiered LLM model routing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import cv_parser, llm, llm_scheduler
+from app.llm_scheduler import LLMScheduler
+from app.metrics import LLM_TASK_CALLS, LLM_TASK_DOWNSHIFTS, LLM_TASK_QUEUE_WAIT
+from app.model_router import ModelRoute, ModelRouter, parse_routes
+
+ROUTE = ModelRoute("extract", ("large", "small", "tiny"), slo_ms=1000)
+
+
+def _router(**overrides) -> ModelRouter:
+    options = {"routes": [ROUTE], "window": 60, "min_samples": 3} | overrides
+    return ModelRouter(**options)
+
+
+def test_downshifts_when_p95_exceeds_slo():
+    """Test slow models are skipped until their samples age out."""
+    router = _router()
+    assert router.candidates("extract") == ["large", "small", "tiny"]
+
+    for seconds in (0.2, 0.3, 2.5):
+        router.observe("extract", "large", seconds)
+    downshifts = LLM_TASK_DOWNSHIFTS.get(task="extract", model="small")
+
+    assert router.p95("extract", "large") == 2.5
+    assert router.candidates("extract") == ["small", "tiny"]
+    assert LLM_TASK_DOWNSHIFTS.get(task="extract", model="small") == downshifts + 1
+
+    router.window = 0
+    assert router.p95("extract", "large") is None
+    assert router.candidates("extract")[0] == "large"
+
+
+def test_all_models_slow_picks_fastest():
+    """Test the lowest p95 wins when no model meets the SLO."""
+    router = _router()
+    for model, seconds in (("large", 5.0), ("small", 1.5), ("tiny", 3.0)):
+        for _ in range(3):
+            router.observe("extract", model, seconds)
+
+    assert router.candidates("extract") == ["small", "tiny"]
+    with pytest.raises(ValueError):
+        router.candidates("unknown")
+
+
+def _client(complete):
+    """A stand-in Mistral client whose chat calls go to ``complete``."""
+
+    async def complete_async(**kwargs):
+        return complete(**kwargs)
+
+    return SimpleNamespace(
+        chat=SimpleNamespace(complete=complete, complete_async=complete_async)
+    )
+
+
+def _reply(content: str):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_failures_fall_back_down_the_chain(monkeypatch):
+    """Test a failing model is retried on the next one and counted as slow."""
+    router = _router(min_samples=1)
+    tried = []
+
+    def complete(**kwargs):
+        tried.append(kwargs["model"])
+        if kwargs["model"] == "large":
+            raise RuntimeError("overloaded")
+        return _reply("Python\nSQL")
+
+    monkeypatch.setattr(llm, "get_model_router", lambda: router)
+    monkeypatch.setattr(llm, "get_mistral", lambda: _client(complete))
+    errors = LLM_TASK_CALLS.get(task="extract", model="large", outcome="error")
+
+    skills = asyncio.run(llm.extract_skills_from_text("Python and SQL"))
+    asyncio.run(llm.extract_skills_from_text("Python and SQL"))
+
+    assert sorted(skills) == ["Python", "Sql"]
+    assert tried == ["large", "small", "small"]
+    assert router.p95("extract", "large") == float("inf")
+    assert LLM_TASK_CALLS.get(task="extract", model="large", outcome="error") == (
+        errors + 1
+    )
+
+
+def test_queue_wait_is_not_model_latency(monkeypatch):
+    """Test time spent waiting for rate-limit budget does not slow a model."""
+    router = _router(min_samples=1)
+    scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=0)
+    scheduler.requests.level = -2  # refills at 10/s, so the call queues ~0.3s
+    monkeypatch.setattr(llm, "get_model_router", lambda: router)
+    monkeypatch.setattr(llm, "get_mistral", lambda: _client(lambda **_: _reply("Go")))
+    monkeypatch.setattr(llm_scheduler, "get_llm_scheduler", lambda: scheduler)
+    waits = LLM_TASK_QUEUE_WAIT.count(task="extract")
+
+    llm.chat_complete("test", task="extract", messages=[])
+
+    assert router.p95("extract", "large") < 0.1
+    assert router.candidates("extract")[0] == "large"
+    assert LLM_TASK_QUEUE_WAIT.count(task="extract") == waits + 1
+
+
+def test_cv_parser_routes_extraction(monkeypatch):
+    """Test resume skill extraction uses the extract route, not a fixed model."""
+    sent = []
+
+    def complete(**kwargs):
+        sent.append(kwargs["model"])
+        return _reply('{"skills": ["Go"], "highlights": []}')
+
+    monkeypatch.setattr(llm, "get_model_router", lambda: _router())
+    monkeypatch.setattr(llm, "get_mistral", lambda: _client(complete))
+
+    assert asyncio.run(cv_parser.llm_extract_skills("Go"))["skills"] == ["Go"]
+    assert sent == ["large"]
+
+
+def test_parse_routes():
+    """Test LLM_ROUTES overrides parse, and malformed entries are rejected."""
+    routes = parse_routes("extract=a, b@1500; generate=c@9000;")
+    assert routes == [
+        ModelRoute("extract", ("a", "b"), 1500),
+        ModelRoute("generate", ("c",), 9000),
+    ]
+    for spec in ("extract=a", "=a@100", "extract=@100", "extract=a@fast"):
+        with pytest.raises(ValueError):
+            parse_routes(spec)
@@ -0,0 +1,37 @@
+"""
+Tests for preloading read-only data.
+"""
+
+from app import preload as preload_module
+from app.preload import preload, register_preload
+
+
+def test_preload_runs_registered_loaders(monkeypatch):
+    """Test preload runs each loader once and survives loader errors."""
+    monkeypatch.setattr(preload_module, "_PRELOADERS", [])
+    calls = []
+
+    @register_preload
+    def load_ok():
+        calls.append("ok")
+
+    @register_preload
+    def load_broken():
+        raise RuntimeError("boom")
+
+    timings = preload()
+
+    assert calls == ["ok"]
+    assert set(timings) == {
+        "test_preload_runs_registered_loaders.<locals>.load_ok",
+        "test_preload_runs_registered_loaders.<locals>.load_broken",
+    }
+
+
+def test_routes_register_catalog_preloaders():
+    """Test the API registers its catalog and embeddings loaders."""
+    from app import routes  # noqa: F401
+
+    names = {name for name, _ in preload_module._PRELOADERS}
+    assert "get_catalog" in names
+    assert "_load_embeddings_module" in names
@@ -0,0 +1,197 @@
+"""
+Tests for profile handles and the profile cache.
+"""
+
+import hashlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.models import JobItem
+from app.profile_cache import (
+    MAX_HANDLE_LENGTH,
+    InvalidProfileHandleError,
+    ProfileCache,
+    ProfileEntry,
+    decode_handle,
+    encode_handle,
+)
+from main import app
+
+client = TestClient(app)
+
+JOBS = [
+    {
+        "id": str(i),
+        "source": "linkedin",
+        "title": f"Backend Intern {i}",
+        "company": "TechCorp",
+        "url": f"https://example.com/job/{i}",
+        "desc": "Python services on Docker and Kubernetes",
+    }
+    for i in range(3)
+]
+
+
+class CountingEmbeddings:
+    """Embeddings client that records every text it embeds."""
+
+    model = "test-embed"
+
+    def __init__(self):
+        self.texts: list[str] = []
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    counting = CountingEmbeddings()
+    monkeypatch.setattr(routes, "get_embeddings_client", lambda: counting)
+    routes.profile_cache.clear()
+    yield counting
+    routes.profile_cache.clear()
+
+
+def test_handle_round_trip():
+    """Test handles decode to the same skills and are stable."""
+    handle = encode_handle(["Python", "SQL", "Docker"])
+
+    assert decode_handle(handle) == ("Python", "SQL", "Docker")
+    assert encode_handle(("Python", "SQL", "Docker")) == handle
+
+
+@pytest.mark.parametrize(
+    "handle",
+    ["", "p1.abc", "garbage.a.b", "x" * 5000],
+)
+def test_malformed_handles_rejected(handle):
+    """Test malformed or oversized handles raise InvalidProfileHandleError."""
+    with pytest.raises(InvalidProfileHandleError):
+        decode_handle(handle)
+
+
+def test_tampered_handle_rejected():
+    """Test a handle whose payload was edited fails its digest check."""
+    prefix, digest, _ = encode_handle(["Python"]).split(".")
+    _, _, payload = encode_handle(["Rust"]).split(".")
+
+    with pytest.raises(InvalidProfileHandleError):
+        decode_handle(f"{prefix}.{digest}.{payload}")
+
+
+def test_oversized_profile_gets_digest_handle(embeddings):
+    """Test a handle over MAX_HANDLE_LENGTH falls back to its digest."""
+    skills = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(200)]
+    handle = encode_handle(skills)
+
+    assert len(handle) <= MAX_HANDLE_LENGTH
+    assert handle.count(".") == 1 and encode_handle(skills) == handle
+    with pytest.raises(InvalidProfileHandleError):
+        decode_handle(handle)
+
+    response = client.post("/v1/match", json={"profile_handle": handle, "jobs": JOBS})
+    assert response.status_code == 400
+
+    assert routes._profile_handle(skills) == handle
+    assert routes._profile_entry(handle).skills == tuple(skills)
+
+
+def test_cache_expires_and_evicts(monkeypatch):
+    """Test entries are rebuilt after their TTL and evicted beyond maxsize."""
+    now = [100.0]
+    monkeypatch.setattr("app.profile_cache.time.monotonic", lambda: now[0])
+    cache = ProfileCache(maxsize=2, ttl=10)
+    built = []
+
+    def build(name):
+        built.append(name)
+        return ProfileEntry((name,), name, 0)
+
+    first = cache.get_or_build("a", lambda: build("a"))
+    assert cache.get_or_build("a", lambda: build("a")) is first
+    now[0] += 11
+    assert cache.get_or_build("a", lambda: build("a")) is not first
+
+    cache.get_or_build("b", lambda: build("b"))
+    cache.get_or_build("c", lambda: build("c"))
+    cache.get_or_build("a", lambda: build("a"))
+
+    assert built == ["a", "a", "b", "c", "a"]
+
+
+def test_analyze_returns_profile_handle():
+    """Test /analyze returns a handle for the extracted skills."""
+    response = client.post("/v1/analyze", json={"text": ""})
+
+    data = response.json()
+    assert decode_handle(data["profile_handle"]) == tuple(data["skills"])
+
+
+def test_match_with_handle_embeds_profile_once(embeddings):
+    """Test repeat matches by handle skip the profile embedding."""
+    response = client.post(
+        "/v1/profile/embed",
+        json={"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python"]},
+    )
+    body = response.json()
+    assert body["embedded"] is True
+    assert embeddings.texts == ["Skills: Python"]
+
+    for _ in range(2):
+        response = client.post(
+            "/v1/match", json={"profile_handle": body["profile_handle"], "jobs": JOBS}
+        )
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+
+    assert embeddings.texts.count("Skills: Python") == 1
+    assert not any("Jane" in text or "jane@" in text for text in embeddings.texts)
+
+
+def test_match_by_profile_shares_the_cache(embeddings):
+    """Test matching by full profile reuses the vector behind its handle."""
+    for _ in range(2):
+        response = client.post(
+            "/v1/match", json={"profile": {"skills": ["Python"]}, "jobs": JOBS[:1]}
+        )
+        assert response.status_code == 200
+
+    assert embeddings.texts.count("Skills: Python") == 1
+
+
+def test_match_rejects_bad_handle():
+    """Test /match answers 400 for a bad handle and 422 with no profile."""
+    response = client.post("/v1/match", json={"profile_handle": "p1.x.y", "jobs": JOBS})
+    assert response.status_code == 400
+
+    response = client.post("/v1/match", json={"jobs": JOBS})
+    assert response.status_code == 422
+
+
+def test_missing_skills_from_bitset():
+    """Test missing skills come from keywords the profile's bitset lacks."""
+    entry = routes._profile_entry(encode_handle(["Python", "docker"]))
+    job = JobItem(**JOBS[0])
+
+    missing = routes._find_missing_skills(entry, job)
+
+    assert "Kubernetes" in missing
+    assert "Python" not in missing and "Docker" not in missing
+    assert missing == sorted(missing)
+
+
+def test_missing_skills_match_whole_words():
+    """Test keywords inside other words ("go" in "good") are not reported."""
+    entry = routes._profile_entry(encode_handle(["Python 3"]))
+    job = JobItem(
+        **{
+            **JOBS[0],
+            "desc": "Good, rigorous engineers with Python and Docker; cargo welcome.",
+        }
+    )
+
+    assert routes._find_missing_skills(entry, job) == ["Docker"]
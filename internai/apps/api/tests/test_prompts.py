@@ -0,0 +1,172 @@
+"""
+Tests for compiled prompt templates and token budgeting.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import cv_parser, llm
+from app.prompts import (
+    PromptError,
+    PromptRegistry,
+    estimate_tokens,
+    get_prompts,
+    truncate_tokens,
+)
+
+RESUME = "Built Python services with FastAPI and PostgreSQL for a fintech. " * 400
+
+
+def test_registry_loads_package_templates():
+    """Test every YAML file is loaded, with static system messages."""
+    prompts = get_prompts()
+
+    for name in (
+        "coach.interview_coach",
+        "coach.skill_assessment",
+        "application_writer.draft_cover_letter",
+        "matcher.skill_matching",
+        "cv_analyzer.extract_skills",
+        "cv_analyzer.extract_skill_list",
+    ):
+        assert name in prompts
+    assert "{{" not in (prompts["coach.interview_coach"].system or "")
+    with pytest.raises(PromptError):
+        prompts.render("coach.interview_coach", role="Intern")
+    with pytest.raises(PromptError):
+        prompts["coach.unknown"]
+
+
+def test_prefix_is_identical_across_calls():
+    """Test system messages and leading user instructions never vary."""
+    template = get_prompts()["coach.interview_coach"]
+    first = template.render(role="Backend Intern", company="Acme", skills="Python")
+    second = template.render(role="Data Intern", company="Globex", skills="SQL, R")
+
+    assert first[0]["content"] is second[0]["content"]
+    instructions = template.user.parts[0]
+    assert instructions.strip()
+    assert first[1]["content"].startswith(instructions)
+    assert second[1]["content"].startswith(instructions)
+
+
+def test_variable_sections_are_trimmed_to_budget():
+    """Test long resumes are cut at a word boundary to fit the budget."""
+    template = get_prompts()["cv_analyzer.extract_skills"]
+
+    short = template.render(resume_text="Python, SQL")
+    assert short[1]["content"].endswith("Python, SQL")
+
+    long = template.render(resume_text=RESUME)
+    kept = long[1]["content"].removeprefix(template.user.parts[0])
+    assert RESUME.startswith(kept) and len(kept) < len(RESUME)
+    assert kept == kept.rstrip()
+    assert template.estimate(resume_text=RESUME) <= template.budget
+    assert template.estimate(resume_text=RESUME) > template.budget - 10
+
+
+def test_estimate_and_truncate_tokens():
+    """Test the local estimate and that truncation never exceeds it."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello, world!") == 4
+    assert estimate_tokens("internationalization") == 4
+    for budget in (0, 1, 5, 50):
+        cut = truncate_tokens(RESUME, budget)
+        assert RESUME.startswith(cut)
+        assert estimate_tokens(cut) <= budget
+    assert truncate_tokens("short text", 10) == "short text"
+
+
+def test_malformed_templates_are_rejected(tmp_path):
+    """Test templates with variable system messages or bad trims fail to load."""
+    (tmp_path / "bad.yaml").write_text(
+        "greet:\n  system: Hi {{name}}\n  user: Hello\n", encoding="utf-8"
+    )
+    with pytest.raises(PromptError):
+        PromptRegistry.load(tmp_path)
+
+    (tmp_path / "bad.yaml").write_text(
+        "greet:\n  trim: [resume]\n  user: Hello {{name}}\n", encoding="utf-8"
+    )
+    with pytest.raises(PromptError):
+        PromptRegistry.load(tmp_path)
+
+    (tmp_path / "bad.yaml").write_text(
+        "greet:\n  user: Hello {{name}}, {{name}}\n", encoding="utf-8"
+    )
+    assert PromptRegistry.load(tmp_path).render("bad.greet", name="Ada") == [
+        {"role": "user", "content": "Hello Ada, Ada"}
+    ]
+
+
+def test_cv_parser_sends_budgeted_prompt(monkeypatch):
+    """Test skill extraction sends the compiled, trimmed prompt."""
+    sent = []
+
+    async def complete(function, **kwargs):
+        sent.append(kwargs["messages"])
+        message = SimpleNamespace(content='{"skills": ["Python"], "highlights": []}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(cv_parser, "chat_complete_async", complete)
+
+    result = asyncio.run(cv_parser.llm_extract_skills(RESUME))
+
+    assert result["skills"] == ["Python"]
+    template = get_prompts()["cv_analyzer.extract_skills"]
+    assert sent == [template.render(resume_text=RESUME)]
+    assert sum(estimate_tokens(m["content"]) for m in sent[0]) <= template.budget
+
+
+def test_skill_list_prompt_is_budgeted(monkeypatch):
+    """Test free-text skill extraction renders its template within budget."""
+    sent = []
+
+    async def complete(function, **kwargs):
+        sent.append(kwargs["messages"])
+        message = SimpleNamespace(content="Python\nFastAPI")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(llm, "chat_complete_async", complete)
+
+    assert sorted(asyncio.run(llm.extract_skills_from_text(RESUME))) == [
+        "Fastapi",
+        "Python",
+    ]
+    template = get_prompts()["cv_analyzer.extract_skill_list"]
+    assert sent == [template.render(text=RESUME)]
+    assert "#" not in sent[0][1]["content"]
+    assert sum(estimate_tokens(m["content"]) for m in sent[0]) <= template.budget
+
+
+def test_coaching_keeps_role_and_company():
+    """Test only the skill list is trimmed from coaching prompts."""
+    role, company = "Senior Backend Engineering Intern", "Globex Corporation"
+    messages = get_prompts().render(
+        "coach.interview_coach", role=role, company=company, skills=RESUME
+    )
+
+    assert f"ROLE: {role}\nCOMPANY: {company}\n" in messages[1]["content"]
+    assert len(messages[1]["content"]) < len(RESUME)
+
+
+def test_cover_letter_puts_job_description_last():
+    """Test the cover letter prompt trims only the job description."""
+    messages = get_prompts().render(
+        "application_writer.draft_cover_letter",
+        name="Ada",
+        skills="Python",
+        linkedin_url="-",
+        email="-",
+        title="Intern",
+        company="Acme",
+        location="Remote",
+        description=RESUME,
+    )
+
+    user = messages[1]["content"]
+    assert "Name: Ada" in user
+    assert user.index("Name: Ada") < user.index("Description: Built Python")
+    assert not user.endswith(RESUME.rstrip())
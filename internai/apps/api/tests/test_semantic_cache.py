@@ -0,0 +1,142 @@
+"""
+Tests for the semantic cache in front of interview coaching.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import llm, routes
+from app.metrics import CACHE_REQUESTS
+from app.semantic_cache import SemanticCache, coaching_key
+from main import app
+
+client = TestClient(app)
+
+VOCABULARY = ["backend", "frontend", "intern", "python", "react", "data"]
+
+
+def bag_of_words(text: str) -> np.ndarray:
+    """Counts of ``VOCABULARY`` words, plus one for everything else."""
+    words = text.lower().replace("|", " ").replace(",", " ").split()
+    counts = [words.count(word) for word in VOCABULARY]
+    return np.array(counts + [1.0], dtype=np.float32)
+
+
+def _cache(**overrides) -> SemanticCache:
+    options = {
+        "name": "test_semantic",
+        "maxsize": 4,
+        "ttl": 60,
+        "threshold": 0.9,
+        "embed": bag_of_words,
+    } | overrides
+    return SemanticCache(**options)
+
+
+def _hits(cache: str) -> float:
+    return CACHE_REQUESTS._values.get((cache, "hit"), 0.0)
+
+
+def test_similar_keys_hit_within_scope():
+    """Test near neighbours hit, distant keys and other scopes miss."""
+    cache = _cache()
+    value, vector = cache.lookup("backend intern python", "acme")
+    assert value is None
+    cache.store("backend intern python", "coaching", vector, "acme")
+
+    assert cache.lookup("Backend intern, python", "acme")[0] == "coaching"
+    assert cache.lookup("frontend intern react", "acme")[0] is None
+    assert cache.lookup("backend intern python", "globex")[0] is None
+
+
+def test_exact_keys_hit_without_embedding():
+    """Test identical keys skip the embedding call, even without vectors."""
+    calls = []
+    cache = _cache(embed=lambda text: calls.append(text))
+    cache.store("backend intern", "coaching", None)
+
+    assert cache.lookup("backend intern") == ("coaching", None)
+    assert calls == []
+    assert cache.lookup("backend interns")[0] is None
+    assert calls == ["backend interns"]
+
+
+def test_size_and_ttl_are_bounded(monkeypatch):
+    """Test the least recently used entry is evicted and entries expire."""
+    now = [1000.0]
+    monkeypatch.setattr("app.semantic_cache.time.monotonic", lambda: now[0])
+    cache = _cache(maxsize=2, threshold=0.999)
+    for key in ("backend", "frontend"):
+        cache.store(key, key, bag_of_words(key))
+    assert cache.lookup("backend")[0] == "backend"
+
+    cache.store("data", "data", bag_of_words("data"))
+
+    assert len(cache) == 2
+    assert cache.lookup("frontend")[0] is None
+    assert cache.lookup("backend")[0] == "backend"
+    now[0] += 61
+    assert cache.lookup("backend")[0] is None
+    cache.store("python", "python", bag_of_words("python"))
+    assert len(cache) == 2
+
+
+def test_coach_routes_reuse_similar_coaching(monkeypatch):
+    """Test /coach and /local/coach share coaching for near-identical roles."""
+    generated = []
+
+    async def generate(role, company, skills):
+        generated.append(role)
+        question = {"q": f"About {role}?", "ideal_answer": "..."}
+        return {"questions": [question], "tips": ["Practice"]}
+
+    class Embeddings:
+        model = "test-embed"
+
+        def embed_texts(self, texts):
+            return [bag_of_words(text).tolist() for text in texts]
+
+    monkeypatch.setattr(llm, "_generate_coaching", generate)
+    monkeypatch.setattr(routes, "get_embeddings_client", lambda: Embeddings())
+    monkeypatch.setattr(routes, "coaching_cache", _cache(name="coaching"))
+    hits = _hits("coaching")
+
+    first = client.post(
+        "/v1/coach",
+        json={
+            "role": "Backend Developer Intern",
+            "company": "StartupXYZ",
+            "profile": {"skills": ["Python"]},
+        },
+    )
+    second = client.post(
+        "/v1/local/coach",
+        json={
+            "role": "Backend Engineering Intern",
+            "company": "startupxyz",
+            "skills": ["python"],
+        },
+    )
+    other = client.post(
+        "/v1/local/coach", json={"role": "Backend Developer Intern", "company": "X"}
+    )
+
+    assert generated == ["Backend Developer Intern", "Backend Developer Intern"]
+    assert second.json()["questions"] == first.json()["questions"]
+    assert other.status_code == 200
+    assert _hits("coaching") == hits + 1
+
+
+@pytest.mark.parametrize(
+    "role,company,skills",
+    [
+        ("Data  Intern", "ACME ", ["SQL", "python", "Python"]),
+        ("data intern", "acme", None),
+    ],
+)
+def test_coaching_key_normalizes(role, company, skills):
+    """Test case, spacing and skill order do not change the key."""
+    key, scope = coaching_key(role, company, skills)
+    assert scope == "acme"
+    assert key.startswith("Role: data intern | Company: acme | Skills:")
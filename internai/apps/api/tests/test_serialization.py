@@ -0,0 +1,75 @@
+"""
+Tests for single-pass response serialization and trusted catalog jobs.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.catalog import JobCatalog, load_sample_jobs
+from app.models import JobItem
+from main import app
+
+client = TestClient(app)
+
+PROFILE = {"name": "Ada", "skills": ["Python", "Docker"]}
+
+
+def test_match_response_shape_unchanged():
+    """Test /match still returns a validated list of MatchResult objects."""
+    jobs = load_sample_jobs()[:3]
+    response = client.post("/v1/match", json={"profile": PROFILE, "jobs": jobs})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert {result["job"]["id"] for result in data} == {job["id"] for job in jobs}
+    for result in data:
+        assert 0 <= result["score"] <= 100
+        assert set(result) == {"job", "score", "missing_skills"}
+
+
+def test_matcher_accepts_catalog_job_ids(monkeypatch):
+    """Test catalog jobs are matched by id without re-validation."""
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(load_sample_jobs())
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+
+    items = catalog.get_items(["3", "missing", "1"])
+    assert [item.id for item in items] == ["3", "1"]
+    assert all(isinstance(item, JobItem) for item in items)
+
+    response = client.post(
+        "/v1/local/matcher", json={"profile": PROFILE, "job_ids": ["1", "2"]}
+    )
+    matches = response.json()["matches"]
+    assert sorted(match["job"]["id"] for match in matches) == ["1", "2"]
+
+
+def test_catalog_rejects_invalid_jobs_at_ingest():
+    """Test the catalog validates jobs before they become trusted."""
+    catalog = JobCatalog(":memory:")
+    with pytest.raises(ValueError):
+        catalog.upsert_many([{"id": "x", "title": "No company"}])
+    assert catalog.count() == 0
+
+
+def test_msgpack_on_request():
+    """Test clients can opt in to MessagePack responses."""
+    msgpack = pytest.importorskip("msgpack")
+    jobs = load_sample_jobs()[:2]
+    response = client.post(
+        "/v1/match",
+        json={"profile": PROFILE, "jobs": jobs},
+        headers={"Accept": "application/msgpack"},
+    )
+
+    assert response.headers["content-type"] == "application/msgpack"
+    assert len(msgpack.unpackb(response.content)) == 2
+
+
+def test_clamp_score_bounds():
+    """Test similarity scores are clamped to MatchResult's range."""
+    assert routes._clamp_score(-3.2) == 0.0
+    assert routes._clamp_score(100.04) == 100.0
+    assert routes._clamp_score(87.26) == 87.3
@@ -0,0 +1,179 @@
+"""
+Tests for the skill -> job inverted index.
+"""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.bm25 import BM25Index
+from app.catalog import JobCatalog
+from app.listing_cache import listing_cache
+from app.skill_index import (
+    SkillIndex,
+    UnknownSkillError,
+    canonical_skill,
+    detect_skills,
+    skill_query,
+)
+from main import app
+
+STACKS = [
+    "Python, Django and PostgreSQL",
+    "Rust services on Kubernetes",
+    "Python and Rust tooling, some Go",
+    "React with TypeScript",
+    "Java and Spring on AWS",
+    "Golang, Docker and k8s",
+]
+
+
+def _jobs(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"job-{i}",
+            "source": "linkedin",
+            "title": "Software Intern",
+            "company": f"Company {i}",
+            "location": "Remote",
+            "url": f"https://example.com/{i}",
+            "desc": f"Work with {STACKS[i % len(STACKS)]}.",
+        }
+        for i in range(n)
+    ]
+
+
+def _ids(*stacks: int, n: int = 30) -> set[str]:
+    """Ids of the jobs whose description uses ``STACKS[stacks]``."""
+    return {f"job-{i}" for i in range(n) if i % len(STACKS) in stacks}
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    catalog = JobCatalog(":memory:")
+    catalog.upsert_many(_jobs(30))
+    index = SkillIndex()
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(
+        routes, "get_skill_index", lambda c: index.sync(c) is not None and index
+    )
+    yield catalog
+    catalog.close()
+
+
+def test_detect_skills_whole_words_and_aliases():
+    """Test skills match whole words only and aliases fold together."""
+    assert detect_skills("Good to go: Golang, K8s, scikit learn, R&D, C++") == {
+        "go",
+        "kubernetes",
+        "scikit-learn",
+        "c++",
+    }
+    assert detect_skills("Amazon Web Services", None, "machine-learning") == {
+        "aws",
+        "machine learning",
+    }
+    assert canonical_skill(" Node.JS ") == canonical_skill("nodejs") == "node.js"
+    with pytest.raises(UnknownSkillError):
+        canonical_skill("cobol")
+    assert skill_query() is None
+
+
+def test_queries_match_brute_force():
+    """Test AND/OR/NOT and missing-skill queries equal checking every job."""
+    rng = random.Random(0)
+    pool = ["python", "rust", "go", "java", "react", "docker", "aws", "sql"]
+    jobs = {
+        f"job-{i}": " ".join(rng.sample(pool, rng.randint(0, 4))) for i in range(300)
+    }
+    index = SkillIndex()
+    for job_id, desc in jobs.items():
+        index.add(job_id, None, desc)
+    for job_id in list(jobs)[::7]:
+        index.remove(job_id)
+        del jobs[job_id]
+
+    for _ in range(50):
+        query = skill_query(
+            rng.sample(pool, rng.randint(0, 2)),
+            rng.sample(pool, rng.randint(0, 2)),
+            rng.sample(pool, rng.randint(0, 1)),
+            have=rng.sample(pool, 3),
+            max_missing=rng.choice([None, 0, 1]),
+        )
+        if query is None:
+            continue
+        expected = [i for i, desc in jobs.items() if query.accepts(detect_skills(desc))]
+        assert sorted(index.within(query)) == sorted(expected)
+        ids = list(jobs) + ["unknown"]
+        assert [ids[i] for i, ok in enumerate(index.matches(ids, query)) if ok] == [
+            i for i in ids if i in expected
+        ]
+
+
+def test_index_syncs_with_catalog(catalog):
+    """Test the index follows catalog upserts and deletes."""
+    index = SkillIndex()
+    index.sync(catalog)
+
+    assert set(index.within(skill_query(["rust"]))) == _ids(1, 2)
+    assert set(index.within(skill_query(["python", "rust"]))) == _ids(2)
+    assert set(index.within(skill_query(any_of=["go", "react"]))) == _ids(2, 3, 5)
+    assert set(index.within(skill_query(["go"], excluded=["docker"]))) == _ids(2)
+
+    catalog.upsert_many([dict(_jobs(1)[0], desc="Rust only")])
+    catalog.delete(["job-1"])
+    index.sync(catalog)
+
+    assert index.skills("job-0") == {"rust"}
+    expected = (_ids(1, 2) | {"job-0"}) - {"job-1"}
+    assert set(index.within(skill_query(["rust"]))) == expected
+
+
+def test_match_filters_by_skills(catalog, monkeypatch):
+    """Test /match skill filters on given jobs and hybrid catalog retrieval."""
+    bm25 = BM25Index()
+    monkeypatch.setattr(
+        routes, "get_bm25_index", lambda c: bm25.sync(c) is not None and bm25
+    )
+    client = TestClient(app)
+    profile = {"skills": ["Python", "Django"]}
+
+    response = client.post(
+        "/v1/match?mode=hybrid&skills=python&exclude_skills=rust",
+        json={"profile": profile},
+    )
+    assert response.status_code == 200
+    assert {m["job"]["id"] for m in response.json()} == _ids(0)
+
+    response = client.post(
+        "/v1/match?max_missing=1",
+        json={"profile": profile, "jobs": _jobs(12)},
+    )
+    # Stack 0 only adds PostgreSQL; every other stack adds two or more
+    assert {m["job"]["id"] for m in response.json()} == _ids(0, n=12)
+
+    response = client.post(
+        "/v1/match?any_skills=cobol", json={"profile": profile, "jobs": _jobs(3)}
+    )
+    assert response.status_code == 400
+
+
+def test_job_scout_filters_by_skills(catalog):
+    """Test job_scout pages through only the jobs with the requested skills."""
+    listing_cache.clear()
+    client = TestClient(app)
+
+    filters = {"skills": "rust", "exclude_skills": ["kubernetes"], "limit": 3}
+    first = client.post("/v1/local/job_scout", json={"filters": filters}).json()
+    filters["cursor"] = first["next_cursor"]
+    second = client.post("/v1/local/job_scout", json={"filters": filters}).json()
+
+    assert second["next_cursor"] is None
+    assert {job["id"] for job in first["jobs"] + second["jobs"]} == _ids(2)
+
+    response = client.post("/v1/local/job_scout", json={"filters": {"skills": "x"}})
+    assert response.status_code == 400
+    listing_cache.clear()
@@ -0,0 +1,45 @@
+"""
+Tests for lazy client construction at startup.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _run(code: str, **env: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=API_DIR,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_import_does_not_load_mistral_sdk():
+    """Test importing the app does not import the Mistral SDK or build clients."""
+    output = _run(
+        "import sys, main; from app import llm, routes; "
+        "print('mistralai' in sys.modules, llm.get_mistral.cache_info().currsize, "
+        "routes.get_embeddings_client.cache_info().currsize)",
+        LLM_BACKEND="mistral",
+    )
+    assert output == "False 0 0"
+
+
+def test_clients_constructed_on_first_use():
+    """Test accessors build one shared client on first call."""
+    output = _run(
+        "from app import llm, routes; "
+        "client = routes.get_embeddings_client(); "
+        "print(type(llm.get_mistral()).__name__, client.client is llm.get_mistral(), "
+        "llm.mistral is llm.get_mistral())",
+        LLM_BACKEND="fake",
+    )
+    assert output == "FakeMistral True True"
@@ -0,0 +1,80 @@
+"""
+Tests for request stage tracing.
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.settings import settings
+from app.tracing import TracingMiddleware, slow_traces, span
+from main import app as main_app
+
+
+def _traced_app(**kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        with span("outer"):
+            with span("inner"):
+                pass
+        return {"ok": True}
+
+    app.add_middleware(TracingMiddleware, **kwargs)
+    return app
+
+
+def test_span_is_noop_outside_trace():
+    """Test spans do nothing when no request is being traced."""
+    with span("untraced") as current:
+        assert current is None
+
+
+def test_server_timing_header_lists_nested_spans():
+    """Test sampled requests get a Server-Timing header with nested stages."""
+    client = TestClient(_traced_app(sample_rate=1.0, server_timing=True))
+    response = client.get("/work")
+    header = response.headers["server-timing"]
+    assert header.startswith("total;dur=")
+    assert "outer;dur=" in header
+    assert "outer.inner;dur=" in header
+
+
+def test_slow_traces_are_buffered():
+    """Test traces over the slow threshold land in the ring buffer."""
+    slow_traces.clear()
+    client = TestClient(_traced_app(sample_rate=1.0, slow_ms=0))
+    client.get("/work")
+    traces = slow_traces.snapshot()
+    assert traces[0]["path"] == "/work"
+    assert traces[0]["spans"][0]["name"] == "outer"
+    assert traces[0]["spans"][0]["children"][0]["name"] == "inner"
+
+
+def test_unsampled_requests_are_not_traced():
+    """Test a zero sample rate skips tracing unless forcing is allowed."""
+    client = TestClient(
+        _traced_app(sample_rate=0.0, server_timing=True, allow_forced=True)
+    )
+    assert "server-timing" not in client.get("/work").headers
+    forced = client.get("/work", headers={"X-Trace": "1"})
+    assert "server-timing" in forced.headers
+
+
+def test_trace_header_ignored_by_default(monkeypatch):
+    """Test clients cannot force traces unless DEBUG_TRACES_ENABLED is set."""
+    monkeypatch.setattr(settings, "DEBUG_TRACES_ENABLED", False)
+    client = TestClient(_traced_app(sample_rate=0.0, server_timing=True))
+    response = client.get("/work", headers={"X-Trace": "1"})
+    assert "server-timing" not in response.headers
+
+
+def test_debug_traces_is_off_by_default(monkeypatch):
+    """Test /debug/traces is hidden unless DEBUG_TRACES_ENABLED is set."""
+    client = TestClient(main_app)
+    assert client.get("/debug/traces").status_code == 404
+
+    monkeypatch.setattr(settings, "DEBUG_TRACES_ENABLED", True)
+    response = client.get("/debug/traces")
+    assert response.status_code == 200
+    assert response.json()["count"] == len(response.json()["traces"])
@@ -0,0 +1,141 @@
+"""
+Tests for quantized job vector snapshots.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.catalog import JobCatalog, load_sample_jobs
+from app.vector_store import VectorStore, text_hash
+from main import app
+
+client = TestClient(app)
+
+
+def _clustered(n: int, dim: int = 128, seed: int = 0) -> np.ndarray:
+    """Unit vectors around a few centroids, like real job embeddings."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((8, dim))
+    vectors = centroids[rng.integers(0, 8, n)] + 0.6 * rng.standard_normal((n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _store(dtype: str, vectors: np.ndarray) -> VectorStore:
+    store = VectorStore(JobCatalog(":memory:"), dtype=dtype)
+    store.write(
+        [(f"job-{i}", text_hash("m", str(i)), v) for i, v in enumerate(vectors)]
+    )
+    store.refresh()
+    return store
+
+
+@pytest.mark.parametrize("dtype,ratio", [("float16", 2), ("int8", 4)])
+def test_quantized_snapshot_is_smaller(dtype, ratio):
+    """Test float16 and int8 snapshots hold 1/2 and ~1/4 of the float32 bytes."""
+    vectors = _clustered(500)
+    full = _store("float32", vectors).snapshot.nbytes
+
+    assert _store(dtype, vectors).snapshot.nbytes <= full / ratio * 1.01
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_search_matches_exact_ranking(dtype):
+    """Test quantized candidate selection plus exact rerank keeps the top 10."""
+    vectors = _clustered(2000)
+    exact = _store("float32", vectors).snapshot
+    quantized = _store(dtype, vectors).snapshot
+
+    for query in _clustered(20, seed=1):
+        expected = exact.search(query, 10, rerank=10)
+        found = quantized.search(query, 10, rerank=100)
+        assert [job_id for job_id, _ in found] == [job_id for job_id, _ in expected]
+        assert np.allclose([s for _, s in found], [s for _, s in expected], atol=1e-6)
+
+
+def test_int8_scale_grows_on_refresh():
+    """Test rows beyond the current scale requantize kept rows, not clip new ones."""
+    vectors = _clustered(100)
+    store = _store("int8", vectors)
+    spike = np.zeros(vectors.shape[1], dtype=np.float32)
+    spike[0] = 1.0
+
+    store.write([("spike", text_hash("m", "spike"), spike)])
+    snapshot = store.refresh()
+
+    assert snapshot.scale[0] == pytest.approx(1.0 / 127)
+    row = snapshot.lookup("spike", text_hash("m", "spike"))
+    assert snapshot.approximate(row)[0] == pytest.approx(1.0)
+    kept = snapshot.approximate(np.arange(100))
+    assert np.abs(kept - vectors).max() < 0.01
+    # Kept rows are quantized again from float32, exactly like new ones
+    assert np.array_equal(
+        snapshot.codes[:100],
+        np.clip(np.rint(vectors / snapshot.scale), -127, 127).astype(np.int8),
+    )
+
+
+def test_vectors_are_exact_unless_changed():
+    """Test exact reads come from the database and fall back when stale."""
+    vectors = _clustered(10)
+    store = _store("int8", vectors)
+    snapshot = store.snapshot
+
+    assert np.array_equal(snapshot.vectors([3]), vectors[[3]])
+
+    store.write([("job-3", text_hash("m", "changed"), vectors[4])])
+    stale = snapshot.vectors([3])
+    assert np.allclose(stale, vectors[[3]], atol=0.01)
+    assert not np.array_equal(stale, vectors[[3]])
+
+
+def test_semantic_mode_ranks_catalog(monkeypatch):
+    """Test /match?mode=semantic returns catalog jobs nearest the profile."""
+    catalog = JobCatalog(":memory:")
+    jobs = load_sample_jobs()
+    catalog.upsert_many(jobs)
+    vectors = _clustered(len(jobs))
+    store = VectorStore(catalog, dtype="int8")
+    store.write(
+        [
+            (job["id"], text_hash("m", job["id"]), vector)
+            for job, vector in zip(jobs, vectors, strict=True)
+        ]
+    )
+    store.refresh()
+
+    class Embeddings:
+        model = "m"
+
+        def embed_texts(self, texts):
+            return [vectors[5].tolist() for _ in texts]
+
+    monkeypatch.setattr(routes, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(routes, "current_snapshot", lambda: store.snapshot)
+    monkeypatch.setattr(routes, "get_embeddings_client", lambda: Embeddings())
+    routes.profile_cache.clear()
+
+    response = client.post(
+        "/v1/match?mode=semantic&limit=3",
+        json={"profile": {"skills": ["Quantization"]}},
+    )
+
+    data = response.json()
+    assert [match["job"]["id"] for match in data][0] == jobs[5]["id"]
+    assert data[0]["score"] == 100.0
+    assert len(data) == 3
+    routes.profile_cache.clear()
+
+
+def test_search_restricted_to_rows():
+    """Test a row subset (e.g. from a location filter) limits the results."""
+    vectors = _clustered(300)
+    snapshot = _store("int8", vectors).snapshot
+    allowed = [f"job-{i}" for i in range(0, 300, 7)]
+
+    found = snapshot.search(vectors[0], 5, rerank=20, rows=snapshot.rows_of(allowed))
+
+    assert found[0][0] == "job-0"
+    assert {job_id for job_id, _ in found} <= set(allowed)
+    assert snapshot.search(vectors[0], 5, rows=snapshot.rows_of(["gone"])) == []
@@ -1,15 +1,32 @@
+from contextvars import ContextVar
+
 import numpy as np
-from mistralai import Mistral
+
+# Usage of the latest embeddings call in the current thread or task; a
+# context variable, since one client is shared by concurrent requests
+_last_usage: ContextVar[object | None] = ContextVar("embeddings_usage", default=None)
 
 
 class EmbeddingsClient:
-    def __init__(self, api_key: str, model: str = "mistral-embed"):
-        self.client = Mistral(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "mistral-embed", client=None):
+        # An existing SDK-compatible client (e.g. a fake backend) may be injected.
+        if client is None:
+            # Deferred: the SDK import is slow and unneeded for cosine_sim users.
+            from mistralai import Mistral
+
+            client = Mistral(api_key=api_key)
+        self.client = client
         self.model = model
 
+    @property
+    def last_usage(self):
+        """Usage (token counts) of this context's most recent embeddings call."""
+        return _last_usage.get()
+
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         # Batch call; the SDK exposes an embeddings endpoint per docs.
         resp = self.client.embeddings.create(model=self.model, inputs=texts)
+        _last_usage.set(getattr(resp, "usage", None))
         # Unify to plain list of floats
         return [e.embedding for e in resp.data]
 